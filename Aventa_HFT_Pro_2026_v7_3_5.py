@@ -79,17 +79,28 @@ TRANSLATIONS = {
 
 
 class TextWidgetLogger:
-    """Custom logging handler that redirects output to GUI Text widget"""
-    def __init__(self, gui_instance):
+    """Custom logging handler that redirects output to GUI Text widget
+    
+    write() may run on any thread (engine threads, the log writer thread);
+    lines are buffered and inserted into the widget by pump() on the Tk thread.
+    """
+    def __init__(self, gui_instance, max_pending=5000):
         self.gui = gui_instance
+        self.pending = deque(maxlen=max_pending)
         
     def write(self, message):
-        """Write message to GUI logs (with filtering for repetitive system messages)"""
+        """Buffer a message for the GUI logs (never touches Tk)"""
         if message.strip():
+            self.pending.append(message)
+    
+    def pump(self):
+        """Insert buffered messages into GUI logs (with filtering for repetitive system messages)"""
+        while self.pending:
+            message = self.pending.popleft()
             try:
                 # Filter out repetitive system/performance messages
                 if self._should_filter_message(message):
-                    return
+                    continue
                 
                 # Determine log level based on message content
                 level = "INFO"
@@ -556,15 +567,25 @@ class HFTProGUI:
             try:
                 # Create custom logger
                 logger_stream = TextWidgetLogger(self)
+                self.log_stream = logger_stream
                 
                 # Redirect stdout and stderr to GUI
                 sys.stdout = logger_stream
                 sys.stderr = logger_stream
+                self.pump_log_stream()
                 
                 self.log_message("✓ Logging system initialized - All console output redirected to Logs tab", "SUCCESS")
             except Exception as e:
                 print(f"Setup logging error: {e}")
 
+        def pump_log_stream(self):
+            """Move buffered console output into the Logs tab (every 100 ms, Tk thread)"""
+            try:
+                self.log_stream.pump()
+            except Exception:
+                pass
+            self.root.after(100, self.pump_log_stream)
+
         def log_ml_message(self, message, level="INFO"):
             """Add message to ML training log"""
             try:
@@ -1688,7 +1709,14 @@ class HFTProGUI:
                 else:
                     self.log_message(f"{self.active_bot_id}: ML Prediction DISABLED (Technical signals only)", "INFO")
                 
-                bot['engine'] = UltraLowLatencyEngine(config['symbol'], config, bot['risk_manager'], ml_predictor, 
+                if config.get('engine_process', False):
+                    # Engine threads run in a worker process, away from the GUI's GIL
+                    from engine_process import EngineProcess
+                    engine_class = EngineProcess
+                else:
+                    engine_class = UltraLowLatencyEngine
+                
+                bot['engine'] = engine_class(config['symbol'], config, bot['risk_manager'], ml_predictor, 
                                                 telegram_callback=lambda **data: self.send_telegram_signal(bot_id=self.active_bot_id, **data))
                 
                 # Initialize and start
@@ -2042,13 +2070,10 @@ class HFTProGUI:
                 
                 # If bot is running, update its risk_manager live
                 if self.bots[bot_id]['is_running'] and self.bots[bot_id]['risk_manager']:
-                    rm = self.bots[bot_id]['risk_manager']
-                    rm.max_daily_loss = config['max_daily_loss']
-                    rm.max_daily_trades = config['max_daily_trades']
-                    rm.max_daily_volume = config['max_daily_volume']
-                    rm.max_position_size = config['max_position_size']
-                    rm.max_positions = config['max_positions']
-                    rm.max_drawdown_pct = config['max_drawdown_pct']
+                    from risk_manager import RiskManager
+                    limits = {key: config[key] for key in RiskManager.LIMIT_FIELDS}
+                    self.bots[bot_id]['risk_manager'].apply_runtime_changes(limits)
+                    self.forward_risk_changes(self.bots[bot_id], limits)
                     
                     self.log_message(f"✓ {bot_id} config updated (running bot)", "SUCCESS")
                 else:
@@ -2446,6 +2471,15 @@ class HFTProGUI:
             ttk.Label(container, text=label_text, font=('Segoe UI', 9)).pack(side=tk.LEFT)
             ttk.Label(container, textvariable=variable, style='Metric.TLabel', width=width).pack(side=tk.LEFT, padx=(5, 0))
 
+        def forward_risk_changes(self, bot, changes):
+            """Send risk manager edits to the running engine (an engine_process worker holds its own copy)"""
+            if not bot.get('is_running') or bot.get('engine') is None:
+                return
+            try:
+                bot['engine'].update_risk_limits(changes)
+            except Exception as e:
+                self.log_message(f"Forward risk changes error: {e}", "ERROR")
+
         def update_risk_limits(self):
             """Update risk limits for active bot"""
             try:
@@ -2465,12 +2499,10 @@ class HFTProGUI:
                 
                 # If bot is running, update risk_manager live
                 if bot['risk_manager']:
-                    bot['risk_manager'].max_daily_loss = bot['config']['max_daily_loss']
-                    bot['risk_manager'].max_daily_trades = bot['config']['max_daily_trades']
-                    bot['risk_manager'].max_daily_volume = bot['config']['max_daily_volume']
-                    bot['risk_manager'].max_position_size = bot['config']['max_position_size']
-                    bot['risk_manager'].max_positions = bot['config']['max_positions']
-                    bot['risk_manager'].max_drawdown_pct = bot['config']['max_drawdown_pct']
+                    from risk_manager import RiskManager
+                    limits = {key: bot['config'][key] for key in RiskManager.LIMIT_FIELDS}
+                    bot['risk_manager'].apply_runtime_changes(limits)
+                    self.forward_risk_changes(bot, limits)
                     
                     self.log_message(f"✓ {self.active_bot_id} risk limits updated", "SUCCESS")
                     self.add_risk_event(f"{self.active_bot_id} risk limits updated", "INFO")
@@ -2510,11 +2542,19 @@ class HFTProGUI:
                         daily_trades_actual = engine_snapshot.get('trades_today', 0)
                         daily_pnl_actual = engine_snapshot.get('daily_pnl', 0.0)
                         
+                        # An engine_process worker trips the circuit breaker on its own copy
+                        # of the risk manager: mirror that copy's state here first
+                        if engine_snapshot.get('risk'):
+                            bot['risk_manager'].apply_runtime_changes(engine_snapshot['risk'])
+                        
                         # Get risk metrics from active bot's risk manager (now with position data)
                         try:
                             # ✅ Also sync risk_manager's counters with engine's actual data
-                            bot['risk_manager'].daily_trades = daily_trades_actual
-                            bot['risk_manager'].daily_pnl = daily_pnl_actual
+                            rm = bot['risk_manager']
+                            if (rm.daily_trades, rm.daily_pnl) != (daily_trades_actual, daily_pnl_actual):
+                                counters = {'daily_trades': daily_trades_actual, 'daily_pnl': daily_pnl_actual}
+                                rm.apply_runtime_changes(counters)
+                                self.forward_risk_changes(bot, counters)
                             
                             metrics = bot['risk_manager'].get_risk_metrics(balance, bot_positions)
                             
@@ -2606,6 +2646,7 @@ class HFTProGUI:
                 if bot['risk_manager']:
                     bot['risk_manager'].circuit_breaker_triggered = False
                     bot['risk_manager'].trading_enabled = True
+                    self.forward_risk_changes(bot, {'circuit_breaker_triggered': False, 'trading_enabled': True})
                     self.log_message(f"✓ {self.active_bot_id} circuit breaker reset", "SUCCESS")
                     self.add_risk_event(f"{self.active_bot_id} circuit breaker reset by user", "INFO")
                 else:
@@ -2625,6 +2666,8 @@ class HFTProGUI:
                 
                 if bot['risk_manager']:
                     bot['risk_manager'].trigger_circuit_breaker(f"Manual trigger by user for {self.active_bot_id}")
+                    self.forward_risk_changes(bot, {'circuit_breaker_triggered': True, 'trading_enabled': False,
+                                                    'last_circuit_reason': bot['risk_manager'].last_circuit_reason})
                     self.log_message(f"🚨 {self.active_bot_id} circuit breaker triggered manually", "WARNING")
                     self.add_risk_event(f"{self.active_bot_id} circuit breaker triggered manually", "CRITICAL")
                 else:
@@ -4152,9 +4195,8 @@ This is a test message from Aventa HFT Pro 2026"""
                     self.log_message(f"Unknown signal type: {signal_type}", "ERROR")
                     return
 
-                import asyncio
-                import threading
                 from telegram import Bot
+                from telegram_bot_runner import get_bot_runner
 
                 async def send_signal():
                     """Send signal to all chat IDs for this specific bot"""
@@ -4175,15 +4217,8 @@ This is a test message from Aventa HFT Pro 2026"""
                     except Exception as e:
                         self.log_message(f"Telegram send error for {bot_id}: {e}", "ERROR")
 
-                # Run in background thread to avoid blocking
-                def run_async():
-                    try:
-                        asyncio.run(send_signal())
-                    except Exception as e:
-                        self.log_message(f"Async error for {bot_id}: {e}", "ERROR")
-
-                thread = threading.Thread(target=run_async, daemon=True, name=f"TelegramSignal-{bot_id}")
-                thread.start()
+                # One long-lived event loop sends every message (no thread per signal)
+                get_bot_runner().submit(send_signal())
                 
                 # ✅ UPDATE STATUS with bot identification
                 self.update_telegram_status(
@@ -4852,6 +4887,7 @@ This is a test message from Aventa HFT Pro 2026"""
 
                 if bot['risk_manager']:
                     bot['risk_manager'].circuit_breaker_triggered = False
+                    self.forward_risk_changes(bot, {'circuit_breaker_triggered': False})
                     self.circuit_breaker_status.set("✅ INACTIVE - Trading Allowed")
                     self.circuit_breaker_reason.set("Manually reset")
                     self.add_risk_event(f"{self.active_bot_id} circuit breaker manually reset", "INFO")
@@ -4872,6 +4908,7 @@ This is a test message from Aventa HFT Pro 2026"""
 
                 if bot['risk_manager']:
                     bot['risk_manager'].circuit_breaker_triggered = True
+                    self.forward_risk_changes(bot, {'circuit_breaker_triggered': True})
                     self.circuit_breaker_status.set("🚨 ACTIVE - Trading Halted")
                     self.circuit_breaker_reason.set("Manually triggered")
                     self.add_risk_event(f"⚠️ {self.active_bot_id} circuit breaker manually triggered", "WARNING")
@@ -5580,6 +5617,8 @@ def main():
 
 
 if __name__ == "__main__": 
+    import multiprocessing
+    multiprocessing.freeze_support()  # engine worker processes in frozen builds
     root = tk.Tk()
     app = HFTProGUI(root)
     root.mainloop()
\ No newline at end of file
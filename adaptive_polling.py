@@ -0,0 +1,185 @@
+"""
+Adaptive Polling for Aventa HFT Pro 2026
+Sleep schedule for the engine's polling threads: fast while ticks flow, backing off in dead markets,
+napping outside trading sessions
+"""
+
+import threading
+from time import monotonic, thread_time
+from typing import Callable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+ACTIVE = 'active'
+BACKOFF = 'backoff'
+SESSION_IDLE = 'session_idle'
+
+
+class AdaptivePoller:
+    """
+    Decides how long a polling loop sleeps after each pass
+
+    - active: ``min_interval`` while passes find new data (the fixed
+      schedule the loops always had)
+    - backoff: after ``backoff_after`` seconds without new data the delay
+      doubles per empty pass up to ``max_interval``; the first pass that
+      finds data drops it back to ``min_interval``
+    - session_idle: while ``session_wait()`` reports seconds until trading
+      may start (outside the configured sessions, no open position), the
+      loop polls every ``idle_interval`` and wakes exactly at session start.
+      New data is still picked up on each pass but does not end the nap.
+
+    sleep() waits on an event (the poller's own, or one passed in such as
+    the engine's new-tick event), so wake() or a new tick cuts any delay
+    short.  The session callback is evaluated at most once per
+    ``session_check_interval``.  Each sleep() also charges the calling
+    thread's CPU time since the previous call to the loop (cpu_seconds).
+    """
+
+    def __init__(self, min_interval: float = 0.001, max_interval: float = 0.25, backoff_after: float = 1.0,
+                 idle_interval: float = 1.0, session_wait: Optional[Callable[[], float]] = None,
+                 session_check_interval: float = 1.0, adaptive: bool = True, factor: float = 2.0):
+        """
+        Initialize poller
+
+        Args:
+            min_interval: Delay while data is flowing (seconds)
+            max_interval: Longest backoff delay while trading is allowed
+            backoff_after: Seconds without new data before backing off
+            idle_interval: Delay outside trading sessions
+            session_wait: Callable returning seconds until trading may start (0 = now)
+            session_check_interval: Min seconds between session_wait calls
+            adaptive: False keeps the fixed min_interval schedule (CPU is still measured)
+            factor: Backoff growth per empty pass
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff_after = backoff_after
+        self.idle_interval = idle_interval
+        self.session_wait = session_wait
+        self.session_check_interval = session_check_interval
+        self.adaptive = adaptive
+        self.factor = factor
+
+        self.mode = ACTIVE
+        self.interval = min_interval
+        self._wake = threading.Event()
+        self._last_data = monotonic()
+        self._idle_until = 0.0
+        self._next_session_check = 0.0
+
+        # Accounting
+        self.started = None
+        self.polls = 0
+        self.empty_polls = 0
+        self.backoff_polls = 0
+        self.idle_polls = 0
+        self.slept = 0.0
+        self.cpu_seconds = 0.0
+        self.active_empty_cpu = 0.0
+        self.active_empty_polls = 0
+        self._cpu_mark = None
+
+    def session_seconds(self) -> float:
+        """Seconds until trading may start (0 while allowed), re-evaluated at most once per check interval"""
+        if self.session_wait is None or not self.adaptive:
+            return 0.0
+        now = monotonic()
+        if now >= self._next_session_check:
+            try:
+                wait = max(0.0, float(self.session_wait()))
+            except Exception as e:
+                logger.debug(f"Session check failed: {e}")
+                wait = 0.0
+            self._idle_until = now + wait
+            self._next_session_check = now + min(self.session_check_interval, wait or self.session_check_interval)
+        return max(0.0, self._idle_until - now)
+
+    def next_delay(self, new_data: bool) -> float:
+        """Record one pass and return how long to sleep before the next"""
+        now = monotonic()
+        self.polls += 1
+        if new_data:
+            self._last_data = now
+        else:
+            self.empty_polls += 1
+        if not self.adaptive:
+            return self.min_interval
+
+        until_session = self.session_seconds()
+        if until_session > 0:
+            self.mode = SESSION_IDLE
+            self.idle_polls += 1
+            self.interval = self.min_interval
+            return max(self.min_interval, min(self.idle_interval, until_session))
+
+        if new_data or now - self._last_data < self.backoff_after:
+            self.mode = ACTIVE
+            self.interval = self.min_interval
+        else:
+            self.mode = BACKOFF
+            self.backoff_polls += 1
+            self.interval = min(self.max_interval, self.interval * self.factor)
+        return self.interval
+
+    def sleep(self, new_data: bool, event: Optional[threading.Event] = None) -> bool:
+        """
+        Account the pass, then wait out the delay
+
+        Waits on ``event`` if given (the caller clears it), else on the
+        poller's own wake() event.  Returns True if the wait was cut short.
+        """
+        cpu = thread_time()
+        if self._cpu_mark is not None:
+            used = cpu - self._cpu_mark
+            self.cpu_seconds += used
+            if not new_data and self.mode == ACTIVE:
+                self.active_empty_cpu += used
+                self.active_empty_polls += 1
+        else:
+            self.started = monotonic()
+        delay = self.next_delay(new_data)
+        start = monotonic()
+        if event is not None:
+            woken = event.wait(delay)
+        else:
+            woken = self._wake.wait(delay)
+            if woken:
+                self._wake.clear()
+        self.slept += monotonic() - start
+        self._cpu_mark = thread_time()
+        return woken
+
+    def wake(self):
+        """Cut the current sleep short and re-check the session on the next pass"""
+        self._next_session_check = 0.0
+        self._wake.set()
+
+    @property
+    def idle(self) -> bool:
+        """True while backing off or napping outside sessions"""
+        return self.mode != ACTIVE
+
+    def get_stats(self) -> dict:
+        """Pass counts, time slept, loop CPU and the CPU a fixed min_interval schedule would have used extra"""
+        elapsed = monotonic() - self.started if self.started is not None else 0.0
+        per_empty_poll = self.active_empty_cpu / self.active_empty_polls if self.active_empty_polls else 0.0
+        fixed_polls = elapsed / self.min_interval if self.min_interval > 0 else self.polls
+        return {
+            'mode': self.mode,
+            'interval': self.interval,
+            'polls': self.polls,
+            'empty_polls': self.empty_polls,
+            'backoff_polls': self.backoff_polls,
+            'idle_polls': self.idle_polls,
+            'slept_s': self.slept,
+            'elapsed_s': elapsed,
+            'cpu_s': self.cpu_seconds,
+            'cpu_per_empty_poll_us': per_empty_poll * 1000000,
+            # Estimate: passes skipped versus the fixed schedule, each costing one empty active pass
+            'cpu_saved_est_s': max(0.0, fixed_polls - self.polls) * per_empty_poll if self.adaptive else 0.0,
+        }
+
+    def __repr__(self):
+        return f"AdaptivePoller(mode={self.mode}, interval={self.interval * 1000:.1f}ms, polls={self.polls})"
@@ -0,0 +1,158 @@
+"""
+Async Logging for Aventa HFT Pro 2026
+Queue-based logging with a background writer and per-call-site rate limits
+"""
+
+import atexit
+import logging
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue, Full
+from typing import Dict, Optional
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Puts records on a bounded queue without formatting them
+
+    The stock QueueHandler formats every record in the calling thread;
+    here ``msg % args`` (and any handler's formatting and I/O) runs on the
+    writer thread instead.  Log arguments should therefore be values that
+    are not mutated afterwards (numbers, strings, tuples).  A full queue
+    drops the record rather than blocking the trading thread.
+    """
+
+    def __init__(self, queue: Queue):
+        super().__init__(queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except Full:
+            self.dropped += 1
+
+
+class AsyncLogging:
+    """
+    Moves a logger's handlers behind a queue drained by one writer thread
+
+    Log calls on the hot path cost a level check, a LogRecord and a queue
+    put; formatting, stream writes and GUI handlers run on the writer.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.queue = Queue(maxsize=maxsize)
+        self.handler = LazyQueueHandler(self.queue)
+        self.listener: Optional[QueueListener] = None
+        self.logger: Optional[logging.Logger] = None
+        self._handlers = []
+
+    def install(self, logger: Optional[logging.Logger] = None):
+        """Route ``logger`` (default: root) through the queue; its current handlers become the writer's"""
+        logger = logger or logging.getLogger()
+        self._handlers = [h for h in logger.handlers if h is not self.handler]
+        for handler in self._handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(self.handler)
+        self.logger = logger
+        self.listener = QueueListener(self.queue, *self._handlers, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Write what is queued and put the original handlers back"""
+        if self.listener is None:
+            return
+        self.listener.stop()
+        self.listener = None
+        self.logger.removeHandler(self.handler)
+        for handler in self._handlers:
+            self.logger.addHandler(handler)
+
+    @property
+    def running(self) -> bool:
+        return self.listener is not None
+
+    def get_stats(self) -> dict:
+        return {
+            'running': self.running,
+            'depth': self.queue.qsize(),
+            'capacity': self.queue.maxsize,
+            'enqueued': self.handler.enqueued,
+            'dropped': self.handler.dropped,
+        }
+
+
+_pipeline: Optional[AsyncLogging] = None
+_pipeline_lock = threading.Lock()
+
+
+def install_async_logging(maxsize: int = 10000) -> AsyncLogging:
+    """Process-wide async logging on the root logger (installed once)"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None or not _pipeline.running:
+            _pipeline = AsyncLogging(maxsize)
+            _pipeline.install()
+        return _pipeline
+
+
+def get_async_logging() -> Optional[AsyncLogging]:
+    return _pipeline
+
+
+class LogRateLimiter:
+    """
+    At most one record per call site every ``interval`` seconds
+
+    The call site is the caller's code location (or an explicit ``key``),
+    so each diagnostic line has its own budget.  The record that gets
+    through reports how many were suppressed since the previous one and
+    carries ``site`` and ``suppressed`` as record attributes.
+    """
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._sites: Dict[object, list] = {}
+        self._lock = threading.Lock()
+        self.emitted = 0
+        self.suppressed = 0
+
+    def log(self, logger: logging.Logger, level: int, msg: str, *args,
+            key=None, interval: Optional[float] = None) -> bool:
+        """Log ``msg % args`` unless this site logged within the interval; True if emitted"""
+        if not logger.isEnabledFor(level):
+            return False
+        if key is None:
+            frame = sys._getframe(1)
+            key = (frame.f_code, frame.f_lineno)
+        now = time.monotonic()
+        with self._lock:
+            state = self._sites.get(key)
+            if state is not None and now < state[0]:
+                state[1] += 1
+                self.suppressed += 1
+                return False
+            suppressed = state[1] if state is not None else 0
+            self._sites[key] = [now + (self.interval if interval is None else interval), 0]
+            self.emitted += 1
+
+        if suppressed:
+            msg += " (+%d suppressed)"
+            args += (suppressed,)
+        code = key[0] if isinstance(key, tuple) else None
+        site = f"{code.co_name}:{key[1]}" if hasattr(code, 'co_name') else str(key)
+        logger.log(level, msg, *args, stacklevel=2, extra={'site': site, 'suppressed': suppressed})
+        return True
+
+    def get_stats(self) -> dict:
+        return {'interval': self.interval, 'sites': len(self._sites),
+                'emitted': self.emitted, 'suppressed': self.suppressed}
@@ -8,18 +8,29 @@ import MetaTrader5 as mt5
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional
 import time
 import threading
 import logging
-from queue import Queue, PriorityQueue
+from queue import Queue, PriorityQueue, Empty
 import json
 # Add these imports at the top
-from thread_safety import rate_limit
 from account_cache import AccountCache
-from performance_utils import cache_with_ttl
+from tick_ingestion import TickIngestor
+from tick_ring_buffer import TickRingBuffer, OrderFlowRingBuffer, ticks_from_mt5
+from order_flow import compute_order_flow
+from streaming_indicators import IndicatorBank
+from tick_recorder import TickRecorder
+from latency_histogram import LatencyTracker
+from volume_profile import VolumeProfile
+from deals_ledger import DealsLedger
+from position_book import PositionBook
+from order_templates import OrderTemplates
+from adaptive_polling import AdaptivePoller
+from symbol_specs import get_symbol_spec_cache
+from notification_outbox import NotificationOutbox
+from async_logging import LogRateLimiter, install_async_logging
 
 # Configure logging
 logging.basicConfig(
@@ -38,6 +49,7 @@ try:
         momentum_fast,
         bollinger_bands_fast
     )
+    import fast_indicators
     FAST_INDICATORS_AVAILABLE = True
     logger.info("✓ Fast indicators (Numba) loaded successfully")
 except ImportError: 
@@ -45,6 +57,16 @@ except ImportError:
     logger.warning("⚠️ Fast indicators not available - using slower pandas methods")
 
 
+# How an ML prediction (confidence in [0, 1]) moves the technical signal strength
+ML_AGREE_BOOST = 0.4           # agree: strength + confidence * 0.4 (capped at 1.0)
+ML_DISAGREE_CUT = 0.4          # disagree: strength * (1 - confidence * 0.4)
+ML_ONLY_MIN_CONFIDENCE = 0.6   # no technical direction: ML alone needs more than this...
+ML_ONLY_SCALE = 0.8            # ...and sets strength = confidence * 0.8
+
+# Seconds between check_positions() runs in the analysis thread
+POSITION_CHECK_INTERVAL = 5.0
+
+
 @dataclass
 class TickData:
     """Ultra-fast tick data structure"""
@@ -81,11 +103,47 @@ class Signal:
     take_profit: float
     volume: float
     reason: str
+    # perf_counter() marks for latency tracking (newest tick seen, time queued)
+    tick_perf: float = field(default=0.0, repr=False, compare=False)
+    queued_perf: float = field(default=0.0, repr=False, compare=False)
     
     def __lt__(self, other):
         return self.timestamp < other.timestamp
 
 
+@dataclass
+class TradingSnapshot:
+    """Trading state fetched once per decision (positions, account, today's deals)"""
+    magic: int
+    positions: tuple        # every position on the symbol
+    balance: float
+    equity: float
+    closed_pnl: float       # today's realized P&L, this magic
+    trade_count: int        # today's entries, this magic
+    total_volume: float     # today's entry volume, this magic
+    
+    @property
+    def position_count(self) -> int:
+        return len(self.positions)
+    
+    @property
+    def own_position_count(self) -> int:
+        return sum(1 for p in self.positions if p.magic == self.magic)
+    
+    @property
+    def floating_loss(self) -> float:
+        """Sum of losing positions of this magic (positive number)"""
+        return sum(abs(p.profit) for p in self.positions if p.magic == self.magic and p.profit < 0)
+    
+    @property
+    def floating_pnl(self) -> float:
+        return sum(p.profit for p in self.positions)
+    
+    @property
+    def position_volume(self) -> float:
+        return sum(p.volume for p in self.positions)
+
+
 class UltraLowLatencyEngine:
     """Core HFT engine with microsecond precision"""
     
@@ -104,12 +162,34 @@ class UltraLowLatencyEngine:
         self.risk_manager = risk_manager
         self.ml_predictor = ml_predictor
         self.telegram_callback = telegram_callback
+        # Notifications leave the trading threads through a bounded outbox
+        self.notifications = NotificationOutbox(
+            self._deliver_notification,
+            maxsize=config.get('notification_queue_size', 256),
+            overflow=config.get('notification_overflow', 'drop_oldest'),
+            name=f"Notify-{symbol}",
+        )
+        
+        # Today's deals for our magic, fetched incrementally
+        self.deals_ledger = DealsLedger(self.config.get('magic_number', 2026002),
+                                        max_age=self.config.get('deals_refresh_interval', 0.5))
+        
+        # Open positions on the symbol: our fills applied locally, marked per tick,
+        # reconciled with the terminal every position_reconcile_interval seconds
+        self.position_book = PositionBook(symbol, self.config.get('magic_number', 2026002),
+                                          self.config.get('position_reconcile_interval', 1.0))
+        
+        # Contract specs shared with other engines, backtester and ML
+        self.symbol_specs = get_symbol_spec_cache()
+        
+        # order_send requests pre-built per side; rebuilt when config_version changes
+        self.order_templates = OrderTemplates(symbol)
         
         # ========================================
         # STEP 3: Data structures
         # ========================================
-        self.tick_buffer = deque(maxlen=10000)
-        self.orderflow_buffer = deque(maxlen=5000)
+        self.tick_buffer = TickRingBuffer(self.config.get('tick_buffer_size', 10000))
+        self.orderflow_buffer = OrderFlowRingBuffer(self.config.get('orderflow_buffer_size', 5000))
         self.signal_queue = PriorityQueue(maxsize=1000)
         
         # ========================================
@@ -125,13 +205,68 @@ class UltraLowLatencyEngine:
         # STEP 5: Order flow tracking
         # ========================================
         self.cumulative_delta = 0.0
-        self.volume_profile = {}
+        # Session volume-at-price (bucket size follows symbol_point once initialize() runs)
+        self.volume_profile = VolumeProfile(point=0.01, value_area_pct=self.config.get('value_area_pct', 0.70))
+        
+        # Tick ingestion: 'batch' pulls every new tick via copy_ticks_from cursor,
+        # 'poll' keeps the legacy symbol_info_tick sampling
+        self.tick_ingestion_mode = self.config.get('tick_ingestion_mode', 'batch')
+        self.tick_ingestor = TickIngestor(symbol, batch_size=self.config.get('tick_batch_size', 1000))
+        
+        # Shared per-symbol market data hub (one data thread for all bots on the symbol)
+        self.use_market_data_hub = self.config.get('use_market_data_hub', True)
+        self.market_data_hub = None
+        self.market_data_subscription = None
+        
+        # Optional on-disk recorder of the ingested tick stream (started in start())
+        self.tick_recorder = None
+        
+        # Sequence number of the next tick this engine will process
+        self.tick_seq = 0
+        
+        # Memoized analysis keyed on (tick_seq, config_version); update_config() bumps the version
+        self.config_version = 0
+        self._analysis_cache_key = None
+        self._analysis_cache = {}
+        self.analysis_cache_hits = 0
+        self.analysis_cache_misses = 0
+        self._analysis_compute_us = 0.0
+        
+        # Fused Numba analysis: metrics + pre-ML signal in one kernel call into a reused buffer
+        self.use_fused_analysis = FAST_INDICATORS_AVAILABLE and self.config.get('fused_analysis', True)
+        self._fused_params_version = None
+        self._fused_params = None
+        self._fused_out = np.zeros(fast_indicators.N_OUTPUTS) if FAST_INDICATORS_AVAILABLE else None
+        
+        # ML inference gating: the model runs only when it can change the outcome, once per bar
+        self._ml_cache_key = None
+        self._ml_cache = None
+        self.ml_predictions_made = 0
+        self.ml_predictions_skipped = 0
+        self.ml_cache_hits = 0
+        
+        # Last close_all_positions batch (positions, closed, wall_ms, per_position_ms)
+        self.last_close_all = None
+        
+        # Streaming indicators: one O(1) instance per configured period, fed per tick
+        self.use_streaming_indicators = self.config.get('streaming_indicators', True)
+        self.indicator_bank = IndicatorBank()
+        self._indicator_params = None
+        self._wanted_indicator_params = self._get_indicator_params()
+        self._sync_indicator_streams()
         
         # ========================================
         # STEP 6: Performance metrics
         # ========================================
-        self.latency_samples = deque(maxlen=1000)
-        self.execution_times = deque(maxlen=1000)
+        # Per-stage log-bucketed latency histograms (fixed memory, per-reader windows)
+        self.latency = LatencyTracker()
+        self.stage_latency = self.latency.histograms
+        self.last_tick_perf = 0.0
+        
+        # Hot-path diagnostics: per-call-site rate limits, formatted on the log writer thread
+        self.log_limiter = LogRateLimiter(self.config.get('log_rate_limit_interval', 5.0))
+        if self.config.get('async_logging', True):
+            install_async_logging()
         
         # ========================================
         # STEP 7: State
@@ -148,6 +283,18 @@ class UltraLowLatencyEngine:
         self.execution_thread = None
         self.analysis_thread = None
         
+        # Event-driven pipeline: the data thread wakes analysis on new ticks and
+        # execution blocks on the signal queue (False: legacy fixed sleeps)
+        self.event_driven = self.config.get('event_driven_pipeline', True)
+        self.analysis_min_spacing = self.config.get('analysis_min_spacing', 0.005)
+        self.new_tick_event = threading.Event()
+        
+        # Sleep schedules of the data and analysis threads: back off while no ticks
+        # arrive, nap outside trading sessions (see adaptive_polling)
+        self.data_poller = AdaptivePoller(min_interval=0.001, session_wait=self._session_wait)
+        self.analysis_poller = AdaptivePoller(session_wait=self._session_wait)
+        self._configure_pollers()
+        
         # ========================================
         # STEP 9: Trading controls
         # ========================================
@@ -217,15 +364,36 @@ class UltraLowLatencyEngine:
             logger.warning(f"⚠️ Mode pengisian '{mode_str}' nggak didukung, pakai FOK aja ya.")
         return mode_map.get(mode_upper, mt5.ORDER_FILLING_FOK)
 
+    def build_order_templates(self) -> OrderTemplates:
+        """Rebuild the order request templates from the current config (order_check probe if enabled)"""
+        check = self.config.get('order_check_templates', True)
+        self.order_templates.build(
+            self.config_version,
+            self.symbol_specs.get(self.symbol),
+            self.get_filling_mode(self.config.get('filling_mode', 'FOK')),
+            self.config.get('slippage', 20),
+            self.config.get('magic_number', 2026002),
+            check=check,
+            tick=mt5.symbol_info_tick(self.symbol) if check else None,
+        )
+        return self.order_templates
+    
+    def get_order_templates(self) -> OrderTemplates:
+        """Order request templates for the current config version"""
+        templates = self.order_templates
+        if templates.version != self.config_version or templates.spec is None:
+            self.build_order_templates()
+        return templates
+    
     def is_trading_session_allowed(self) -> bool:
         """Check if current time is within allowed trading sessions"""
         if not self.config.get('trading_sessions_enabled', True):
             return True  # No restrictions if disabled
         
-        from datetime import datetime
+        from datetime import datetime, timezone
         
-        # Get current GMT time
-        now_gmt = datetime.utcnow()
+        # Get current GMT time (via time.time() so a replay clock can stand in)
+        now_gmt = datetime.fromtimestamp(time.time(), tz=timezone.utc)
         current_hour = now_gmt.hour
         current_minute = now_gmt.minute
         current_time_minutes = current_hour * 60 + current_minute
@@ -268,6 +436,26 @@ class UltraLowLatencyEngine:
         
         return is_allowed
     
+    def seconds_until_session(self) -> float:
+        """Seconds until is_trading_session_allowed() turns True (0 while it is)"""
+        if self.is_trading_session_allowed():
+            return 0.0
+        starts = [
+            self._time_to_minutes(self.config.get(f'{name}_start', start))
+            for name, start, enabled in (('london', '08:00', True), ('ny', '13:00', True), ('asia', '22:00', False))
+            if self.config.get(f'{name}_session_enabled', enabled)
+        ]
+        if not starts:
+            return 86400.0
+        seconds_of_day = time.time() % 86400
+        return min((start * 60 - seconds_of_day) % 86400 for start in starts)
+    
+    def _session_wait(self) -> float:
+        """How long the polling threads may nap: until the next session opens, never with a position open"""
+        if self.position_book.own_count:
+            return 0.0
+        return self.seconds_until_session()
+    
     @staticmethod
     def _time_to_minutes(time_str: str) -> int:
         """Convert HH:MM string to minutes since midnight"""
@@ -300,8 +488,8 @@ class UltraLowLatencyEngine:
                 logger.error(f"  -> Update MT5 path in GUI settings if needed")
                 return False
             
-            # Check symbol
-            symbol_info = mt5.symbol_info(self.symbol)
+            # Check symbol (fresh spec; later lookups are served from the shared cache)
+            symbol_info = self.symbol_specs.refresh(self.symbol)
             if symbol_info is None:
                 logger.error(f"Symbol {self.symbol} not found")
                 return False
@@ -332,25 +520,16 @@ class UltraLowLatencyEngine:
             # Store symbol info
             self.symbol_point = symbol_info.point
             self.stops_level = symbol_info.trade_stops_level
+            self.volume_profile.set_point(self.symbol_point)
+            self.position_book.set_spec(symbol_info)
+            self.position_book.reconcile()
+            self.build_order_templates()
 
-            # ✅ ADD THIS: Warmup fast indicators (JIT compilation)
-            if FAST_INDICATORS_AVAILABLE: 
-                logger.info("🔥 Warming up fast indicators (JIT compilation)...")
-                try:
-                    # Create dummy data for warmup
-                    dummy_data = np.random.random(100) * 2600.0  # Gold-like prices
-                    
-                    # Warmup all fast indicators (triggers JIT compilation)
-                    from fast_indicators import ema_fast, rsi_fast, atr_fast, momentum_fast
-                    _ = ema_fast(dummy_data, 7)
-                    _ = ema_fast(dummy_data, 21)
-                    _ = rsi_fast(dummy_data, 7)
-                    _ = atr_fast(dummy_data, dummy_data * 1.001, dummy_data * 0.999, 14)
-                    _ = momentum_fast(dummy_data, 5)
-                    
-                    logger.info("✓ Fast indicators warmed up - JIT compilation complete")
-                except Exception as e: 
-                    logger.warning(f"⚠️ Warmup failed: {e} - will compile on first use")
+            # Fast indicator kernels are compiled ahead of time and loaded from the disk cache at import
+            if FAST_INDICATORS_AVAILABLE:
+                report = fast_indicators.startup_report()
+                logger.info("✓ Fast indicators ready: %d kernels from disk cache, %d compiled (%.2fs at import)",
+                            report['from_cache'], report['compiled'], report['seconds'])
             
             # Calculate actual spread in price terms
             spread_price = symbol_info.spread * symbol_info.point
@@ -434,7 +613,7 @@ class UltraLowLatencyEngine:
                 return None
             
             tick_data = TickData(
-                timestamp=tick.time + tick.time_msc / 1000.0,
+                timestamp=tick.time_msc / 1000.0,
                 bid=tick.bid,
                 ask=tick.ask,
                 last=tick.last,
@@ -444,7 +623,7 @@ class UltraLowLatencyEngine:
             
             # Track latency
             latency = (time.perf_counter() - start_time) * 1000000  # microseconds
-            self.latency_samples.append(latency)
+            self.stage_latency['tick_fetch'].record(latency)
             
             return tick_data
             
@@ -452,6 +631,20 @@ class UltraLowLatencyEngine:
             logger.error(f"Tick retrieval error: {e}")
             return None
     
+    def fetch_new_tick_rows(self) -> np.ndarray:
+        """Raw copy_ticks_from rows since the last call (each real tick exactly once)"""
+        start_time = time.perf_counter()
+        
+        try:
+            rows = self.tick_ingestor.fetch()
+        except Exception as e:
+            logger.error(f"Tick batch retrieval error: {e}")
+            return np.empty(0)
+        
+        # Track latency (per terminal round-trip)
+        self.stage_latency['tick_fetch'].record((time.perf_counter() - start_time) * 1000000)
+        return rows
+    
     def calculate_order_flow(self, tick: TickData) -> OrderFlowData:
         """Advanced order flow analysis"""
         if self.last_tick is None:
@@ -504,6 +697,202 @@ class UltraLowLatencyEngine:
         self.last_tick = tick
         return orderflow
     
+    def process_tick(self, tick: TickData):
+        """Feed one new tick through buffers, order flow and streaming indicators"""
+        # Periods changed by the analysis thread are (re)built here, on the updating
+        # thread, and back-filled before this tick lands in the buffer
+        if self.use_streaming_indicators and self._wanted_indicator_params is not self._indicator_params:
+            self._sync_indicator_streams()
+        
+        start_time = time.perf_counter()
+        self.last_tick_perf = start_time
+        
+        if self.market_data_subscription is None:
+            self.tick_buffer.append(tick)
+            
+            # Calculate order flow
+            orderflow = self.calculate_order_flow(tick)
+            if orderflow:
+                self.orderflow_buffer.append(orderflow)
+            self.stage_latency['orderflow_update'].record((time.perf_counter() - start_time) * 1000000)
+        else:
+            # Buffers and order flow are maintained once by the shared hub
+            self.last_tick = tick
+        self.tick_seq += 1
+        
+        if self.use_streaming_indicators:
+            self.indicator_bank.update(tick.mid_price)
+        
+        # Volume profile resets at the server day boundary; ticks without volume count once
+        session = int(tick.timestamp // 86400)
+        if session != self.volume_profile.session:
+            self.volume_profile.reset(session)
+        self.volume_profile.add(tick.last if tick.last > 0 else tick.mid_price, tick.volume or 1)
+        
+        self.position_book.mark(tick.bid, tick.ask)
+    
+    def process_tick_batch(self, ticks: np.ndarray):
+        """Vectorized process_tick for a batch of TICK_DTYPE records from our own feed"""
+        if len(ticks) == 0:
+            return
+        if self.use_streaming_indicators and self._wanted_indicator_params is not self._indicator_params:
+            self._sync_indicator_streams()
+        
+        start_time = time.perf_counter()
+        self.last_tick_perf = start_time
+        self.tick_buffer.append_many(ticks)
+        
+        # Order flow for the whole batch, identical to calculate_order_flow per tick
+        prev_last = self.last_tick.last if self.last_tick is not None else None
+        orderflow, self.cumulative_delta = compute_order_flow(ticks, prev_last, self.cumulative_delta)
+        self.orderflow_buffer.append_many(orderflow)
+        self.last_tick = self._newest_tick(ticks)
+        self.stage_latency['orderflow_update'].record((time.perf_counter() - start_time) * 1000000)
+        self._apply_tick_batch(ticks)
+    
+    def process_hub_batch(self, ticks: np.ndarray):
+        """process_tick_batch for records the shared hub already buffered (and ran order flow on)"""
+        if len(ticks) == 0:
+            return
+        if self.use_streaming_indicators and self._wanted_indicator_params is not self._indicator_params:
+            self._sync_indicator_streams()
+        
+        self.last_tick_perf = time.perf_counter()
+        self.last_tick = self._newest_tick(ticks)
+        self._apply_tick_batch(ticks)
+    
+    @staticmethod
+    def _newest_tick(ticks: np.ndarray) -> TickData:
+        newest = ticks[-1]
+        return TickData(
+            timestamp=float(newest['timestamp']),
+            bid=float(newest['bid']),
+            ask=float(newest['ask']),
+            last=float(newest['last']),
+            volume=int(newest['volume']),
+            spread=float(newest['spread'])
+        )
+    
+    def _apply_tick_batch(self, ticks: np.ndarray):
+        """Per-bot stages of a batch: sequence, streaming indicators, volume profile, position marks"""
+        self.tick_seq += len(ticks)
+        
+        if self.use_streaming_indicators:
+            update = self.indicator_bank.update
+            for mid in ticks['mid'].tolist():
+                update(mid)
+        
+        # Volume profile, split where the batch crosses a server day
+        prices = np.where(ticks['last'] > 0, ticks['last'], ticks['mid'])
+        volumes = np.where(ticks['volume'] != 0, ticks['volume'], 1.0)
+        sessions = (ticks['timestamp'] // 86400).astype(np.int64)
+        cuts = np.flatnonzero(np.diff(sessions)) + 1
+        for start, stop in zip(np.r_[0, cuts], np.r_[cuts, len(ticks)]):
+            session = int(sessions[start])
+            if session != self.volume_profile.session:
+                self.volume_profile.reset(session)
+            self.volume_profile.add_many(prices[start:stop], volumes[start:stop])
+        
+        # Only the newest quote matters for the open positions' value
+        self.position_book.mark(self.last_tick.bid, self.last_tick.ask)
+    
+    def attach_market_data_hub(self):
+        """Subscribe to the process-wide hub for this symbol and read its shared buffers"""
+        from market_data_hub import subscribe_market_data_hub
+        
+        name = self.config.get('bot_id', f"magic_{self.config.get('magic_number', 2026002)}")
+        hub, subscription = subscribe_market_data_hub(
+            self.symbol, name,
+            batch_size=self.config.get('tick_batch_size', 1000),
+            tick_capacity=self.config.get('tick_buffer_size', 10000),
+            orderflow_capacity=self.config.get('orderflow_buffer_size', 5000),
+            adaptive_polling=self.config.get('adaptive_polling', True),
+            backoff_after=self.config.get('poll_backoff_after', 1.0),
+            backoff_max=self.config.get('poll_backoff_max', 0.25),
+            idle_interval=self.config.get('session_idle_poll', 1.0),
+        )
+        
+        self.market_data_hub = hub
+        self.market_data_subscription = subscription
+        self.tick_buffer = hub.tick_buffer
+        self.orderflow_buffer = hub.orderflow_buffer
+        self.tick_seq = subscription.cursor
+        self.last_tick = hub.last_tick
+        self._analysis_cache_key = None
+        
+        # Rebuild indicators from the hub's history up to our cursor
+        self.indicator_bank.clear()
+        self._sync_indicator_streams()
+        logger.info(f"✓ {self.symbol}: pakai market data hub bersama ({hub.subscriber_count} bot)")
+    
+    def detach_market_data_hub(self):
+        """Unsubscribe from the shared hub"""
+        if self.market_data_subscription is not None:
+            self.market_data_subscription.close()
+            self.market_data_subscription = None
+    
+    def start_tick_recording(self):
+        """Record the ingested tick stream to per-day memory-mapped files (needs symbol_point)"""
+        root_dir = self.config.get('tick_record_dir', 'tick_data')
+        try:
+            if self.market_data_subscription is not None:
+                # One recorder per symbol, owned by the hub that ingests it
+                self.market_data_hub.enable_recording(self.symbol_point, root_dir)
+            elif self.tick_recorder is None:
+                self.tick_recorder = TickRecorder(self.symbol, self.symbol_point, root_dir=root_dir)
+                self.tick_recorder.start()
+        except Exception as e:
+            logger.error(f"Tick recorder not started: {e}")
+    
+    def _read_hub_ticks(self, timeout: float = 0.1):
+        """Process ticks the hub published since our cursor (blocks up to timeout)"""
+        subscription = self.market_data_subscription
+        subscription.wait(timeout)
+        start_seq, records = subscription.read_new()
+        self.tick_seq = start_seq
+        self.process_hub_batch(records)
+        if len(records):
+            self.new_tick_event.set()
+    
+    def _get_indicator_params(self) -> Tuple:
+        """Configured indicator periods (ema_fast, ema_slow, rsi, atr, momentum)"""
+        return (
+            self.config.get('ema_fast_period', 7),
+            self.config.get('ema_slow_period', 21),
+            self.config.get('rsi_period', 7),
+            self.config.get('atr_period', 14),
+            self.config.get('momentum_period', 5),
+        )
+    
+    def _sync_indicator_streams(self):
+        """Create streaming indicators for the wanted periods, back-filled from the tick buffer"""
+        params = self._wanted_indicator_params
+        ema_fast_period, ema_slow_period, rsi_period, atr_period, momentum_period = params
+        history = self.tick_buffer.range(self.tick_seq - len(self.tick_buffer), self.tick_seq)['mid']
+        
+        self.indicator_bank.get('ema', ema_fast_period, history)
+        self.indicator_bank.get('ema', ema_slow_period, history)
+        self.indicator_bank.get('rsi', rsi_period, history)
+        self.indicator_bank.get('atr', atr_period, history)
+        self.indicator_bank.get('momentum', momentum_period, history)
+        self._indicator_params = params
+    
+    def _get_streaming_indicators(self, params: Tuple) -> Optional[Tuple]:
+        """Current (ema_fast, ema_slow, rsi, atr, momentum) from the streams, None if not warmed up"""
+        ema_fast_period, ema_slow_period, rsi_period, atr_period, momentum_period = params
+        bank = self.indicator_bank
+        streams = (
+            bank.peek('ema', ema_fast_period),
+            bank.peek('ema', ema_slow_period),
+            bank.peek('rsi', rsi_period),
+            bank.peek('atr', atr_period),
+            bank.peek('momentum', momentum_period),
+        )
+        for stream in streams:
+            if stream is None or not stream.ready:
+                return None
+        return tuple(stream.value for stream in streams)
+    
     def calculate_tick_range_avg(self, prices, period: int):
         """
         Tick Range Average (TRA)
@@ -514,12 +903,164 @@ class UltraLowLatencyEngine:
         diffs = [abs(prices[i] - prices[i-1]) for i in range(-period, 0)]
         return sum(diffs) / len(diffs)
 
+    def update_config(self, changes: Dict):
+        """Apply config changes to a running engine (invalidates the memoized analysis)"""
+        self.config.update(changes)
+        self.config_version += 1
+        magic = self.config.get('magic_number', 2026002)
+        if magic != self.deals_ledger.magic:
+            self.deals_ledger = DealsLedger(magic, max_age=self.config.get('deals_refresh_interval', 0.5))
+        if magic != self.position_book.magic:
+            self.position_book.set_magic(magic)
+        self.position_book.reconcile_interval = self.config.get('position_reconcile_interval', 1.0)
+        self.min_trade_interval = self.config.get("min_trade_interval", 0.3)
+        self.analysis_min_spacing = self.config.get('analysis_min_spacing', 0.005)
+        if self.order_templates.version is not None:
+            self.build_order_templates()
+        self._configure_pollers()
+        self.data_poller.wake()
+    
+    def update_risk_limits(self, changes: Dict) -> Dict:
+        """
+        Apply risk edits made while running: limits go to the config and the
+        risk manager, counters and circuit breaker state to the risk manager only
+        (so a counter sync does not invalidate the memoized analysis).
+        Returns the risk manager's resulting runtime fields ({} without one)
+        """
+        from risk_manager import RiskManager
+        config_changes = {key: value for key, value in changes.items()
+                          if key in RiskManager.LIMIT_FIELDS or key == 'daily_target_profit'}
+        if config_changes:
+            self.update_config(config_changes)
+        if self.risk_manager:
+            return self.risk_manager.apply_runtime_changes(changes)
+        return {}
+
+    def _configure_pollers(self):
+        """Apply the polling config to the data and analysis thread schedules"""
+        adaptive = self.config.get('adaptive_polling', True)
+        backoff_after = self.config.get('poll_backoff_after', 1.0)
+        backoff_max = self.config.get('poll_backoff_max', 0.25)
+        idle_interval = self.config.get('session_idle_poll', 1.0)
+        analysis_interval = self.config.get('analysis_interval', 0.1)
+        for poller in (self.data_poller, self.analysis_poller):
+            poller.adaptive = adaptive
+            poller.backoff_after = backoff_after
+            poller.idle_interval = idle_interval
+        self.data_poller.max_interval = max(backoff_max, self.data_poller.min_interval)
+        self.analysis_poller.min_interval = analysis_interval
+        # Event-driven analysis is woken by ticks; its timeout only paces the position checks
+        self.analysis_poller.max_interval = max(1.0 if self.event_driven else backoff_max, analysis_interval)
+        self.analysis_poller.idle_interval = max(idle_interval, analysis_interval)
+    
     def analyze_microstructure(self) -> Dict:
+        """Analyze market microstructure, reusing the last result while no tick or config changed"""
+        key = (self.tick_seq, self.config_version)
+        if key == self._analysis_cache_key:
+            self.analysis_cache_hits += 1
+            return self._analysis_cache
+        
+        start = time.perf_counter()
+        result = self._compute_microstructure()
+        self._analysis_compute_us += (time.perf_counter() - start) * 1000000
+        self.analysis_cache_misses += 1
+        self._analysis_cache_key = key
+        self._analysis_cache = result
+        return result
+    
+    def get_analysis_cache_stats(self) -> Dict:
+        """Hit rate of the memoized analysis and the compute time it saved"""
+        hits, misses = self.analysis_cache_hits, self.analysis_cache_misses
+        calls = hits + misses
+        avg_compute_us = self._analysis_compute_us / misses if misses else 0.0
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / calls if calls else 0.0,
+            'avg_compute_us': avg_compute_us,
+            'cpu_saved_ms': hits * avg_compute_us / 1000,
+        }
+    
+    def _get_fused_params(self, indicator_params: Tuple) -> np.ndarray:
+        """Packed kernel parameters, rebuilt only when the config version or the periods change"""
+        version = (self.config_version, indicator_params)
+        if self._fused_params_version != version:
+            params = np.empty(fast_indicators.N_PARAMS)
+            params[fast_indicators.P_EMA_FAST:fast_indicators.P_MOMENTUM + 1] = indicator_params
+            params[fast_indicators.P_MAX_SPREAD] = self.config.get('max_spread', 0.0001)
+            params[fast_indicators.P_MIN_DELTA] = self.config.get('min_delta_threshold', 100)
+            params[fast_indicators.P_MIN_VELOCITY] = self.config.get('min_velocity_threshold', 0.00001)
+            params[fast_indicators.P_RSI_OVERBOUGHT] = self.config.get('rsi_overbought', 70)
+            params[fast_indicators.P_RSI_OVERSOLD] = self.config.get('rsi_oversold', 30)
+            params[fast_indicators.P_MAX_VOLATILITY] = self.config.get('max_volatility', 0.001)
+            self._fused_params = params
+            self._fused_params_version = version
+        return self._fused_params
+    
+    def _compute_microstructure_fused(self, recent_ticks: np.ndarray) -> Optional[Dict]:
+        """
+        One microstructure_signal kernel call instead of the NumPy / per-indicator path;
+        None when the window is too short for the configured periods
+        """
+        indicator_params = self._get_indicator_params()
+        params = self._get_fused_params(indicator_params)
+        out = self._fused_out
+        
+        streamed = None
+        if self.use_streaming_indicators:
+            if indicator_params != self._wanted_indicator_params:
+                self._wanted_indicator_params = indicator_params
+            streamed = self._get_streaming_indicators(indicator_params)
+        if streamed is not None:
+            out[fast_indicators.M_EMA_FAST:fast_indicators.M_MOMENTUM + 1] = streamed
+        else:
+            ema_fast_period, ema_slow_period, rsi_period, atr_period, momentum_period = indicator_params
+            if len(recent_ticks) <= max(ema_slow_period, rsi_period, atr_period, momentum_period):
+                return None
+        
+        if len(self.orderflow_buffer) > 0:
+            recent_flow = self.orderflow_buffer.last_n(50)
+            flow_delta = recent_flow['delta']
+            cumul_delta = float(recent_flow['cumulative_delta'][-1])
+        else:
+            flow_delta = recent_ticks['spread'][:0]
+            cumul_delta = 0.0
+        
+        fast_indicators.microstructure_signal(recent_ticks['mid'], recent_ticks['spread'], flow_delta,
+                                              cumul_delta, params, out, streamed is None)
+        (avg_spread, spread_volatility, price_velocity, price_change, avg_delta, _, volatility,
+         ema_fast_current, ema_slow_current, rsi, atr, momentum, signal, strength, flags) = out.tolist()
+        
+        return {
+            'avg_spread': avg_spread,
+            'spread_volatility': spread_volatility,
+            'price_velocity': price_velocity,
+            'price_change': price_change,
+            'avg_delta': avg_delta,
+            'cumulative_delta': cumul_delta,
+            'volatility': volatility,
+            'tick_count': len(recent_ticks),
+            'ema_fast': ema_fast_current,
+            'ema_slow': ema_slow_current,
+            'rsi': rsi,
+            'atr': atr,
+            'momentum': momentum,
+            # Pre-ML signal from the kernel, valid for this price; generate_signal reuses it
+            'technical_signal': (int(signal), strength, int(flags), float(recent_ticks['mid'][-1])),
+            **self.volume_profile.get_features(),
+        }
+    
+    def _compute_microstructure(self) -> Dict:
         """Analyze market microstructure for HFT opportunities (OPTIMIZED)"""
         if len(self.tick_buffer) < 100:
             return {}
 
-        recent_ticks = list(self.tick_buffer)[-100:]
+        recent_ticks = self.tick_buffer.last_n(100)
+        
+        if self.use_fused_analysis:
+            fused = self._compute_microstructure_fused(recent_ticks)
+            if fused is not None:
+                return fused
 
         # Get config parameters
         ema_fast_period = self.config.get('ema_fast_period', 7)
@@ -531,20 +1072,20 @@ class UltraLowLatencyEngine:
         momentum_period = self.config.get('momentum_period', 5)
 
         # Spread analysis
-        spreads = [t.spread for t in recent_ticks]
-        avg_spread = np.mean(spreads)
-        spread_volatility = np.std(spreads)
+        spreads = recent_ticks['spread']
+        avg_spread = spreads.mean()
+        spread_volatility = spreads.std()
 
         # Price momentum (ultra-short term)
-        prices = np.array([t.mid_price for t in recent_ticks])
+        prices = recent_ticks['mid']
         price_change = prices[-1] - prices[0]
         price_velocity = price_change / len(prices)
 
         # Order flow imbalance
         if len(self.orderflow_buffer) > 0:
-            recent_flow = list(self.orderflow_buffer)[-50:]
-            avg_delta = np.mean([f.delta for f in recent_flow])
-            cumul_delta = recent_flow[-1].cumulative_delta if recent_flow else 0
+            recent_flow = self.orderflow_buffer.last_n(50)
+            avg_delta = recent_flow['delta'].mean()
+            cumul_delta = recent_flow['cumulative_delta'][-1]
         else:
             avg_delta = 0
             cumul_delta = 0
@@ -554,9 +1095,19 @@ class UltraLowLatencyEngine:
         volatility = np.std(returns) if len(returns) > 0 else 0
 
         # === OPTIMIZED INDICATOR CALCULATIONS ===
+        params = (ema_fast_period, ema_slow_period, rsi_period, atr_period, momentum_period)
+        streamed = None
+        if self.use_streaming_indicators:
+            if params != self._wanted_indicator_params:
+                self._wanted_indicator_params = params
+            streamed = self._get_streaming_indicators(params)
+        
         use_fast = FAST_INDICATORS_AVAILABLE and len(prices) >= max(ema_slow_period, rsi_period, atr_period)
         
-        if use_fast:
+        if streamed is not None:
+            # O(1): values maintained tick-by-tick by the data thread
+            ema_fast_current, ema_slow_current, rsi, atr, momentum = streamed
+        elif use_fast:
             # Use Numba-optimized calculations (ULTRA-FAST)
             try:
                 # Import inside try block to catch any issues
@@ -572,14 +1123,9 @@ class UltraLowLatencyEngine:
                 rsi_values = rsi_fast(prices, rsi_period)
                 rsi = float(rsi_values[-1])
                 
-                # ATR (using actual high/low if available, else approximate)
-                if hasattr(recent_ticks[0], 'high') and hasattr(recent_ticks[0], 'low'):
-                    high_prices = np.array([t.high for t in recent_ticks])
-                    low_prices = np.array([t.low for t in recent_ticks])
-                else:
-                    # Approximate from mid_price
-                    high_prices = prices * 1.0001
-                    low_prices = prices * 0.9999
+                # ATR (ticks carry no high/low - approximate from mid_price)
+                high_prices = prices * 1.0001
+                low_prices = prices * 0.9999
                 
                 atr_values = atr_fast(high_prices, low_prices, prices, atr_period)
                 atr = float(atr_values[-1])
@@ -623,6 +1169,7 @@ class UltraLowLatencyEngine:
             'rsi': rsi,
             'atr': atr,
             'momentum': momentum,
+            **self.volume_profile.get_features(),
         }
 
 
@@ -687,87 +1234,101 @@ class UltraLowLatencyEngine:
         # Signal generation parameters
         min_delta_threshold = self.config.get('min_delta_threshold', 100)
         min_velocity_threshold = self.config.get('min_velocity_threshold', 0.00001)
-        spread_threshold = self.config.get('max_spread', 0.0001)
         
-        # Check spread condition with rate-limited logging
-        if microstructure['avg_spread'] > spread_threshold:
-            self.log_spread_reject(microstructure['avg_spread'], spread_threshold)
-            return None
-        
-        signal_strength = 0.0
-        signal_type = None
-        reason = []
-        
-        # --- Ambil indikator dari microstructure ---
-        ema_fast = microstructure.get('ema_fast', np.nan)
-        ema_slow = microstructure.get('ema_slow', np.nan)
-        rsi = microstructure.get('rsi', np.nan)
-        atr_val = microstructure.get('atr', np.nan)
-        momentum_val = microstructure.get('momentum', np.nan)
-        price = current_tick.mid_price if current_tick else np.nan
-        rsi_overbought = self.config.get('rsi_overbought', 70)
-        rsi_oversold = self.config.get('rsi_oversold', 30)
-
-        # --- Order flow signal ---
-        if microstructure['cumulative_delta'] > min_delta_threshold:
-            # Tambah filter EMA, RSI, Momentum untuk BUY
-            if (
-                not np.isnan(ema_fast) and not np.isnan(ema_slow) and not np.isnan(rsi) and not np.isnan(momentum_val)
-                and price > ema_fast > ema_slow
-                and rsi < rsi_overbought
-                and momentum_val > 0
-            ):
-                signal_strength += 0.4
-                signal_type = 'BUY'
-                reason.append(f"Delta+ & EMA/RSI/Mom OK: Δ={microstructure['cumulative_delta']:.0f}, EMAf={ema_fast:.2f}, EMAs={ema_slow:.2f}, RSI={rsi:.1f}, Mom={momentum_val:.5f}")
-            else:
-                reason.append(f"Delta+ but filter fail: EMA/RSI/Mom")
-        elif microstructure['cumulative_delta'] < -min_delta_threshold:
-            # Tambah filter EMA, RSI, Momentum untuk SELL
-            if (
-                not np.isnan(ema_fast) and not np.isnan(ema_slow) and not np.isnan(rsi) and not np.isnan(momentum_val)
-                and price < ema_fast < ema_slow
-                and rsi > rsi_oversold
-                and momentum_val < 0
-            ):
-                signal_strength += 0.4
-                signal_type = 'SELL'
-                reason.append(f"Delta- & EMA/RSI/Mom OK: Δ={microstructure['cumulative_delta']:.0f}, EMAf={ema_fast:.2f}, EMAs={ema_slow:.2f}, RSI={rsi:.1f}, Mom={momentum_val:.5f}")
-            else:
-                reason.append(f"Delta- but filter fail: EMA/RSI/Mom")
-
-        # --- Momentum signal (tambahan, tetap pakai price_velocity untuk penguat) ---
-        if microstructure['price_velocity'] > min_velocity_threshold:
-            signal_strength += 0.3
-            if signal_type is None:
-                signal_type = 'BUY'
-            elif signal_type == 'BUY':
-                signal_strength += 0.1
-            reason.append(f"Positive momentum: {microstructure['price_velocity']:.6f}")
-        elif microstructure['price_velocity'] < -min_velocity_threshold:
-            signal_strength += 0.3
-            if signal_type is None:
-                signal_type = 'SELL'
-            elif signal_type == 'SELL':
-                signal_strength += 0.1
-            reason.append(f"Negative momentum: {microstructure['price_velocity']:.6f}")
-        
-        # Volatility check
-        if microstructure['volatility'] > self.config.get('max_volatility', 0.001):
-            signal_strength *= 0.5
-            reason.append("High volatility - reduced confidence")
+        technical = microstructure.get('technical_signal')
+        if technical is not None and technical[3] == current_tick.mid_price:
+            # Pre-ML signal already computed by the fused kernel; reason text is built on demand
+            signal_code, signal_strength, technical_flags, _ = technical
+            if technical_flags & fast_indicators.FLAG_SPREAD_REJECT:
+                self.log_spread_reject(microstructure['avg_spread'], self.config.get('max_spread', 0.0001))
+                return None
+            signal_type = 'BUY' if signal_code > 0 else 'SELL' if signal_code < 0 else None
+            reason = []
+        else:
+            technical_flags = None
+            spread_threshold = self.config.get('max_spread', 0.0001)
+            
+            # Check spread condition with rate-limited logging
+            if microstructure['avg_spread'] > spread_threshold:
+                self.log_spread_reject(microstructure['avg_spread'], spread_threshold)
+                return None
+            
+            signal_strength = 0.0
+            signal_type = None
+            reason = []
+            
+            # --- Ambil indikator dari microstructure ---
+            ema_fast = microstructure.get('ema_fast', np.nan)
+            ema_slow = microstructure.get('ema_slow', np.nan)
+            rsi = microstructure.get('rsi', np.nan)
+            atr_val = microstructure.get('atr', np.nan)
+            momentum_val = microstructure.get('momentum', np.nan)
+            price = current_tick.mid_price if current_tick else np.nan
+            rsi_overbought = self.config.get('rsi_overbought', 70)
+            rsi_oversold = self.config.get('rsi_oversold', 30)
+
+            # --- Order flow signal ---
+            if microstructure['cumulative_delta'] > min_delta_threshold:
+                # Tambah filter EMA, RSI, Momentum untuk BUY
+                if (
+                    not np.isnan(ema_fast) and not np.isnan(ema_slow) and not np.isnan(rsi) and not np.isnan(momentum_val)
+                    and price > ema_fast > ema_slow
+                    and rsi < rsi_overbought
+                    and momentum_val > 0
+                ):
+                    signal_strength += 0.4
+                    signal_type = 'BUY'
+                    reason.append(f"Delta+ & EMA/RSI/Mom OK: Δ={microstructure['cumulative_delta']:.0f}, EMAf={ema_fast:.2f}, EMAs={ema_slow:.2f}, RSI={rsi:.1f}, Mom={momentum_val:.5f}")
+                else:
+                    reason.append(f"Delta+ but filter fail: EMA/RSI/Mom")
+            elif microstructure['cumulative_delta'] < -min_delta_threshold:
+                # Tambah filter EMA, RSI, Momentum untuk SELL
+                if (
+                    not np.isnan(ema_fast) and not np.isnan(ema_slow) and not np.isnan(rsi) and not np.isnan(momentum_val)
+                    and price < ema_fast < ema_slow
+                    and rsi > rsi_oversold
+                    and momentum_val < 0
+                ):
+                    signal_strength += 0.4
+                    signal_type = 'SELL'
+                    reason.append(f"Delta- & EMA/RSI/Mom OK: Δ={microstructure['cumulative_delta']:.0f}, EMAf={ema_fast:.2f}, EMAs={ema_slow:.2f}, RSI={rsi:.1f}, Mom={momentum_val:.5f}")
+                else:
+                    reason.append(f"Delta- but filter fail: EMA/RSI/Mom")
+
+            # --- Momentum signal (tambahan, tetap pakai price_velocity untuk penguat) ---
+            if microstructure['price_velocity'] > min_velocity_threshold:
+                signal_strength += 0.3
+                if signal_type is None:
+                    signal_type = 'BUY'
+                elif signal_type == 'BUY':
+                    signal_strength += 0.1
+                reason.append(f"Positive momentum: {microstructure['price_velocity']:.6f}")
+            elif microstructure['price_velocity'] < -min_velocity_threshold:
+                signal_strength += 0.3
+                if signal_type is None:
+                    signal_type = 'SELL'
+                elif signal_type == 'SELL':
+                    signal_strength += 0.1
+                reason.append(f"Negative momentum: {microstructure['price_velocity']:.6f}")
+            
+            # Volatility check
+            if microstructure['volatility'] > self.config.get('max_volatility', 0.001):
+                signal_strength *= 0.5
+                reason.append("High volatility - reduced confidence")
         
         # ============================================
         # ML PREDICTION (MANDATORY IF enable_ml=True)
         # ============================================
         if enable_ml:
             # ML is ENABLED - MUST use ML to assist decision
-            if ml_ready:
+            if ml_ready and not self._ml_can_change_outcome(signal_type, signal_strength):
+                # No ML answer can lift this pass to a trade or a close - skip the model
+                self.ml_predictions_skipped += 1
+                reason.append("📊 ML skipped: technical strength out of reach")
+            elif ml_ready:
                 # Model is trained and ready
                 try:
-                    # Prepare features for ML prediction
-                    features = self.ml_predictor.prepare_realtime_features(current_tick, microstructure)
-                    ml_direction_num, ml_confidence = self.ml_predictor.predict(features)
+                    ml_direction_num, ml_confidence = self._predict_ml(current_tick, microstructure)
                     
                     # Convert ML direction: 1 = BUY, 0/-1 = SELL
                     ml_direction = 'BUY' if ml_direction_num == 1 else 'SELL'
@@ -775,16 +1336,16 @@ class UltraLowLatencyEngine:
                     # Enhance signal strength based on ML prediction
                     if signal_type and ml_direction == signal_type:
                         # ML agrees with technical signal - boost confidence significantly
-                        signal_strength = min(1.0, signal_strength + (ml_confidence * 0.4))
+                        signal_strength = min(1.0, signal_strength + (ml_confidence * ML_AGREE_BOOST))
                         reason.append(f"✅ ML AGREED: {ml_direction} confidence {ml_confidence:.2f}")
                     elif signal_type and ml_direction != signal_type:
                         # ML disagrees - reduce confidence significantly
-                        signal_strength *= (1.0 - ml_confidence * 0.4)
+                        signal_strength *= (1.0 - ml_confidence * ML_DISAGREE_CUT)
                         reason.append(f"⚠️  ML DISAGREED: Technical {signal_type} vs ML {ml_direction} ({ml_confidence:.2f})")
-                    elif not signal_type and ml_confidence > 0.6:
+                    elif not signal_type and ml_confidence > ML_ONLY_MIN_CONFIDENCE:
                         # No technical signal but strong ML signal - ACCEPT ML signal
                         signal_type = ml_direction
-                        signal_strength = ml_confidence * 0.8  # ML-driven signal, use higher confidence
+                        signal_strength = ml_confidence * ML_ONLY_SCALE  # ML-driven signal, use higher confidence
                         reason.append(f"📊 ML SIGNAL ONLY: {ml_direction} confidence {ml_confidence:.2f}")
                     else:
                         # Weak technical signal or weak ML confidence
@@ -860,7 +1421,7 @@ class UltraLowLatencyEngine:
                 volume = self.config.get('default_volume', 0.01)
                 
                 # Get symbol info for calculation
-                symbol_info = mt5.symbol_info(self.symbol)
+                symbol_info = self.symbol_specs.get(self.symbol)
                 if symbol_info and symbol_info.trade_contract_size > 0:
                     # For commodities/metals: Profit = price_diff × volume × contract_size
                     # Therefore: price_diff = profit / (volume × contract_size)
@@ -897,6 +1458,9 @@ class UltraLowLatencyEngine:
             # Increment signals generated counter
             self.signals_generated += 1
             
+            if technical_flags is not None:
+                reason = self._technical_reasons(technical_flags, microstructure) + reason
+            
             return Signal(
                 timestamp=time.time(),
                 signal_type=signal_type,
@@ -909,36 +1473,116 @@ class UltraLowLatencyEngine:
             )
         elif signal_type:
             # Signal exists but not strong enough - log occasionally
-            if np.random.random() < 0.1:  # Log 10% of weak signals
-                logger.warning(f"⚠️ WEAK SIGNAL: {signal_type} | Strength: {signal_strength:.2f} < {min_strength:.2f}")
-                logger.warning(f"   Thresholds: Delta={min_delta_threshold} | Velocity={min_velocity_threshold:.6f}")
-                logger.warning(f"   Actuals: Delta={microstructure['cumulative_delta']:.0f} | Velocity={microstructure['price_velocity']:.6f}")
+            self.log_limiter.log(
+                logger, logging.WARNING,
+                "⚠️ WEAK SIGNAL: %s | Strength: %.2f < %.2f | Thresholds: Delta=%s Velocity=%.6f | "
+                "Actuals: Delta=%.0f Velocity=%.6f",
+                signal_type, signal_strength, min_strength, min_delta_threshold, min_velocity_threshold,
+                microstructure['cumulative_delta'], microstructure['price_velocity'])
         else:
             # No signal type at all - log very occasionally to show thresholds
-            if np.random.random() < 0.01:  # 1% of the time
-                logger.info(f"🔍 No signal criteria met.Need: Delta>{min_delta_threshold} OR Velocity>{min_velocity_threshold:.6f}")
-                logger.info(f"   Current: Delta={microstructure['cumulative_delta']:.0f} | Velocity={microstructure['price_velocity']:.6f}")
+            self.log_limiter.log(
+                logger, logging.INFO,
+                "🔍 No signal criteria met. Need: Delta>%s OR Velocity>%.6f | Current: Delta=%.0f Velocity=%.6f",
+                min_delta_threshold, min_velocity_threshold,
+                microstructure['cumulative_delta'], microstructure['price_velocity'],
+                interval=self.log_limiter.interval * 6)
         
         return None
     
-    def verify_position_exists(self) -> bool:
-        """Check if position actually exists in MT5"""
+    def _technical_reasons(self, flags: int, microstructure: Dict) -> List[str]:
+        """Reason text for the technical rules the fused kernel reported in ``flags``"""
+        reason = []
+        if flags & fast_indicators.FLAG_DELTA_BUY:
+            reason.append(f"Delta+ & EMA/RSI/Mom OK: Δ={microstructure['cumulative_delta']:.0f}, EMAf={microstructure['ema_fast']:.2f}, EMAs={microstructure['ema_slow']:.2f}, RSI={microstructure['rsi']:.1f}, Mom={microstructure['momentum']:.5f}")
+        elif flags & fast_indicators.FLAG_DELTA_BUY_FILTERED:
+            reason.append(f"Delta+ but filter fail: EMA/RSI/Mom")
+        elif flags & fast_indicators.FLAG_DELTA_SELL:
+            reason.append(f"Delta- & EMA/RSI/Mom OK: Δ={microstructure['cumulative_delta']:.0f}, EMAf={microstructure['ema_fast']:.2f}, EMAs={microstructure['ema_slow']:.2f}, RSI={microstructure['rsi']:.1f}, Mom={microstructure['momentum']:.5f}")
+        elif flags & fast_indicators.FLAG_DELTA_SELL_FILTERED:
+            reason.append(f"Delta- but filter fail: EMA/RSI/Mom")
+        if flags & fast_indicators.FLAG_MOMENTUM_UP:
+            reason.append(f"Positive momentum: {microstructure['price_velocity']:.6f}")
+        elif flags & fast_indicators.FLAG_MOMENTUM_DOWN:
+            reason.append(f"Negative momentum: {microstructure['price_velocity']:.6f}")
+        if flags & fast_indicators.FLAG_HIGH_VOLATILITY:
+            reason.append("High volatility - reduced confidence")
+        return reason
+    
+    def _ml_can_change_outcome(self, signal_type: Optional[str], signal_strength: float) -> bool:
+        """
+        Whether some ML answer (any direction, confidence in [0, 1]) can make
+        generate_signal return a signal - otherwise the pass ends in None regardless
+        """
+        min_strength = self.config.get('min_signal_strength', 0.6)
+        if signal_type:
+            # Best case: ML agrees with full confidence
+            best = min(1.0, signal_strength + ML_AGREE_BOOST)
+            reversal = self.position_type is not None and self.position_type != signal_type
+            return best >= min_strength or (reversal and best > 0.6)
+        # No technical direction: ML alone reaches at most ML_ONLY_SCALE, any direction
+        return ML_ONLY_SCALE >= min_strength or (self.position_type is not None and ML_ONLY_SCALE > 0.6)
+    
+    def _predict_ml(self, current_tick: TickData, microstructure: Dict) -> Tuple:
+        """(direction, confidence) for the current bar; the model runs once per bar, model and config"""
+        bar_seconds = self.config.get('ml_bar_seconds', 60)
+        key = None
+        if bar_seconds > 0:
+            key = (int(current_tick.timestamp // bar_seconds), self.config_version,
+                   id(self.ml_predictor), id(getattr(self.ml_predictor, 'direction_model', None)))
+            if key == self._ml_cache_key:
+                self.ml_cache_hits += 1
+                return self._ml_cache
+        
+        ml_start = time.perf_counter()
+        features = self.ml_predictor.prepare_realtime_features(current_tick, microstructure)
+        prediction = self.ml_predictor.predict(features)
+        self.stage_latency['ml_predict'].record((time.perf_counter() - ml_start) * 1000000)
+        self.ml_predictions_made += 1
+        if prediction[0] is not None:  # predict() answers (None, 0.0) when features aren't ready - retry next pass
+            self._ml_cache_key, self._ml_cache = key, prediction
+        return prediction
+    
+    def get_polling_stats(self) -> Dict:
+        """Data/analysis thread schedules, their CPU time and the estimated CPU saved by adaptive polling"""
+        data = self.data_poller.get_stats()
+        analysis = self.analysis_poller.get_stats()
+        return {
+            'data': data,
+            'analysis': analysis,
+            'cpu_s': data['cpu_s'] + analysis['cpu_s'],
+            'cpu_saved_est_s': data['cpu_saved_est_s'] + analysis['cpu_saved_est_s'],
+        }
+    
+    def get_ml_inference_stats(self) -> Dict:
+        """Model calls made vs avoided by the reachability gate and the per-bar cache"""
+        made, skipped, cached = self.ml_predictions_made, self.ml_predictions_skipped, self.ml_cache_hits
+        passes = made + skipped + cached
+        return {
+            'predictions_made': made,
+            'predictions_skipped': skipped,
+            'cache_hits': cached,
+            'avoided_rate': (skipped + cached) / passes if passes else 0.0,
+            'avg_predict_us': self.stage_latency['ml_predict'].snapshot()['mean_us'],
+        }
+    
+    def get_position_book(self) -> PositionBook:
+        """The position book, reconciled with the terminal first if it is due"""
         try:
-            positions = mt5.positions_get(symbol=self.symbol)
-            if positions is None:
-                return False
-            
-            # Check if any position matches our magic number
-            magic = self.config.get('magic_number', 2026002)
-            for pos in positions:
-                if pos.magic == magic:
-                    return True
-            
-            return False
-            
+            if self.position_book.refresh():
+                # Tick value moves with the conversion rate for non-account-currency quotes
+                self.position_book.set_spec(self.symbol_specs.get(self.symbol))
         except Exception as e:
-            logger.error(f"Error checking position: {e}")
-            return False
+            logger.error(f"Position book reconcile error: {e}")
+        return self.position_book
+    
+    def get_position_book_stats(self) -> Dict:
+        """Position book totals and reconciliation counters"""
+        return self.position_book.get_stats()
+    
+    def verify_position_exists(self) -> bool:
+        """Check if any position with our magic number is open"""
+        return self.get_position_book().own_count > 0
     
     def execute_signal(self, signal: Signal) -> bool:
         """Execute trading signal with ultra-low latency"""
@@ -969,15 +1613,16 @@ class UltraLowLatencyEngine:
                 return False
             
             # Track execution time
-            exec_time = (time.perf_counter() - start_time) * 1000  # milliseconds
-            self.execution_times.append(exec_time)
+            end_time = time.perf_counter()
+            exec_time = (end_time - start_time) * 1000  # milliseconds
+            self.stage_latency['execution'].record(exec_time * 1000)
+            
+            if result and signal.tick_perf:
+                self.stage_latency['tick_to_order'].record((end_time - signal.tick_perf) * 1000000)
             
             if result:
-                logger.info(f"✓ Executed {signal.signal_type} | "
-                          f"Price: {signal.price:.5f} | "
-                          f"Strength: {signal.strength:.2f} | "
-                          f"Time: {exec_time:.2f}ms | "
-                          f"Reason: {signal.reason}")
+                logger.info("✓ Executed %s | Price: %.5f | Strength: %.2f | Time: %.2fms | Reason: %s",
+                            signal.signal_type, signal.price, signal.strength, exec_time, signal.reason)
             
             return result
             
@@ -987,23 +1632,7 @@ class UltraLowLatencyEngine:
     
     def get_total_floating_loss(self) -> float:
         """Calculate total floating loss from all open positions"""
-        try:
-            positions = mt5.positions_get(symbol=self.symbol)
-            if positions is None or len(positions) == 0:
-                return 0.0
-            
-            magic = self.config.get('magic_number', 2026002)
-            total_loss = 0.0
-            
-            for pos in positions:
-                if pos.magic == magic and pos.profit < 0:
-                    total_loss += abs(pos.profit)
-            
-            return total_loss
-            
-        except Exception as e:
-            logger.error(f"Error calculating floating loss: {e}")
-            return 0.0
+        return self.get_position_book().own_loss
     
     def get_total_floating_profit(self) -> float:
             """
@@ -1013,19 +1642,11 @@ class UltraLowLatencyEngine:
                 float: Net floating profit after deducting commission
             """
             try:
-                positions = mt5.positions_get(symbol=self.symbol)
-                if positions is None or len(positions) == 0:
+                book = self.get_position_book()
+                position_count = book.own_count
+                if position_count == 0:
                     return 0.0
-                
-                magic = self.config.get('magic_number', 2026002)
-                total_profit = 0.0
-                position_count = 0
-                
-                # Sum up all position profits
-                for pos in positions:
-                    if pos.magic == magic:
-                        total_profit += pos.profit
-                        position_count += 1
+                total_profit = book.own_profit
                 
                 # Deduct commission
                 commission_per_trade = float(self.config.get('commission_per_trade', 0.0))
@@ -1052,109 +1673,91 @@ class UltraLowLatencyEngine:
                 return 0.0
     
     def close_all_positions(self, reason:  str = "Target reached") -> int:
-        """Close all positions with our magic number"""
+        """
+        Close all positions with our magic number
+        
+        The quote is fetched once and the close orders go out back-to-back;
+        logging and one summary notification (account/deals accounting runs
+        on the outbox consumer) follow the last close.
+        """
         try:
-            magic = self.config.get('magic_number', 2026002)
-            positions = mt5.positions_get(symbol=self.symbol)
+            wall_start = time.perf_counter()
+            # Closing acts on the terminal's current positions, never on a stale book
+            book = self.position_book
+            if not book.reconcile():
+                return 0
+            
+            positions = book.own_positions()
+            if not positions:
+                return 0
             
-            if positions is None or len(positions) == 0:
+            tick = mt5.symbol_info_tick(self.symbol)
+            if tick is None:
+                logger.error(f"Close all positions: no quote for {self.symbol}")
                 return 0
             
-            closed_count = 0
-            total_profit = 0.0
-            total_commission = 0.0  # ✅ Tambahkan tracker komisi
+            templates = self.get_order_templates()
             
+            # Send every close before doing anything else
+            closed = []
+            failed = []
             for position in positions:
-                if position.magic != magic:
-                    continue
-                
-                # Send close order for this position
-                close_type = mt5.ORDER_TYPE_SELL if position.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY
-                price = mt5.symbol_info_tick(self.symbol).bid if position.type == mt5.ORDER_TYPE_BUY else mt5.symbol_info_tick(self.symbol).ask
-
-                filling_mode_str = self.config.get('filling_mode', 'FOK')
-                filling_mode = self.get_filling_mode(filling_mode_str)
-
-                request = {
-                    "action": mt5.TRADE_ACTION_DEAL,
-                    "symbol": self.symbol,
-                    "volume": position.volume,
-                    "type": close_type,
-                    "position": position.ticket,
-                    "price": price,
-                    "deviation": self.config.get('slippage', 20),
-                    "magic": self.config.get('magic_number', 2026002),
-                    "comment": "AvHFTPro2026_CLOSE",
-                    "type_time": mt5.ORDER_TIME_GTC,
-                    "type_filling": filling_mode,
-                }
+                price = tick.bid if position.type == mt5.ORDER_TYPE_BUY else tick.ask
+                request = templates.close_request(position.type, position.volume, position.ticket, price)
 
+                send_start = time.perf_counter()
                 result = mt5.order_send(request)
+                self.stage_latency['order_send'].record((time.perf_counter() - send_start) * 1000000)
                 
-                if result.retcode == mt5.TRADE_RETCODE_DONE:
-                    closed_count += 1
-                    total_profit += position.profit
-                    
-                    # ✅ Hitung komisi per posisi
-                    commission_per_trade = self.config.get('commission_per_trade', 0.0)
-                    total_commission += commission_per_trade
-                    
-                    logger.info(f"✓ Posisi #{position.ticket} berhasil ditutup: "
+                if result is not None and result.retcode == mt5.TRADE_RETCODE_DONE:
+                    book.on_close(position.ticket)
+                    closed.append(position)
+                else:
+                    failed.append((position, result))
+            
+            wall_us = (time.perf_counter() - wall_start) * 1000000
+            self.stage_latency['close_all'].record(wall_us)
+            self.last_close_all = {
+                'positions': len(positions),
+                'closed': len(closed),
+                'wall_ms': wall_us / 1000,
+                'per_position_ms': wall_us / 1000 / len(positions),
+            }
+            
+            for position, result in failed:
+                logger.error(f"❌ Gagal nutup posisi #{position.ticket}: "
+                             f"{result.comment if result is not None else mt5.last_error()}")
+            
+            if not closed:
+                return 0
+            
+            commission_per_trade = self.config.get('commission_per_trade', 0.0)
+            for position in closed:
+                logger.info(f"✓ Posisi #{position.ticket} berhasil ditutup: "
                             f"Profit=${position.profit:.2f} | "
                             f"Commission=${commission_per_trade:.2f}")
-                    
-                    if self.telegram_callback:
-                        # Get account info right after position close
-                        try:
-                            account_info = mt5.account_info()
-                            if account_info:
-                                balance = account_info.balance
-                                equity = account_info.equity
-                                free_margin = account_info.margin_free
-                                margin = account_info.margin
-                                margin_level = (equity / margin) * 100 if margin and margin > 0 else 0
-                                logger.info(f"Account info fetched for close: Balance={balance:.2f}, Equity={equity:.2f}, Free Margin={free_margin:.2f}, Margin Level={margin_level:.2f}%")
-                            else:
-                                logger.warning("MT5 account_info() returned None during position close")
-                                balance = equity = free_margin = margin_level = None
-                        except Exception as e:
-                            logger.error(f"Failed to get account info during position close: {e}")
-                            balance = equity = free_margin = margin_level = None
-
-                        # Get total volume traded today
-                        try:
-                            total_volume_today = self.get_today_total_volume()
-                            logger.info(f"Total volume today: {total_volume_today:.2f}")
-                        except Exception as e:
-                            logger.error(f"Failed to get total volume today: {e}")
-                            total_volume_today = 0.0
-
-                        self.telegram_callback(
-                            signal_type="close_position",
-                            symbol=self.symbol,
-                            ticket=position.ticket,
-                            profit=position.profit,
-                            volume=position.volume,
-                            balance=balance,
-                            equity=equity,
-                            free_margin=free_margin,
-                            margin_level=margin_level,
-                            total_volume_today=total_volume_today
-                        )
-            
-            if closed_count > 0:
-                # ✅ Hitung net profit (setelah komisi)
-                net_profit = total_profit - total_commission
-                
-                logger.info(f"🎯 SEMUA POSISI DITUTUP: {closed_count} posisi berhasil ditutup")
-                logger.info(f"   Gross Profit: ${total_profit:.2f}")
-                logger.info(f"   Total Commission: ${total_commission:.2f}")
-                logger.info(f"   NET PROFIT: ${net_profit:.2f} 💰")
-                logger.info(f"   Alasan: {reason}")
-                
-                self.position_type = None
-                self.position_volume = 0.0
-                self.position_price = 0.0
+            
+            closed_count = len(closed)
+            total_profit = sum(p.profit for p in closed)
+            total_commission = commission_per_trade * closed_count
+            net_profit = total_profit - total_commission
+            
+            logger.info(f"🎯 SEMUA POSISI DITUTUP: {closed_count} posisi berhasil ditutup "
+                        f"dalam {wall_us / 1000:.2f} ms")
+            logger.info(f"   Gross Profit: ${total_profit:.2f}")
+            logger.info(f"   Total Commission: ${total_commission:.2f}")
+            logger.info(f"   NET PROFIT: ${net_profit:.2f} 💰")
+            logger.info(f"   Alasan: {reason}")
+            
+            self.position_type = None
+            self.position_volume = 0.0
+            self.position_price = 0.0
+            
+            self.notify(
+                "clear_all_positions",
+                closed_count=closed_count,
+                total_profit=total_profit,
+            )
             
             return closed_count
             
@@ -1162,11 +1765,92 @@ class UltraLowLatencyEngine:
             logger.error(f"Close all positions error: {e}")
             return 0
     
+    def notify(self, signal_type: str, **fields) -> bool:
+        """Queue a notification for telegram_callback (returns immediately)"""
+        if not self.telegram_callback:
+            return False
+        return self.notifications.post(signal_type, **fields)
+    
+    def _deliver_notification(self, signal_type: str, **fields):
+        """Outbox consumer: add the account summary and hand the record to telegram_callback"""
+        balance = equity = free_margin = margin_level = None
+        try:
+            account_info = self.account_cache.force_update()
+            if account_info:
+                balance = account_info.balance
+                equity = account_info.equity
+                free_margin = account_info.margin_free
+                margin = account_info.margin
+                margin_level = (equity / margin) * 100 if margin and margin > 0 else 0
+            else:
+                logger.warning(f"MT5 account_info() returned None for {signal_type} notification")
+        except Exception as e:
+            logger.error(f"Failed to get account info for {signal_type} notification: {e}")
+
+        try:
+            self.refresh_deals_ledger(max_age=0)
+            total_volume_today = self.get_today_total_volume(refresh=False)
+        except Exception as e:
+            logger.error(f"Failed to get total volume today: {e}")
+            total_volume_today = 0.0
+
+        self.telegram_callback(
+            signal_type=signal_type,
+            **fields,
+            balance=balance,
+            equity=equity,
+            free_margin=free_margin,
+            margin_level=margin_level,
+            total_volume_today=total_volume_today
+        )
+    
+    def _server_time(self) -> float:
+        """Current server timestamp: newest tick, else the terminal's last tick, else local clock"""
+        if self.last_tick is not None:
+            return self.last_tick.timestamp
+        tick = mt5.symbol_info_tick(self.symbol)
+        if tick is not None and hasattr(tick, 'time'):
+            return tick.time
+        return time.time()
+    
+    def refresh_deals_ledger(self, max_age: Optional[float] = None) -> int:
+        """Apply deals added since the last refresh (no-op while younger than max_age)"""
+        try:
+            return self.deals_ledger.refresh(self._server_time(), max_age)
+        except Exception as e:
+            logger.error(f"Deals ledger refresh error: {e}")
+            return 0
+    
+    def get_trading_snapshot(self) -> TradingSnapshot:
+        """Position book, one account call and one deals fetch for a trading decision"""
+        start = time.perf_counter()
+        magic = self.config.get('magic_number', 2026002)
+        positions = self.get_position_book().all_positions()
+        account = self.account_cache.force_update()
+        # Only the deals added since the previous refresh
+        self.refresh_deals_ledger(max_age=0)
+        ledger = self.deals_ledger
+        
+        snapshot = TradingSnapshot(
+            magic=magic,
+            positions=positions,
+            balance=account.balance if account else 0.0,
+            equity=account.equity if account else 0.0,
+            closed_pnl=ledger.closed_pnl,
+            trade_count=ledger.entries,
+            total_volume=self.get_today_total_volume(refresh=False),
+        )
+        self.stage_latency['trading_snapshot'].record((time.perf_counter() - start) * 1000000)
+        return snapshot
+    
     def open_position(self, order_type: str, signal: Signal) -> bool:
         """Open new position"""
+        # Every pre-trade gate below evaluates the same snapshot
+        snapshot = self.get_trading_snapshot()
+        
         # Check floating loss limit
         max_floating_loss = self.config.get('max_floating_loss', 500)
-        current_floating_loss = self.get_total_floating_loss()
+        current_floating_loss = snapshot.floating_loss
         
         if current_floating_loss >= max_floating_loss:
             logger.warning(f"⚠️ Floating loss udah mentok: ${current_floating_loss:.2f} >= ${max_floating_loss:.2f}")
@@ -1175,22 +1859,15 @@ class UltraLowLatencyEngine:
         
         # Check max positions (only count positions with our magic number)
         max_positions = self.config.get('max_positions', 3)
-        magic = self.config.get('magic_number', 2026002)
-        positions = mt5.positions_get(symbol=self.symbol)
-        
-        # Count only positions with our magic number
-        our_positions_count = 0
-        if positions:
-            for pos in positions:
-                if pos.magic == magic:
-                    our_positions_count += 1
+        magic = snapshot.magic
+        our_positions_count = snapshot.own_position_count
         
         if our_positions_count >= max_positions:
             logger.warning(f"⚠️ Jumlah posisi udah maksimal: {our_positions_count}/{max_positions} (Magic: {magic})")
             return False
 
         # Enforcement: floating loss hard block
-        floating_pnl = self.get_floating_pnl()
+        floating_pnl = snapshot.floating_pnl
         max_floating_loss = self.config.get("max_floating_loss", 0)
 
         max_floating_profit = self.config.get("max_floating_profit", 0)
@@ -1207,7 +1884,7 @@ class UltraLowLatencyEngine:
         )
 
         # Enforcement: daily loss hard block
-        daily_pnl = self.get_today_closed_pnl()
+        daily_pnl = snapshot.closed_pnl
         max_daily_loss = self.config.get("max_daily_loss", 0)
 
         logger.info(
@@ -1225,7 +1902,7 @@ class UltraLowLatencyEngine:
             return False
 
         # Enforcement: daily trade count hard block
-        daily_trades = self.get_today_trade_count()
+        daily_trades = snapshot.trade_count
         max_daily_trades = self.config.get("max_daily_trades", 0)
 
         logger.info(
@@ -1240,7 +1917,7 @@ class UltraLowLatencyEngine:
             return False
 
         # Check daily volume limit
-        daily_volume = self.get_today_total_volume()
+        daily_volume = snapshot.total_volume
         max_daily_volume = self.config.get("max_daily_volume", 0)
 
         if max_daily_volume > 0 and daily_volume >= max_daily_volume:
@@ -1250,7 +1927,7 @@ class UltraLowLatencyEngine:
             return False
 
         # Enforcement: max total position volume
-        current_volume = self.get_total_position_volume()
+        current_volume = snapshot.position_volume
         max_position_size = self.config.get("max_position_size", 0)
 
         if max_position_size > 0 and (current_volume + signal.volume) > max_position_size:
@@ -1263,7 +1940,7 @@ class UltraLowLatencyEngine:
         # ✅ Reset daily stats if it's a new day
         self.reset_daily_stats()
         
-        current_equity = self.get_account_equity()
+        current_equity = snapshot.equity
 
         # ✅ DAILY DRAWDOWN CALCULATION (from today's peak only, not all-time peak)
         # peak_equity is reset to current equity at start of day, so this calculates daily DD
@@ -1296,8 +1973,8 @@ class UltraLowLatencyEngine:
 
         # Prepare request
         try:
-            symbol_info = mt5.symbol_info(self.symbol)
-            if symbol_info is None:
+            templates = self.get_order_templates()
+            if templates.spec is None:
                 return False
             
             # Validate TP distance before sending order
@@ -1315,25 +1992,9 @@ class UltraLowLatencyEngine:
                 logger.error(f"❌ SL distance too small: {sl_distance:.5f} < {min_required:.5f}")
                 return False
             
-            # Get filling mode from config
-            filling_mode_str = self.config.get('filling_mode', 'FOK')
-            filling_mode = self.get_filling_mode(filling_mode_str)
-            
-            # Prepare request
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": self.symbol,
-                "volume": signal.volume,
-                "type": mt5.ORDER_TYPE_BUY if order_type == 'BUY' else mt5.ORDER_TYPE_SELL,
-                "price": signal.price,
-                "sl": signal.stop_loss,
-                "tp": signal.take_profit,
-                "deviation": self.config.get('slippage', 20),
-                "magic": self.config.get('magic_number', 2026002),
-                "comment": f"AvHFTPro2026_{order_type}",
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": filling_mode,
-            }
+            # Prepare request (filling mode, deviation, magic and comment come with the template)
+            request = templates.open_request(order_type, signal.volume, signal.price,
+                                             signal.stop_loss, signal.take_profit)
 
             # =============================
             # HARD SAFETY CHECK (FINAL FIX)
@@ -1344,11 +2005,10 @@ class UltraLowLatencyEngine:
             if now - self.last_trade_time < self.min_trade_interval:
                 return False
 
-            current_positions = self.get_current_positions_count()
+            current_positions = snapshot.position_count
 
             # ✅ FIX: Get current account balance for proper drawdown calculation
-            account_info = mt5.account_info()
-            account_balance = account_info.balance if account_info else 0.0
+            account_balance = snapshot.balance
 
             allowed, reason = True, ""
             if self.risk_manager:
@@ -1366,7 +2026,9 @@ class UltraLowLatencyEngine:
             # =============================
             # EXECUTE ORDER
             # =============================
+            send_start = time.perf_counter()
             result = mt5.order_send(request)
+            self.stage_latency['order_send'].record((time.perf_counter() - send_start) * 1000000)
 
             if result.retcode == mt5.TRADE_RETCODE_DONE:
                 # ✅ INCREMENT BOT'S TRADE COUNTER
@@ -1376,50 +2038,20 @@ class UltraLowLatencyEngine:
                 self.position_type = order_type
                 self.position_volume = signal.volume
                 self.position_price = result.price
+                self.position_book.on_open(result, request['type'], request['sl'], request['tp'])
                 
                 logger.info(f"✓ Bot trade #{self.bot_trades_today} opened:  {order_type} @ {result.price:.5f}")
                 
                 # Send Telegram signal for open position
-                if self.telegram_callback:
-                    # Get account info for telegram signal
-                    try:
-                        account_info = mt5.account_info()
-                        if account_info:
-                            balance = account_info.balance
-                            equity = account_info.equity
-                            free_margin = account_info.margin_free
-                            margin = account_info.margin
-                            margin_level = (equity / margin) * 100 if margin and margin > 0 else 0
-                            logger.info(f"Account info fetched for open: Balance={balance:.2f}, Equity={equity:.2f}, Free Margin={free_margin:.2f}, Margin Level={margin_level:.2f}%")
-                        else:
-                            logger.warning("MT5 account_info() returned None during position open")
-                            balance = equity = free_margin = margin_level = None
-                    except Exception as e:
-                        logger.error(f"Failed to get account info during position open: {e}")
-                        balance = equity = free_margin = margin_level = None
-                    
-                    # ✅ NEW: Get total volume traded today
-                    try:
-                        total_volume_today = self.get_today_total_volume()
-                        logger.info(f"Total volume today: {total_volume_today:.2f}")
-                    except Exception as e:
-                        logger.error(f"Failed to get total volume today: {e}")
-                        total_volume_today = 0.0
-                    
-                    self.telegram_callback(
-                        signal_type="open_position",
-                        symbol=self.symbol,
-                        order_type=order_type,
-                        volume=signal.volume,
-                        price=signal.price,
-                        sl=signal.stop_loss,
-                        tp=signal.take_profit,
-                        balance=balance,
-                        equity=equity,
-                        free_margin=free_margin,
-                        margin_level=margin_level,
-                        total_volume_today=total_volume_today
-                    )
+                self.notify(
+                    "open_position",
+                    symbol=self.symbol,
+                    order_type=order_type,
+                    volume=signal.volume,
+                    price=signal.price,
+                    sl=signal.stop_loss,
+                    tp=signal.take_profit,
+                )
                 
                 return True
             else:
@@ -1445,18 +2077,10 @@ class UltraLowLatencyEngine:
         
         try:
             magic = self.config.get('magic_number', 2026002)
-            positions = mt5.positions_get(symbol=self.symbol)
-            
-            if positions is None or len(positions) == 0:
-                self.position_type = None
-                return False
+            positions = self.get_position_book().own_positions()
             
-            # Find first position with our magic number
-            position = None
-            for pos in positions:
-                if pos.magic == magic:
-                    position = pos
-                    break
+            # First position with our magic number
+            position = positions[0] if positions else None
             
             if position is None:
                 logger.warning(f"Nggak nemu posisi dengan magic number {magic}")
@@ -1464,30 +2088,15 @@ class UltraLowLatencyEngine:
                 return False
             
             # Prepare close request
-            close_type = mt5.ORDER_TYPE_SELL if position.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY
             price = mt5.symbol_info_tick(self.symbol).bid if position.type == mt5.ORDER_TYPE_BUY else mt5.symbol_info_tick(self.symbol).ask
+            request = self.get_order_templates().close_request(position.type, position.volume, position.ticket, price)
             
-            # Get filling mode from config
-            filling_mode_str = self.config.get('filling_mode', 'FOK')
-            filling_mode = self.get_filling_mode(filling_mode_str)
-            
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": self.symbol,
-                "volume": position.volume,
-                "type": close_type,
-                "position": position.ticket,
-                "price": price,
-                "deviation": self.config.get('slippage', 20),
-                "magic": self.config.get('magic_number', 2026002),
-                "comment": "AvHFTPro2026_CLOSE",
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": filling_mode,
-            }
-            
+            send_start = time.perf_counter()
             result = mt5.order_send(request)
+            self.stage_latency['order_send'].record((time.perf_counter() - send_start) * 1000000)
             
             if result.retcode == mt5.TRADE_RETCODE_DONE:
+                self.position_book.on_close(position.ticket)
                 profit = position.profit
                 
                 # ✅ UPDATE BOT-SPECIFIC WIN/LOSS
@@ -1505,43 +2114,13 @@ class UltraLowLatencyEngine:
                 logger.info(f"✓ Position closed:  Profit={profit:.2f} | Bot Balance:  ${self.bot_balance:.2f}")
                 
                 # Send Telegram signal for close position (include account info)
-                if self.telegram_callback:
-                    try:
-                        account_info = mt5.account_info()
-                        if account_info:
-                            balance = account_info.balance
-                            equity = account_info.equity
-                            free_margin = account_info.margin_free
-                            margin = account_info.margin
-                            margin_level = (equity / margin) * 100 if margin and margin > 0 else 0
-                            logger.info(f"Account info fetched for close: Balance={balance:.2f}, Equity={equity:.2f}, Free Margin={free_margin:.2f}, Margin Level={margin_level:.2f}%")
-                        else:
-                            logger.warning("MT5 account_info() returned None during position close")
-                            balance = equity = free_margin = margin_level = None
-                    except Exception as e:
-                        logger.error(f"Failed to get account info during position close: {e}")
-                        balance = equity = free_margin = margin_level = None
-
-                    # Get total volume traded today
-                    try:
-                        total_volume_today = self.get_today_total_volume()
-                        logger.info(f"Total volume today: {total_volume_today:.2f}")
-                    except Exception as e:
-                        logger.error(f"Failed to get total volume today: {e}")
-                        total_volume_today = 0.0
-
-                    self.telegram_callback(
-                        signal_type="close_position",
-                        symbol=self.symbol,
-                        ticket=position.ticket,
-                        profit=position.profit,
-                        volume=position.volume,
-                        balance=balance,
-                        equity=equity,
-                        free_margin=free_margin,
-                        margin_level=margin_level,
-                        total_volume_today=total_volume_today
-                    )
+                self.notify(
+                    "close_position",
+                    symbol=self.symbol,
+                    ticket=position.ticket,
+                    profit=position.profit,
+                    volume=position.volume,
+                )
                 
                 # Record trade to risk_manager
                 if self.risk_manager:
@@ -1576,113 +2155,152 @@ class UltraLowLatencyEngine:
         
         while self.is_running:
             try:
+                if self.market_data_subscription is not None:
+                    # Hub does the terminal polling; we only consume its shared buffer
+                    # and tell it how long we could do without ticks
+                    self.market_data_subscription.idle_seconds = self.data_poller.session_seconds()
+                    self._read_hub_ticks()
+                    continue
+                
                 # Get tick data
-                tick = self.get_tick_ultra_fast()
-                if tick:
-                    self.tick_buffer.append(tick)
-                    
-                    # Calculate order flow
-                    orderflow = self.calculate_order_flow(tick)
-                    if orderflow:
-                        self.orderflow_buffer.append(orderflow)
+                if self.tick_ingestion_mode == 'batch':
+                    # Whole batch through the vectorized path
+                    ticks = self.fetch_new_tick_rows()
+                    if len(ticks):
+                        self.process_tick_batch(ticks_from_mt5(ticks))
+                else:
+                    tick = self.get_tick_ultra_fast()
+                    ticks = [tick] if tick else []
+                    for tick in ticks:
+                        self.process_tick(tick)
+                
+                if len(ticks):
+                    # Wake the analysis thread
+                    self.new_tick_event.set()
                 
-                # Sleep for minimal time (adjust based on broker tick frequency)
-                time.sleep(0.001)  # 1ms
+                # Recorder stage: hand the batch over, encoding/writing happens off this thread
+                if len(ticks) and self.tick_recorder is not None:
+                    self.tick_recorder.record(ticks)
+                
+                # 1 ms while ticks flow; backs off in dead markets and naps outside sessions
+                self.data_poller.sleep(len(ticks) > 0)
                 
             except Exception as e:
                 logger.error(f"Data collection error: {e}")
                 time.sleep(0.1)
     
+    def check_positions(self):
+        """Position status log, floating profit target and state reset (run every few seconds)"""
+        # Check position status and floating loss (only our magic number)
+        magic = self.config.get('magic_number', 2026002)
+        pos_count = self.get_position_book().own_count
+        
+        floating_loss = self.get_total_floating_loss()
+        max_floating = self.config.get('max_floating_loss', 500)
+        
+        # Check floating profit target (total floating profit - commission)
+        floating_profit = self.get_total_floating_profit()  # ✅ Sudah NET (profit - commission)
+        max_profit_target = self.config.get('max_floating_profit', 0.5)
+
+        if pos_count > 0:
+            commission_per_trade = self.config.get('commission_per_trade', 0.0)
+            total_commission = commission_per_trade * pos_count
+            
+            # ✅ FIXED: Added .2f to max_floating
+            logger.info("📊 Status Posisi: %d posisi kebuka (Magic: %s) | Profit (NET): $%.2f | "
+                        "Commission: $%.2f | Rugi: $%.2f/$%.2f",
+                        pos_count, magic, floating_profit, total_commission, floating_loss, max_floating)
+            
+            # ✅ UNIFIED CHECK: Gunakan config max_profit_target (hapus hardcoded $1)
+            if floating_profit >= max_profit_target:
+                logger.warning(f"🎯 Target profit tercapai: ${floating_profit:.2f} >= ${max_profit_target:.2f} (SETELAH KOMISI)")
+                logger.warning(f"   Total Commission Paid: ${total_commission:.2f}")
+                logger.warning(f"   Tutup semua posisi biar profitnya nggak ilang!")
+                closed = self.close_all_positions(reason=f"Profit_Target_{floating_profit:.2f}_net")
+                if closed > 0:
+                    logger.info(f"✓ Berhasil nutup {closed} posisi")
+            # Reset state if no positions exist
+            if not self.verify_position_exists():
+                logger.info(f"🔄 Semua posisi udah ditutup - Reset ulang state")
+                self.position_type = None
+                self.position_volume = 0.0
+                self.position_price = 0.0
+    
     def analysis_loop(self):
         """Market analysis and signal generation thread"""
         logger.info("Thread analisa jalan, siap mantau market!")
         analysis_count = 0
         last_position_check = time.time()
+        last_seq = self.tick_seq
+        new_ticks = True
         
         while self.is_running:
             try:
+                if self.event_driven:
+                    # Wake on new ticks; the timeout keeps the position checks running in quiet
+                    # markets and stretches towards their cadence while no ticks arrive
+                    new_ticks = self.analysis_poller.sleep(new_ticks, self.new_tick_event)
+                    self.new_tick_event.clear()
+                    cycle_start = time.perf_counter()
+                
                 # Periodic position sync check (every 5 seconds)
                 current_time = time.time()
-                if current_time - last_position_check > 5.0:
-                    # Check position status and floating loss (only our magic number)
-                    magic = self.config.get('magic_number', 2026002)
-                    positions = mt5.positions_get(symbol=self.symbol)
-                    
-                    # Count only our positions
-                    pos_count = 0
-                    if positions:
-                        for pos in positions:
-                            if pos.magic == magic:
-                                pos_count += 1
-                    
-                    floating_loss = self.get_total_floating_loss()
-                    max_floating = self.config.get('max_floating_loss', 500)
-                    
-                    # Check floating profit target (total floating profit - commission)
-                    floating_profit = self.get_total_floating_profit()  # ✅ Sudah NET (profit - commission)
-                    max_profit_target = self.config.get('max_floating_profit', 0.5)
-
-                    if pos_count > 0:
-                        commission_per_trade = self.config.get('commission_per_trade', 0.0)
-                        total_commission = commission_per_trade * pos_count
-                        
-                        # ✅ FIXED: Added .2f to max_floating
-                        logger.info(f"📊 Status Posisi: {pos_count} posisi kebuka (Magic: {magic}) | "
-                                    f"Profit (NET): ${floating_profit:.2f} | "
-                                    f"Commission: ${total_commission:.2f} | "
-                                    f"Rugi: ${floating_loss:.2f}/${max_floating:.2f}")  # ← FIXED!
-                        
-                        # ✅ UNIFIED CHECK: Gunakan config max_profit_target (hapus hardcoded $1)
-                        if floating_profit >= max_profit_target:
-                            logger.warning(f"🎯 Target profit tercapai: ${floating_profit:.2f} >= ${max_profit_target:.2f} (SETELAH KOMISI)")
-                            logger.warning(f"   Total Commission Paid: ${total_commission:.2f}")
-                            logger.warning(f"   Tutup semua posisi biar profitnya nggak ilang!")
-                            closed = self.close_all_positions(reason=f"Profit_Target_{floating_profit:.2f}_net")
-                            if closed > 0:
-                                logger.info(f"✓ Berhasil nutup {closed} posisi")
-                        # Reset state if no positions exist
-                        if not self.verify_position_exists():
-                            logger.info(f"🔄 Semua posisi udah ditutup - Reset ulang state")
-                            self.position_type = None
-                            self.position_volume = 0.0
-                            self.position_price = 0.0
-                    
+                if current_time - last_position_check > POSITION_CHECK_INTERVAL:
+                    self.check_positions()
                     last_position_check = current_time
                 
+                if not new_ticks or not self.is_running:
+                    # Nothing changed since the last analysis
+                    continue
+                
                 # Analyze market microstructure
+                stage_start = time.perf_counter()
+                tick_perf = self.last_tick_perf
                 microstructure = self.analyze_microstructure()
+                stage_end = time.perf_counter()
+                self.stage_latency['microstructure'].record((stage_end - stage_start) * 1000000)
                 
                 if microstructure:
                     analysis_count += 1
                     
                     # Generate signal
                     signal = self.generate_signal(microstructure)
+                    queued = time.perf_counter()
+                    self.stage_latency['signal_generation'].record((queued - stage_end) * 1000000)
                     
                     if signal:
                         # Add to signal queue
                         if not self.signal_queue.full():
+                            signal.tick_perf = tick_perf
+                            signal.queued_perf = queued
                             self.signal_queue.put(signal)
-                            logger.info(f"📊 SINYAL DIBUAT: {signal.signal_type} | "
-                                      f"Kekuatan: {signal.strength:.2f} | "
-                                      f"Harga: {signal.price:.5f} | "
-                                      f"Alasan: {signal.reason}")
+                            logger.info("📊 SINYAL DIBUAT: %s | Kekuatan: %.2f | Harga: %.5f | Alasan: %s",
+                                        signal.signal_type, signal.strength, signal.price, signal.reason)
                         else:
                             logger.warning("Antrian sinyal penuh, skip dulu ya")
                     else:
-                        # Log every 10 analyses with diagnostics
-                        if analysis_count % 10 == 0:
-                            logger.info(f"⏳ [{analysis_count}] Spread: {microstructure['avg_spread']:.5f} | "
-                                      f"Delta: {microstructure['cumulative_delta']:.0f} | "
-                                      f"Velocity: {microstructure['price_velocity']:.6f} | "
-                                      f"Volatility: {microstructure['volatility']:.5f}")
-                        # Log every 50 for summary
-                        if analysis_count % 50 == 0:
-                            logger.info(f"⏳ Analyzing market...({analysis_count} analyses, no strong signal yet)")
+                        # Diagnostics and summary, each at most once per rate-limit interval
+                        self.log_limiter.log(
+                            logger, logging.INFO, "⏳ [%d] Spread: %.5f | Delta: %.0f | Velocity: %.6f | Volatility: %.5f",
+                            analysis_count, microstructure['avg_spread'], microstructure['cumulative_delta'],
+                            microstructure['price_velocity'], microstructure['volatility'])
+                        self.log_limiter.log(
+                            logger, logging.INFO, "⏳ Analyzing market...(%d analyses, no strong signal yet)",
+                            analysis_count, interval=self.log_limiter.interval * 5)
                 else:
                     logger.debug("Waiting for sufficient tick data...")
                 
                 # Analysis frequency
-                time.sleep(self.config.get('analysis_interval', 0.1))  # 100ms
+                if self.event_driven:
+                    # Optional CPU guard: minimum spacing between analyses
+                    spacing = self.analysis_min_spacing - (time.perf_counter() - cycle_start)
+                    if spacing > 0:
+                        time.sleep(spacing)
+                else:
+                    # analysis_interval while ticks arrive, backing off while none do
+                    fresh = self.tick_seq != last_seq
+                    last_seq = self.tick_seq
+                    self.analysis_poller.sleep(fresh)
                 
             except Exception as e:
                 logger.error(f"Analysis error: {e}")
@@ -1695,14 +2313,24 @@ class UltraLowLatencyEngine:
         while self.is_running:
             try:
                 # Get signal from queue
-                if not self.signal_queue.empty():
+                if self.event_driven:
+                    # Block until analysis queues a signal (timeout so stop() is noticed)
+                    try:
+                        signal = self.signal_queue.get(timeout=0.5)
+                    except Empty:
+                        continue
+                elif not self.signal_queue.empty():
                     signal = self.signal_queue.get(timeout=1)
-                    
-                    # Execute signal
-                    self.execute_signal(signal)
                 else:
                     time.sleep(0.01)  # 10ms
-                    
+                    continue
+
+                if signal.queued_perf:
+                    self.stage_latency['queue_wait'].record((time.perf_counter() - signal.queued_perf) * 1000000)
+
+                # Execute signal
+                self.execute_signal(signal)
+
             except Exception as e:
                 logger.error(f"Execution loop error: {e}")
                 time.sleep(0.1)
@@ -1717,6 +2345,12 @@ class UltraLowLatencyEngine:
             logger.error("Failed to initialize")
             return False
         
+        if self.use_market_data_hub and self.market_data_subscription is None:
+            self.attach_market_data_hub()
+        
+        if self.config.get('record_ticks', False):
+            self.start_tick_recording()
+        
         self.is_running = True
         
         # Start threads
@@ -1747,10 +2381,17 @@ class UltraLowLatencyEngine:
         
         return True
     
-    def stop(self):
-        """Stop HFT engine (TIDAK MENUTUP POSISI!)"""
+    def stop(self, shutdown_terminal: bool = True):
+        """Stop HFT engine (TIDAK MENUTUP POSISI!)
+        
+        Args:
+            shutdown_terminal: False leaves the MT5 connection up for engines still running
+        """
         logger.info("🛑 Stopping HFT engine...")
         self.is_running = False
+        self.new_tick_event.set()  # release a waiting analysis thread
+        self.data_poller.wake()
+        self.analysis_poller.wake()
         
         # Wait for threads to finish
         if self.data_thread:
@@ -1760,6 +2401,15 @@ class UltraLowLatencyEngine:
         if self.execution_thread:
             self.execution_thread.join(timeout=5)
         
+        self.detach_market_data_hub()
+        
+        if self.tick_recorder is not None:
+            self.tick_recorder.stop()
+            self.tick_recorder = None
+        
+        # Deliver pending notifications before the terminal goes away
+        self.notifications.stop(timeout=self.config.get('notification_flush_timeout', 2.0))
+        
         # ✅ FIX:  JANGAN tutup posisi ketika stop!
         # Posisi tetap terbuka dan bisa dikelola manual atau bot lain
         if self.position_type:
@@ -1769,7 +2419,8 @@ class UltraLowLatencyEngine:
             logger.info(f"   💡 Manage position manually or restart bot to continue")
         
         # Shutdown MT5 connection (posisi tetap di server)
-        mt5.shutdown()
+        if shutdown_terminal:
+            mt5.shutdown()
         logger.info("✓ Engine stopped (positions remain active)")
     
     def get_performance_stats(self) -> Dict:
@@ -1777,14 +2428,34 @@ class UltraLowLatencyEngine:
         trades, wins, losses, daily_pnl = self.get_today_trade_stats()
         win_rate = (wins / trades * 100) if trades > 0 else 0.0
         pos_type, pos_vol = self.get_current_position_info()
+        ingestor = self.market_data_hub.ingestor if self.market_data_subscription else self.tick_ingestor
+        ingestion = ingestor.get_stats()
+        latency = self.latency.read_window('stats')
+        recorder = self.market_data_hub.recorder if self.market_data_subscription else self.tick_recorder
 
         return {
-            "tick_latency_avg_us": np.mean(self.latency_samples) if self.latency_samples else 0,
-            "tick_latency_max_us": max(self.latency_samples) if self.latency_samples else 0,
-            "tick_latency_min_us": min(self.latency_samples) if self.latency_samples else 0,
-            "execution_time_avg_ms": np.mean(self.execution_times) if self.execution_times else 0,
-            "execution_time_max_ms": max(self.execution_times) if self.execution_times else 0,
+            "tick_latency_avg_us": latency['tick_fetch']['mean_us'],
+            "tick_latency_max_us": latency['tick_fetch']['max_us'],
+            "tick_latency_min_us": latency['tick_fetch']['min_us'],
+            "execution_time_avg_ms": latency['execution']['mean_us'] / 1000,
+            "execution_time_max_ms": latency['execution']['max_us'] / 1000,
+            "latency": latency,
             "ticks_processed": len(self.tick_buffer),
+            "ingest_mode": self.tick_ingestion_mode,
+            "ingest_ticks_per_sec": ingestion['ticks_per_sec'],
+            "ingest_duplicates_dropped": ingestion['duplicates_dropped'],
+            "ingest_avg_batch_size": ingestion['avg_batch_size'],
+            "ingest_max_batch_size": ingestion['max_batch_size'],
+            "ticks_recorded": recorder.ticks_recorded if recorder else 0,
+            "analysis_cache": self.get_analysis_cache_stats(),
+            "symbol_spec_cache": self.symbol_specs.get_stats(),
+            "close_all": self.last_close_all,
+            "notifications": self.notifications.get_stats(),
+            "logging": self.log_limiter.get_stats(),
+            "ml_inference": self.get_ml_inference_stats(),
+            "position_book": self.get_position_book_stats(),
+            "order_templates": self.order_templates.get_stats(),
+            "polling": self.get_polling_stats(),
             "signals_generated": self.signals_generated,
             "trades_today": trades,
             "daily_pnl": daily_pnl,
@@ -1802,22 +2473,17 @@ class UltraLowLatencyEngine:
         win_rate = (bot_wins / total_trades * 100) if total_trades > 0 else 0.0
         
         # ✅ GET ONLY THIS BOT'S POSITIONS
-        magic = self.config.get('magic_number', 2026002)
-        positions = mt5.positions_get(symbol=self.symbol)
+        book = self.get_position_book()
+        positions = book.own_positions()  # ✅ ONLY THIS BOT!
         
-        bot_floating = 0.0
-        bot_position_count = 0
+        bot_floating = book.own_profit
         bot_position_type = "None"
         bot_position_volume = 0.0
         
         if positions:
-            for pos in positions:
-                if pos.magic == magic:  # ✅ ONLY THIS BOT! 
-                    bot_floating += pos.profit
-                    bot_position_count += 1
-                    if bot_position_count == 1:  # First position
-                        bot_position_type = "BUY" if pos.type == mt5.ORDER_TYPE_BUY else "SELL"
-                        bot_position_volume = pos.volume
+            pos = positions[0]  # First position
+            bot_position_type = "BUY" if pos.type == mt5.ORDER_TYPE_BUY else "SELL"
+            bot_position_volume = pos.volume
         
         # ✅ GET GLOBAL ACCOUNT BALANCE (shared)
         account = mt5.account_info()
@@ -1835,6 +2501,8 @@ class UltraLowLatencyEngine:
         if self.bot_peak_balance > 0:
             bot_drawdown = ((self.bot_peak_balance - bot_equity) / self.bot_peak_balance) * 100
 
+        latency = self.latency.read_window('snapshot')
+
         return {
             # ✅ BOT-SPECIFIC TRADING STATS WITH ACTUAL FLOATING P&L
             "trades_today": trades_today,
@@ -1849,10 +2517,11 @@ class UltraLowLatencyEngine:
             "signals_generated": self.signals_generated,
             
             # Performance
-            "tick_latency_avg": np.mean(self.latency_samples) if self.latency_samples else 0,
-            "tick_latency_max": max(self.latency_samples) if self.latency_samples else 0,
-            "exec_time_avg": np.mean(self.execution_times) if self.execution_times else 0,
-            "exec_time_max": max(self.execution_times) if self.execution_times else 0,
+            "tick_latency_avg": latency['tick_fetch']['mean_us'],
+            "tick_latency_max": latency['tick_fetch']['max_us'],
+            "exec_time_avg": latency['execution']['mean_us'] / 1000,
+            "exec_time_max": latency['execution']['max_us'] / 1000,
+            "latency": latency,
             "ticks_processed": len(self.tick_buffer),
             
             # ✅ BOT-SPECIFIC ACCOUNT METRICS
@@ -1863,120 +2532,33 @@ class UltraLowLatencyEngine:
         }
 
     def get_current_positions_count(self):
-        positions = mt5.positions_get(symbol=self.symbol)
-        if positions is None:
-            return 0
-        return len(positions)
+        return self.get_position_book().count
 
     def get_floating_pnl(self):
-        positions = mt5.positions_get(symbol=self.symbol)
-        if positions is None:
-            return 0.0
+        return self.get_position_book().profit
 
-        floating = 0.0
-        for p in positions:
-            floating += p.profit  # profit MT5 sudah termasuk swap & commission
-        return floating
-
-    @cache_with_ttl(ttl_seconds=0.5)  # Cache 500ms
     def get_today_closed_pnl(self):
-        from datetime import datetime, time, timezone
-        import pytz
-
-        # Ambil timezone server MT5
-        tick_info = mt5.symbol_info_tick(self.symbol)
-        if tick_info is not None and hasattr(tick_info, 'time'):
-            server_time = tick_info.time
-            server_dt = datetime.fromtimestamp(server_time)
-            local_dt = datetime.now()
-            offset = local_dt - server_dt
-            now = datetime.now()
-            day_start = datetime.combine(now.date(), time.min)
-            day_start_server = day_start - offset
-            now_server = now - offset
-            deals = mt5.history_deals_get(day_start_server, now_server)
-        else:
-            # Fallback: gunakan waktu lokal tanpa konversi jika info tick tidak tersedia
-            now = datetime.now()
-            day_start = datetime.combine(now.date(), time.min)
-            deals = mt5.history_deals_get(day_start, now)
-        if deals is None:
-            return 0.0
-
-        pnl = 0.0
-        magic = self.config.get('magic_number', 2026002)
-        for d in deals:
-            # ✅ FILTER BY MAGIC NUMBER - only count this bot's P&L
-            if d.magic == magic:
-                pnl += d.profit  # sudah termasuk commission & swap
+        """Today's realized P&L for this bot (commission & swap included)"""
+        self.refresh_deals_ledger()
+        return self.deals_ledger.closed_pnl
 
-        return pnl
-
-    @cache_with_ttl(ttl_seconds=1.0)  # Cache 1 second
     def get_today_trade_count(self):
-        from datetime import datetime, time, timezone
-        import pytz
-
-        tick_info = mt5.symbol_info_tick(self.symbol)
-        if tick_info is not None and hasattr(tick_info, 'time'):
-            server_time = tick_info.time
-            server_dt = datetime.fromtimestamp(server_time)
-            local_dt = datetime.now()
-            offset = local_dt - server_dt
-            now = datetime.now()
-            day_start = datetime.combine(now.date(), time.min)
-            day_start_server = day_start - offset
-            now_server = now - offset
-            deals = mt5.history_deals_get(day_start_server, now_server)
-        else:
-            # Fallback: gunakan waktu lokal tanpa konversi jika info tick tidak tersedia
-            now = datetime.now()
-            day_start = datetime.combine(now.date(), time.min)
-            deals = mt5.history_deals_get(day_start, now)
-        if deals is None:
-            return 0
-
-        trade_count = 0
-        magic = self.config.get('magic_number', 2026002)
-        for d in deals:
-            # ✅ FILTER BY MAGIC NUMBER - only count this bot's trades
-            if d.magic == magic and d.entry == mt5.DEAL_ENTRY_IN:
-                trade_count += 1
+        """Positions opened today by this bot"""
+        self.refresh_deals_ledger()
+        return self.deals_ledger.entries
 
-        return trade_count
-
-    def get_today_total_volume(self):
-        """Get total volume traded today for this bot - uses database fallback"""
-        from datetime import datetime, time
-
-        # Try risk_manager's database method first (most reliable)
-        if self.risk_manager:
-            try:
-                total_volume = self.risk_manager.get_daily_volume_from_db()
-                if total_volume is not None and total_volume > 0:
-                    return total_volume
-            except Exception as e:
-                logger.debug(f"Could not get volume from risk_manager DB: {e}")
+    def get_today_total_volume(self, refresh: bool = True):
+        """Get total volume traded today for this bot (trade database if deals are unavailable)"""
+        if refresh:
+            self.refresh_deals_ledger()
+        if self.deals_ledger.synced or not self.risk_manager:
+            return self.deals_ledger.entry_volume
 
-        # Fallback to MT5 history deals
         try:
-            now = datetime.now()
-            day_start = datetime.combine(now.date(), time.min)
-            deals = mt5.history_deals_get(day_start, now)
-
-            if deals is None:
-                return 0.0
-
-            total_volume = 0.0
-            magic = self.config.get('magic_number', 2026002)
-
-            for deal in deals:
-                if deal.magic == magic and deal.entry == mt5.DEAL_ENTRY_IN:
-                    total_volume += deal.volume
-
-            return total_volume
+            total_volume = self.risk_manager.get_daily_volume_from_db()
+            return total_volume if total_volume is not None else 0.0
         except Exception as e:
-            logger.error(f"Failed to get total volume from MT5 deals: {e}")
+            logger.debug(f"Could not get volume from risk_manager DB: {e}")
             return 0.0
 
     def get_today_trade_stats(self):
@@ -1986,59 +2568,14 @@ class UltraLowLatencyEngine:
         Daily P&L = Realized P&L (closed trades) + Unrealized P&L (floating from open positions)
         This ensures Daily P&L reflects ACTUAL MT5 floating actual, not just accumulated trades
         """
-        from datetime import datetime, time, timezone
-        import pytz
-
-        tick = mt5.symbol_info_tick(self.symbol)
-        if tick is None:
-            # Return default values or raise a warning if tick data is unavailable
-            return 0, 0, 0, 0.0
-        server_time = tick.time
-        server_dt = datetime.fromtimestamp(server_time)
-        local_dt = datetime.now()
-        offset = local_dt - server_dt
-
-        now = datetime.now()
-        day_start = datetime.combine(now.date(), time.min)
-
-        day_start_server = day_start - offset
-        now_server = now - offset
-
-        deals = mt5.history_deals_get(day_start_server, now_server)
-        if not deals:
-            # Still need to calculate floating from open positions even if no closed trades
-            realized_pnl = 0.0
-        else:
-            realized_pnl = 0.0
-
-        trades = 0
-        wins = 0
-        losses = 0
-
-        magic = self.config.get('magic_number', 2026002)
-
-        if deals:
-            for d in deals:
-                # ✅ FILTER BY MAGIC NUMBER - only count this bot's trades
-                if d.magic != magic:
-                    continue
-                    
-                realized_pnl += d.profit
-                if d.entry == mt5.DEAL_ENTRY_IN:
-                    trades += 1
-                if d.profit > 0:
-                    wins += 1
-                elif d.profit < 0:
-                    losses += 1
+        self.refresh_deals_ledger()
+        ledger = self.deals_ledger
+        realized_pnl = ledger.closed_pnl
+        trades, wins, losses = ledger.entries, ledger.wins, ledger.losses
 
         # ✅ GET CURRENT FLOATING P&L FROM OPEN POSITIONS
         # This ensures Daily P&L reflects ACTUAL floating actual from MT5
-        floating_pnl = 0.0
-        positions = mt5.positions_get(symbol=self.symbol)
-        if positions:
-            for pos in positions:
-                if pos.magic == magic:  # Only this bot's positions
-                    floating_pnl += pos.profit
+        floating_pnl = self.get_position_book().own_profit  # Only this bot's positions
         
         # ✅ TOTAL DAILY P&L = Realized (closed trades) + Unrealized (floating from open positions)
         total_daily_pnl = realized_pnl + floating_pnl
@@ -2046,15 +2583,7 @@ class UltraLowLatencyEngine:
         return trades, wins, losses, total_daily_pnl
 
     def get_total_position_volume(self):
-        positions = mt5.positions_get(symbol=self.symbol)
-        if positions is None:
-            return 0.0
-
-        total_volume = 0.0
-        for p in positions:
-            total_volume += p.volume
-
-        return total_volume
+        return self.get_position_book().volume
 
     def get_account_equity(self):
         """Get account equity (cached)"""
@@ -2066,14 +2595,12 @@ class UltraLowLatencyEngine:
         snapshot = self.account_cache.get_info()
         return snapshot.balance if snapshot else 0.0
     
-    # ✅ ADD rate limiting to logging
-    @rate_limit(seconds=5)
     def log_spread_reject(self, spread, threshold):
         """Rate-limited spread rejection logging"""
-        logger.warning(f"⚠️ SPREAD REJECT: {spread:.5f} > {threshold:.5f}")
+        self.log_limiter.log(logger, logging.WARNING, "⚠️ SPREAD REJECT: %.5f > %.5f", spread, threshold)
 
     def get_current_position_info(self):
-        positions = mt5.positions_get(symbol=self.symbol)
+        positions = self.get_position_book().all_positions()
         if not positions:
             return "None", 0.0
 
@@ -2097,20 +2624,17 @@ class UltraLowLatencyEngine:
             # Get current position
             position_type, position_volume = self.get_current_position_info()
             
-            # Calculate floating P&L
-            floating_pnl = 0.0
-            positions = mt5.positions_get(symbol=self.symbol)
-            if positions:
-                for pos in positions:
-                    floating_pnl += pos.profit
+            # Floating P&L of every position on the symbol
+            floating_pnl = self.get_position_book().profit
             
-            # Calculate latency metrics
-            latency_avg = sum(self.latency_samples) / len(self.latency_samples) if self.latency_samples else 0
-            latency_max = max(self.latency_samples) if self.latency_samples else 0
+            # Per-stage latency since the previous snapshot (reset-on-read window)
+            latency = self.latency.read_window('snapshot')
+            latency_avg = latency['tick_fetch']['mean_us']
+            latency_max = latency['tick_fetch']['max_us']
             
-            # Calculate execution time metrics
-            exec_avg = sum(self.execution_times) / len(self.execution_times) if self.execution_times else 0
-            exec_max = max(self.execution_times) if self.execution_times else 0
+            # Calculate execution time metrics (ms)
+            exec_avg = latency['execution']['mean_us'] / 1000
+            exec_max = latency['execution']['max_us'] / 1000
             
             return {
                 'trades_today': trades_today,
@@ -2128,7 +2652,10 @@ class UltraLowLatencyEngine:
                 'tick_latency_max': latency_max,
                 'exec_time_avg': exec_avg,
                 'exec_time_max': exec_max,
-                'ticks_processed': len(self.tick_buffer)
+                'latency': latency,
+                'ticks_processed': len(self.tick_buffer),
+                # Limits, counters and circuit breaker of the risk manager this engine enforces
+                'risk': self.risk_manager.runtime_state() if self.risk_manager else None,
             }
         except Exception as e:
             logger.error(f"Error getting performance snapshot: {e}")
@@ -0,0 +1,76 @@
+"""
+Adaptive polling benchmark
+CPU used by one bot's data and analysis threads over a quiet stretch: a dead market inside the
+trading session, and an out-of-session window with no position open.  Fixed 1 ms schedule
+(adaptive_polling=False, as before) vs the adaptive schedule.
+Runs against the replay terminal (no terminal required)
+
+Usage: python bench_adaptive_polling.py [seconds]
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+logging.disable(logging.ERROR)
+
+import aventa_hft_core
+from config_manager import ConfigManager
+from tick_replay import patch_mt5, ReplayMT5
+
+
+def run(seconds: float, adaptive: bool, in_session: bool) -> dict:
+    terminal = ReplayMT5('XAUUSD', balance=100000.0)
+    terminal.set_tick(int(time.time() * 1000), 2600.00, 2600.20, 2600.10, 1)
+    patch_mt5(terminal)
+
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update({'use_market_data_hub': False, 'async_logging': False, 'adaptive_polling': adaptive,
+                   'trading_sessions_enabled': not in_session})
+    if not in_session:
+        # One session opening well after the run ends
+        opens = time.gmtime(time.time() + 6 * 3600)
+        config.update({'london_session_enabled': True, 'ny_session_enabled': False,
+                       'asia_session_enabled': False, 'london_start': f"{opens.tm_hour:02d}:{opens.tm_min:02d}",
+                       'london_end': f"{opens.tm_hour:02d}:{opens.tm_min:02d}"})
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', config)
+    engine.initialize()
+
+    cpu_start = time.process_time()
+    engine.start()
+    time.sleep(seconds)
+    engine.stop()
+    cpu = time.process_time() - cpu_start
+
+    stats = engine.get_polling_stats()
+    return {
+        'process_cpu_ms': cpu * 1000,
+        'data_cpu_ms': stats['data']['cpu_s'] * 1000,
+        'analysis_cpu_ms': stats['analysis']['cpu_s'] * 1000,
+        'data_polls': stats['data']['polls'],
+        'data_mode': stats['data']['mode'],
+        'copy_calls': terminal.call_counts['copy_ticks_from'],
+    }
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+
+    print("=" * 96)
+    print("ADAPTIVE POLLING BENCHMARK")
+    print(f"{seconds:.0f} s of engine threads per run, no new ticks; CPU per bot (ms)")
+    print("=" * 96)
+    print(f"{'Scenario':<22} | {'Schedule':<8} | {'process CPU':>11} | {'data CPU':>8} | "
+          f"{'analysis CPU':>12} | {'data polls':>10} | {'copy_ticks':>10} | {'mode':<12}")
+    print("-" * 96)
+    for scenario, in_session in (('dead market', True), ('out of session', False)):
+        for label, adaptive in (('fixed', False), ('adaptive', True)):
+            r = run(seconds, adaptive, in_session)
+            print(f"{scenario:<22} | {label:<8} | {r['process_cpu_ms']:>11.1f} | {r['data_cpu_ms']:>8.1f} | "
+                  f"{r['analysis_cpu_ms']:>12.1f} | {r['data_polls']:>10} | {r['copy_calls']:>10} | "
+                  f"{r['data_mode']:<12}")
+    print("=" * 96)
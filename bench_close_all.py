@@ -0,0 +1,73 @@
+"""
+close_all_positions benchmark
+Terminal calls and wall time to close N positions
+Runs against the replay terminal with a simulated per-call IPC cost (no terminal required)
+
+Usage: python bench_close_all.py [positions] [call_cost_us]
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+logging.disable(logging.ERROR)
+
+from aventa_hft_core import UltraLowLatencyEngine
+from bench_open_position import CountingTerminal
+from config_manager import ConfigManager
+from tick_replay import patch_mt5, ReplayMT5
+
+
+def run(positions: int, call_cost_us: float) -> dict:
+    terminal = ReplayMT5('XAUUSD', balance=100000.0)
+    now_msc = int(time.time() * 1000)
+    terminal.set_tick(now_msc, 2600.00, 2600.20, 2600.10, 1)
+    counting = CountingTerminal(terminal, call_cost_us)
+    patch_mt5(counting)
+
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update({'use_market_data_hub': False})
+    notifications = []
+    engine = UltraLowLatencyEngine('XAUUSD', config, telegram_callback=lambda **data: notifications.append(data))
+    engine.initialize()
+    magic = config['magic_number']
+    for i in range(positions):
+        terminal.order_send({'action': terminal.TRADE_ACTION_DEAL, 'symbol': 'XAUUSD', 'volume': 0.01,
+                             'type': terminal.ORDER_TYPE_BUY if i % 2 == 0 else terminal.ORDER_TYPE_SELL,
+                             'magic': magic})
+
+    counting.calls.clear()
+    start = time.perf_counter()
+    closed = engine.close_all_positions(reason='bench')
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        'closed': closed,
+        'calls': dict(sorted(counting.calls.items())),
+        'notifications': len(notifications),
+        'wall_ms': wall_ms,
+        'send_window_ms': engine.last_close_all['wall_ms'] if engine.last_close_all else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    positions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    call_cost_us = float(sys.argv[2]) if len(sys.argv) > 2 else 200.0
+
+    r = run(positions, call_cost_us)
+    print("=" * 70)
+    print("CLOSE ALL POSITIONS")
+    print(f"{positions} positions, {call_cost_us:.0f} us simulated cost per terminal call")
+    print("=" * 70)
+    print(f"Positions closed:        {r['closed']}/{positions}")
+    print(f"Terminal calls:          {sum(r['calls'].values())}")
+    for name, n in r['calls'].items():
+        print(f"  {name:<22} {n}")
+    print(f"Notifications:           {r['notifications']}")
+    print(f"First to last close:     {r['send_window_ms']:.2f} ms")
+    print(f"close_all_positions:     {r['wall_ms']:.2f} ms")
+    print("=" * 70)
@@ -0,0 +1,133 @@
+"""
+Engine-per-process benchmark
+Per-bot tick latency with 1, 5 and 10 bots as threads in one process vs one worker process per bot,
+while the host process runs CPU-bound Python work (GUI / backtest stand-in)
+Runs the real engine threads against live replay feeds (no terminal required)
+
+Usage: python bench_engine_process.py [seconds_per_run] [ticks_per_second] [host_load 0/1]
+"""
+
+import sys
+import time
+import threading
+from unittest.mock import MagicMock
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+logging.disable(logging.ERROR)
+
+import aventa_hft_core
+import symbol_specs
+from bench_multi_symbol import feed
+from config_manager import ConfigManager
+from engine_process import EngineProcess
+from tick_replay import MultiReplayMT5, patch_mt5, serve_live, synthetic_ticks
+
+
+CONFIG = {
+    'max_spread': 0.5, 'max_volatility': 0.05, 'min_delta_threshold': 30, 'min_velocity_threshold': 0.001,
+    'trading_sessions_enabled': False, 'max_floating_loss': 500.0, 'max_floating_profit': 0,
+    'use_market_data_hub': False, 'record_ticks': False, 'min_trade_interval': 0.3,
+}
+
+
+def make_ticks(index: int, duration: float, rate: float):
+    return synthetic_ticks(int(rate * (duration + 30)), seed=40 + index, mean_interval_ms=1000.0 / rate)
+
+
+def replay_initializer(symbol: str, index: int, duration: float, rate: float):
+    """Worker side: live replay feed for this bot's symbol"""
+    sys.modules.setdefault('MetaTrader5', MagicMock())
+    logging.disable(logging.ERROR)
+    serve_live(symbol, make_ticks(index, duration, rate), balance=100000.0)
+
+
+def host_load(stop: threading.Event):
+    """Pure-Python CPU work holding the GIL in slices, like a backtest or GUI redraw"""
+    while not stop.is_set():
+        total = 0
+        for i in range(20000):
+            total += i * i % 7
+
+
+def configs_for(bots: int) -> dict:
+    configs = {}
+    for i in range(bots):
+        config = dict(ConfigManager.DEFAULT_CONFIG)
+        config.update(CONFIG)
+        config['magic_number'] = 5000 + i
+        configs[f"XAU{i:02d}"] = config
+    return configs
+
+
+def run(processes: bool, bots: int, duration: float, rate: float, load: bool) -> dict:
+    configs = configs_for(bots)
+    stop = threading.Event()
+
+    if processes:
+        engines = [EngineProcess(name, config, initializer=replay_initializer, initargs=(name, i, duration, rate))
+                   for i, (name, config) in enumerate(configs.items())]
+    else:
+        names = list(configs)
+        streams = {name: make_ticks(i, duration, rate) for i, name in enumerate(names)}
+        terminal = MultiReplayMT5(names, balance=100000.0 * bots)
+        for name, ticks in streams.items():
+            first = ticks[0]
+            terminal.set_tick(name, int(time.time() * 1000), float(first['bid']), float(first['ask']),
+                              float(first['last']), float(first['volume']))
+        patch_mt5(terminal)
+        engines = [aventa_hft_core.UltraLowLatencyEngine(name, config) for name, config in configs.items()]
+        threading.Thread(target=feed, args=(terminal, streams, stop), daemon=True).start()
+
+    for engine in engines:
+        if not engine.start():
+            raise RuntimeError("engine failed to start against the replay feed")
+    for engine in engines:
+        engine.get_performance_stats()  # open the 'stats' latency window after warm-up
+
+    loader = threading.Thread(target=host_load, args=(stop,), daemon=True)
+    if load:
+        loader.start()
+    time.sleep(duration)
+    windows = [engine.get_performance_stats()['latency'] for engine in engines]
+    stop.set()
+    for engine in engines:
+        engine.stop()
+    symbol_specs.get_symbol_spec_cache().invalidate()
+
+    def per_bot(stage, key):
+        values = [w[stage][key] / 1000 for w in windows if w[stage]['count']]
+        return (sum(values) / len(values), max(values)) if values else (0.0, 0.0)
+
+    return {
+        'fetch_p50': per_bot('tick_fetch', 'p50_us'),
+        'fetch_p99': per_bot('tick_fetch', 'p99_us'),
+        't2o_p50': per_bot('tick_to_order', 'p50_us'),
+        't2o_p99': per_bot('tick_to_order', 'p99_us'),
+        'orders': sum(w['order_send']['count'] for w in windows),
+    }
+
+
+if __name__ == "__main__":
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 8.0
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    load = bool(int(sys.argv[3])) if len(sys.argv) > 3 else True
+
+    print("=" * 100)
+    print("ENGINE PER PROCESS BENCHMARK")
+    print(f"{duration:.1f}s per run, ~{rate:.0f} ticks/s per bot, host CPU load {'on' if load else 'off'}")
+    print("Per-bot latency in ms: mean over bots / worst bot")
+    print("=" * 100)
+    print(f"{'Mode':<8} | {'Bots':>4} | {'tick fetch p50':>15} | {'tick fetch p99':>15} | "
+          f"{'tick->order p50':>15} | {'tick->order p99':>15} | {'Orders':>6}")
+    print("-" * 100)
+    for bots in (1, 5, 10):
+        for processes in (False, True):
+            r = run(processes, bots, duration, rate, load)
+            mode = "process" if processes else "thread"
+            cells = [f"{r[k][0]:.3f} / {r[k][1]:.3f}" for k in ('fetch_p50', 'fetch_p99', 't2o_p50', 't2o_p99')]
+            print(f"{mode:<8} | {bots:>4} | {cells[0]:>15} | {cells[1]:>15} | {cells[2]:>15} | "
+                  f"{cells[3]:>15} | {r['orders']:>6}")
+    print("=" * 100)
@@ -0,0 +1,101 @@
+"""
+Event-driven pipeline benchmark
+Tick-to-order latency and CPU of the legacy sleep loops vs the event-driven pipeline
+Runs the real engine threads against the replay terminal fed in real time (no terminal required)
+
+Usage: python bench_event_pipeline.py [seconds_per_run] [ticks_per_second]
+"""
+
+import sys
+import time
+import threading
+from unittest.mock import MagicMock
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+logging.disable(logging.ERROR)
+
+import aventa_hft_core
+from config_manager import ConfigManager
+from tick_replay import patch_mt5, ReplayMT5, synthetic_ticks
+
+
+CONFIG = {
+    'max_spread': 0.5, 'max_volatility': 0.05, 'min_delta_threshold': 30, 'min_velocity_threshold': 0.001,
+    'trading_sessions_enabled': False, 'max_floating_loss': 500.0, 'max_floating_profit': 0,
+    'use_market_data_hub': False, 'record_ticks': False, 'min_trade_interval': 0.3,
+}
+
+
+def feed(terminal: ReplayMT5, ticks, stop: threading.Event):
+    """Publish ticks on their own schedule, stamped with the wall clock"""
+    t0 = float(ticks['timestamp'][0])
+    start = time.time()
+    for row in ticks:
+        due = start + (float(row['timestamp']) - t0)
+        delay = due - time.time()
+        if delay > 0 and stop.wait(delay):
+            return
+        if stop.is_set():
+            return
+        terminal.set_tick(int(time.time() * 1000), float(row['bid']), float(row['ask']),
+                          float(row['last']), float(row['volume']))
+
+
+def run(event_driven: bool, duration: float, rate: float) -> dict:
+    ticks = synthetic_ticks(int(rate * (duration + 5)), seed=11, mean_interval_ms=1000.0 / rate)
+    terminal = ReplayMT5('XAUUSD', balance=100000.0)
+    first = ticks[0]
+    terminal.set_tick(int(time.time() * 1000), float(first['bid']), float(first['ask']),
+                      float(first['last']), float(first['volume']))
+    patch_mt5(terminal)
+
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update(CONFIG)
+    config['event_driven_pipeline'] = event_driven
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', config)
+
+    stop = threading.Event()
+    feeder = threading.Thread(target=feed, args=(terminal, ticks, stop), daemon=True)
+    if not engine.start():
+        raise RuntimeError("engine failed to start against the replay terminal")
+    cpu_start = time.process_time()
+    feeder.start()
+    time.sleep(duration)
+    cpu = time.process_time() - cpu_start
+    engine.is_running = False
+    stop.set()
+    feeder.join(timeout=5)
+    engine.stop()
+
+    window = engine.latency.read_window('bench')
+    return {
+        'tick_to_order': window['tick_to_order'],
+        'queue_wait': window['queue_wait'],
+        'analyses': window['microstructure']['count'],
+        'orders': terminal.call_counts['order_send'],
+        'cpu_pct': cpu / duration * 100,
+    }
+
+
+if __name__ == "__main__":
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 50.0
+
+    print("=" * 94)
+    print("EVENT-DRIVEN PIPELINE BENCHMARK")
+    print(f"{duration:.1f}s per run, ~{rate:.0f} ticks/s replay feed, all times in ms")
+    print("=" * 94)
+    print(f"{'Mode':<8} | {'tick->order p50':>15} | {'p90':>7} | {'p99':>7} | {'queue p50':>9} | "
+          f"{'queue p99':>9} | {'Analyses':>8} | {'Orders':>6} | {'CPU %':>6}")
+    print("-" * 94)
+    for event_driven in (False, True):
+        r = run(event_driven, duration, rate)
+        t2o, queue = r['tick_to_order'], r['queue_wait']
+        mode = "event" if event_driven else "legacy"
+        print(f"{mode:<8} | {t2o['p50_us'] / 1000:>15.2f} | {t2o['p90_us'] / 1000:>7.2f} | "
+              f"{t2o['p99_us'] / 1000:>7.2f} | {queue['p50_us'] / 1000:>9.3f} | {queue['p99_us'] / 1000:>9.3f} | "
+              f"{r['analyses']:>8} | {r['orders']:>6} | {r['cpu_pct']:>6.1f}")
+    print("=" * 94)
@@ -0,0 +1,92 @@
+"""
+Fused analysis kernel benchmark
+analyze_microstructure + generate_signal per new tick: the NumPy / per-indicator path
+vs one microstructure_signal kernel call, with streaming indicators on and off
+Replays synthetic ticks through the engine (no terminal required)
+
+Usage: python bench_fused_analysis.py [ticks]
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+logging.disable(logging.ERROR)
+
+import numpy as np
+
+import account_cache
+import aventa_hft_core
+from bench_event_pipeline import CONFIG
+from config_manager import ConfigManager
+from tick_replay import synthetic_ticks
+
+
+def run(fused: bool, streaming: bool, ticks) -> dict:
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update(CONFIG)
+    config.update({'fused_analysis': fused, 'streaming_indicators': streaming, 'async_logging': False,
+                   'tp_mode': 'RiskReward'})
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', config)
+
+    analyze_us = []
+    signal_us = []
+    outcomes = []
+    for row in ticks:
+        engine.process_tick(aventa_hft_core.TickData(
+            timestamp=float(row['timestamp']), bid=float(row['bid']), ask=float(row['ask']),
+            last=float(row['last']), volume=int(row['volume']), spread=float(row['spread'])))
+        start = time.perf_counter()
+        micro = engine.analyze_microstructure()
+        mid = time.perf_counter()
+        if not micro:
+            continue
+        signal = engine.generate_signal(micro)
+        end = time.perf_counter()
+        analyze_us.append((mid - start) * 1000000)
+        signal_us.append((end - mid) * 1000000)
+        outcomes.append(None if signal is None else (signal.signal_type, round(signal.strength, 9)))
+
+    analyze_us = np.array(analyze_us[200:])  # skip JIT compilation and warm-up
+    signal_us = np.array(signal_us[200:])
+    total = analyze_us + signal_us
+    return {
+        'analyze_p50': np.percentile(analyze_us, 50),
+        'signal_p50': np.percentile(signal_us, 50),
+        'total_p50': np.percentile(total, 50),
+        'total_p99': np.percentile(total, 99),
+        'signals': sum(o is not None for o in outcomes),
+        'outcomes': outcomes,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    aventa_hft_core.mt5 = stub
+    account_cache.mt5 = stub
+    ticks = synthetic_ticks(n, seed=9)
+
+    print("=" * 92)
+    print("FUSED ANALYSIS KERNEL BENCHMARK")
+    print(f"{n} ticks, analyze_microstructure + generate_signal per tick (us)")
+    print("=" * 92)
+    print(f"{'Indicators':<10} | {'Path':<6} | {'analyze p50':>11} | {'signal p50':>10} | "
+          f"{'cycle p50':>9} | {'cycle p99':>9} | {'Signals':>7} | {'Same':>4}")
+    print("-" * 92)
+    for streaming in (True, False):
+        baseline = None
+        for fused in (False, True):
+            r = run(fused, streaming, ticks)
+            baseline = baseline or r
+            print(f"{'streaming' if streaming else 'window':<10} | {'fused' if fused else 'numpy':<6} | "
+                  f"{r['analyze_p50']:>11.1f} | {r['signal_p50']:>10.1f} | {r['total_p50']:>9.1f} | "
+                  f"{r['total_p99']:>9.1f} | {r['signals']:>7} | "
+                  f"{'yes' if r['outcomes'] == baseline['outcomes'] else 'NO':>4}")
+    print("=" * 92)
@@ -0,0 +1,69 @@
+"""
+Fast indicator startup benchmark
+Time until the Numba kernels are usable in a fresh process:
+  - lazy JIT: the old per-start warm-up (plain @jit, compiled on dummy data in initialize())
+  - cold cache: first import after install, eager signatures compiled and written to disk
+  - warm cache: every later import / bot start / worker process, loaded from disk
+Each scenario runs in its own interpreter against a private NUMBA_CACHE_DIR
+
+Usage: python bench_kernel_cache.py [warm_runs]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+LAZY = """
+import json, time
+import numpy as np
+from numba import jit
+import fast_indicators as fi
+kernels = [jit(nopython=True)(getattr(fi, name).py_func)
+           for name in ('ema_fast', 'rsi_fast', 'atr_fast', 'momentum_fast')]
+ema, rsi, atr, mom = kernels
+start = time.perf_counter()
+dummy_data = np.random.random(100) * 2600.0
+ema(dummy_data, 7); ema(dummy_data, 21); rsi(dummy_data, 7)
+atr(dummy_data, dummy_data * 1.001, dummy_data * 0.999, 14); mom(dummy_data, 5)
+print(json.dumps({'seconds': time.perf_counter() - start, 'kernels': 4}))
+"""
+
+EAGER = """
+import json
+import fast_indicators as fi
+report = fi.startup_report()
+print(json.dumps({'seconds': report['seconds'], 'kernels': len(report['kernels']),
+                  'compiled': report['compiled'], 'from_cache': report['from_cache']}))
+"""
+
+
+def measure(code: str, cache_dir: str) -> dict:
+    env = dict(os.environ, NUMBA_CACHE_DIR=cache_dir, PYTHONPATH=HERE)
+    out = subprocess.run([sys.executable, '-c', code], env=env, cwd=HERE, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    warm_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print("=" * 72)
+    print("FAST INDICATOR STARTUP BENCHMARK (fresh interpreter per row)")
+    print("=" * 72)
+    print(f"{'Scenario':<34} | {'Kernels':>7} | {'Seconds':>8} | {'Compiled':>8}")
+    print("-" * 72)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        lazy = measure(LAZY, cache_dir)
+        print(f"{'lazy JIT warm-up (before)':<34} | {lazy['kernels']:>7} | {lazy['seconds']:>8.3f} | {'all':>8}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = measure(EAGER, cache_dir)
+        print(f"{'eager, cold cache (once/install)':<34} | {cold['kernels']:>7} | {cold['seconds']:>8.3f} | "
+              f"{cold['compiled']:>8}")
+        for i in range(warm_runs):
+            warm = measure(EAGER, cache_dir)
+            print(f"{f'eager, warm cache (start {i + 1})':<34} | {warm['kernels']:>7} | {warm['seconds']:>8.3f} | "
+                  f"{warm['compiled']:>8}")
+    print("=" * 72)
@@ -0,0 +1,114 @@
+"""
+Hot-path logging benchmark
+CPU and stage latency per analysis cycle with synchronous vs async logging, with and without rate limits
+Log output goes to a sink that costs as much as a Tk text insert per line
+Runs the real engine threads against the replay terminal fed in real time (no terminal required)
+
+Usage: python bench_logging.py [seconds_per_run] [ticks_per_second] [sink_cost_us]
+"""
+
+import sys
+import time
+import threading
+from unittest.mock import MagicMock
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+
+import async_logging
+import aventa_hft_core
+import symbol_specs
+from bench_event_pipeline import CONFIG, feed
+from config_manager import ConfigManager
+from tick_replay import patch_mt5, ReplayMT5, synthetic_ticks
+
+logging.disable(logging.NOTSET)  # bench_event_pipeline silences logging on import
+
+
+class SlowSink:
+    """Text sink with a fixed per-write cost (GUI log widget stand-in)"""
+
+    def __init__(self, cost_us: float):
+        self.cost = cost_us / 1000000
+        self.lines = 0
+
+    def write(self, text):
+        end = time.perf_counter() + self.cost
+        while time.perf_counter() < end:
+            pass
+        self.lines += 1
+
+    def flush(self):
+        pass
+
+
+def run(async_mode: bool, interval: float, duration: float, rate: float, sink_cost_us: float) -> dict:
+    sink = SlowSink(sink_cost_us)
+    root = logging.getLogger()
+    saved = root.handlers[:]
+    root.handlers = [logging.StreamHandler(sink)]
+    root.handlers[0].setFormatter(logging.Formatter('%(asctime)s.%(msecs)03d - %(levelname)s - %(message)s'))
+    root.setLevel(logging.INFO)
+
+    ticks = synthetic_ticks(int(rate * (duration + 5)), seed=11, mean_interval_ms=1000.0 / rate)
+    terminal = ReplayMT5('XAUUSD', balance=100000.0)
+    first = ticks[0]
+    terminal.set_tick(int(time.time() * 1000), float(first['bid']), float(first['ask']),
+                      float(first['last']), float(first['volume']))
+    patch_mt5(terminal)
+
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update(CONFIG)
+    config.update({'async_logging': async_mode, 'log_rate_limit_interval': interval, 'max_spread': 0.15})
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', config)
+
+    stop = threading.Event()
+    feeder = threading.Thread(target=feed, args=(terminal, ticks, stop), daemon=True)
+    if not engine.start():
+        raise RuntimeError("engine failed to start against the replay terminal")
+    engine.latency.read_window('bench')
+    cpu_start = time.process_time()
+    feeder.start()
+    time.sleep(duration)
+    cpu = time.process_time() - cpu_start
+    engine.is_running = False
+    stop.set()
+    feeder.join(timeout=5)
+    window = engine.latency.read_window('bench')
+    engine.stop()
+
+    pipeline = async_logging.get_async_logging()
+    if pipeline is not None:
+        pipeline.stop()
+    root.handlers = saved
+    symbol_specs.get_symbol_spec_cache().invalidate()
+
+    analyses = max(1, window['microstructure']['count'])
+    return {
+        'analyses': window['microstructure']['count'],
+        'cpu_us_per_analysis': cpu * 1000000 / analyses,
+        'signal': window['signal_generation'],
+        'lines': sink.lines,
+    }
+
+
+if __name__ == "__main__":
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 6.0
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 200.0
+    sink_cost_us = float(sys.argv[3]) if len(sys.argv) > 3 else 150.0
+
+    print("=" * 92)
+    print("HOT-PATH LOGGING BENCHMARK")
+    print(f"{duration:.1f}s per run, ~{rate:.0f} ticks/s, {sink_cost_us:.0f} us per log line written")
+    print("=" * 92)
+    print(f"{'Mode':<22} | {'Analyses':>8} | {'CPU us/analysis':>15} | {'signal p50 us':>13} | "
+          f"{'signal p99 us':>13} | {'Lines':>6}")
+    print("-" * 92)
+    for name, async_mode, interval in (("sync, every line", False, 0.0), ("sync, rate-limited", False, 5.0),
+                                       ("async, rate-limited", True, 5.0)):
+        r = run(async_mode, interval, duration, rate, sink_cost_us)
+        print(f"{name:<22} | {r['analyses']:>8} | {r['cpu_us_per_analysis']:>15.1f} | "
+              f"{r['signal']['p50_us']:>13.1f} | {r['signal']['p99_us']:>13.1f} | {r['lines']:>6}")
+    print("=" * 92)
@@ -0,0 +1,143 @@
+"""
+Market Data Hub scaling benchmark
+Per-bot data threads vs one shared hub per symbol, 1 to 20 bots
+Runs against a synthetic MetaTrader5 stand-in (no terminal required)
+
+Usage: python bench_market_data_hub.py [seconds_per_run] [ticks_per_second]
+"""
+
+import sys
+import time
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+logging.disable(logging.ERROR)
+
+import account_cache
+import aventa_hft_core
+import market_data_hub
+import tick_ingestion
+
+
+MT5_TICK_DTYPE = np.dtype([
+    ('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'),
+    ('volume', '<u8'), ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8'),
+])
+
+
+class LiveFeedMT5:
+    """Terminal stand-in whose ticks 'arrive' in real time at a fixed rate"""
+
+    COPY_TICKS_ALL = -1
+
+    def __init__(self, ticks_per_second: float, duration: float):
+        n = int(ticks_per_second * (duration + 5))
+        rng = np.random.default_rng(7)
+        self.t0_msc = int(time.time() * 1000)
+        ticks = np.zeros(n, dtype=MT5_TICK_DTYPE)
+        ticks['time_msc'] = self.t0_msc + (np.arange(n) * 1000.0 / ticks_per_second).astype(np.int64)
+        ticks['time'] = ticks['time_msc'] // 1000
+        ticks['bid'] = 2600.0 + np.cumsum(rng.choice([-0.01, 0.0, 0.01], n))
+        ticks['ask'] = ticks['bid'] + 0.02
+        ticks['last'] = ticks['bid'] + 0.01
+        ticks['volume'] = 1
+        self.ticks = ticks
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _visible(self):
+        now_msc = int(time.time() * 1000)
+        return self.ticks[:np.searchsorted(self.ticks['time_msc'], now_msc, side='right')]
+
+    def _count(self):
+        with self._lock:
+            self.calls += 1
+
+    def symbol_info_tick(self, symbol):
+        self._count()
+        visible = self._visible()
+        if len(visible) == 0:
+            return None
+        t = visible[-1]
+        return SimpleNamespace(time=int(t['time']), time_msc=int(t['time_msc']), bid=float(t['bid']),
+                               ask=float(t['ask']), last=float(t['last']), volume=int(t['volume']))
+
+    def copy_ticks_from(self, symbol, date_from, count, flags):
+        self._count()
+        visible = self._visible()
+        start = np.searchsorted(visible['time_msc'], int(date_from) * 1000, side='left')
+        return visible[start:start + count].copy()
+
+    def account_info(self):
+        return None
+
+
+def run(n_bots: int, use_hub: bool, duration: float, rate: float) -> dict:
+    feed = LiveFeedMT5(rate, duration)
+    for module in (tick_ingestion, aventa_hft_core, account_cache):
+        module.mt5 = feed
+    market_data_hub._hubs.clear()
+
+    engines = []
+    for i in range(n_bots):
+        config = {'magic_number': 2026001 + i, 'bot_id': f"Bot_{i + 1}",
+                  'use_market_data_hub': use_hub, 'tick_buffer_size': 10000}
+        engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', config)
+        if use_hub:
+            engine.attach_market_data_hub()
+        engine.is_running = True
+        engines.append(engine)
+
+    threads = [threading.Thread(target=e.data_collection_loop, daemon=True) for e in engines]
+    cpu_start = time.process_time()
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    for e in engines:
+        e.is_running = False
+    for t in threads:
+        t.join(timeout=5)
+    cpu = time.process_time() - cpu_start
+
+    if use_hub:
+        buffer_bytes = engines[0].tick_buffer.nbytes + engines[0].orderflow_buffer.nbytes
+    else:
+        buffer_bytes = sum(e.tick_buffer.nbytes + e.orderflow_buffer.nbytes for e in engines)
+    ticks_per_bot = np.mean([e.tick_seq for e in engines])
+
+    for e in engines:
+        e.detach_market_data_hub()
+
+    return {
+        'calls_per_sec': feed.calls / duration,
+        'cpu_pct': cpu / duration * 100,
+        'buffer_mb': buffer_bytes / 1024 / 1024,
+        'ticks_per_bot': ticks_per_bot,
+    }
+
+
+if __name__ == "__main__":
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 50.0
+
+    print("=" * 78)
+    print("MARKET DATA HUB SCALING BENCHMARK")
+    print(f"{duration:.1f}s per run, {rate:.0f} ticks/s synthetic feed")
+    print("=" * 78)
+    print(f"{'Bots':>4} | {'Mode':<8} | {'Terminal calls/s':>16} | {'CPU %':>7} | {'Buffers MB':>10} | {'Ticks/bot':>9}")
+    print("-" * 78)
+
+    for n in [1, 2, 5, 10, 20]:
+        for use_hub in (False, True):
+            r = run(n, use_hub, duration, rate)
+            mode = "hub" if use_hub else "per-bot"
+            print(f"{n:>4} | {mode:<8} | {r['calls_per_sec']:>16.0f} | {r['cpu_pct']:>7.1f} | "
+                  f"{r['buffer_mb']:>10.2f} | {r['ticks_per_bot']:>9.0f}")
+    print("=" * 78)
@@ -0,0 +1,115 @@
+"""
+Lazy ML inference benchmark
+Model calls and generate_signal cost per analysis with the ML model called on every pass,
+only when it can change the outcome, and additionally once per bar
+Uses the real MLPredictor (sklearn fallback models) trained on synthetic bars (no terminal required)
+
+Usage: python bench_ml_gating.py [ticks] [ml_bar_seconds] [min_signal_strength]
+"""
+
+import sys
+import time
+import warnings
+from unittest.mock import MagicMock
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+logging.disable(logging.ERROR)
+warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+import numpy as np
+import pandas as pd
+
+import account_cache
+import aventa_hft_core
+from bench_event_pipeline import CONFIG
+from config_manager import ConfigManager
+from ml_predictor import MLPredictor
+from tick_replay import synthetic_ticks
+
+FEATURES = ['ema_fast', 'ema_slow', 'rsi', 'atr', 'momentum', 'open', 'high', 'low', 'close', 'tick_volume']
+
+
+def trained_predictor(config: dict) -> MLPredictor:
+    rng = np.random.default_rng(3)
+    close = 2600.0 + np.cumsum(rng.normal(0, 0.5, 3000))
+    X = pd.DataFrame({name: close + rng.normal(0, 0.2, close.size) for name in FEATURES})
+    X['rsi'] = rng.uniform(20, 80, close.size)
+    X['atr'] = rng.uniform(0.5, 2.0, close.size)
+    X['momentum'] = np.r_[0.0, np.diff(close)]
+    X['tick_volume'] = rng.integers(50, 500, close.size)
+    y = pd.Series((np.r_[np.diff(close), 0.0] > 0).astype(int))
+
+    predictor = MLPredictor('XAUUSD', config)
+    predictor.feature_columns = FEATURES
+    predictor.train_models(X, y)
+    if not predictor.is_trained:
+        raise RuntimeError("model training failed")
+    return predictor
+
+
+def run(mode: str, predictor: MLPredictor, ticks, bar_seconds: float, min_strength: float) -> dict:
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update(CONFIG)
+    config.update({'enable_ml': True, 'ml_bar_seconds': bar_seconds if mode == 'gate + bar cache' else 0,
+                   'async_logging': False, 'tp_mode': 'RiskReward',
+                   'min_signal_strength': min_strength})
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', config, ml_predictor=predictor)
+    if mode == 'every pass':
+        engine._ml_can_change_outcome = lambda signal_type, strength: True
+
+    signals = 0
+    elapsed = 0.0
+    analyses = 0
+    for row in ticks:
+        engine.process_tick(aventa_hft_core.TickData(
+            timestamp=float(row['timestamp']), bid=float(row['bid']), ask=float(row['ask']),
+            last=float(row['last']), volume=int(row['volume']), spread=float(row['spread'])))
+        micro = engine.analyze_microstructure()
+        if not micro:
+            continue
+        analyses += 1
+        start = time.perf_counter()
+        signal = engine.generate_signal(micro)
+        elapsed += time.perf_counter() - start
+        if signal is not None:
+            signals += 1
+            # Track the would-be position so reversal (CLOSE) reachability is exercised too
+            engine.position_type = None if signal.signal_type == 'CLOSE' else signal.signal_type
+
+    stats = engine.get_ml_inference_stats()
+    return {'analyses': analyses, 'signals': signals, 'us_per_analysis': elapsed * 1000000 / max(1, analyses),
+            **stats}
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    bar_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 60.0
+    min_strength = float(sys.argv[3]) if len(sys.argv) > 3 else 0.6
+
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    aventa_hft_core.mt5 = stub
+    account_cache.mt5 = stub
+
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config['enable_ml'] = True
+    predictor = trained_predictor(config)
+    ticks = synthetic_ticks(n, seed=21)
+
+    print("=" * 96)
+    print("LAZY ML INFERENCE BENCHMARK")
+    print(f"{n} ticks (~{(ticks['timestamp'][-1] - ticks['timestamp'][0]) / 60:.0f} min), "
+          f"bar = {bar_seconds:.0f}s, min_signal_strength = {min_strength:.2f}, model: {predictor.training_stats.get('model_type')}")
+    print("=" * 96)
+    print(f"{'Mode':<18} | {'Analyses':>8} | {'Signals':>7} | {'Predicts':>8} | {'Skipped':>7} | "
+          f"{'Bar hits':>8} | {'predict us':>10} | {'signal us/analysis':>18}")
+    print("-" * 96)
+    for mode in ('every pass', 'gate', 'gate + bar cache'):
+        r = run(mode, predictor, ticks, bar_seconds, min_strength)
+        print(f"{mode:<18} | {r['analyses']:>8} | {r['signals']:>7} | {r['predictions_made']:>8} | "
+              f"{r['predictions_skipped']:>7} | {r['cache_hits']:>8} | {r['avg_predict_us']:>10.0f} | "
+              f"{r['us_per_analysis']:>18.1f}")
+    print("=" * 96)
@@ -0,0 +1,130 @@
+"""
+Multi-symbol benchmark
+CPU, thread count and tick-to-order latency of N separate engines (3 threads each)
+vs one MultiSymbolEngine (3 threads for all symbols)
+Runs the real engine threads against the replay terminal fed in real time (no terminal required)
+
+Usage: python bench_multi_symbol.py [symbols] [seconds_per_run] [ticks_per_second_per_symbol]
+"""
+
+import sys
+import time
+import threading
+from unittest.mock import MagicMock
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+logging.disable(logging.ERROR)
+
+import aventa_hft_core
+import symbol_specs
+from config_manager import ConfigManager
+from latency_histogram import LatencyHistogram
+from multi_symbol_engine import MultiSymbolEngine
+from tick_replay import MultiReplayMT5, patch_mt5, synthetic_ticks
+
+
+CONFIG = {
+    'max_spread': 0.5, 'max_volatility': 0.05, 'min_delta_threshold': 30, 'min_velocity_threshold': 0.001,
+    'trading_sessions_enabled': False, 'max_floating_loss': 500.0, 'max_floating_profit': 0,
+    'use_market_data_hub': False, 'record_ticks': False, 'min_trade_interval': 0.3,
+}
+
+
+def feed(terminal: MultiReplayMT5, streams: dict, stop: threading.Event):
+    """Publish every symbol's ticks on their own schedule, stamped with the wall clock"""
+    events = sorted((float(row['timestamp']) - float(ticks['timestamp'][0]), symbol, i)
+                    for symbol, ticks in streams.items() for i, row in enumerate(ticks))
+    start = time.time()
+    for offset, symbol, i in events:
+        delay = start + offset - time.time()
+        if delay > 0 and stop.wait(delay):
+            return
+        if stop.is_set():
+            return
+        row = streams[symbol][i]
+        terminal.set_tick(symbol, int(time.time() * 1000), float(row['bid']), float(row['ask']),
+                          float(row['last']), float(row['volume']))
+
+
+def merged(histograms) -> dict:
+    counts = [sum(c) for c in zip(*(h._counts for h in histograms))]
+    return LatencyHistogram.summarize(counts, sum(counts), sum(h.total_us for h in histograms))
+
+
+def run(shared: bool, symbols: int, duration: float, rate: float) -> dict:
+    names = [f"XAU{i:02d}" for i in range(symbols)]
+    streams = {name: synthetic_ticks(int(rate * (duration + 5)), seed=20 + i, mean_interval_ms=1000.0 / rate)
+               for i, name in enumerate(names)}
+    terminal = MultiReplayMT5(names, balance=100000.0 * symbols)
+    for name, ticks in streams.items():
+        first = ticks[0]
+        terminal.set_tick(name, int(time.time() * 1000), float(first['bid']), float(first['ask']),
+                          float(first['last']), float(first['volume']))
+    patch_mt5(terminal)
+
+    configs = {}
+    for i, name in enumerate(names):
+        config = dict(ConfigManager.DEFAULT_CONFIG)
+        config.update(CONFIG)
+        config['magic_number'] = 3000 + i
+        configs[name] = config
+
+    threads_before = threading.active_count()
+    if shared:
+        engine = MultiSymbolEngine(configs)
+        if not engine.start():
+            raise RuntimeError("multi-symbol engine failed to start against the replay terminal")
+        legs = list(engine.legs.values())
+    else:
+        legs = [aventa_hft_core.UltraLowLatencyEngine(name, config) for name, config in configs.items()]
+        for leg in legs:
+            if not leg.start():
+                raise RuntimeError("engine failed to start against the replay terminal")
+    engine_threads = threading.active_count() - threads_before
+
+    stop = threading.Event()
+    feeder = threading.Thread(target=feed, args=(terminal, streams, stop), daemon=True)
+    cpu_start = time.process_time()
+    feeder.start()
+    time.sleep(duration)
+    cpu = time.process_time() - cpu_start
+    stop.set()
+    feeder.join(timeout=5)
+    if shared:
+        engine.stop()
+    else:
+        for leg in legs:
+            leg.stop()
+    symbol_specs.get_symbol_spec_cache().invalidate()
+
+    return {
+        'threads': engine_threads,
+        'cpu_pct': cpu / duration * 100,
+        'tick_to_order': merged([leg.stage_latency['tick_to_order'] for leg in legs]),
+        'analyses': sum(leg.analysis_cache_misses for leg in legs),
+        'orders': terminal.call_counts['order_send'],
+    }
+
+
+if __name__ == "__main__":
+    symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    rate = float(sys.argv[3]) if len(sys.argv) > 3 else 20.0
+
+    print("=" * 88)
+    print("MULTI-SYMBOL ENGINE BENCHMARK")
+    print(f"{symbols} symbols, {duration:.1f}s per run, ~{rate:.0f} ticks/s per symbol, times in ms")
+    print("=" * 88)
+    print(f"{'Mode':<10} | {'Threads':>7} | {'CPU %':>6} | {'tick->order p50':>15} | {'p90':>7} | "
+          f"{'p99':>7} | {'Analyses':>8} | {'Orders':>6}")
+    print("-" * 88)
+    for shared in (False, True):
+        r = run(shared, symbols, duration, rate)
+        t2o = r['tick_to_order']
+        mode = "shared" if shared else "separate"
+        print(f"{mode:<10} | {r['threads']:>7} | {r['cpu_pct']:>6.1f} | {t2o['p50_us'] / 1000:>15.2f} | "
+              f"{t2o['p90_us'] / 1000:>7.2f} | {t2o['p99_us'] / 1000:>7.2f} | {r['analyses']:>8} | {r['orders']:>6}")
+    print("=" * 88)
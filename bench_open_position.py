@@ -0,0 +1,106 @@
+"""
+open_position pre-trade cost benchmark
+Terminal calls and wall time per open_position decision
+Runs against the replay terminal with a simulated per-call IPC cost (no terminal required)
+
+Usage: python bench_open_position.py [decisions] [call_cost_us]
+"""
+
+import sys
+import time
+from collections import Counter
+from unittest.mock import MagicMock
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+logging.disable(logging.ERROR)
+
+import aventa_hft_core
+from aventa_hft_core import Signal, UltraLowLatencyEngine
+from config_manager import ConfigManager
+from tick_replay import patch_mt5, ReplayMT5
+
+
+class CountingTerminal:
+    """Forwards to a ReplayMT5, counting every API call and spinning call_cost_us on each"""
+
+    def __init__(self, terminal: ReplayMT5, call_cost_us: float):
+        self._terminal = terminal
+        self._cost = call_cost_us / 1e6
+        self.calls = Counter()
+
+    def __getattr__(self, name):
+        attr = getattr(self._terminal, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self.calls[name] += 1
+            end = time.perf_counter() + self._cost
+            while time.perf_counter() < end:
+                pass
+            return attr(*args, **kwargs)
+        return call
+
+
+def run(decisions: int, call_cost_us: float) -> dict:
+    terminal = ReplayMT5('XAUUSD', balance=100000.0)
+    now_msc = int(time.time() * 1000)
+    terminal.set_tick(now_msc, 2600.00, 2600.20, 2600.10, 1)
+    counting = CountingTerminal(terminal, call_cost_us)
+    patch_mt5(counting)
+
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update({'max_floating_profit': 0, 'max_positions': 1000, 'max_position_size': 1000.0,
+                   'max_daily_volume': 1000.0, 'use_market_data_hub': False})
+    engine = UltraLowLatencyEngine('XAUUSD', config)
+    engine.initialize()
+    engine.process_tick(aventa_hft_core.TickData(timestamp=now_msc / 1000.0, bid=2600.00, ask=2600.20,
+                                                 last=2600.10, volume=1, spread=0.20))
+
+    walls = []
+    per_call = Counter()
+    opened = 0
+    for i in range(decisions):
+        # Decisions arrive no faster than min_trade_interval
+        time.sleep(engine.min_trade_interval + 0.05)
+        side = 'BUY' if i % 2 == 0 else 'SELL'
+        price = 2600.20 if side == 'BUY' else 2600.00
+        direction = 1 if side == 'BUY' else -1
+        signal = Signal(timestamp=time.time(), signal_type=side, strength=0.9, price=price,
+                        stop_loss=price - direction * 5.0, take_profit=price + direction * 5.0,
+                        volume=0.01, reason='bench')
+        before = Counter(counting.calls)
+        start = time.perf_counter()
+        opened += bool(engine.open_position(side, signal))
+        walls.append((time.perf_counter() - start) * 1e6)
+        per_call.update(counting.calls - before)
+
+    pre_trade = {name: n / decisions for name, n in sorted(per_call.items()) if name != 'order_send'}
+    return {
+        'opened': opened,
+        'calls_per_decision': sum(pre_trade.values()),
+        'breakdown': pre_trade,
+        'wall_us_mean': sum(walls) / len(walls),
+        'wall_us_max': max(walls),
+    }
+
+
+if __name__ == "__main__":
+    decisions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    call_cost_us = float(sys.argv[2]) if len(sys.argv) > 2 else 200.0
+
+    r = run(decisions, call_cost_us)
+    print("=" * 70)
+    print("OPEN_POSITION PRE-TRADE COST")
+    print(f"{decisions} decisions, {call_cost_us:.0f} us simulated cost per terminal call")
+    print("=" * 70)
+    print(f"Orders opened:               {r['opened']}/{decisions}")
+    print(f"Terminal calls per decision: {r['calls_per_decision']:.1f} (excluding order_send)")
+    for name, n in r['breakdown'].items():
+        print(f"  {name:<24} {n:.1f}")
+    print(f"Wall time per open_position: mean {r['wall_us_mean'] / 1000:.2f} ms, "
+          f"max {r['wall_us_max'] / 1000:.2f} ms")
+    print("=" * 70)
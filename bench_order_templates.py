@@ -0,0 +1,164 @@
+"""
+Order request template benchmark
+Time to prepare the order_send request at each call site (open_position, close_position,
+close_all_positions per position): the per-order dict built from config and the spec cache
+(as before) vs a copy of the pre-built template.  Order sending itself is not timed.
+Runs against the replay terminal (no terminal required)
+
+Usage: python bench_order_templates.py [orders]
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+logging.disable(logging.ERROR)
+
+import numpy as np
+
+import aventa_hft_core
+from config_manager import ConfigManager
+from tick_replay import patch_mt5, ReplayMT5
+
+mt5 = None
+
+
+def legacy_open(engine, order_type, signal):
+    """open_position's request preparation before templates"""
+    symbol_info = engine.symbol_specs.get(engine.symbol)
+    if symbol_info is None:
+        return None
+    filling_mode_str = engine.config.get('filling_mode', 'FOK')
+    filling_mode = engine.get_filling_mode(filling_mode_str)
+    return {
+        "action": mt5.TRADE_ACTION_DEAL,
+        "symbol": engine.symbol,
+        "volume": signal.volume,
+        "type": mt5.ORDER_TYPE_BUY if order_type == 'BUY' else mt5.ORDER_TYPE_SELL,
+        "price": signal.price,
+        "sl": signal.stop_loss,
+        "tp": signal.take_profit,
+        "deviation": engine.config.get('slippage', 20),
+        "magic": engine.config.get('magic_number', 2026002),
+        "comment": f"AvHFTPro2026_{order_type}",
+        "type_time": mt5.ORDER_TIME_GTC,
+        "type_filling": filling_mode,
+    }
+
+
+def legacy_close(engine, position, price):
+    """close_position's request preparation before templates"""
+    close_type = mt5.ORDER_TYPE_SELL if position.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY
+    filling_mode_str = engine.config.get('filling_mode', 'FOK')
+    filling_mode = engine.get_filling_mode(filling_mode_str)
+    return {
+        "action": mt5.TRADE_ACTION_DEAL,
+        "symbol": engine.symbol,
+        "volume": position.volume,
+        "type": close_type,
+        "position": position.ticket,
+        "price": price,
+        "deviation": engine.config.get('slippage', 20),
+        "magic": engine.config.get('magic_number', 2026002),
+        "comment": "AvHFTPro2026_CLOSE",
+        "type_time": mt5.ORDER_TIME_GTC,
+        "type_filling": filling_mode,
+    }
+
+
+def legacy_close_all(engine, positions, tick):
+    """close_all_positions' request preparation before templates (settings read once per call)"""
+    magic = engine.config.get('magic_number', 2026002)
+    filling_mode = engine.get_filling_mode(engine.config.get('filling_mode', 'FOK'))
+    deviation = engine.config.get('slippage', 20)
+    requests = []
+    for position in positions:
+        is_buy = position.type == mt5.ORDER_TYPE_BUY
+        requests.append({
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": engine.symbol,
+            "volume": position.volume,
+            "type": mt5.ORDER_TYPE_SELL if is_buy else mt5.ORDER_TYPE_BUY,
+            "position": position.ticket,
+            "price": tick.bid if is_buy else tick.ask,
+            "deviation": deviation,
+            "magic": magic,
+            "comment": "AvHFTPro2026_CLOSE",
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": filling_mode,
+        })
+    return requests
+
+
+def template_open(engine, order_type, signal):
+    templates = engine.get_order_templates()
+    if templates.spec is None:
+        return None
+    return templates.open_request(order_type, signal.volume, signal.price, signal.stop_loss, signal.take_profit)
+
+
+def template_close(engine, position, price):
+    return engine.get_order_templates().close_request(position.type, position.volume, position.ticket, price)
+
+
+def template_close_all(engine, positions, tick):
+    templates = engine.get_order_templates()
+    return [templates.close_request(p.type, p.volume, p.ticket, tick.bid if p.type == mt5.ORDER_TYPE_BUY else tick.ask)
+            for p in positions]
+
+
+def timed(fn, args, n, per=1):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1e6 / per)
+    return np.percentile(samples, 50), np.mean(samples)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    terminal = ReplayMT5('XAUUSD', balance=100000.0)
+    terminal.set_tick(int(time.time() * 1000), 2600.00, 2600.20, 2600.10, 1)
+    mt5 = terminal
+    patch_mt5(terminal)
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update({'use_market_data_hub': False, 'async_logging': False})
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', config)
+    engine.initialize()
+
+    signal = aventa_hft_core.Signal(timestamp=time.time(), signal_type='BUY', strength=0.9, price=2600.20,
+                                    stop_loss=2595.20, take_profit=2605.20, volume=0.01, reason='bench')
+    for i in range(5):
+        terminal.order_send({'type': i % 2, 'volume': 0.01, 'magic': config['magic_number']})
+    positions = terminal.positions_get(symbol='XAUUSD')
+    tick = terminal.tick
+    assert legacy_open(engine, 'BUY', signal) == template_open(engine, 'BUY', signal)
+    assert legacy_close(engine, positions[1], tick.ask) == template_close(engine, positions[1], tick.ask)
+    assert legacy_close_all(engine, positions, tick) == template_close_all(engine, positions, tick)
+
+    rows = [
+        ('open_position', (legacy_open, template_open), (engine, 'BUY', signal), 1),
+        ('close_position', (legacy_close, template_close), (engine, positions[0], tick.bid), 1),
+        (f'close_all (per pos, {len(positions)})', (legacy_close_all, template_close_all),
+         (engine, positions, tick), len(positions)),
+    ]
+    print("=" * 80)
+    print("ORDER REQUEST PREPARATION BENCHMARK")
+    print(f"{n} requests per call site, us per order (identical request dicts)")
+    print(f"order_check at template build: {terminal.call_counts['order_check']} calls, "
+          f"build {engine.order_templates.last_build_us:.0f} us, valid={engine.order_templates.valid}")
+    print("=" * 80)
+    print(f"{'Call site':<26} | {'legacy p50':>10} | {'template p50':>12} | {'saved p50':>9} | {'saved mean':>10}")
+    print("-" * 80)
+    for label, (legacy, template), args, per in rows:
+        legacy_p50, legacy_mean = timed(legacy, args, n, per)
+        template_p50, template_mean = timed(template, args, n, per)
+        print(f"{label:<26} | {legacy_p50:>10.2f} | {template_p50:>12.2f} | {legacy_p50 - template_p50:>9.2f} | "
+              f"{legacy_mean - template_mean:>10.2f}")
+    print("=" * 80)
@@ -0,0 +1,99 @@
+"""
+Position book benchmark
+Cost of the position reads made on every tick/decision (exists, floating loss/profit, volume, snapshot)
+with the book reconciled on every read (= one positions_get scan per read, as before) vs on its cadence
+Runs against the replay terminal with a simulated per-call IPC cost (no terminal required)
+
+Usage: python bench_position_book.py [ticks] [positions] [call_cost_us]
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+# Stand-in terminal before importing engine modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import logging
+logging.disable(logging.ERROR)
+
+import numpy as np
+
+import aventa_hft_core
+from bench_open_position import CountingTerminal
+from config_manager import ConfigManager
+from tick_replay import patch_mt5, ReplayMT5, synthetic_ticks
+
+
+def run(ticks, positions: int, call_cost_us: float, reconcile_interval: float) -> dict:
+    first = ticks[0]
+    terminal = ReplayMT5('XAUUSD', balance=100000.0)
+    terminal.set_tick(int(first['timestamp'] * 1000), float(first['bid']), float(first['ask']),
+                      float(first['last']), 1)
+    counting = CountingTerminal(terminal, call_cost_us)
+    patch_mt5(counting)
+
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update({'magic_number': 7, 'use_market_data_hub': False, 'async_logging': False,
+                   'position_reconcile_interval': reconcile_interval})
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', config)
+    engine.initialize()
+    for i in range(positions):
+        terminal.order_send({'type': terminal.ORDER_TYPE_BUY if i % 2 == 0 else terminal.ORDER_TYPE_SELL,
+                             'volume': 0.01, 'magic': 7 if i % 3 else 99})
+    engine.position_book.reconcile()
+
+    mark_us = []
+    read_us = []
+    drift = []
+    counting.calls.clear()
+    start_wall = time.perf_counter()
+    for row in ticks:
+        bid, ask = float(row['bid']), float(row['ask'])
+        terminal.set_tick(int(row['timestamp'] * 1000), bid, ask, float(row['last']), 1)
+        tick = aventa_hft_core.TickData(timestamp=float(row['timestamp']), bid=bid, ask=ask,
+                                        last=float(row['last']), volume=int(row['volume']), spread=ask - bid)
+        start = time.perf_counter()
+        engine.position_book.mark(bid, ask)
+        mid = time.perf_counter()
+        engine.verify_position_exists()
+        engine.get_total_floating_loss()
+        profit = engine.get_total_floating_profit()
+        engine.get_total_position_volume()
+        end = time.perf_counter()
+        mark_us.append((mid - start) * 1e6)
+        read_us.append((end - mid) * 1e6)
+        own = sum(p.profit for p in terminal.positions.values() if p.magic == 7)
+        drift.append(abs(profit + engine.config['commission_per_trade'] * engine.position_book.own_count - own))
+        engine.last_tick = tick
+    wall = time.perf_counter() - start_wall
+
+    return {
+        'mark_p50': np.percentile(mark_us, 50),
+        'read_p50': np.percentile(read_us, 50),
+        'read_p99': np.percentile(read_us, 99),
+        'positions_get_per_tick': counting.calls['positions_get'] / len(ticks),
+        'max_drift': max(drift),
+        'wall_s': wall,
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    positions = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    call_cost_us = float(sys.argv[3]) if len(sys.argv) > 3 else 200.0
+    ticks = synthetic_ticks(n, seed=4)
+
+    print("=" * 86)
+    print("POSITION BOOK BENCHMARK")
+    print(f"{n} ticks, {positions} open positions, {call_cost_us:.0f} us simulated cost per terminal call")
+    print("4 reads per tick: verify_position_exists, floating loss, floating profit, position volume (us)")
+    print("=" * 86)
+    print(f"{'Reconcile':<16} | {'mark p50':>8} | {'reads p50':>9} | {'reads p99':>9} | "
+          f"{'positions_get/tick':>18} | {'max drift $':>11}")
+    print("-" * 86)
+    for label, interval in (('every read', 0.0), ('every 1.0 s', 1.0)):
+        r = run(ticks, positions, call_cost_us, interval)
+        print(f"{label:<16} | {r['mark_p50']:>8.1f} | {r['read_p50']:>9.1f} | {r['read_p99']:>9.1f} | "
+              f"{r['positions_get_per_tick']:>18.3f} | {r['max_drift']:>11.4f}")
+    print("=" * 86)
@@ -67,8 +67,32 @@ class ConfigManager:
         'max_drawdown_pct': 10.0,
         
         # Performance
-        'tick_buffer_size': 1000,
+        'tick_buffer_size': 10000,  # Engine tick ring buffer (and hub buffer) capacity
         'analysis_interval': 0.1,
+        'tick_ingestion_mode': 'batch',  # 'batch' (copy_ticks_from cursor) or 'poll' (symbol_info_tick)
+        'tick_batch_size': 1000,
+        'streaming_indicators': True,  # O(1) incremental EMA/RSI/ATR/Momentum
+        'use_market_data_hub': True,   # Share one tick feed per symbol across bots
+        'record_ticks': False,         # Persist ingested ticks to memory-mapped day files
+        'tick_record_dir': 'tick_data',
+        'event_driven_pipeline': True, # Analysis wakes on new ticks, execution blocks on the queue
+        'analysis_min_spacing': 0.005, # Min seconds between analyses (CPU guard, event mode)
+        'value_area_pct': 0.70,        # Share of session volume inside the volume-profile value area
+        'deals_refresh_interval': 0.5, # Min seconds between incremental deal fetches for daily stats
+        'position_reconcile_interval': 1.0, # Max seconds the local position book goes without a terminal check
+        'order_check_templates': True, # order_check the prepared order requests at start and on config change
+        'adaptive_polling': True,      # Poll slower in dead markets and outside trading sessions
+        'poll_backoff_after': 1.0,     # Seconds without new ticks before tick polling backs off
+        'poll_backoff_max': 0.25,      # Slowest tick poll (seconds) while trading is allowed
+        'session_idle_poll': 1.0,      # Tick poll interval outside trading sessions with no open position
+        'notification_queue_size': 256,        # Pending Telegram notifications per engine
+        'notification_overflow': 'drop_oldest', # 'drop_oldest' or 'drop_newest' when the outbox is full
+        'notification_flush_timeout': 2.0,     # Seconds stop() waits for pending notifications
+        'engine_process': False,       # Run the bot's engine in its own worker process (own GIL)
+        'async_logging': True,         # Format and write log records on a background thread
+        'log_rate_limit_interval': 5.0, # Min seconds between repeats of a hot-path diagnostic line
+        'ml_bar_seconds': 60,          # ML prediction reused within one bar of this length (0 = every analysis)
+        'fused_analysis': True,        # Microstructure metrics + pre-ML signal in one Numba kernel call
     }
     
     def __init__(self, config_dir='configs'):
@@ -0,0 +1,126 @@
+"""
+Intraday Deals Ledger for Aventa HFT Pro 2026
+Running per-magic totals of today's deals, fed with only the deals not seen yet
+"""
+
+import MetaTrader5 as mt5
+from time import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+
+class DealsLedger:
+    """
+    Today's closed P&L, entries, entry volume and wins/losses for one magic number
+
+    Each refresh asks the terminal only for deals from the newest deal time
+    already seen (deal tickets at or below the last one are skipped), so the
+    cost is O(new deals) instead of a full-day scan.  The ledger resets when
+    the server day changes.  Server time is the terminal's epoch (tick and
+    deal ``time`` fields).
+    """
+
+    def __init__(self, magic: int, max_age: float = 0.5):
+        """
+        Initialize ledger
+
+        Args:
+            magic: Magic number whose deals are totalled
+            max_age: refresh() is a no-op if the last fetch is younger than this (seconds)
+        """
+        self.magic = magic
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.failed_fetches = 0
+        self.deals_processed = 0
+        self.reset(None)
+
+    def reset(self, day):
+        """Start a new server day"""
+        self.day = day
+        self.last_ticket = 0
+        self.last_time = 0
+        self.last_refresh = 0.0
+        self.synced = False
+        self.closed_pnl = 0.0
+        self.entries = 0
+        self.entry_volume = 0.0
+        self.wins = 0
+        self.losses = 0
+
+    def refresh(self, server_time: float, max_age: float = None) -> int:
+        """
+        Fetch and apply deals newer than the last one seen
+
+        Args:
+            server_time: Current server timestamp (seconds)
+            max_age: Override of the instance max_age (0 forces a fetch)
+
+        Returns:
+            Number of new deals applied
+        """
+        with self._lock:
+            day = int(server_time // SECONDS_PER_DAY)
+            if day != self.day:
+                self.reset(day)
+            elif time() - self.last_refresh < (self.max_age if max_age is None else max_age):
+                return 0
+
+            day_start = day * SECONDS_PER_DAY
+            date_from = max(self.last_time, day_start)
+            deals = mt5.history_deals_get(date_from, day_start + SECONDS_PER_DAY)
+            self.fetches += 1
+            self.last_refresh = time()
+            if deals is None:
+                self.failed_fetches += 1
+                return 0
+            self.synced = True
+            return self._apply(deals)
+
+    def _apply(self, deals) -> int:
+        seen_up_to = self.last_ticket
+        applied = 0
+        for d in deals:
+            if d.ticket <= seen_up_to:
+                continue
+            if d.ticket > self.last_ticket:
+                self.last_ticket = d.ticket
+            if d.time > self.last_time:
+                self.last_time = d.time
+            applied += 1
+            if d.magic != self.magic:
+                continue
+            self.closed_pnl += d.profit  # includes commission & swap
+            if d.entry == mt5.DEAL_ENTRY_IN:
+                self.entries += 1
+                self.entry_volume += d.volume
+            if d.profit > 0:
+                self.wins += 1
+            elif d.profit < 0:
+                self.losses += 1
+        self.deals_processed += applied
+        return applied
+
+    def get_stats(self) -> dict:
+        """Totals and fetch counters"""
+        return {
+            'day': self.day,
+            'closed_pnl': self.closed_pnl,
+            'entries': self.entries,
+            'entry_volume': self.entry_volume,
+            'wins': self.wins,
+            'losses': self.losses,
+            'fetches': self.fetches,
+            'failed_fetches': self.failed_fetches,
+            'deals_processed': self.deals_processed,
+            'last_ticket': self.last_ticket,
+        }
+
+    def __repr__(self):
+        return (f"DealsLedger(magic={self.magic}, day={self.day}, pnl={self.closed_pnl:.2f}, "
+                f"entries={self.entries}, volume={self.entry_volume:.2f})")
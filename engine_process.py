@@ -0,0 +1,253 @@
+"""
+Engine Process for Aventa HFT Pro 2026
+Hosts one UltraLowLatencyEngine in its own worker process (own interpreter, own GIL)
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import logging
+from queue import Empty
+from typing import Callable, Dict, Optional
+
+from latency_histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Engine methods the parent may call; everything else stays inside the worker
+COMMANDS = frozenset({
+    'initialize', 'start', 'stop', 'get_performance_snapshot', 'get_performance_stats',
+    'update_config', 'update_risk_limits', 'close_all_positions', 'get_analysis_cache_stats',
+})
+
+
+def _engine_worker(symbol: str, config: Dict, risk_manager, ml_predictor, notify: bool,
+                   commands, events, initializer: Optional[Callable], initargs: tuple):
+    """
+    Worker process main: build the engine, then serve commands until shutdown
+
+    Protocol (one request in flight per pipe):
+        parent -> worker: (seq, command, args, kwargs)
+        worker -> parent: (seq, 'ok', result) or (seq, 'error', message)
+    Status changes and notifications go out on the events queue as
+    ('status', dict) and ('notify', dict).
+    """
+    if initializer is not None:
+        initializer(*initargs)
+
+    from aventa_hft_core import UltraLowLatencyEngine
+
+    def post_status(state: str, **fields):
+        events.put(('status', {'state': state, 'pid': os.getpid(), 'time': time.time(), **fields}))
+
+    callback = (lambda **data: events.put(('notify', data))) if notify else None
+    try:
+        engine = UltraLowLatencyEngine(symbol, config, risk_manager, ml_predictor, telegram_callback=callback)
+    except Exception as e:
+        post_status('failed', error=f"{type(e).__name__}: {e}")
+        return
+    post_status('ready')
+
+    while True:
+        try:
+            seq, name, args, kwargs = commands.recv()
+        except (EOFError, OSError):
+            # Parent went away: leave positions open like a normal stop
+            break
+
+        if name == 'shutdown':
+            if engine.is_running:
+                engine.stop()
+            commands.send((seq, 'ok', None))
+            break
+
+        if name not in COMMANDS:
+            commands.send((seq, 'error', f"unknown command: {name}"))
+            continue
+
+        try:
+            result = getattr(engine, name)(*args, **kwargs)
+            reply = (seq, 'ok', result)
+        except Exception as e:
+            reply = (seq, 'error', f"{type(e).__name__}: {e}")
+        commands.send(reply)
+
+        if name in ('start', 'stop'):
+            post_status('running' if engine.is_running else 'stopped')
+
+    if engine.is_running:
+        engine.stop()
+    post_status('exited')
+
+
+class EngineProcess:
+    """
+    Drop-in stand-in for UltraLowLatencyEngine that runs the engine in a worker process
+
+    The GUI keeps calling initialize / start / stop / get_performance_snapshot
+    (and the other methods in COMMANDS); each call is forwarded over a pipe
+    and answered by the worker.  The risk manager and ML predictor are
+    pickled into the worker, so the worker owns copies of them: risk limit,
+    counter and circuit breaker edits must go through update_risk_limits()
+    to reach the copy the engine enforces.
+    Notifications raised in the worker are handed to ``telegram_callback``
+    on a listener thread in this process.
+
+    The engine's data, analysis and execution threads therefore no longer
+    share the GIL with the GUI, the Telegram loop, backtests or other bots.
+    """
+
+    def __init__(self, symbol: str, config: Dict, risk_manager=None, ml_predictor=None,
+                 telegram_callback: Optional[Callable] = None, call_timeout: float = 15.0,
+                 startup_timeout: float = 120.0, start_method: str = 'spawn', initializer: Optional[Callable] = None, initargs: tuple = ()):
+        """
+        Start the worker process
+
+        Args:
+            symbol: Trading symbol
+            config: Engine config (copied into the worker)
+            risk_manager: Risk manager (a copy runs in the worker)
+            ml_predictor: ML predictor (a copy runs in the worker)
+            telegram_callback: Called here as callback(**data) for worker notifications
+            call_timeout: Seconds to wait for a command reply
+            startup_timeout: Seconds to wait for initialize/start (worker imports, JIT warmup, MT5 login)
+            start_method: multiprocessing start method ('spawn' matches Windows)
+            initializer: Called as initializer(*initargs) in the worker before the engine is built
+        """
+        self.symbol = symbol
+        self.config = config
+        self.telegram_callback = telegram_callback
+        self.call_timeout = call_timeout
+        self.startup_timeout = startup_timeout
+        self.is_running = False
+        self.status: Dict = {'state': 'starting'}
+        self.call_latency = LatencyHistogram()
+
+        context = multiprocessing.get_context(start_method)
+        self._conn, worker_conn = context.Pipe()
+        self._events = context.Queue()
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._process = context.Process(
+            target=_engine_worker,
+            args=(symbol, dict(config), risk_manager, ml_predictor, telegram_callback is not None,
+                  worker_conn, self._events, initializer, initargs),
+            name=f"Engine-{symbol}",
+            daemon=True,
+        )
+        self._process.start()
+        worker_conn.close()
+
+        self._listening = True
+        self._listener = threading.Thread(target=self._listen, daemon=True, name=f"EngineEvents-{symbol}")
+        self._listener.start()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process.is_alive()
+
+    def _listen(self):
+        """Apply status updates and deliver notifications from the worker"""
+        while self._listening or not self._events.empty():
+            try:
+                kind, data = self._events.get(timeout=0.5)
+            except Empty:
+                if not self._process.is_alive() and self._events.empty():
+                    break
+                continue
+            except (EOFError, OSError):
+                break
+
+            if kind == 'status':
+                self.status = data
+                if data['state'] == 'failed':
+                    logger.error(f"Engine process {self.symbol} failed: {data.get('error')}")
+            elif kind == 'notify' and self.telegram_callback:
+                try:
+                    self.telegram_callback(**data)
+                except Exception as e:
+                    logger.error(f"Notification callback error: {e}")
+
+    def call(self, command: str, *args, timeout: Optional[float] = None, **kwargs):
+        """Run an engine method in the worker and return its result"""
+        if not self._process.is_alive():
+            raise RuntimeError(f"engine process {self.symbol} is not running")
+        timeout = self.call_timeout if timeout is None else timeout
+        with self._lock:
+            self._seq += 1
+            start = time.perf_counter()
+            deadline = start + timeout
+            self._conn.send((self._seq, command, args, kwargs))
+            while True:
+                if not self._conn.poll(max(0.0, deadline - time.perf_counter())):
+                    raise TimeoutError(f"engine process {self.symbol}: no reply to {command} within {timeout}s")
+                seq, status, result = self._conn.recv()
+                if seq == self._seq:
+                    break
+                # Late reply to a call that already timed out
+            self.call_latency.record((time.perf_counter() - start) * 1000000)
+        if status == 'error':
+            raise RuntimeError(result)
+        return result
+
+    # --- UltraLowLatencyEngine API ---
+
+    def initialize(self) -> bool:
+        try:
+            return bool(self.call('initialize', timeout=self.startup_timeout))
+        except Exception as e:
+            logger.error(f"Engine process {self.symbol} initialize failed: {e}")
+            return False
+
+    def start(self) -> bool:
+        started = self.call('start', timeout=self.startup_timeout)
+        self.is_running = started is not False
+        return self.is_running
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the engine (positions stay open) and end the worker process"""
+        self.is_running = False
+        if self._process.is_alive():
+            try:
+                self.call('shutdown', timeout=timeout)
+            except Exception as e:
+                logger.warning(f"Engine process {self.symbol} did not shut down cleanly: {e}")
+        self._process.join(timeout)
+        if self._process.is_alive():
+            logger.warning(f"Engine process {self.symbol} still alive, terminating")
+            self._process.terminate()
+            self._process.join(timeout)
+        self._listening = False
+        self._listener.join(timeout)
+        self._conn.close()
+
+    def update_config(self, changes: Dict):
+        self.call('update_config', changes)
+        self.config.update(changes)
+
+    def update_risk_limits(self, changes: Dict) -> Dict:
+        return self.call('update_risk_limits', changes)
+
+    def get_performance_snapshot(self) -> Optional[Dict]:
+        try:
+            return self.call('get_performance_snapshot')
+        except Exception as e:
+            logger.error(f"Engine process {self.symbol} snapshot failed: {e}")
+            return None
+
+    def get_performance_stats(self) -> Dict:
+        return self.call('get_performance_stats')
+
+    def close_all_positions(self, reason: str = "Target reached") -> int:
+        return self.call('close_all_positions', reason=reason)
+
+    def get_analysis_cache_stats(self) -> Dict:
+        return self.call('get_analysis_cache_stats')
+
+    def __repr__(self):
+        return f"EngineProcess(symbol={self.symbol}, pid={self.pid}, state={self.status.get('state')})"
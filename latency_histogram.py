@@ -0,0 +1,183 @@
+"""
+Latency Histograms for Aventa HFT Pro 2026
+Fixed-memory, log-bucketed per-stage latency tracking with per-reader windows
+"""
+
+import threading
+from typing import Dict, List
+
+
+# Stages recorded by UltraLowLatencyEngine (others are created on first use)
+ENGINE_STAGES = (
+    'tick_fetch',          # terminal tick retrieval (per poll / batch)
+    'orderflow_update',    # buffer append + order flow per tick
+    'microstructure',      # analyze_microstructure
+    'signal_generation',   # generate_signal
+    'ml_predict',          # ML feature prep + predict
+    'queue_wait',          # signal queued -> picked up by execution thread
+    'order_send',          # mt5.order_send round-trip
+    'execution',           # execute_signal total
+    'tick_to_order',       # newest tick ingested -> order filled
+    'trading_snapshot',    # pre-trade positions/account/deals fetch
+    'close_all',           # close_all_positions wall time (all closes sent)
+)
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of latencies in microseconds
+
+    Values are quantized to 1/16 us and bucketed with 16 linear sub-buckets
+    per power of two, so every bucket is within 6.25% of its values and
+    512 buckets span 1/16 us to well over a minute.  ``record`` is a few
+    integer operations and a list increment.
+
+    Counts are cumulative and never reset by writers: each reader keeps its
+    own copy of the counts it last saw, so several consumers (GUI snapshot,
+    stats, telemetry) each get their own reset-on-read window.
+    """
+
+    SUB_BITS = 4
+    SUB_BUCKETS = 1 << SUB_BITS
+    UNITS_PER_US = 16.0
+    NUM_BUCKETS = 512
+
+    def __init__(self):
+        self._counts: List[int] = [0] * self.NUM_BUCKETS
+        self.total_us = 0.0
+        self._readers: Dict[str, tuple] = {}
+        self._read_lock = threading.Lock()
+
+    def record(self, value_us: float):
+        """Add one sample (microseconds)"""
+        n = int(value_us * 16.0)
+        if n < 16:
+            index = n if n > 0 else 0
+        else:
+            shift = n.bit_length() - 5
+            index = (shift << 4) + (n >> shift)
+            if index > 511:
+                index = 511
+        self._counts[index] += 1
+        self.total_us += value_us
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @classmethod
+    def bucket_bounds(cls, index: int) -> tuple:
+        """(low, high) microsecond range covered by a bucket"""
+        if index < cls.SUB_BUCKETS:
+            return index / cls.UNITS_PER_US, (index + 1) / cls.UNITS_PER_US
+        shift = (index >> cls.SUB_BITS) - 1
+        mantissa = (index & (cls.SUB_BUCKETS - 1)) | cls.SUB_BUCKETS
+        return (mantissa << shift) / cls.UNITS_PER_US, ((mantissa + 1) << shift) / cls.UNITS_PER_US
+
+    @classmethod
+    def summarize(cls, counts: List[int], count: int, total_us: float) -> dict:
+        """Count, mean, min/max (bucket edges) and percentiles (bucket midpoints) from bucket counts"""
+        stats = {'count': count, 'mean_us': total_us / count if count else 0.0, 'min_us': 0.0,
+                 'p50_us': 0.0, 'p90_us': 0.0, 'p99_us': 0.0, 'p999_us': 0.0, 'max_us': 0.0}
+        if count <= 0:
+            return stats
+
+        targets = [('p50_us', 0.50), ('p90_us', 0.90), ('p99_us', 0.99), ('p999_us', 0.999)]
+        seen = 0
+        t = 0
+        for index, c in enumerate(counts):
+            if not c:
+                continue
+            low, high = cls.bucket_bounds(index)
+            if not seen:
+                stats['min_us'] = low
+            seen += c
+            while t < len(targets) and seen >= targets[t][1] * count:
+                stats[targets[t][0]] = (low + high) / 2
+                t += 1
+            stats['max_us'] = high
+        return stats
+
+    def snapshot(self) -> dict:
+        """Lifetime statistics (does not affect reader windows)"""
+        counts = list(self._counts)
+        return self.summarize(counts, sum(counts), self.total_us)
+
+    def read_window(self, reader: str = 'default') -> dict:
+        """Statistics for the samples recorded since this reader's previous call"""
+        with self._read_lock:
+            counts = list(self._counts)
+            total = self.total_us
+            previous = self._readers.get(reader)
+            self._readers[reader] = (counts, total)
+        if previous is not None:
+            prev_counts, prev_total = previous
+            counts = [c - p for c, p in zip(counts, prev_counts)]
+            total -= prev_total
+        return self.summarize(counts, sum(counts), total)
+
+    def reset(self):
+        """Drop all samples and reader windows"""
+        with self._read_lock:
+            self._counts = [0] * self.NUM_BUCKETS
+            self.total_us = 0.0
+            self._readers.clear()
+
+
+class LatencyTracker:
+    """Named per-stage histograms"""
+
+    def __init__(self, stages=ENGINE_STAGES):
+        self.histograms: Dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in stages}
+
+    def __getitem__(self, stage: str) -> LatencyHistogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        return histogram
+
+    def record(self, stage: str, value_us: float):
+        """Add one sample for a stage (microseconds)"""
+        self[stage].record(value_us)
+
+    def read_window(self, reader: str = 'default') -> Dict[str, dict]:
+        """Per-stage statistics since this reader's previous call"""
+        return {stage: h.read_window(reader) for stage, h in list(self.histograms.items())}
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Per-stage lifetime statistics"""
+        return {stage: h.snapshot() for stage, h in list(self.histograms.items())}
+
+    def reset(self):
+        for histogram in list(self.histograms.values()):
+            histogram.reset()
+
+
+if __name__ == "__main__":
+    import time
+    import numpy as np
+
+    samples = np.random.default_rng(0).lognormal(3.0, 1.0, 1_000_000).tolist()
+    histogram = LatencyHistogram()
+    record = histogram.record
+
+    start = time.perf_counter()
+    for value in samples:
+        record(value)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for value in samples:
+        pass
+    loop_only = time.perf_counter() - start
+
+    stats = histogram.snapshot()
+    exact = np.percentile(samples, [50, 90, 99, 99.9])
+    print("=" * 60)
+    print("LATENCY HISTOGRAM BENCHMARK (1M samples)")
+    print("=" * 60)
+    print(f"record(): {(elapsed - loop_only) / len(samples) * 1e9:.0f} ns/sample (loop overhead excluded)")
+    for key, value in zip(('p50_us', 'p90_us', 'p99_us', 'p999_us'), exact):
+        print(f"  {key:<8} histogram={stats[key]:>9.2f}  exact={value:>9.2f}  "
+              f"err={abs(stats[key] - value) / value * 100:.1f}%")
+    print(f"Memory: {LatencyHistogram.NUM_BUCKETS} buckets per stage")
@@ -0,0 +1,301 @@
+"""
+Market Data Hub for Aventa HFT Pro 2026
+One tick ingestion thread per symbol, shared by every bot trading that symbol
+"""
+
+import threading
+from time import sleep
+from typing import Dict
+import logging
+
+from adaptive_polling import ACTIVE, AdaptivePoller
+from tick_ingestion import TickIngestor
+from tick_ring_buffer import TickRingBuffer, OrderFlowRingBuffer, ticks_from_mt5
+from order_flow import compute_order_flow
+from tick_recorder import TickRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class HubSubscription:
+    """
+    Per-subscriber cursor into a hub's shared tick buffer
+
+    The buffers themselves are shared and read-only for subscribers; each
+    subscription only remembers the sequence number it has consumed up to.
+    """
+
+    def __init__(self, hub: 'MarketDataHub', name: str, cursor: int):
+        self.hub = hub
+        self.name = name
+        self.cursor = cursor
+        self.ticks_read = 0
+        self.ticks_lost = 0
+        # Seconds until this subscriber trades again (set by its engine outside trading sessions)
+        self.idle_seconds = 0.0
+        self._event = threading.Event()
+
+    def read_new(self):
+        """
+        Consume ticks published since the last call
+
+        Returns:
+            (start_seq, records) - read-only view of new tick records and the
+            sequence number of the first one
+        """
+        self._event.clear()
+        buffer = self.hub.tick_buffer
+        end = buffer.total_written
+        start = max(self.cursor, end - buffer.capacity)
+        if start > self.cursor:
+            # Subscriber fell behind by more than the buffer holds
+            self.ticks_lost += start - self.cursor
+        records = buffer.range(start, end)
+        self.cursor = end
+        self.ticks_read += len(records)
+        return start, records
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the hub publishes new ticks (or timeout). Returns True if notified"""
+        return self._event.wait(timeout)
+
+    @property
+    def lag(self) -> int:
+        """Ticks published but not yet consumed"""
+        return self.hub.tick_buffer.total_written - self.cursor
+
+    def _notify(self):
+        self._event.set()
+
+    def close(self):
+        """Unsubscribe from the hub"""
+        self.hub.unsubscribe(self)
+
+    def __repr__(self):
+        return f"HubSubscription({self.hub.symbol}:{self.name}, cursor={self.cursor}, lag={self.lag})"
+
+
+class MarketDataHub:
+    """
+    Ingests ticks for one symbol once and fans them out to subscribed engines
+
+    The hub owns the only data thread for the symbol: it pulls new ticks
+    with a TickIngestor, computes order flow once per batch, and appends both to
+    shared ring buffers.  Engines subscribe and read from those buffers
+    through their own cursor instead of polling the terminal themselves.
+    The thread starts with the first subscriber and stops with the last; a
+    hub stopped that way is out of the registry and refuses new subscribers
+    (use subscribe_market_data_hub to get a live one).
+    Between fetches it backs off while no ticks arrive and naps while every
+    subscriber is outside its trading sessions (AdaptivePoller).
+    """
+
+    def __init__(self, symbol: str, batch_size: int = 1000, tick_capacity: int = 10000,
+                 orderflow_capacity: int = 5000, poll_interval: float = 0.001,
+                 autostart: bool = True, adaptive_polling: bool = True, backoff_after: float = 1.0,
+                 backoff_max: float = 0.25, idle_interval: float = 1.0):
+        """
+        Initialize hub
+
+        Args:
+            symbol: Symbol to ingest
+            batch_size: Maximum ticks per copy_ticks_from call
+            tick_capacity: Shared tick buffer size
+            orderflow_capacity: Shared order flow buffer size
+            poll_interval: Sleep between fetches when no tick arrived (seconds)
+            autostart: Start the ingestion thread with the first subscriber
+                (False: caller drives ingest_once(), e.g. replay and tests)
+            adaptive_polling: False keeps polling every poll_interval around the clock
+            backoff_after: Seconds without ticks before polling slows down
+            backoff_max: Slowest poll while any subscriber may trade
+            idle_interval: Poll interval while all subscribers are outside their sessions
+        """
+        self.symbol = symbol
+        self.poll_interval = poll_interval
+        self.poller = AdaptivePoller(min_interval=poll_interval, max_interval=backoff_max,
+                                     backoff_after=backoff_after, idle_interval=idle_interval,
+                                     session_wait=self._session_wait, adaptive=adaptive_polling)
+        self.autostart = autostart
+        self.ingestor = TickIngestor(symbol, batch_size=batch_size)
+        self.tick_buffer = TickRingBuffer(tick_capacity)
+        self.orderflow_buffer = OrderFlowRingBuffer(orderflow_capacity)
+
+        # Order flow state (computed once for all subscribers)
+        self.last_tick = None
+        self.cumulative_delta = 0.0
+
+        # Optional on-disk recorder (enabled by the first engine that asks for it)
+        self.recorder = None
+        
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self.is_running = False
+        self.is_stopping = False
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def subscribe(self, name: str) -> HubSubscription:
+        """Subscribe a consumer; starts the ingestion thread if needed"""
+        with self._lock:
+            if self.is_stopping:
+                raise RuntimeError(f"Hub {self.symbol} is stopping; get a new one from the registry")
+            subscription = HubSubscription(self, name, self.tick_buffer.total_written)
+            self._subscriptions = self._subscriptions + [subscription]
+            if self.autostart and not self.is_running:
+                self._start()
+        logger.info(f"📡 Hub {self.symbol}: {name} subscribed ({len(self._subscriptions)} subscriber(s))")
+        return subscription
+
+    def unsubscribe(self, subscription: HubSubscription):
+        """Remove a consumer; stops the hub when none are left"""
+        # Registry lock first: the last unsubscribe drops the hub from the
+        # registry before anyone can look it up and subscribe to it again
+        with _hubs_lock, self._lock:
+            if subscription not in self._subscriptions:
+                return
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+            remaining = len(self._subscriptions)
+            if remaining == 0:
+                self.is_stopping = True
+                if _hubs.get(self.symbol) is self:
+                    del _hubs[self.symbol]
+        logger.info(f"📡 Hub {self.symbol}: {subscription.name} unsubscribed ({remaining} left)")
+        if remaining == 0:
+            self.stop()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def _session_wait(self) -> float:
+        """Seconds until the first subscriber trades again (0 if any trades now)"""
+        return min((s.idle_seconds for s in self._subscriptions), default=0.0)
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def _start(self):
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"MarketDataHub-{self.symbol}")
+        self._thread.start()
+
+    def stop(self):
+        """Stop the ingestion thread (and the recorder, if any)"""
+        with self._lock:
+            self.is_running = False
+            thread = self._thread
+            self._thread = None
+        self.poller.wake()
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        if self.recorder is not None:
+            self.recorder.stop()
+            self.recorder = None
+
+    def enable_recording(self, point: float, root_dir: str = 'tick_data'):
+        """Record every ingested tick to disk (idempotent)"""
+        with self._lock:
+            if self.recorder is None:
+                self.recorder = TickRecorder(self.symbol, point, root_dir=root_dir)
+                self.recorder.start()
+
+    def _run(self):
+        logger.info(f"Hub {self.symbol}: thread pengambilan data mulai jalan!")
+        poller = self.poller
+        while self.is_running:
+            try:
+                published = self.ingest_once()
+                if published and poller.mode == ACTIVE:
+                    # Straight back for the rest of a burst
+                    poller.next_delay(True)
+                else:
+                    poller.sleep(published > 0)
+            except Exception as e:
+                logger.error(f"Hub {self.symbol} data collection error: {e}")
+                sleep(0.1)
+
+    def ingest_once(self) -> int:
+        """Fetch new ticks, publish them and wake subscribers. Returns ticks published"""
+        from aventa_hft_core import TickData
+
+        rows = self.ingestor.fetch()
+        if len(rows) == 0:
+            return 0
+
+        # Whole batch at once: tick records, then vectorized order flow
+        ticks = ticks_from_mt5(rows)
+        prev_last = self.last_tick.last if self.last_tick is not None else None
+        orderflow, self.cumulative_delta = compute_order_flow(ticks, prev_last, self.cumulative_delta)
+        newest = ticks[-1]
+        self.last_tick = TickData(
+            timestamp=float(newest['timestamp']),
+            bid=float(newest['bid']),
+            ask=float(newest['ask']),
+            last=float(newest['last']),
+            volume=int(newest['volume']),
+            spread=float(newest['spread'])
+        )
+        self.tick_buffer.append_many(ticks)
+        self.orderflow_buffer.append_many(orderflow)
+
+        if self.recorder is not None:
+            self.recorder.record(rows)
+
+        for subscription in self._subscriptions:
+            subscription._notify()
+        return len(rows)
+
+    def get_stats(self) -> dict:
+        """Get hub statistics"""
+        stats = self.ingestor.get_stats()
+        stats.update({
+            'symbol': self.symbol,
+            'subscribers': self.subscriber_count,
+            'buffer_bytes': self.tick_buffer.nbytes + self.orderflow_buffer.nbytes,
+            'max_subscriber_lag': max((s.lag for s in self._subscriptions), default=0),
+            'ticks_lost': sum(s.ticks_lost for s in self._subscriptions),
+            'ticks_recorded': self.recorder.ticks_recorded if self.recorder else 0,
+            'polling': self.poller.get_stats(),
+        })
+        return stats
+
+    def __repr__(self):
+        return f"MarketDataHub({self.symbol}, subscribers={self.subscriber_count}, running={self.is_running})"
+
+
+# Process-wide registry: one hub per symbol
+_hubs: Dict[str, MarketDataHub] = {}
+_hubs_lock = threading.Lock()
+
+
+def get_market_data_hub(symbol: str, **kwargs) -> MarketDataHub:
+    """Get (or create) the process-wide hub for symbol. kwargs apply on creation only"""
+    with _hubs_lock:
+        return _registered_hub(symbol, kwargs)
+
+
+def _registered_hub(symbol: str, kwargs: dict) -> MarketDataHub:
+    """Registry entry for symbol, created on first use (caller holds _hubs_lock)"""
+    hub = _hubs.get(symbol)
+    if hub is None:
+        hub = MarketDataHub(symbol, **kwargs)
+        _hubs[symbol] = hub
+    return hub
+
+
+def subscribe_market_data_hub(symbol: str, name: str, **kwargs):
+    """Subscribe name to the live hub for symbol. Returns (hub, subscription)"""
+    with _hubs_lock:
+        hub = _registered_hub(symbol, kwargs)
+        return hub, hub.subscribe(name)
+
+
+def get_all_hub_stats() -> Dict[str, dict]:
+    """Statistics for every active hub"""
+    with _hubs_lock:
+        hubs = list(_hubs.values())
+    return {hub.symbol: hub.get_stats() for hub in hubs}
@@ -11,12 +11,14 @@ from sklearn.model_selection import train_test_split
 import joblib
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Tuple, Optional
 from collections import deque
 import MetaTrader5 as mt5
 import os
 import pickle
 
+from symbol_specs import get_symbol_spec
+
 logger = logging.getLogger(__name__)
 
 
@@ -76,38 +78,50 @@ class FeatureEngineering:
         return true_range.rolling(window=period).mean()
     
     @staticmethod
-    def calculate_orderflow_features(orderflow_data: List) -> Dict:
-        """Calculate order flow based features"""
+    def calculate_orderflow_features(orderflow_data) -> Dict:
+        """Calculate order flow based features (list of OrderFlowData or OrderFlowRingBuffer)"""
         if len(orderflow_data) < 10:
             return {}
         
-        deltas = [d.delta for d in orderflow_data[-100:]]
-        cumul_deltas = [d.cumulative_delta for d in orderflow_data[-100:]]
-        imbalances = [d.imbalance_ratio for d in orderflow_data[-100:]]
+        if hasattr(orderflow_data, 'last_n'):
+            window = orderflow_data.last_n(100)
+            deltas = window['delta']
+            cumul_deltas = window['cumulative_delta']
+            imbalances = window['imbalance_ratio']
+        else:
+            deltas = [d.delta for d in orderflow_data[-100:]]
+            cumul_deltas = [d.cumulative_delta for d in orderflow_data[-100:]]
+            imbalances = [d.imbalance_ratio for d in orderflow_data[-100:]]
         
         features = {
             'delta_mean': np.mean(deltas),
             'delta_std': np.std(deltas),
             'delta_sum': np.sum(deltas),
-            'cumul_delta_last': cumul_deltas[-1] if cumul_deltas else 0,
+            'cumul_delta_last': cumul_deltas[-1] if len(cumul_deltas) > 0 else 0,
             'cumul_delta_change': cumul_deltas[-1] - cumul_deltas[0] if len(cumul_deltas) > 1 else 0,
             'imbalance_mean': np.mean(imbalances),
             'imbalance_std': np.std(imbalances),
-            'positive_delta_count': sum(1 for d in deltas if d > 0),
-            'negative_delta_count': sum(1 for d in deltas if d < 0),
+            'positive_delta_count': int(np.count_nonzero(np.asarray(deltas) > 0)),
+            'negative_delta_count': int(np.count_nonzero(np.asarray(deltas) < 0)),
         }
         
         return features
     
     @staticmethod
-    def calculate_microstructure_features(tick_data: List) -> Dict:
-        """Calculate market microstructure features"""
+    def calculate_microstructure_features(tick_data) -> Dict:
+        """Calculate market microstructure features (list of TickData or TickRingBuffer)"""
         if len(tick_data) < 10:
             return {}
         
-        spreads = [t.spread for t in tick_data[-100:]]
-        mid_prices = [t.mid_price for t in tick_data[-100:]]
-        volumes = [t.volume for t in tick_data[-100:]]
+        if hasattr(tick_data, 'last_n'):
+            window = tick_data.last_n(100)
+            spreads = window['spread']
+            mid_prices = window['mid']
+            volumes = window['volume']
+        else:
+            spreads = [t.spread for t in tick_data[-100:]]
+            mid_prices = [t.mid_price for t in tick_data[-100:]]
+            volumes = [t.volume for t in tick_data[-100:]]
         
         # Price impact
         price_changes = np.diff(mid_prices)
@@ -118,7 +132,7 @@ class FeatureEngineering:
             'spread_min': np.min(spreads),
             'spread_max': np.max(spreads),
             'price_volatility': np.std(price_changes) if len(price_changes) > 0 else 0,
-            'price_range': max(mid_prices) - min(mid_prices),
+            'price_range': np.max(mid_prices) - np.min(mid_prices),
             'volume_mean': np.mean(volumes),
             'volume_std': np.std(volumes),
             'tick_frequency': len(tick_data) / 60.0,  # ticks per minute
@@ -136,7 +150,7 @@ class MLPredictor:
                 if not mt5.initialize():
                     return False
                 # Check if we can get symbol info
-                symbol_info = mt5.symbol_info(self.symbol)
+                symbol_info = get_symbol_spec(self.symbol)
                 if symbol_info is None:
                     return False
                 # For training purposes, we consider market "open" if symbol exists
@@ -0,0 +1,460 @@
+"""
+Multi-Symbol Engine for Aventa HFT Pro 2026
+One data, one analysis and one execution thread for a list of symbols
+"""
+
+import MetaTrader5 as mt5
+import numpy as np
+import time
+import threading
+import logging
+from queue import Queue, Empty, Full
+from typing import Dict, List, Optional, Tuple
+
+from aventa_hft_core import UltraLowLatencyEngine, Signal, FAST_INDICATORS_AVAILABLE
+from latency_histogram import LatencyTracker
+from tick_ring_buffer import ticks_from_mt5
+
+if FAST_INDICATORS_AVAILABLE:
+    from fast_indicators import indicators_last_2d
+
+logger = logging.getLogger(__name__)
+
+# Same windows as UltraLowLatencyEngine._compute_microstructure
+ANALYSIS_WINDOW = 100
+ORDERFLOW_WINDOW = 50
+
+
+def vector_features(ticks: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Spread, momentum and volatility features for every row of a (symbols x window) tick stack
+
+    Row i equals what UltraLowLatencyEngine computes from that symbol's last ``window`` ticks.
+    """
+    spreads = ticks['spread']
+    prices = ticks['mid']
+    price_change = prices[:, -1] - prices[:, 0]
+    return {
+        'avg_spread': spreads.mean(axis=1),
+        'spread_volatility': spreads.std(axis=1),
+        'price_velocity': price_change / prices.shape[1],
+        'price_change': price_change,
+        'volatility': np.diff(prices, axis=1).std(axis=1),
+    }
+
+
+def order_flow_features(flows: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """(avg_delta, cumulative_delta) per symbol from each symbol's last order-flow records"""
+    count = len(flows)
+    avg_delta = np.zeros(count)
+    cumulative = np.zeros(count)
+    full = [i for i, flow in enumerate(flows) if len(flow) == ORDERFLOW_WINDOW]
+    if full:
+        stacked = np.stack([flows[i] for i in full])
+        avg_delta[full] = stacked['delta'].mean(axis=1)
+        cumulative[full] = stacked['cumulative_delta'][:, -1]
+    for i, flow in enumerate(flows):
+        if 0 < len(flow) < ORDERFLOW_WINDOW:
+            avg_delta[i] = flow['delta'].mean()
+            cumulative[i] = flow['cumulative_delta'][-1]
+    return avg_delta, cumulative
+
+
+def prescreen_signals(features: Dict[str, np.ndarray], indicators: np.ndarray, price: np.ndarray,
+                      params: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    generate_signal's technical rules as array expressions
+
+    Args:
+        features: per-symbol avg_spread, cumulative_delta, price_velocity, volatility
+        indicators: (symbols x 5) ema_fast, ema_slow, rsi, atr, momentum
+        price: per-symbol mid price of the newest tick
+        params: per-symbol thresholds (see MultiSymbolEngine._leg_params)
+
+    Returns:
+        (direction, strength, spread_ok): direction is +1 BUY, -1 SELL, 0 none
+    """
+    ema_f, ema_s, rsi, momentum = indicators[:, 0], indicators[:, 1], indicators[:, 2], indicators[:, 4]
+    delta = features['cumulative_delta']
+    velocity = features['price_velocity']
+    valid = ~(np.isnan(ema_f) | np.isnan(ema_s) | np.isnan(rsi) | np.isnan(momentum))
+
+    delta_up = delta > params['min_delta']
+    delta_down = ~delta_up & (delta < -params['min_delta'])
+    flow_buy = delta_up & valid & (price > ema_f) & (ema_f > ema_s) & (rsi < params['rsi_overbought']) & (momentum > 0)
+    flow_sell = delta_down & valid & (price < ema_f) & (ema_f < ema_s) & (rsi > params['rsi_oversold']) & (momentum < 0)
+
+    direction = np.where(flow_buy, 1, np.where(flow_sell, -1, 0))
+    strength = np.zeros(len(direction))
+    strength += np.where(flow_buy | flow_sell, 0.4, 0.0)
+
+    vel_up = velocity > params['min_velocity']
+    vel_down = ~vel_up & (velocity < -params['min_velocity'])
+    vel_direction = np.where(vel_up, 1, np.where(vel_down, -1, 0))
+    strength += np.where(vel_direction != 0, 0.3, 0.0)
+    strength += np.where((direction != 0) & (direction == vel_direction), 0.1, 0.0)
+    direction = np.where(direction == 0, vel_direction, direction)
+
+    strength = np.where(features['volatility'] > params['max_volatility'], strength * 0.5, strength)
+    spread_ok = ~(features['avg_spread'] > params['max_spread'])
+    return direction, strength, spread_ok
+
+
+class MultiSymbolEngine:
+    """
+    Trades a list of symbols from three shared threads
+
+    Every symbol is a *leg*: an UltraLowLatencyEngine with its own config,
+    magic number, buffers, deals ledger and notification outbox that is
+    initialized but never start()ed.  The shared threads replace the legs'
+    own threads:
+
+    * data: one sweep fetches and processes the new ticks of every leg
+    * analysis: stacks the last ticks of every leg that changed into 2-D
+      arrays, computes microstructure features and indicators for all of
+      them in one vectorized / Numba pass, evaluates the technical signal
+      rules as array expressions and calls generate_signal only for legs
+      whose rules can produce a signal (always, when the leg uses ML)
+    * execution: executes queued (leg, signal) pairs
+
+    Each leg's microstructure is stored in its analysis cache, so
+    leg.analyze_microstructure() returns the shared pass's result.  Legs
+    read their own feed; the market data hub is not used in this mode.
+    """
+
+    def __init__(self, configs: Dict[str, Dict], risk_manager=None,
+                 ml_predictors: Optional[Dict] = None, telegram_callback=None):
+        """
+        Initialize engine
+
+        Args:
+            configs: symbol -> engine config (each with its own magic_number)
+            risk_manager: Shared risk manager (optional)
+            ml_predictors: symbol -> MLPredictor (optional)
+            telegram_callback: Shared notification callback (optional)
+        """
+        if not configs:
+            raise ValueError("at least one symbol is required")
+        magics = [config.get('magic_number', 2026002) for config in configs.values()]
+        if len(set(magics)) != len(magics):
+            raise ValueError("every symbol needs its own magic_number")
+
+        ml_predictors = ml_predictors or {}
+        self.legs: Dict[str, UltraLowLatencyEngine] = {}
+        for symbol, config in configs.items():
+            leg_config = dict(config)
+            leg_config['use_market_data_hub'] = False
+            self.legs[symbol] = UltraLowLatencyEngine(symbol, leg_config, risk_manager=risk_manager,
+                                                      ml_predictor=ml_predictors.get(symbol),
+                                                      telegram_callback=telegram_callback)
+
+        # Loop timing comes from the first symbol's config
+        first = next(iter(configs.values()))
+        self.analysis_interval = first.get('analysis_interval', 0.1)
+        self.analysis_min_spacing = first.get('analysis_min_spacing', 0.005)
+
+        self.signal_queue = Queue(maxsize=1000)
+        self.new_tick_event = threading.Event()
+        self.latency = LatencyTracker()
+        self.is_running = False
+        self.data_thread = None
+        self.analysis_thread = None
+        self.execution_thread = None
+
+        self._params = None
+        self._params_key = None
+
+        # Counters
+        self.analysis_passes = 0
+        self.legs_analyzed = 0
+        self.generate_signal_calls = 0
+        self.signals_queued = 0
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.legs)
+
+    def update_config(self, symbol: str, changes: Dict):
+        """Apply config changes to one symbol"""
+        self.legs[symbol].update_config(changes)
+
+    # ------------------------------------------------------------------
+    # Analysis
+    # ------------------------------------------------------------------
+
+    def _leg_params(self, legs: List[UltraLowLatencyEngine]) -> Dict[str, np.ndarray]:
+        """Per-leg thresholds and indicator periods as arrays (rebuilt when a config changes)"""
+        key = tuple((id(leg), leg.config_version) for leg in legs)
+        if key == self._params_key:
+            return self._params
+
+        def column(name, default):
+            return np.array([leg.config.get(name, default) for leg in legs], dtype=np.float64)
+
+        params = {
+            'periods': np.array([leg._get_indicator_params() for leg in legs], dtype=np.int64).reshape(-1, 5),
+            'min_delta': column('min_delta_threshold', 100),
+            'min_velocity': column('min_velocity_threshold', 0.00001),
+            'max_spread': column('max_spread', 0.0001),
+            'rsi_overbought': column('rsi_overbought', 70),
+            'rsi_oversold': column('rsi_oversold', 30),
+            'max_volatility': column('max_volatility', 0.001),
+            'min_strength': column('min_signal_strength', 0.6),
+            'use_ml': np.array([bool(leg.config.get('enable_ml', False)) for leg in legs]),
+        }
+        self._params, self._params_key = params, key
+        return params
+
+    def _indicators(self, legs: List[UltraLowLatencyEngine], prices: np.ndarray,
+                    periods: np.ndarray) -> np.ndarray:
+        """(legs x 5) indicators: streaming values where warmed up, one batch kernel call for the rest"""
+        out = np.full((len(legs), 5), np.nan)
+        batch = []
+        for i, leg in enumerate(legs):
+            params = tuple(int(p) for p in periods[i])
+            streamed = None
+            if leg.use_streaming_indicators:
+                if params != leg._wanted_indicator_params:
+                    leg._wanted_indicator_params = params
+                streamed = leg._get_streaming_indicators(params)
+            if streamed is not None:
+                out[i] = streamed
+            else:
+                batch.append(i)
+        if not batch:
+            return out
+
+        window = prices.shape[1]
+        fast = [i for i in batch if FAST_INDICATORS_AVAILABLE and window >= max(periods[i, 1], periods[i, 2], periods[i, 3])]
+        if fast:
+            try:
+                out[fast] = indicators_last_2d(np.ascontiguousarray(prices[fast]), periods[fast])
+            except Exception as e:
+                logger.warning(f"⚠️ Batch indicator kernel failed, using pandas fallback: {e}")
+                fast = []
+        for i in batch:
+            if i not in fast:
+                out[i] = legs[i]._calculate_indicators_pandas(prices[i], *(int(p) for p in periods[i]))
+        return out
+
+    def analyze(self) -> List[Tuple[UltraLowLatencyEngine, Signal]]:
+        """One vectorized analysis pass over every leg with new ticks; returns the signals found"""
+        legs = [leg for leg in self.legs.values()
+                if len(leg.tick_buffer) >= ANALYSIS_WINDOW
+                and leg._analysis_cache_key != (leg.tick_seq, leg.config_version)]
+        if not legs:
+            return []
+
+        start = time.perf_counter()
+        keys = [(leg.tick_seq, leg.config_version) for leg in legs]
+        ticks = np.stack([leg.tick_buffer.last_n(ANALYSIS_WINDOW) for leg in legs])
+        features = vector_features(ticks)
+        features['avg_delta'], features['cumulative_delta'] = order_flow_features(
+            [leg.orderflow_buffer.last_n(ORDERFLOW_WINDOW) if len(leg.orderflow_buffer) else np.empty(0)
+             for leg in legs])
+        params = self._leg_params(legs)
+        indicators = self._indicators(legs, ticks['mid'], params['periods'])
+
+        columns = {name: values.tolist() for name, values in features.items()}
+        indicator_rows = indicators.tolist()
+        micros = []
+        for i, leg in enumerate(legs):
+            ema_f, ema_s, rsi, atr, momentum = indicator_rows[i]
+            micro = {
+                'avg_spread': columns['avg_spread'][i],
+                'spread_volatility': columns['spread_volatility'][i],
+                'price_velocity': columns['price_velocity'][i],
+                'price_change': columns['price_change'][i],
+                'avg_delta': columns['avg_delta'][i],
+                'cumulative_delta': columns['cumulative_delta'][i],
+                'volatility': columns['volatility'][i],
+                'tick_count': ANALYSIS_WINDOW,
+                'ema_fast': ema_f,
+                'ema_slow': ema_s,
+                'rsi': rsi,
+                'atr': atr,
+                'momentum': momentum,
+                **leg.volume_profile.get_features(),
+            }
+            leg._analysis_cache_key = keys[i]
+            leg._analysis_cache = micro
+            leg.analysis_cache_misses += 1
+            micros.append(micro)
+        analyzed = time.perf_counter()
+        self.latency['microstructure'].record((analyzed - start) * 1000000)
+        per_leg_us = (analyzed - start) * 1000000 / len(legs)
+        for leg in legs:
+            leg._analysis_compute_us += per_leg_us
+
+        # Technical rules for all legs at once; generate_signal only where a signal is possible
+        price = np.array([leg.last_tick.mid_price if leg.last_tick else np.nan for leg in legs])
+        direction, strength, spread_ok = prescreen_signals(features, indicators, price, params)
+        position = np.array([{'BUY': 1, 'SELL': -1}.get(leg.position_type, 0) for leg in legs])
+        possible = spread_ok & (direction != 0) & (
+            (strength >= params['min_strength']) | ((position == -direction) & (strength > 0.6)))
+        candidates = np.flatnonzero(possible | params['use_ml'])
+
+        signals = []
+        for i in candidates.tolist():
+            self.generate_signal_calls += 1
+            signal = legs[i].generate_signal(micros[i])
+            if signal:
+                signals.append((legs[i], signal))
+        self.latency['signal_generation'].record((time.perf_counter() - analyzed) * 1000000)
+
+        self.analysis_passes += 1
+        self.legs_analyzed += len(legs)
+        return signals
+
+    # ------------------------------------------------------------------
+    # Threads
+    # ------------------------------------------------------------------
+
+    def data_collection_loop(self):
+        """One sweep over every symbol's feed per iteration"""
+        logger.info(f"Thread data multi-simbol jalan ({len(self.legs)} simbol)")
+
+        while self.is_running:
+            try:
+                sweep_start = time.perf_counter()
+                new_ticks = False
+                for leg in self.legs.values():
+                    if leg.tick_ingestion_mode == 'batch':
+                        ticks = leg.fetch_new_tick_rows()
+                        if len(ticks):
+                            leg.process_tick_batch(ticks_from_mt5(ticks))
+                    else:
+                        tick = leg.get_tick_ultra_fast()
+                        ticks = [tick] if tick else []
+                        for tick in ticks:
+                            leg.process_tick(tick)
+
+                    if len(ticks):
+                        new_ticks = True
+                        if leg.tick_recorder is not None:
+                            leg.tick_recorder.record(ticks)
+
+                self.latency['data_sweep'].record((time.perf_counter() - sweep_start) * 1000000)
+                if new_ticks:
+                    self.new_tick_event.set()
+                time.sleep(0.001)
+
+            except Exception as e:
+                logger.error(f"Multi-symbol data collection error: {e}")
+                time.sleep(0.1)
+
+    def analysis_loop(self):
+        """Vectorized analysis of all symbols, woken by new ticks"""
+        logger.info("Thread analisa multi-simbol jalan!")
+        last_position_check = time.time()
+
+        while self.is_running:
+            try:
+                new_ticks = self.new_tick_event.wait(self.analysis_interval)
+                self.new_tick_event.clear()
+                cycle_start = time.perf_counter()
+
+                current_time = time.time()
+                if current_time - last_position_check > 5.0:
+                    for leg in self.legs.values():
+                        leg.check_positions()
+                    last_position_check = current_time
+
+                if not new_ticks or not self.is_running:
+                    continue
+
+                for leg, signal in self.analyze():
+                    signal.tick_perf = leg.last_tick_perf
+                    signal.queued_perf = time.perf_counter()
+                    try:
+                        self.signal_queue.put_nowait((leg, signal))
+                        self.signals_queued += 1
+                        logger.info(f"📊 SINYAL DIBUAT [{leg.symbol}]: {signal.signal_type} | "
+                                    f"Kekuatan: {signal.strength:.2f} | "
+                                    f"Harga: {signal.price:.5f} | "
+                                    f"Alasan: {signal.reason}")
+                    except Full:
+                        logger.warning("Antrian sinyal penuh, skip dulu ya")
+
+                spacing = self.analysis_min_spacing - (time.perf_counter() - cycle_start)
+                if spacing > 0:
+                    time.sleep(spacing)
+
+            except Exception as e:
+                logger.error(f"Multi-symbol analysis error: {e}")
+                time.sleep(1)
+
+    def execution_loop(self):
+        """Executes queued signals on their leg"""
+        logger.info("Thread eksekusi multi-simbol udah nyala!")
+
+        while self.is_running:
+            try:
+                try:
+                    leg, signal = self.signal_queue.get(timeout=0.5)
+                except Empty:
+                    continue
+
+                if signal.queued_perf:
+                    leg.stage_latency['queue_wait'].record((time.perf_counter() - signal.queued_perf) * 1000000)
+                leg.execute_signal(signal)
+
+            except Exception as e:
+                logger.error(f"Multi-symbol execution loop error: {e}")
+                time.sleep(0.1)
+
+    def start(self) -> bool:
+        """Initialize every symbol and start the three shared threads"""
+        logger.info("=" * 60)
+        logger.info(f"Mesin multi-simbol: {', '.join(self.legs)}")
+        logger.info("=" * 60)
+
+        for symbol, leg in self.legs.items():
+            if not leg.initialize():
+                logger.error(f"Failed to initialize {symbol}")
+                return False
+            if leg.config.get('record_ticks', False):
+                leg.start_tick_recording()
+            leg.is_running = True
+
+        self.is_running = True
+        self.data_thread = threading.Thread(target=self.data_collection_loop, daemon=True, name="MultiData")
+        self.analysis_thread = threading.Thread(target=self.analysis_loop, daemon=True, name="MultiAnalysis")
+        self.execution_thread = threading.Thread(target=self.execution_loop, daemon=True, name="MultiExecution")
+        self.data_thread.start()
+        self.analysis_thread.start()
+        self.execution_thread.start()
+
+        logger.info(f"✓ {len(self.legs)} simbol jalan di 3 thread")
+        return True
+
+    def stop(self):
+        """Stop the shared threads and every symbol (positions stay open)"""
+        logger.info("🛑 Stopping multi-symbol engine...")
+        self.is_running = False
+        self.new_tick_event.set()
+
+        for thread in (self.data_thread, self.analysis_thread, self.execution_thread):
+            if thread:
+                thread.join(timeout=5)
+
+        for leg in self.legs.values():
+            leg.stop(shutdown_terminal=False)
+        mt5.shutdown()
+        logger.info("✓ Multi-symbol engine stopped (positions remain active)")
+
+    def get_performance_stats(self) -> Dict:
+        """Shared-thread statistics plus each symbol's engine statistics"""
+        passes = self.analysis_passes
+        return {
+            'symbols': {symbol: leg.get_performance_stats() for symbol, leg in self.legs.items()},
+            'threads': 3,
+            'analysis_passes': passes,
+            'avg_symbols_per_pass': self.legs_analyzed / passes if passes else 0.0,
+            'generate_signal_calls': self.generate_signal_calls,
+            'signals_queued': self.signals_queued,
+            'latency': self.latency.read_window('stats'),
+        }
+
+    def __repr__(self):
+        return f"MultiSymbolEngine(symbols={self.symbols}, running={self.is_running})"
@@ -0,0 +1,198 @@
+"""
+Notification Outbox for Aventa HFT Pro 2026
+Bounded queue between the trading threads and notification I/O (Telegram)
+"""
+
+from collections import deque
+from time import perf_counter
+from typing import Callable, Dict, Optional
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest')
+
+
+class NotificationOutbox:
+    """
+    Single-consumer outbox for notification records
+
+    ``post`` only appends a small record (signal type + fields) and wakes the
+    consumer; the lock it takes guards O(1) deque/dict updates and is never
+    held during delivery, so a slow or failing sender cannot delay the
+    posting thread.  One long-lived daemon thread delivers records in order
+    through ``deliver(signal_type, **fields)``.
+
+    When the queue is full the overflow policy applies: ``drop_oldest``
+    evicts the oldest pending record, ``drop_newest`` rejects the new one.
+    Records posted with a ``coalesce_key`` replace a still-pending record
+    with the same key instead of queueing behind it (latest wins).
+    """
+
+    def __init__(self, deliver: Callable, maxsize: int = 256, overflow: str = 'drop_oldest',
+                 name: str = 'NotificationOutbox'):
+        """
+        Initialize outbox
+
+        Args:
+            deliver: Called on the consumer thread as deliver(signal_type, **fields)
+            maxsize: Maximum pending records
+            overflow: 'drop_oldest' or 'drop_newest'
+            name: Consumer thread name
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.deliver = deliver
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.name = name
+
+        self._queue = deque()
+        self._keyed: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._in_flight = 0
+
+        self.posted = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._send_total = 0.0
+        self._send_max = 0.0
+
+    def post(self, signal_type: str, coalesce_key: Optional[str] = None, **fields) -> bool:
+        """
+        Queue a notification (never blocks on delivery)
+
+        Returns:
+            False if the record was dropped by the drop_newest policy
+        """
+        with self._lock:
+            self.posted += 1
+            if coalesce_key is not None:
+                pending = self._keyed.get(coalesce_key)
+                if pending is not None:
+                    pending[1], pending[2], pending[3] = perf_counter(), signal_type, fields
+                    self.coalesced += 1
+                    return True
+
+            if len(self._queue) >= self.maxsize:
+                if self.overflow == 'drop_newest':
+                    self.dropped += 1
+                    return False
+                self._discard(self._queue.popleft())
+                self.dropped += 1
+
+            record = [coalesce_key, perf_counter(), signal_type, fields]
+            self._queue.append(record)
+            if coalesce_key is not None:
+                self._keyed[coalesce_key] = record
+            depth = len(self._queue)
+            if depth > self.max_depth:
+                self.max_depth = depth
+            if not self._running:
+                self._start()
+
+        self._wakeup.set()
+        return True
+
+    def _discard(self, record):
+        key = record[0]
+        if key is not None and self._keyed.get(key) is record:
+            del self._keyed[key]
+
+    def _start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._consume, daemon=True, name=self.name)
+        self._thread.start()
+
+    def _consume(self):
+        while True:
+            with self._lock:
+                if self._queue:
+                    record = self._queue.popleft()
+                    self._discard(record)
+                    self._in_flight = 1
+                else:
+                    self._idle.notify_all()
+                    if not self._running:
+                        return
+                    record = None
+                    self._wakeup.clear()
+
+            if record is None:
+                self._wakeup.wait(1.0)
+                continue
+
+            _, posted_at, signal_type, fields = record
+            start = perf_counter()
+            wait = start - posted_at
+            try:
+                self.deliver(signal_type, **fields)
+                self.delivered += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Notification {signal_type} failed: {e}")
+            send = perf_counter() - start
+
+            with self._lock:
+                self._in_flight = 0
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+                self._send_total += send
+                self._send_max = max(self._send_max, send)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every pending record has been delivered; False on timeout"""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._queue and not self._in_flight, timeout)
+
+    def stop(self, timeout: float = 2.0):
+        """Deliver what is pending (up to timeout) and stop the consumer"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(f"{self.name}: {len(self._queue)} notifications still pending at stop")
+            self._thread = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def get_stats(self) -> dict:
+        """Queue depth and delivery counters (times in ms)"""
+        handled = self.delivered + self.failed
+        return {
+            'depth': len(self._queue),
+            'max_depth': self.max_depth,
+            'capacity': self.maxsize,
+            'overflow': self.overflow,
+            'posted': self.posted,
+            'delivered': self.delivered,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+            'avg_wait_ms': (self._wait_total / handled * 1000) if handled else 0.0,
+            'max_wait_ms': self._wait_max * 1000,
+            'avg_send_ms': (self._send_total / handled * 1000) if handled else 0.0,
+            'max_send_ms': self._send_max * 1000,
+        }
+
+    def __repr__(self):
+        return (f"NotificationOutbox(depth={len(self._queue)}/{self.maxsize}, "
+                f"delivered={self.delivered}, dropped={self.dropped})")
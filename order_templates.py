@@ -0,0 +1,128 @@
+"""
+Order Request Templates for Aventa HFT Pro 2026
+order_send requests for one symbol prepared once per config version instead of per order
+"""
+
+import MetaTrader5 as mt5
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+COMMENT_PREFIX = "AvHFTPro2026_"
+
+# order_check reports success as 0; some builds echo TRADE_RETCODE_DONE
+CHECK_OK = (0, 10009)
+
+
+class OrderTemplates:
+    """
+    Per-side open and close request templates for one symbol
+
+    Everything in a request that does not change between orders (action,
+    symbol, type, deviation, magic, comment, time and filling mode) is
+    resolved by build(); open_request()/close_request() copy the template
+    and fill in volume, price, stops and position.  ``version`` is the
+    engine config_version the templates were built for, ``spec`` the symbol
+    specification they were built with.
+
+    With check=True, build() sends a minimum-volume probe of each open
+    template through order_check, so an unsupported filling mode or a
+    disabled symbol shows up once at start/config change, not on every order.
+    """
+
+    def __init__(self, symbol: str):
+        """
+        Initialize templates
+
+        Args:
+            symbol: Symbol the requests are for
+        """
+        self.symbol = symbol
+        self.version: Optional[int] = None
+        self.spec = None
+        self.open: Dict[str, dict] = {}
+        self.close: Dict[int, dict] = {}
+        self.checks: Dict[str, Tuple[int, str]] = {}
+        self.builds = 0
+        self.last_build_us = 0.0
+
+    def build(self, version: int, spec, filling_mode: int, deviation: int, magic: int,
+              check: bool = False, tick=None):
+        """Prepare the templates for one config version (order_check probes if check and a quote is given)"""
+        start = perf_counter()
+        base = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": self.symbol,
+            "deviation": deviation,
+            "magic": magic,
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": filling_mode,
+        }
+        self.open = {
+            'BUY': dict(base, type=mt5.ORDER_TYPE_BUY, comment=f"{COMMENT_PREFIX}BUY"),
+            'SELL': dict(base, type=mt5.ORDER_TYPE_SELL, comment=f"{COMMENT_PREFIX}SELL"),
+        }
+        # Keyed by the type of the position being closed
+        self.close = {
+            mt5.ORDER_TYPE_BUY: dict(base, type=mt5.ORDER_TYPE_SELL, comment=f"{COMMENT_PREFIX}CLOSE"),
+            mt5.ORDER_TYPE_SELL: dict(base, type=mt5.ORDER_TYPE_BUY, comment=f"{COMMENT_PREFIX}CLOSE"),
+        }
+        self.spec = spec
+        self.version = version
+        self.checks = {}
+        if check and spec is not None and tick is not None:
+            self.check(tick)
+        self.builds += 1
+        self.last_build_us = (perf_counter() - start) * 1000000
+
+    def check(self, tick) -> bool:
+        """order_check a minimum-volume market order per side; True if both would be accepted"""
+        for side, template in self.open.items():
+            price = tick.ask if side == 'BUY' else tick.bid
+            result = mt5.order_check(self.open_request(side, self.spec.volume_min, price, 0.0, 0.0))
+            if result is None:
+                self.checks[side] = (-1, str(mt5.last_error()))
+            else:
+                self.checks[side] = (result.retcode, result.comment)
+            retcode, comment = self.checks[side]
+            if retcode not in CHECK_OK:
+                logger.warning(f"⚠️ order_check {self.symbol} {side} ditolak: {retcode} - {comment} "
+                               f"(filling={template['type_filling']}, magic={template['magic']})")
+        return self.valid
+
+    @property
+    def valid(self) -> bool:
+        """False if an order_check probe was rejected (True when not checked)"""
+        return all(retcode in CHECK_OK for retcode, _ in self.checks.values())
+
+    def open_request(self, side: str, volume: float, price: float, sl: float, tp: float) -> dict:
+        """Market order opening a 'BUY' or 'SELL' position"""
+        request = self.open[side].copy()
+        request["volume"] = volume
+        request["price"] = price
+        request["sl"] = sl
+        request["tp"] = tp
+        return request
+
+    def close_request(self, position_type: int, volume: float, ticket: int, price: float) -> dict:
+        """Market order closing position ``ticket`` of ``position_type``"""
+        request = self.close[position_type].copy()
+        request["volume"] = volume
+        request["position"] = ticket
+        request["price"] = price
+        return request
+
+    def get_stats(self) -> dict:
+        """Build count, last build time and the order_check results"""
+        return {
+            'version': self.version,
+            'builds': self.builds,
+            'last_build_us': self.last_build_us,
+            'checks': dict(self.checks),
+            'valid': self.valid,
+        }
+
+    def __repr__(self):
+        return f"OrderTemplates({self.symbol}, version={self.version}, builds={self.builds}, valid={self.valid})"
@@ -0,0 +1,204 @@
+"""
+Position Book for Aventa HFT Pro 2026
+Open positions on one symbol kept locally: fills applied as they happen, marked to market per tick
+"""
+
+import MetaTrader5 as mt5
+from dataclasses import dataclass, replace
+from time import time
+from typing import Dict, Optional, Tuple
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BookPosition:
+    """One open position (field names as in the terminal's TradePosition)"""
+    ticket: int
+    type: int
+    magic: int
+    volume: float
+    price_open: float
+    price_current: float
+    profit: float = 0.0
+    sl: float = 0.0
+    tp: float = 0.0
+
+
+class PositionBook:
+    """
+    Every open position on the symbol, keyed by ticket, with running totals
+
+    Our own fills are added/removed from order_send results; positions of
+    other magics and server-side exits (SL/TP, stop-out, manual closes) are
+    picked up by reconcile(), which replaces the book with the terminal's
+    positions.  refresh() reconciles at most every ``reconcile_interval``
+    seconds, or on the next read after a tick crossed a position's SL/TP.
+
+    mark() re-prices the book from each new bid/ask: profit is the price
+    move in ticks times the symbol's tick value (account currency per tick
+    per lot) times volume, so it holds for any quote currency; reconcile()
+    brings back the terminal's own figures.  Totals are recomputed on every
+    change, so count / volume / floating P&L reads are plain attribute reads.
+    """
+
+    def __init__(self, symbol: str, magic: int, reconcile_interval: float = 1.0):
+        """
+        Initialize book
+
+        Args:
+            symbol: Symbol whose positions are tracked
+            magic: Magic number of this bot ("own" totals)
+            reconcile_interval: Max seconds between terminal reconciliations in refresh()
+        """
+        self.symbol = symbol
+        self.magic = magic
+        self.reconcile_interval = reconcile_interval
+        # Account currency per 1.0 price move per lot (trade_tick_value / trade_tick_size); None = not set
+        self.value_per_price: Optional[float] = None
+        self.positions: Dict[int, BookPosition] = {}
+        self._lock = threading.Lock()
+        self.last_reconcile = 0.0
+        self.synced = False
+        self.stale = True
+        self.bid = 0.0
+        self.ask = 0.0
+        self.reconciles = 0
+        self.failed_reconciles = 0
+        self.fills_applied = 0
+        self.marks = 0
+        self.last_drift = 0.0
+        self._totals()
+
+    def _totals(self):
+        """Recompute the running totals (caller holds the lock or owns the book)"""
+        count = own_count = 0
+        volume = own_volume = profit = own_profit = own_loss = 0.0
+        for p in self.positions.values():
+            count += 1
+            volume += p.volume
+            profit += p.profit
+            if p.magic == self.magic:
+                own_count += 1
+                own_volume += p.volume
+                own_profit += p.profit
+                if p.profit < 0:
+                    own_loss -= p.profit
+        self.count, self.volume, self.profit = count, volume, profit
+        self.own_count, self.own_volume, self.own_profit, self.own_loss = own_count, own_volume, own_profit, own_loss
+
+    def reconcile(self) -> bool:
+        """Replace the book with the terminal's positions; False (book kept) if the terminal call failed"""
+        with self._lock:
+            positions = mt5.positions_get(symbol=self.symbol)
+            self.reconciles += 1
+            self.last_reconcile = time()
+            if positions is None:
+                self.failed_reconciles += 1
+                return False
+            local_profit = self.own_profit
+            self.positions = {
+                p.ticket: BookPosition(ticket=p.ticket, type=p.type, magic=p.magic, volume=p.volume,
+                                       price_open=p.price_open, price_current=p.price_current,
+                                       profit=p.profit, sl=p.sl, tp=p.tp)
+                for p in positions
+            }
+            self._totals()
+            if self.synced:
+                self.last_drift = self.own_profit - local_profit
+            self.synced = True
+            self.stale = False
+            return True
+
+    def set_spec(self, spec):
+        """Take the tick value/size to price moves with from a SymbolSpec (None or zero values stop marking)"""
+        if spec is None or spec.trade_tick_size <= 0 or spec.trade_tick_value <= 0:
+            self.value_per_price = None
+        else:
+            self.value_per_price = spec.trade_tick_value / spec.trade_tick_size
+
+    def refresh(self) -> bool:
+        """Reconcile if the book is stale or older than the interval; True if it reconciled"""
+        if self.stale or time() - self.last_reconcile >= self.reconcile_interval:
+            return self.reconcile()
+        return False
+
+    def mark(self, bid: float, ask: float):
+        """Mark every position to the new quote (buys close at bid, sells at ask)"""
+        self.bid, self.ask = bid, ask
+        if not self.positions or not self.value_per_price:
+            return
+        with self._lock:
+            value = self.value_per_price
+            for p in self.positions.values():
+                if p.type == mt5.ORDER_TYPE_BUY:
+                    p.price_current = bid
+                    p.profit = (bid - p.price_open) * p.volume * value
+                    if (p.sl and bid <= p.sl) or (p.tp and bid >= p.tp):
+                        self.stale = True
+                else:
+                    p.price_current = ask
+                    p.profit = (p.price_open - ask) * p.volume * value
+                    if (p.sl and ask >= p.sl) or (p.tp and ask <= p.tp):
+                        self.stale = True
+            self._totals()
+            self.marks += 1
+
+    def on_open(self, result, order_type: int, sl: float = 0.0, tp: float = 0.0):
+        """Add our position from a successful order_send result (order ticket = position ticket)"""
+        with self._lock:
+            is_buy = order_type == mt5.ORDER_TYPE_BUY
+            current = (self.bid if is_buy else self.ask) or result.price
+            value = self.value_per_price or 0.0
+            direction = 1.0 if is_buy else -1.0
+            self.positions[result.order] = BookPosition(
+                ticket=result.order, type=order_type, magic=self.magic, volume=result.volume,
+                price_open=result.price, price_current=current,
+                profit=(current - result.price) * direction * result.volume * value, sl=sl, tp=tp,
+            )
+            self._totals()
+            self.fills_applied += 1
+
+    def on_close(self, ticket: int):
+        """Drop a position we closed"""
+        with self._lock:
+            if self.positions.pop(ticket, None) is not None:
+                self._totals()
+                self.fills_applied += 1
+
+    def set_magic(self, magic: int):
+        """Switch the magic number the own totals are computed for"""
+        with self._lock:
+            self.magic = magic
+            self._totals()
+
+    def all_positions(self) -> Tuple[BookPosition, ...]:
+        """Copies of every position on the symbol (any magic), safe to keep while marking continues"""
+        with self._lock:
+            return tuple(replace(p) for p in self.positions.values())
+
+    def own_positions(self) -> Tuple[BookPosition, ...]:
+        """Copies of the positions with our magic number"""
+        with self._lock:
+            return tuple(replace(p) for p in self.positions.values() if p.magic == self.magic)
+
+    def get_stats(self) -> dict:
+        """Totals and reconciliation counters"""
+        return {
+            'positions': self.count,
+            'own_positions': self.own_count,
+            'own_volume': self.own_volume,
+            'own_profit': self.own_profit,
+            'reconciles': self.reconciles,
+            'failed_reconciles': self.failed_reconciles,
+            'fills_applied': self.fills_applied,
+            'marks': self.marks,
+            'last_drift': self.last_drift,
+            'age': time() - self.last_reconcile if self.last_reconcile else None,
+        }
+
+    def __repr__(self):
+        return (f"PositionBook({self.symbol}, magic={self.magic}, positions={self.count}, "
+                f"own={self.own_count}, profit={self.own_profit:.2f})")
@@ -50,6 +50,12 @@ class TradeRecord:
 class RiskManager:
     """Advanced risk management for HFT"""
     
+    # Attributes the GUI changes on a running bot (see apply_runtime_changes)
+    LIMIT_FIELDS = ('max_daily_loss', 'max_daily_trades', 'max_daily_volume', 'max_position_size',
+                    'max_positions', 'max_drawdown_pct')
+    RUNTIME_FIELDS = LIMIT_FIELDS + ('daily_trades', 'daily_pnl', 'circuit_breaker_triggered',
+                                     'trading_enabled', 'last_circuit_reason')
+    
     def __init__(self, config: Dict):
         self.config = config
         
@@ -119,6 +125,22 @@ class RiskManager:
                 self.circuit_breaker_triggered = False
                 self.trading_enabled = True
     
+    def apply_runtime_changes(self, changes: Dict) -> Dict:
+        """
+        Set limits, daily counters or circuit breaker state changed while the bot runs
+        Unknown keys are ignored. Returns the resulting values of RUNTIME_FIELDS
+        """
+        for key, value in changes.items():
+            if key in self.RUNTIME_FIELDS:
+                setattr(self, key, value)
+            else:
+                logger.debug(f"Ignoring runtime risk change: {key}")
+        return self.runtime_state()
+    
+    def runtime_state(self) -> Dict:
+        """Current values of RUNTIME_FIELDS (what a copy needs to mirror this risk manager)"""
+        return {key: getattr(self, key) for key in self.RUNTIME_FIELDS}
+    
     def check_risk_limits(self, account_balance: float = 0.0) -> Tuple[bool, str]:
         """
         Check if trading is allowed based on risk limits
@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 import time
 import logging
 
+from symbol_specs import get_symbol_spec_cache
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -89,7 +91,7 @@ class StrategyBacktester:
         """Get symbol information from MT5"""
         try:
             symbol = self.config['symbol']
-            info = mt5.symbol_info(symbol)
+            info = get_symbol_spec_cache().get(symbol)
             if info is None:
                 raise ValueError(f"Symbol {symbol} not found in MT5")
 
@@ -105,7 +107,8 @@ class StrategyBacktester:
             # For forex: pip_value = volume * pip_size * contract_size / current_price
             contract_size = 100000  # Standard lot size
             volume = self.config.get('default_volume', 0.01)
-            current_price = info.ask if hasattr(info, 'ask') else 1.0
+            tick = mt5.symbol_info_tick(symbol)
+            current_price = tick.ask if tick is not None and tick.ask > 0 else 1.0
 
             self.pip_value = volume * self.pip_size * contract_size / current_price
 
@@ -124,8 +127,7 @@ class StrategyBacktester:
                 if not mt5.initialize():
                     return []
             
-            symbols = mt5.symbols_get()
-            return [s.name for s in symbols] if symbols else []
+            return get_symbol_spec_cache().symbol_names()
         except Exception as e:
             logger.error(f"Failed to get available symbols: {e}")
             return []
@@ -0,0 +1,247 @@
+"""
+Streaming Indicators - O(1) incremental technical indicators for HFT
+Stateful counterparts of the batch kernels in fast_indicators.py
+"""
+
+from collections import deque
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingEMA:
+    """
+    Incremental EMA
+
+    Fed the same series, ``value`` equals ``ema_fast(data, period)[-1]``.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1.0)
+        self.count = 0
+        self.value = 0.0
+
+    def update(self, price: float) -> float:
+        if self.count == 0:
+            self.value = price
+        else:
+            self.value = self.alpha * price + (1.0 - self.alpha) * self.value
+        self.count += 1
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+
+class StreamingRSI:
+    """
+    Incremental RSI with Wilder smoothing
+
+    Fed the same series, ``value`` equals ``rsi_fast(data, period)[-1]``
+    (0.0 until ``period`` price changes have been seen, like the batch kernel).
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.prev = 0.0
+        self.sum_gain = 0.0
+        self.sum_loss = 0.0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.value = 0.0
+
+    def _rsi(self) -> float:
+        if self.avg_loss == 0:
+            return 100.0
+        rs = self.avg_gain / self.avg_loss
+        return 100.0 - (100.0 / (1.0 + rs))
+
+    def update(self, price: float) -> float:
+        i = self.count
+        self.count += 1
+
+        if i == 0:
+            self.prev = price
+            return self.value
+
+        delta = price - self.prev
+        self.prev = price
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta <= 0 else 0.0
+
+        p = self.period
+        if i < p:
+            self.sum_gain += gain
+            self.sum_loss += loss
+            return self.value
+
+        if i == p:
+            self.sum_gain += gain
+            self.sum_loss += loss
+            self.avg_gain = self.sum_gain / p
+            self.avg_loss = self.sum_loss / p
+
+        # Batch kernel reports RSI before folding in the current bar
+        self.value = self._rsi()
+        self.avg_gain = (self.avg_gain * (p - 1) + gain) / p
+        self.avg_loss = (self.avg_loss * (p - 1) + loss) / p
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.count > self.period
+
+
+class StreamingATR:
+    """
+    Incremental ATR with Wilder smoothing
+
+    Fed the same series, ``value`` equals ``atr_fast(high, low, close, period)[-1]``.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.prev_close = 0.0
+        self.sum_tr = 0.0
+        self.value = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        i = self.count
+        self.count += 1
+
+        if i == 0:
+            self.prev_close = close
+            return self.value
+
+        tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+
+        p = self.period
+        if i < p:
+            self.sum_tr += tr
+        elif i == p:
+            self.sum_tr += tr
+            self.value = self.sum_tr / p
+        else:
+            self.value = (self.value * (p - 1) + tr) / p
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.count > self.period
+
+
+class StreamingMomentum:
+    """
+    Incremental momentum (price - price[period] bars ago)
+
+    Fed the same series, ``value`` equals ``momentum_fast(data, period)[-1]``.
+    """
+
+    def __init__(self, period: int = 10):
+        self.period = period
+        self.window = deque(maxlen=period + 1)
+        self.value = 0.0
+
+    def update(self, price: float) -> float:
+        self.window.append(price)
+        if len(self.window) > self.period:
+            self.value = price - self.window[0]
+        return self.value
+
+    @property
+    def count(self) -> int:
+        return len(self.window)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.window) > self.period
+
+
+class IndicatorBank:
+    """
+    One streaming indicator instance per (kind, period), updated once per tick
+
+    Indicators requested for the first time are back-filled from the
+    supplied price history so a config change does not restart warm-up.
+    Create indicators from the thread that calls ``update()``; other
+    threads should only ``peek()``.
+    """
+
+    # ATR needs high/low; ticks carry none, so approximate around the mid price
+    ATR_HIGH_FACTOR = 1.0001
+    ATR_LOW_FACTOR = 0.9999
+
+    _FACTORIES = {
+        'ema': StreamingEMA,
+        'rsi': StreamingRSI,
+        'atr': StreamingATR,
+        'momentum': StreamingMomentum,
+    }
+
+    def __init__(self):
+        self._indicators = {}
+        self._update_order = ()
+        self._lock = threading.Lock()
+        self.updates = 0
+
+    def get(self, kind: str, period: int, history=None):
+        """
+        Get (or create) the indicator for kind/period
+
+        Args:
+            kind: 'ema', 'rsi', 'atr' or 'momentum'
+            period: Indicator period
+            history: Optional iterable of past prices used to back-fill a new instance
+        """
+        key = (kind, int(period))
+        indicator = self._indicators.get(key)
+        if indicator is not None:
+            return indicator
+
+        with self._lock:
+            indicator = self._indicators.get(key)
+            if indicator is None:
+                indicator = self._FACTORIES[kind](int(period))
+                if history is not None:
+                    for price in history:
+                        self._feed(indicator, float(price))
+                self._indicators[key] = indicator
+                # Replace the tuple atomically so the updating thread never sees a resize
+                self._update_order = tuple(self._indicators.values())
+        return indicator
+
+    def peek(self, kind: str, period: int):
+        """Get the indicator for kind/period without creating it (None if missing)"""
+        return self._indicators.get((kind, int(period)))
+
+    def _feed(self, indicator, price: float):
+        if isinstance(indicator, StreamingATR):
+            indicator.update(price * self.ATR_HIGH_FACTOR, price * self.ATR_LOW_FACTOR, price)
+        else:
+            indicator.update(price)
+
+    def update(self, price: float):
+        """Feed one new price to every indicator"""
+        for indicator in self._update_order:
+            self._feed(indicator, price)
+        self.updates += 1
+
+    def clear(self):
+        """Drop all indicator state"""
+        with self._lock:
+            self._indicators = {}
+            self._update_order = ()
+            self.updates = 0
+
+    def __len__(self):
+        return len(self._indicators)
+
+    def __repr__(self):
+        keys = ", ".join(f"{k}({p})" for k, p in self._indicators)
+        return f"IndicatorBank([{keys}], updates={self.updates})"
@@ -0,0 +1,149 @@
+"""
+Symbol Specification Cache for Aventa HFT Pro 2026
+Process-wide symbol_info() / symbols_get() cache with TTL and explicit refresh
+"""
+
+import MetaTrader5 as mt5
+from time import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SymbolSpec:
+    """Contract specification of one symbol (static fields of symbol_info)"""
+    name: str
+    point: float
+    digits: int
+    trade_contract_size: float
+    trade_stops_level: int
+    filling_mode: int
+    volume_min: float
+    volume_max: float
+    volume_step: float
+    trade_tick_size: float
+    trade_tick_value: float
+    visible: bool
+    spread: int          # at fetch time (informational)
+    timestamp: float
+
+    @classmethod
+    def from_info(cls, info, timestamp: float) -> 'SymbolSpec':
+        return cls(
+            name=info.name,
+            point=info.point,
+            digits=info.digits,
+            trade_contract_size=info.trade_contract_size,
+            trade_stops_level=info.trade_stops_level,
+            filling_mode=getattr(info, 'filling_mode', 0),
+            volume_min=getattr(info, 'volume_min', 0.0),
+            volume_max=getattr(info, 'volume_max', 0.0),
+            volume_step=getattr(info, 'volume_step', 0.0),
+            trade_tick_size=getattr(info, 'trade_tick_size', info.point),
+            trade_tick_value=getattr(info, 'trade_tick_value', 0.0),
+            visible=getattr(info, 'visible', True),
+            spread=getattr(info, 'spread', 0),
+            timestamp=timestamp,
+        )
+
+    @property
+    def age(self) -> float:
+        return time() - self.timestamp
+
+
+class SymbolSpecCache:
+    """Thread-safe symbol specification cache shared by engines, backtester and ML"""
+
+    def __init__(self, ttl: float = 300.0):
+        """
+        Initialize cache
+
+        Args:
+            ttl: Seconds before a spec (or the symbol list) is fetched again
+        """
+        self.ttl = ttl
+        self._specs: Dict[str, SymbolSpec] = {}
+        self._names: Optional[Tuple[float, List[str]]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.symbol_info_calls = 0
+        self.symbols_get_calls = 0
+        self.names_hits = 0
+
+    def get(self, symbol: str, force_refresh: bool = False) -> Optional[SymbolSpec]:
+        """Spec for symbol (cached unless older than ttl); None if the terminal does not know it"""
+        spec = self._specs.get(symbol)
+        if not force_refresh and spec is not None and time() - spec.timestamp <= self.ttl:
+            self.hits += 1
+            return spec
+
+        with self._lock:
+            self.symbol_info_calls += 1
+            info = mt5.symbol_info(symbol)
+            if info is None:
+                # Keep a stale spec rather than failing a running engine
+                return spec
+            spec = SymbolSpec.from_info(info, time())
+            self._specs[symbol] = spec
+            return spec
+
+    def symbol_names(self, force_refresh: bool = False) -> List[str]:
+        """Names of all terminal symbols (cached symbols_get)"""
+        names = self._names
+        if not force_refresh and names is not None and time() - names[0] <= self.ttl:
+            self.names_hits += 1
+            return names[1]
+
+        with self._lock:
+            self.symbols_get_calls += 1
+            symbols = mt5.symbols_get()
+            result = [s.name for s in symbols] if symbols else []
+            if result:
+                self._names = (time(), result)
+            return result
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop one symbol's spec (or everything, including the symbol list)"""
+        with self._lock:
+            if symbol is None:
+                self._specs.clear()
+                self._names = None
+            else:
+                self._specs.pop(symbol, None)
+
+    def refresh(self, symbol: str) -> Optional[SymbolSpec]:
+        """Re-fetch a symbol's spec now"""
+        return self.get(symbol, force_refresh=True)
+
+    def get_stats(self) -> dict:
+        """Cache statistics (calls_saved = symbol_info round-trips avoided)"""
+        lookups = self.hits + self.symbol_info_calls
+        return {
+            'symbols': len(self._specs),
+            'symbol_info_calls': self.symbol_info_calls,
+            'calls_saved': self.hits,
+            'hit_rate': (self.hits / lookups * 100) if lookups else 0.0,
+            'symbols_get_calls': self.symbols_get_calls,
+            'symbols_get_saved': self.names_hits,
+        }
+
+    def __repr__(self):
+        return f"SymbolSpecCache(symbols={len(self._specs)}, saved={self.hits}, ttl={self.ttl}s)"
+
+
+# Process-wide instance
+_cache = SymbolSpecCache()
+
+
+def get_symbol_spec_cache() -> SymbolSpecCache:
+    """The process-wide symbol spec cache"""
+    return _cache
+
+
+def get_symbol_spec(symbol: str, force_refresh: bool = False) -> Optional[SymbolSpec]:
+    """Shortcut for get_symbol_spec_cache().get(symbol)"""
+    return _cache.get(symbol, force_refresh)
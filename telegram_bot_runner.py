@@ -19,6 +19,7 @@ class TelegramBotRunner:
         self.loop: Optional[asyncio.AbstractEventLoop] = None
         self.thread: Optional[threading.Thread] = None
         self.running = False
+        self._loop_ready = threading.Event()
     
     def start(self):
         """Start the async event loop in a background thread"""
@@ -27,6 +28,7 @@ class TelegramBotRunner:
             return
         
         self.running = True
+        self._loop_ready.clear()
         self.thread = threading.Thread(target=self._run_loop, daemon=True)
         self.thread.start()
         logger.info("Telegram Bot Runner: Event loop started in background thread")
@@ -48,6 +50,19 @@ class TelegramBotRunner:
         
         logger.info("Telegram Bot Runner: Stopped")
     
+    def submit(self, coro):
+        """Run a coroutine on the shared event loop (starts the loop if needed)
+        
+        Returns:
+            concurrent.futures.Future of the coroutine result
+        """
+        if not self.running:
+            self.start()
+        if not self._loop_ready.wait(timeout=5.0):
+            coro.close()
+            raise RuntimeError("Telegram event loop did not start")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
     def add_bot(self, bot_id: str, telegram_bot):
         """Add and start a telegram bot
         
@@ -150,6 +165,7 @@ class TelegramBotRunner:
         try:
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
+            self._loop_ready.set()
             self.loop.run_forever()
         except Exception as e:
             logger.error(f"Event loop error: {e}")
@@ -0,0 +1,134 @@
+"""
+Tests for the adaptive polling schedule of the data/analysis threads and the market data hub
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import pytest
+
+import adaptive_polling
+from adaptive_polling import ACTIVE, BACKOFF, SESSION_IDLE, AdaptivePoller
+from aventa_hft_core import UltraLowLatencyEngine
+from market_data_hub import MarketDataHub
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = Clock()
+    monkeypatch.setattr(adaptive_polling, 'monotonic', fake)
+    return fake
+
+
+def test_backoff_doubles_to_the_cap_and_resets_on_data(clock):
+    poller = AdaptivePoller(min_interval=0.001, max_interval=0.01, backoff_after=1.0)
+    assert poller.next_delay(True) == 0.001
+
+    # Quiet, but not for long enough yet
+    clock.now += 0.5
+    assert poller.next_delay(False) == 0.001 and poller.mode == ACTIVE
+
+    clock.now += 0.6
+    delays = [poller.next_delay(False) for _ in range(5)]
+    assert delays == pytest.approx([0.002, 0.004, 0.008, 0.01, 0.01])
+    assert poller.mode == BACKOFF and poller.idle
+
+    assert poller.next_delay(True) == 0.001 and poller.mode == ACTIVE
+    assert poller.get_stats()['backoff_polls'] == 5
+
+
+def test_session_idle_wakes_at_session_start(clock):
+    wait = [3600.0]
+    calls = []
+    poller = AdaptivePoller(min_interval=0.001, idle_interval=1.0, session_check_interval=1.0,
+                            session_wait=lambda: calls.append(1) or wait[0])
+    assert poller.next_delay(False) == 1.0 and poller.mode == SESSION_IDLE
+    # New ticks outside the session do not end the nap
+    assert poller.next_delay(True) == 1.0
+
+    # Checked at most once per session_check_interval
+    assert len(calls) == 1
+    clock.now += 1.0
+    wait[0] = 0.4
+    assert poller.next_delay(False) == pytest.approx(0.4)
+    assert len(calls) == 2
+
+    # The session opened: straight back to the fast schedule
+    clock.now += 0.4
+    wait[0] = 0.0
+    assert poller.next_delay(True) == 0.001 and poller.mode == ACTIVE
+
+
+def test_fixed_schedule_when_not_adaptive(clock):
+    poller = AdaptivePoller(min_interval=0.001, session_wait=lambda: 3600.0, adaptive=False)
+    clock.now += 10.0
+    assert [poller.next_delay(False) for _ in range(3)] == [0.001] * 3
+    assert poller.mode == ACTIVE and poller.session_seconds() == 0.0
+
+
+def test_wake_cuts_a_nap_short():
+    poller = AdaptivePoller(min_interval=0.001, session_wait=lambda: 3600.0, idle_interval=5.0)
+    poller.wake()
+    start = time.perf_counter()
+    assert poller.sleep(False)
+    assert time.perf_counter() - start < 1.0
+    assert poller.mode == SESSION_IDLE
+
+
+def test_engine_naps_only_outside_sessions_without_positions(monkeypatch):
+    import account_cache
+    import aventa_hft_core
+
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    stub.positions_get.return_value = ()
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+    engine = UltraLowLatencyEngine('XAUUSD', {
+        'magic_number': 1, 'use_market_data_hub': False, 'london_session_enabled': True,
+        'london_start': '08:00', 'london_end': '16:30', 'ny_session_enabled': False})
+    day = 1_700_006_400  # 00:00 GMT
+
+    monkeypatch.setattr(aventa_hft_core.time, 'time', lambda: day + 7 * 3600 + 1800)
+    assert engine.seconds_until_session() == pytest.approx(1800)
+    assert engine._session_wait() == pytest.approx(1800)
+    engine.position_book.own_count = 1
+    assert engine._session_wait() == 0.0
+    engine.position_book.own_count = 0
+
+    monkeypatch.setattr(aventa_hft_core.time, 'time', lambda: day + 9 * 3600)
+    assert engine.seconds_until_session() == 0.0
+    # Past london_end the next open is tomorrow's
+    monkeypatch.setattr(aventa_hft_core.time, 'time', lambda: day + 17 * 3600)
+    assert engine.seconds_until_session() == pytest.approx(15 * 3600)
+
+    engine.update_config({'adaptive_polling': False})
+    assert not engine.data_poller.adaptive and not engine.analysis_poller.adaptive
+    assert 'polling' in engine.get_performance_stats()
+
+
+def test_hub_naps_only_when_every_subscriber_is_idle():
+    hub = MarketDataHub('XAUUSD', autostart=False, idle_interval=1.0)
+    assert hub._session_wait() == 0.0
+    subs = [hub.subscribe(f"Bot_{i}") for i in range(2)]
+    subs[0].idle_seconds = 3600.0
+    assert hub._session_wait() == 0.0
+    subs[1].idle_seconds = 600.0
+    assert hub._session_wait() == 600.0
+    assert hub.poller.next_delay(False) == 1.0 and hub.poller.mode == SESSION_IDLE
+    assert hub.get_stats()['polling']['idle_polls'] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,67 @@
+"""
+Tests for the memoized microstructure analysis
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import account_cache
+import aventa_hft_core
+from aventa_hft_core import TickData, UltraLowLatencyEngine
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+    engine = UltraLowLatencyEngine('XAUUSD', {'magic_number': 1, 'use_market_data_hub': False})
+    for i in range(150):
+        engine.process_tick(make_tick(i))
+    return engine
+
+
+def make_tick(i):
+    bid = 2600.0 + (i % 7) * 0.01 + i * 0.002
+    return TickData(timestamp=1000.0 + i * 0.1, bid=bid, ask=bid + 0.2, last=bid + 0.1, volume=1, spread=0.2)
+
+
+def test_unchanged_buffer_reuses_result(engine):
+    first = engine.analyze_microstructure()
+    assert first
+    for _ in range(9):
+        assert engine.analyze_microstructure() is first
+
+    stats = engine.get_analysis_cache_stats()
+    assert (stats['hits'], stats['misses']) == (9, 1)
+    assert stats['hit_rate'] == pytest.approx(0.9)
+    assert stats['cpu_saved_ms'] == pytest.approx(9 * stats['avg_compute_us'] / 1000)
+
+
+def test_new_tick_recomputes(engine):
+    first = engine.analyze_microstructure()
+    engine.process_tick(make_tick(150))
+    second = engine.analyze_microstructure()
+    assert second is not first
+    assert second == engine._compute_microstructure()
+    assert engine.get_analysis_cache_stats()['misses'] == 2
+
+
+def test_config_change_invalidates(engine):
+    first = engine.analyze_microstructure()
+    engine.update_config({'ema_fast_period': 3})
+    second = engine.analyze_microstructure()
+    assert engine.config_version == 1
+    assert second is not first
+    assert second['ema_fast'] != first['ema_fast']
+    assert engine.get_performance_stats()['analysis_cache']['misses'] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
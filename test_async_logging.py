@@ -0,0 +1,132 @@
+"""
+Tests for the async logging pipeline and per-call-site rate limits
+"""
+
+import logging
+import sys
+import threading
+import time
+from queue import Queue
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import account_cache
+import aventa_hft_core
+from async_logging import AsyncLogging, LazyQueueHandler, LogRateLimiter
+from aventa_hft_core import UltraLowLatencyEngine
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.messages = []
+        self.threads = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.messages.append(record.getMessage())
+        self.threads.append(threading.current_thread().name)
+
+
+class FormatProbe:
+    """Records which thread turned it into text"""
+    def __init__(self):
+        self.thread = None
+
+    def __str__(self):
+        self.thread = threading.current_thread().name
+        return "probe"
+
+
+@pytest.fixture
+def isolated_logger():
+    log = logging.getLogger('test_async_logging')
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    sink = ListHandler()
+    log.addHandler(sink)
+    yield log, sink
+    log.handlers.clear()
+
+
+def test_records_are_formatted_on_the_writer_thread(isolated_logger):
+    log, sink = isolated_logger
+    pipeline = AsyncLogging()
+    pipeline.install(log)
+    assert log.handlers == [pipeline.handler]
+
+    probe = FormatProbe()
+    log.info("value %s", probe)
+    assert probe.thread is None  # nothing formatted in the caller
+    pipeline.stop()
+
+    assert sink.messages == ["value probe"]
+    assert probe.thread != threading.current_thread().name
+    assert sink.threads[0] != threading.current_thread().name
+    # Original handlers are back after stop
+    assert sink in log.handlers and pipeline.handler not in log.handlers
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = LazyQueueHandler(Queue(maxsize=2))
+    log = logging.getLogger('test_async_logging.full')
+    log.propagate = False
+    log.addHandler(handler)
+    try:
+        start = time.perf_counter()
+        for i in range(10):
+            log.warning("line %d", i)
+        assert time.perf_counter() - start < 0.5
+    finally:
+        log.removeHandler(handler)
+    assert (handler.enqueued, handler.dropped) == (2, 8)
+
+
+def test_rate_limit_is_per_call_site(isolated_logger):
+    log, sink = isolated_logger
+    limiter = LogRateLimiter(interval=60.0)
+    for i in range(5):
+        limiter.log(log, logging.INFO, "first %d", i)
+        limiter.log(log, logging.INFO, "second %d", i)
+
+    assert sink.messages == ["first 0", "second 0"]
+    assert limiter.get_stats() == {'interval': 60.0, 'sites': 2, 'emitted': 2, 'suppressed': 8}
+    assert sink.records[0].site.startswith('test_rate_limit_is_per_call_site:')
+    assert sink.records[0].funcName == 'test_rate_limit_is_per_call_site'
+
+
+def test_suppressed_count_reported_after_interval(isolated_logger):
+    log, sink = isolated_logger
+    limiter = LogRateLimiter(interval=0.05)
+    for _ in range(4):
+        limiter.log(log, logging.WARNING, "spread %.1f", 1.5, key='spread')
+    time.sleep(0.06)
+    assert limiter.log(log, logging.WARNING, "spread %.1f", 2.5, key='spread')
+
+    assert sink.messages == ["spread 1.5", "spread 2.5 (+3 suppressed)"]
+    assert (sink.records[1].site, sink.records[1].suppressed) == ('spread', 3)
+
+
+def test_disabled_level_costs_no_budget(isolated_logger):
+    log, sink = isolated_logger
+    limiter = LogRateLimiter(interval=60.0)
+    assert not limiter.log(log, logging.DEBUG, "hidden")
+    assert limiter.get_stats()['sites'] == 0
+
+
+def test_engine_spread_rejects_are_rate_limited(monkeypatch):
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+    engine = UltraLowLatencyEngine('XAUUSD', {'magic_number': 1, 'use_market_data_hub': False,
+                                              'async_logging': False, 'log_rate_limit_interval': 60.0})
+    for _ in range(100):
+        engine.log_spread_reject(0.9, 0.5)
+    assert engine.get_performance_stats()['logging']['emitted'] == 1
+    assert engine.log_limiter.suppressed == 99
@@ -0,0 +1,106 @@
+"""
+Tests for the batched close_all_positions
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import pytest
+
+from aventa_hft_core import TickData, UltraLowLatencyEngine
+from config_manager import ConfigManager
+from tick_replay import patch_mt5, ReplayMT5
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    terminal = ReplayMT5('XAUUSD', balance=10000.0)
+    terminal.set_tick(int(time.time() * 1000), 2600.00, 2600.20, 2600.10, 1)
+    patch_mt5(terminal, monkeypatch.setattr)
+    return terminal
+
+
+def make_engine(callback=None):
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update({'magic_number': 7, 'use_market_data_hub': False})
+    engine = UltraLowLatencyEngine('XAUUSD', config, telegram_callback=callback)
+    assert engine.initialize()
+    engine.process_tick(TickData(timestamp=time.time(), bid=2600.00, ask=2600.20, last=2600.10,
+                                 volume=1, spread=0.20))
+    return engine
+
+
+def open_positions(terminal, count, magic):
+    for i in range(count):
+        result = terminal.order_send({'action': terminal.TRADE_ACTION_DEAL, 'symbol': 'XAUUSD', 'volume': 0.01,
+                                      'type': terminal.ORDER_TYPE_BUY if i % 2 == 0 else terminal.ORDER_TYPE_SELL,
+                                      'magic': magic})
+        assert result.retcode == terminal.TRADE_RETCODE_DONE
+
+
+def test_one_quote_and_one_summary_for_all_closes(terminal):
+    notifications = []
+    engine = make_engine(lambda **data: notifications.append(data))
+    open_positions(terminal, 5, magic=7)
+    open_positions(terminal, 2, magic=99)
+    terminal.call_counts.clear()
+
+    assert engine.close_all_positions(reason='test') == 5
+    assert engine.notifications.flush()
+
+    calls = dict(terminal.call_counts)
+    assert calls['order_send'] == 5
+    assert calls['symbol_info_tick'] == 1
+    assert calls['account_info'] == 1
+    assert calls['history_deals_get'] == 1
+    assert sorted(p.magic for p in terminal.positions_get()) == [99, 99]
+
+    assert len(notifications) == 1
+    summary = notifications[0]
+    assert summary['signal_type'] == 'clear_all_positions'
+    assert summary['closed_count'] == 5
+    assert summary['balance'] is not None
+    assert summary['total_volume_today'] == pytest.approx(0.05)
+
+
+def test_close_all_wall_time_metric(terminal):
+    engine = make_engine()
+    open_positions(terminal, 3, magic=7)
+    engine.close_all_positions()
+
+    stats = engine.get_performance_stats()['close_all']
+    assert stats['positions'] == 3
+    assert stats['closed'] == 3
+    assert stats['wall_ms'] > 0
+    assert stats['per_position_ms'] == pytest.approx(stats['wall_ms'] / 3)
+    assert engine.latency['close_all'].count == 1
+
+
+def test_failed_close_is_not_counted(terminal, monkeypatch):
+    notifications = []
+    engine = make_engine(lambda **data: notifications.append(data))
+    open_positions(terminal, 2, magic=7)
+    stuck = terminal.positions_get()[0].ticket
+    send = terminal.order_send
+    monkeypatch.setattr(terminal, 'order_send', lambda request: None if request['position'] == stuck else send(request))
+
+    assert engine.close_all_positions() == 1
+    assert engine.notifications.flush()
+    assert engine.last_close_all['positions'] == 2
+    assert engine.last_close_all['closed'] == 1
+    assert [p.ticket for p in terminal.positions_get()] == [stuck]
+    assert [n['closed_count'] for n in notifications] == [1]
+
+
+def test_nothing_to_close(terminal):
+    notifications = []
+    engine = make_engine(lambda **data: notifications.append(data))
+    open_positions(terminal, 1, magic=99)
+    terminal.call_counts.clear()
+
+    assert engine.close_all_positions() == 0
+    assert 'symbol_info_tick' not in terminal.call_counts
+    assert notifications == []
@@ -0,0 +1,116 @@
+"""
+Tests for the incremental intraday deals ledger
+"""
+
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import deals_ledger
+from deals_ledger import DealsLedger
+
+DAY = 20_000 * 86400
+ENTRY_IN, ENTRY_OUT = 0, 1
+
+
+class HistoryStub:
+    """history_deals_get honouring the date range, recording every request"""
+
+    DEAL_ENTRY_IN = ENTRY_IN
+
+    def __init__(self):
+        self.deals = []
+        self.requests = []
+
+    def add(self, t, magic, entry, profit=0.0, volume=0.1):
+        self.deals.append(SimpleNamespace(ticket=len(self.deals) + 1, time=t, magic=magic, entry=entry,
+                                          profit=profit, volume=volume))
+
+    def history_deals_get(self, date_from, date_to):
+        self.requests.append((date_from, date_to))
+        return tuple(d for d in self.deals if date_from <= d.time < date_to)
+
+
+@pytest.fixture
+def history(monkeypatch):
+    stub = HistoryStub()
+    monkeypatch.setattr(deals_ledger, 'mt5', stub)
+    return stub
+
+
+def test_totals_match_a_full_scan(history):
+    ledger = DealsLedger(magic=7, max_age=0)
+    t = DAY + 3600
+    for i in range(30):
+        history.add(t + i // 3, 7 if i % 4 else 8, ENTRY_IN if i % 2 == 0 else ENTRY_OUT,
+                    profit=0.0 if i % 2 == 0 else (i - 15) * 1.5, volume=0.01 * (i + 1))
+        if i % 5 == 4:
+            ledger.refresh(t + i)
+
+    ledger.refresh(t + 40)
+    own = [d for d in history.deals if d.magic == 7]
+    assert ledger.closed_pnl == pytest.approx(sum(d.profit for d in own))
+    assert ledger.entries == sum(d.entry == ENTRY_IN for d in own)
+    assert ledger.entry_volume == pytest.approx(sum(d.volume for d in own if d.entry == ENTRY_IN))
+    assert (ledger.wins, ledger.losses) == (sum(d.profit > 0 for d in own), sum(d.profit < 0 for d in own))
+    assert ledger.deals_processed == len(history.deals)
+
+
+def test_fetches_only_from_last_seen_deal(history):
+    ledger = DealsLedger(magic=7, max_age=0)
+    history.add(DAY + 100, 7, ENTRY_IN)
+    history.add(DAY + 200, 7, ENTRY_OUT, profit=5.0)
+    ledger.refresh(DAY + 300)
+    assert history.requests[-1] == (DAY, DAY + 86400)
+
+    history.add(DAY + 200, 7, ENTRY_IN)  # same second as the last seen deal
+    assert ledger.refresh(DAY + 400) == 1
+    assert history.requests[-1][0] == DAY + 200
+    assert ledger.entries == 2 and ledger.closed_pnl == 5.0
+
+
+def test_max_age_and_day_reset(history, monkeypatch):
+    ledger = DealsLedger(magic=7, max_age=60)
+    history.add(DAY + 100, 7, ENTRY_OUT, profit=-3.0)
+    ledger.refresh(DAY + 150)
+    ledger.refresh(DAY + 160)
+    assert len(history.requests) == 1
+
+    # Next server day starts from zero, whatever max_age says
+    history.add(DAY + 86400 + 10, 7, ENTRY_OUT, profit=2.0)
+    ledger.refresh(DAY + 86400 + 20)
+    assert ledger.day == DAY // 86400 + 1
+    assert ledger.closed_pnl == 2.0 and ledger.losses == 0
+
+
+def test_engine_stats_answer_from_ledger(history, monkeypatch):
+    import account_cache
+    import aventa_hft_core
+
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    stub.positions_get.return_value = ()
+    stub.DEAL_ENTRY_IN = ENTRY_IN
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', {'magic_number': 7, 'deals_refresh_interval': 60})
+    now = time.time()
+    engine.last_tick = aventa_hft_core.TickData(timestamp=now, bid=1.0, ask=1.1, last=1.05, volume=1, spread=0.1)
+    history.add(now - 5, 7, ENTRY_IN, volume=0.3)
+    history.add(now - 1, 7, ENTRY_OUT, profit=4.0, volume=0.3)
+
+    assert engine.get_today_closed_pnl() == 4.0
+    assert engine.get_today_trade_count() == 1
+    assert engine.get_today_total_volume() == pytest.approx(0.3)
+    assert engine.get_today_trade_stats() == (1, 1, 0, 4.0)
+    assert len(history.requests) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
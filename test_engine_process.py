@@ -0,0 +1,110 @@
+"""
+Tests for hosting an engine in a worker process
+"""
+
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+from engine_process import EngineProcess
+from tick_replay import serve_live, synthetic_ticks
+
+CONFIG = {
+    'max_spread': 0.5, 'max_volatility': 0.05, 'min_delta_threshold': 30, 'min_velocity_threshold': 0.001,
+    'trading_sessions_enabled': False, 'max_floating_loss': 500.0, 'max_floating_profit': 0,
+    'use_market_data_hub': False, 'magic_number': 4242,
+}
+
+
+def replay_initializer(symbol, seed):
+    """Runs in the worker: live replay feed instead of a terminal"""
+    sys.modules.setdefault('MetaTrader5', MagicMock())
+    serve_live(symbol, synthetic_ticks(2000, seed=seed, mean_interval_ms=5.0), balance=100000.0)
+
+
+@pytest.fixture
+def proc():
+    notifications = []
+    proc = EngineProcess('XAUUSD', dict(CONFIG), telegram_callback=lambda **data: notifications.append(data),
+                         initializer=replay_initializer, initargs=('XAUUSD', 7))
+    proc.notifications = notifications
+    yield proc
+    if proc.is_alive:
+        proc.stop()
+
+
+def test_engine_runs_in_worker_process(proc):
+    assert proc.initialize()
+    assert proc.start()
+    assert proc.is_running
+    # Stats latency is a window since the previous read: count fetches across the polls
+    deadline = time.time() + 10
+    fetches = 0
+    while time.time() < deadline:
+        stats = proc.get_performance_stats()
+        fetches += stats['latency']['tick_fetch']['count']
+        if stats['ticks_processed'] >= 200:
+            break
+        time.sleep(0.1)
+
+    assert proc.pid != os.getpid()
+    assert proc.status['state'] == 'running'
+    snapshot = proc.get_performance_snapshot()
+    assert snapshot is not None and 'trades_today' in snapshot
+    stats = proc.get_performance_stats()
+    assert stats['ticks_processed'] >= 200
+    assert fetches + stats['latency']['tick_fetch']['count'] > 0
+
+    proc.stop()
+    assert not proc.is_alive
+    assert not proc.is_running
+    assert proc.status['state'] == 'exited'
+
+
+def test_errors_and_config_cross_the_boundary(proc):
+    with pytest.raises(RuntimeError, match='unknown command'):
+        proc.call('shutdown_terminal')
+    with pytest.raises(RuntimeError, match='TypeError'):
+        proc.call('update_config')
+
+    proc.update_config({'min_delta_threshold': 55})
+    assert proc.config['min_delta_threshold'] == 55
+    assert proc.call_latency.count == 3
+
+
+def test_worker_notifications_reach_callback(proc):
+    proc._events.put(('notify', {'signal_type': 'clear_all_positions', 'closed_count': 0}))
+    deadline = time.time() + 5
+    while time.time() < deadline and not proc.notifications:
+        time.sleep(0.05)
+    assert proc.notifications == [{'signal_type': 'clear_all_positions', 'closed_count': 0}]
+
+
+def test_risk_limit_edits_reach_the_worker_copy(tmp_path):
+    from risk_manager import RiskManager
+
+    risk_manager = RiskManager({'max_positions': 3, 'db_path': str(tmp_path / 'trades.db')})
+    proc = EngineProcess('XAUUSD', dict(CONFIG), risk_manager=risk_manager,
+                         initializer=replay_initializer, initargs=('XAUUSD', 7))
+    try:
+        applied = proc.update_risk_limits({'max_positions': 1, 'max_daily_loss': 25.0, 'daily_trades': 4,
+                                           'circuit_breaker_triggered': True, 'unknown_field': 1})
+        # Values come back from the worker's copy; the parent's object is a separate one
+        assert applied['max_positions'] == 1 and applied['max_daily_loss'] == 25.0
+        assert applied['daily_trades'] == 4 and applied['circuit_breaker_triggered']
+        assert risk_manager.max_positions == 3
+        assert 'unknown_field' not in applied
+
+        # State the worker's copy holds comes back with the snapshot for the GUI to mirror
+        risk = proc.get_performance_snapshot()['risk']
+        assert risk['circuit_breaker_triggered'] and risk['max_positions'] == 1
+        risk_manager.apply_runtime_changes(risk)
+        assert risk_manager.circuit_breaker_triggered and risk_manager.runtime_state() == risk
+    finally:
+        proc.stop()
@@ -0,0 +1,133 @@
+"""
+Tests for the event-driven analysis/execution pipeline
+"""
+
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import aventa_hft_core
+from aventa_hft_core import Signal, UltraLowLatencyEngine
+
+
+@pytest.fixture(autouse=True)
+def stub_terminal(monkeypatch):
+    import account_cache
+
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    stub.positions_get.return_value = ()
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+    return stub
+
+
+def make_engine(**config):
+    base = {'magic_number': 1, 'use_market_data_hub': False, 'analysis_interval': 0.05,
+            'analysis_min_spacing': 0.0, 'trading_sessions_enabled': False}
+    base.update(config)
+    return UltraLowLatencyEngine('XAUUSD', base)
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.002)
+    return predicate()
+
+
+def test_analysis_runs_only_when_ticks_arrive(monkeypatch):
+    engine = make_engine()
+    calls = []
+    monkeypatch.setattr(engine, 'analyze_microstructure', lambda: calls.append(time.perf_counter()))
+    engine.is_running = True
+    thread = threading.Thread(target=engine.analysis_loop, daemon=True)
+    thread.start()
+    try:
+        # Quiet market: the loop keeps timing out without analysing
+        time.sleep(0.2)
+        assert calls == []
+
+        notified = time.perf_counter()
+        engine.new_tick_event.set()
+        assert wait_for(lambda: len(calls) == 1)
+        assert calls[0] - notified < 0.05
+        time.sleep(0.15)
+        assert len(calls) == 1
+    finally:
+        engine.stop()
+    thread.join(timeout=1)
+    assert not thread.is_alive()
+
+
+def test_min_spacing_limits_analysis_rate(monkeypatch):
+    engine = make_engine(analysis_min_spacing=0.05)
+    calls = []
+    monkeypatch.setattr(engine, 'analyze_microstructure', lambda: calls.append(time.perf_counter()))
+    engine.is_running = True
+    thread = threading.Thread(target=engine.analysis_loop, daemon=True)
+    thread.start()
+    try:
+        # A tick storm: the event is set continuously
+        end = time.time() + 0.3
+        while time.time() < end:
+            engine.new_tick_event.set()
+            time.sleep(0.001)
+    finally:
+        engine.stop()
+    assert 3 <= len(calls) <= 8
+    assert min(b - a for a, b in zip(calls, calls[1:])) >= 0.045
+
+
+def test_execution_blocks_on_queue(monkeypatch):
+    engine = make_engine()
+    executed = []
+    monkeypatch.setattr(engine, 'execute_signal', lambda signal: executed.append(time.perf_counter()))
+    engine.is_running = True
+    thread = threading.Thread(target=engine.execution_loop, daemon=True)
+    thread.start()
+    try:
+        signal = Signal(timestamp=time.time(), signal_type='BUY', strength=0.9, price=2600.0,
+                        stop_loss=2599.0, take_profit=2602.0, volume=0.01, reason='test')
+        signal.queued_perf = time.perf_counter()
+        engine.signal_queue.put(signal)
+        assert wait_for(lambda: executed)
+        assert executed[0] - signal.queued_perf < 0.005
+        assert engine.latency['queue_wait'].count == 1
+    finally:
+        engine.stop()
+
+
+def test_data_loop_notifies_analysis(monkeypatch):
+    from tick_replay import MT5_TICK_DTYPE
+
+    engine = make_engine()
+    rows = np.zeros(1, dtype=MT5_TICK_DTYPE)
+    rows[0] = (1, 2600.0, 2600.2, 2600.1, 1, 1000, 0, 1.0)
+    batches = iter([rows, rows[:0]])
+
+    def fetch():
+        batch = next(batches, None)
+        if batch is None:
+            engine.is_running = False
+            return rows[:0]
+        return batch
+
+    monkeypatch.setattr(engine, 'fetch_new_tick_rows', fetch)
+    engine.is_running = True
+    engine.data_collection_loop()
+    assert engine.new_tick_event.is_set()
+    assert engine.tick_seq == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
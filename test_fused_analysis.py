@@ -0,0 +1,102 @@
+"""
+Tests for the fused microstructure + signal kernel
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import account_cache
+import aventa_hft_core
+import fast_indicators as fi
+from aventa_hft_core import TickData, UltraLowLatencyEngine
+from tick_replay import synthetic_ticks
+
+CONFIG = {'magic_number': 1, 'use_market_data_hub': False, 'async_logging': False, 'max_spread': 0.5,
+          'max_volatility': 0.05, 'min_delta_threshold': 30, 'min_velocity_threshold': 0.001}
+
+
+@pytest.fixture
+def stub_mt5(monkeypatch):
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+
+
+def as_tick(row):
+    return TickData(timestamp=float(row['timestamp']), bid=float(row['bid']), ask=float(row['ask']),
+                    last=float(row['last']), volume=int(row['volume']), spread=float(row['spread']))
+
+
+def test_kernel_matches_numpy_and_indicator_kernels():
+    rng = np.random.default_rng(1)
+    mid = 2600.0 + np.cumsum(rng.normal(0, 0.05, 100))
+    spread = rng.uniform(0.1, 0.3, 100)
+    delta = rng.normal(0, 5, 50)
+    params = np.zeros(fi.N_PARAMS)
+    params[:5] = (7, 21, 7, 14, 5)
+    params[fi.P_MAX_SPREAD] = 1.0
+    out = np.zeros(fi.N_OUTPUTS)
+    fi.microstructure_signal(mid, spread, delta, 12.0, params, out, True)
+
+    assert out[fi.M_AVG_SPREAD] == pytest.approx(spread.mean(), abs=1e-12)
+    assert out[fi.M_SPREAD_VOLATILITY] == pytest.approx(spread.std(), abs=1e-12)
+    assert out[fi.M_VOLATILITY] == pytest.approx(np.std(np.diff(mid)), abs=1e-12)
+    assert out[fi.M_AVG_DELTA] == pytest.approx(delta.mean(), abs=1e-12)
+    assert out[fi.M_EMA_FAST] == pytest.approx(fi.ema_fast(mid, 7)[-1], abs=1e-9)
+    assert out[fi.M_EMA_SLOW] == pytest.approx(fi.ema_fast(mid, 21)[-1], abs=1e-9)
+    assert out[fi.M_RSI] == pytest.approx(fi.rsi_fast(mid, 7)[-1], abs=1e-9)
+    assert out[fi.M_ATR] == pytest.approx(fi.atr_fast(mid * 1.0001, mid * 0.9999, mid, 14)[-1], abs=1e-9)
+    assert out[fi.M_MOMENTUM] == pytest.approx(fi.momentum_fast(mid, 5)[-1], abs=1e-9)
+
+    # Spread above the limit short-circuits the signal
+    params[fi.P_MAX_SPREAD] = 0.1
+    fi.microstructure_signal(mid, spread, delta, 12.0, params, out, True)
+    assert out[fi.M_FLAGS] == fi.FLAG_SPREAD_REJECT and out[fi.M_SIGNAL] == 0
+
+
+@pytest.mark.parametrize('streaming', [True, False])
+def test_fused_engine_matches_python_path(stub_mt5, streaming):
+    fused = UltraLowLatencyEngine('XAUUSD', dict(CONFIG, streaming_indicators=streaming))
+    python = UltraLowLatencyEngine('XAUUSD', dict(CONFIG, streaming_indicators=streaming, fused_analysis=False))
+    signals = 0
+    for row in synthetic_ticks(1500, seed=5):
+        tick = as_tick(row)
+        fused.process_tick(tick)
+        python.process_tick(tick)
+        expected = python.analyze_microstructure()
+        if not expected:
+            continue
+        actual = fused.analyze_microstructure()
+        assert 'technical_signal' in actual and 'technical_signal' not in expected
+        for key, value in expected.items():
+            assert actual[key] == pytest.approx(value, abs=1e-9), key
+
+        a, b = fused.generate_signal(actual), python.generate_signal(expected)
+        assert (a is None) == (b is None)
+        if a is not None:
+            signals += 1
+            assert (a.signal_type, a.reason) == (b.signal_type, b.reason)
+            assert a.strength == pytest.approx(b.strength)
+    assert signals > 0
+
+
+def test_stale_kernel_signal_is_recomputed(stub_mt5):
+    engine = UltraLowLatencyEngine('XAUUSD', dict(CONFIG))
+    for row in synthetic_ticks(300, seed=2):
+        engine.process_tick(as_tick(row))
+    micro = engine.analyze_microstructure()
+    # Kernel result claims a strong BUY for a different price: generate_signal must not trust it
+    micro = dict(micro, technical_signal=(1, 1.0, fi.FLAG_DELTA_BUY, micro['technical_signal'][3] + 1.0),
+                 cumulative_delta=0.0, price_velocity=0.0)
+    assert engine.generate_signal(micro) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,59 @@
+"""
+Tests for the eagerly compiled, disk-cached fast indicator kernels
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import fast_indicators as fi
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+REPORT = """
+import json
+import fast_indicators
+print(json.dumps(fast_indicators.startup_report()))
+"""
+
+
+def test_kernels_compiled_at_import_for_every_array_layout():
+    report = fi.startup_report()
+    assert set(report['kernels']) == {'ema_fast', 'rsi_fast', 'atr_fast', 'momentum_fast', 'bollinger_bands_fast',
+                                      'indicators_last_2d', 'microstructure_signal'}
+    assert report['compiled'] + report['from_cache'] == 7
+    assert len(fi.ema_fast.signatures) == 1
+
+    # Contiguous, strided and read-only arrays all hit the precompiled signature
+    records = np.zeros(50, dtype=[('mid', 'f8'), ('spread', 'f8')])
+    records['mid'] = 2600.0 + np.arange(50) * 0.01
+    contiguous = np.ascontiguousarray(records['mid'])
+    assert fi.ema_fast(records['mid'], 7)[-1] == fi.ema_fast(contiguous, 7)[-1]
+    contiguous.setflags(write=False)
+    assert fi.ema_fast(contiguous, 7)[-1] == fi.ema_fast(records['mid'], 7)[-1]
+    assert len(fi.ema_fast.signatures) == 1  # nothing compiled on the call path
+    middle, _, _ = fi.bollinger_bands_fast(records['mid'], 20, 2.0)
+    assert middle[-1] == pytest.approx(contiguous[-20:].mean())
+
+
+def test_second_process_loads_from_disk_cache(tmp_path):
+    env = dict(os.environ, NUMBA_CACHE_DIR=str(tmp_path), PYTHONPATH=HERE)
+
+    def run():
+        out = subprocess.run([sys.executable, '-c', REPORT], env=env, cwd=HERE,
+                             capture_output=True, text=True, check=True)
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    cold = run()
+    warm = run()
+    assert cold['compiled'] == 7 and cold['from_cache'] == 0
+    assert warm['compiled'] == 0 and warm['from_cache'] == 7
+    assert warm['seconds'] < cold['seconds']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""
+Tests for the per-stage latency histograms
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+from latency_histogram import LatencyHistogram, ENGINE_STAGES
+
+
+def test_percentiles_within_bucket_resolution():
+    samples = np.random.default_rng(1).lognormal(3.0, 1.2, 200_000)
+    histogram = LatencyHistogram()
+    for value in samples.tolist():
+        histogram.record(value)
+
+    stats = histogram.snapshot()
+    assert stats['count'] == len(samples)
+    assert stats['mean_us'] == pytest.approx(samples.mean())
+    for key, q in (('p50_us', 50), ('p90_us', 90), ('p99_us', 99), ('p999_us', 99.9)):
+        exact = np.percentile(samples, q)
+        assert stats[key] == pytest.approx(exact, rel=0.07), key
+    assert stats['min_us'] <= samples.min() <= stats['p50_us']
+    assert stats['max_us'] >= samples.max()
+
+
+def test_buckets_are_contiguous():
+    previous_high = 0.0
+    for index in range(LatencyHistogram.NUM_BUCKETS):
+        low, high = LatencyHistogram.bucket_bounds(index)
+        assert low == previous_high
+        assert high > low
+        previous_high = high
+    assert previous_high > 60e6  # covers over a minute
+
+
+def test_reader_windows_are_independent():
+    histogram = LatencyHistogram()
+    for _ in range(10):
+        histogram.record(5.0)
+    assert histogram.read_window('gui')['count'] == 10
+
+    for _ in range(3):
+        histogram.record(500.0)
+    gui = histogram.read_window('gui')
+    stats = histogram.read_window('stats')
+    assert gui['count'] == 3
+    assert gui['p50_us'] == pytest.approx(500.0, rel=0.07)
+    assert stats['count'] == 13
+    assert histogram.read_window('gui')['count'] == 0
+
+
+def test_record_overhead_is_sub_microsecond():
+    histogram = LatencyHistogram()
+    record = histogram.record
+    values = np.random.default_rng(2).lognormal(3.0, 1.0, 200_000).tolist()
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for value in values:
+            record(value)
+        best = min(best, (time.perf_counter() - start) / len(values))
+    # Generous bound for slow CI machines; typically a few hundred ns
+    assert best < 2e-6
+
+
+def test_engine_records_every_stage_through_replay():
+    from tick_replay import TickReplay, synthetic_ticks
+
+    config = {'max_spread': 0.5, 'max_volatility': 0.05, 'min_delta_threshold': 30,
+              'min_velocity_threshold': 0.001, 'trading_sessions_enabled': False,
+              'max_floating_loss': 500.0, 'max_floating_profit': 0}
+    replay = TickReplay('XAUUSD', config, synthetic_ticks(4000, seed=3))
+    replay.run()
+    engine = replay.engine
+
+    window = engine.latency.read_window('test')
+    assert set(ENGINE_STAGES) <= set(window)
+    assert window['orderflow_update']['count'] == 4000
+    for stage in ('order_send', 'execution', 'tick_to_order'):
+        assert window[stage]['count'] > 0, stage
+    assert window['tick_to_order']['p50_us'] >= window['order_send']['p50_us']
+    assert engine.latency.read_window('test')['execution']['count'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
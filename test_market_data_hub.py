@@ -0,0 +1,179 @@
+"""
+Tests for the process-wide per-symbol market data hub
+Runs against a stubbed MetaTrader5 module - no terminal required
+"""
+
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import account_cache
+import aventa_hft_core
+import market_data_hub
+import tick_ingestion
+from market_data_hub import get_market_data_hub, subscribe_market_data_hub, MarketDataHub
+
+
+MT5_TICK_DTYPE = np.dtype([
+    ('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'),
+    ('volume', '<u8'), ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8'),
+])
+
+
+class StubMT5:
+    """MetaTrader5 stand-in serving a random-walk tick stream"""
+
+    COPY_TICKS_ALL = -1
+
+    def __init__(self, n=400, seed=3):
+        rng = np.random.default_rng(seed)
+        ticks = np.zeros(n, dtype=MT5_TICK_DTYPE)
+        ticks['time_msc'] = 1_700_000_000_000 + np.cumsum(rng.integers(0, 400, n))
+        ticks['time'] = ticks['time_msc'] // 1000
+        ticks['bid'] = 2600.0 + np.cumsum(rng.choice([-0.01, 0.0, 0.01], n))
+        ticks['ask'] = ticks['bid'] + 0.02
+        ticks['last'] = ticks['bid'] + rng.choice([0.0, 0.01, 0.02], n)
+        ticks['volume'] = rng.integers(1, 5, n)
+        self.ticks = ticks
+        self.arrived = 0
+        self.copy_calls = 0
+
+    def release(self, n):
+        self.arrived = min(len(self.ticks), self.arrived + n)
+
+    def symbol_info_tick(self, symbol):
+        if self.arrived == 0:
+            return None
+        t = self.ticks[self.arrived - 1]
+        return SimpleNamespace(time=int(t['time']), time_msc=int(t['time_msc']))
+
+    def copy_ticks_from(self, symbol, date_from, count, flags):
+        self.copy_calls += 1
+        visible = self.ticks[:self.arrived]
+        start = np.searchsorted(visible['time_msc'], int(date_from) * 1000, side='left')
+        return visible[start:start + count].copy()
+
+    def account_info(self):
+        return None
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    fake = StubMT5()
+    monkeypatch.setattr(tick_ingestion, 'mt5', fake)
+    monkeypatch.setattr(aventa_hft_core, 'mt5', fake)
+    monkeypatch.setattr(account_cache, 'mt5', fake)
+    yield fake
+    market_data_hub._hubs.clear()
+
+
+def test_every_subscriber_sees_every_tick_once(stub):
+    hub = MarketDataHub('XAUUSD', autostart=False)
+    stub.release(1)
+    hub.ingest_once()
+    subs = [hub.subscribe(f"Bot_{i}") for i in range(5)]
+
+    seen = {s.name: [] for s in subs}
+    for step in [10, 0, 25, 3, 60]:
+        stub.release(step)
+        hub.ingest_once()
+        for s in subs:
+            _, records = s.read_new()
+            seen[s.name].extend(records['timestamp'].tolist())
+
+    expected = (stub.ticks['time_msc'][1:stub.arrived] / 1000.0).tolist()
+    for name, timestamps in seen.items():
+        assert timestamps == expected, name
+    # One terminal fetch per cycle regardless of subscriber count
+    assert stub.copy_calls == 6
+
+
+def test_engines_share_hub_buffers(stub):
+    config = {'magic_number': 1, 'use_market_data_hub': True}
+    hub = get_market_data_hub('XAUUSD', autostart=False)
+    engines = [aventa_hft_core.UltraLowLatencyEngine('XAUUSD', dict(config, bot_id=f"Bot_{i}"))
+               for i in range(3)]
+    for e in engines:
+        e.attach_market_data_hub()
+        # Shared records go through the batch path, never one TickData at a time
+        e.process_tick = None
+
+    # Reference engine computing its own buffers from the same ticks
+    reference = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', {'magic_number': 9})
+
+    for step in [1, 50, 0, 120, 80]:
+        stub.release(step)
+        before = hub.tick_buffer.total_written
+        hub.ingest_once()
+        for record in hub.tick_buffer.range(before, hub.tick_buffer.total_written):
+            reference.process_tick(aventa_hft_core.TickData(
+                timestamp=record.timestamp, bid=record.bid, ask=record.ask,
+                last=record.last, volume=record.volume, spread=record.spread))
+        for e in engines:
+            e._read_hub_ticks(timeout=0)
+
+    assert all(e.tick_buffer is hub.tick_buffer for e in engines)
+    assert all(e.orderflow_buffer is hub.orderflow_buffer for e in engines)
+    np.testing.assert_allclose(hub.orderflow_buffer.last_n(5000)['cumulative_delta'],
+                               reference.orderflow_buffer.last_n(5000)['cumulative_delta'])
+
+    expected = reference.analyze_microstructure()
+    for e in engines:
+        assert e.tick_seq == hub.tick_buffer.total_written
+        result = e.analyze_microstructure()
+        for key in ('avg_spread', 'cumulative_delta', 'ema_fast', 'rsi', 'momentum', 'poc_price',
+                    'profile_volume'):
+            assert result[key] == pytest.approx(expected[key]), key
+        assert e.last_tick == reference.last_tick
+
+
+def test_lagging_subscriber_reports_lost_ticks(stub):
+    hub = MarketDataHub('XAUUSD', tick_capacity=32, autostart=False)
+    stub.release(1)
+    hub.ingest_once()
+    sub = hub.subscribe('slow')
+
+    stub.release(100)
+    hub.ingest_once()
+    start, records = sub.read_new()
+
+    assert len(records) == 32
+    assert sub.ticks_lost == 100 - 32
+    assert sub.lag == 0
+
+
+def test_hub_released_with_last_subscriber(stub):
+    hub = get_market_data_hub('XAUUSD', autostart=False)
+    assert get_market_data_hub('XAUUSD') is hub
+    a = hub.subscribe('a')
+    b = hub.subscribe('b')
+    a.close()
+    assert 'XAUUSD' in market_data_hub._hubs
+    b.close()
+    assert 'XAUUSD' not in market_data_hub._hubs
+
+
+def test_subscriber_after_last_unsubscribe_gets_a_live_hub(stub):
+    old, sub = subscribe_market_data_hub('XAUUSD', 'a', poll_interval=0.01)
+    assert old.is_running
+    # A caller that looked the hub up just before it emptied cannot revive it
+    sub.close()
+    assert old.is_stopping and not old.is_running and old._thread is None
+    with pytest.raises(RuntimeError):
+        old.subscribe('b')
+
+    hub, sub = subscribe_market_data_hub('XAUUSD', 'b', poll_interval=0.01)
+    assert hub is not old and market_data_hub._hubs['XAUUSD'] is hub
+    assert hub.is_running and hub._thread.is_alive()
+    sub.close()
+    assert not hub.is_running
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,117 @@
+"""
+Tests for lazy ML inference in generate_signal
+"""
+
+import itertools
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import account_cache
+import aventa_hft_core
+from aventa_hft_core import TickData, UltraLowLatencyEngine
+
+
+class FakePredictor:
+    """Deterministic per-tick prediction; counts model calls"""
+    is_trained = True
+
+    def __init__(self):
+        self.direction_model = object()
+        self.calls = 0
+
+    def prepare_realtime_features(self, tick, microstructure):
+        return {'close': tick.bid}
+
+    def predict(self, features):
+        self.calls += 1
+        code = int(round(features['close'] * 100))
+        return (1 if code % 2 else 0), (code % 11) / 10.0
+
+
+@pytest.fixture
+def stub_mt5(monkeypatch):
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+
+
+def make_engine(**config):
+    base = {'magic_number': 1, 'use_market_data_hub': False, 'enable_ml': True, 'async_logging': False,
+            'max_spread': 0.5, 'max_volatility': 0.01, 'min_delta_threshold': 50,
+            'min_velocity_threshold': 0.001, 'min_signal_strength': 0.6}
+    base.update(config)
+    return UltraLowLatencyEngine('XAUUSD', base, ml_predictor=FakePredictor())
+
+
+def make_tick(i, timestamp=None):
+    bid = 2600.0 + i * 0.01
+    return TickData(timestamp=1000.0 + i if timestamp is None else timestamp,
+                    bid=bid, ask=bid + 0.2, last=bid + 0.1, volume=1, spread=0.2)
+
+
+def microstructure(delta, velocity, volatility, trend):
+    # trend: +1 passes the BUY filters, -1 the SELL filters, 0 neither
+    ema_fast, ema_slow = (2590.0, 2580.0) if trend > 0 else (2700.0, 2710.0) if trend < 0 else (2600.0, 2600.0)
+    return {'avg_spread': 0.2, 'cumulative_delta': delta, 'price_velocity': velocity, 'volatility': volatility,
+            'ema_fast': ema_fast, 'ema_slow': ema_slow, 'rsi': 50.0, 'atr': 1.0, 'momentum': 0.5 * trend}
+
+
+def outcome(signal):
+    return None if signal is None else (signal.signal_type, round(signal.strength, 9))
+
+
+def test_gated_outcomes_match_ungated(stub_mt5):
+    gated = make_engine(ml_bar_seconds=0)
+    ungated = make_engine(ml_bar_seconds=0)
+    ungated._ml_can_change_outcome = lambda signal_type, strength: True
+
+    grid = itertools.product((0, 80, -80), (0.0, 0.002, -0.002), (0.0, 0.02), (1, -1, 0),
+                             (None, 'BUY', 'SELL'), (0.6, 0.9))
+    for i, (delta, velocity, volatility, trend, position, min_strength) in enumerate(grid):
+        for engine in (gated, ungated):
+            engine.last_tick = make_tick(i)
+            engine.position_type = position
+            engine.config['min_signal_strength'] = min_strength
+        micro = microstructure(delta, velocity, volatility, trend)
+        assert outcome(gated.generate_signal(micro)) == outcome(ungated.generate_signal(micro)), (i, micro)
+
+    stats = gated.get_ml_inference_stats()
+    assert stats['predictions_skipped'] > 0
+    assert stats['predictions_made'] + stats['predictions_skipped'] == ungated.ml_predictions_made
+    assert gated.ml_predictor.calls == stats['predictions_made']
+
+
+def test_unreachable_threshold_skips_model(stub_mt5):
+    engine = make_engine(min_signal_strength=0.95)
+    engine.last_tick = make_tick(1)
+    # Momentum only: 0.3 + best-case ML boost 0.4 < 0.95, and no position to reverse
+    assert engine.generate_signal(microstructure(0, 0.002, 0.0, 0)) is None
+    assert engine.ml_predictor.calls == 0
+    assert engine.ml_predictions_skipped == 1
+
+
+def test_prediction_reused_within_bar(stub_mt5):
+    engine = make_engine(ml_bar_seconds=60)
+    micro = microstructure(80, 0.002, 0.0, 1)
+    for i in range(5):
+        engine.last_tick = make_tick(i, timestamp=1200.0 + i)  # same minute
+        engine.generate_signal(micro)
+    engine.last_tick = make_tick(5, timestamp=1260.0)  # next bar
+    engine.generate_signal(micro)
+    engine.update_config({'rsi_overbought': 75})  # config change invalidates the bar cache
+    engine.generate_signal(micro)
+
+    assert engine.ml_predictor.calls == 3
+    stats = engine.get_performance_stats()['ml_inference']
+    assert (stats['predictions_made'], stats['cache_hits'], stats['predictions_skipped']) == (3, 4, 0)
+    assert stats['avoided_rate'] == pytest.approx(4 / 7)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
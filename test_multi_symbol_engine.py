@@ -0,0 +1,157 @@
+"""
+Tests for the multi-symbol engine and its vectorized analysis
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import account_cache
+import aventa_hft_core
+import multi_symbol_engine
+import symbol_specs
+from aventa_hft_core import TickData
+from fast_indicators import ema_fast, rsi_fast, atr_fast, momentum_fast, indicators_last_2d
+from multi_symbol_engine import MultiSymbolEngine
+from tick_replay import MultiReplayMT5, patch_mt5
+
+SYMBOLS = ['XAUUSD', 'EURUSD', 'GBPUSD']
+BASE_PRICE = {'XAUUSD': 2600.0, 'EURUSD': 1.08, 'GBPUSD': 1.27}
+
+
+def make_configs(**overrides):
+    configs = {}
+    for i, symbol in enumerate(SYMBOLS):
+        config = {'magic_number': 100 + i, 'max_spread': 1.0, 'min_delta_threshold': 5,
+                  'min_signal_strength': 0.3, 'max_volatility': 1.0}
+        config.update(overrides)
+        configs[symbol] = config
+    return configs
+
+
+def make_tick(symbol, i, rng):
+    base = BASE_PRICE[symbol]
+    bid = base * (1 + 0.0004 * np.sin(i / 15.0 + len(symbol)) + 0.0001 * rng.standard_normal())
+    spread = base * 0.00005
+    return TickData(timestamp=1000.0 + i * 0.1, bid=bid, ask=bid + spread, last=bid + spread / 2,
+                    volume=1 + (i % 3), spread=spread)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    for module in (aventa_hft_core, account_cache, multi_symbol_engine):
+        monkeypatch.setattr(module, 'mt5', stub)
+    return stub
+
+
+def test_duplicate_magic_rejected(stub):
+    configs = make_configs()
+    configs['EURUSD']['magic_number'] = configs['XAUUSD']['magic_number']
+    with pytest.raises(ValueError):
+        MultiSymbolEngine(configs)
+    with pytest.raises(ValueError):
+        MultiSymbolEngine({})
+
+
+def test_batch_kernel_matches_1d_kernels():
+    rng = np.random.default_rng(1)
+    prices = 100 + np.cumsum(rng.standard_normal((4, 100)) * 0.05, axis=1)
+    periods = np.array([[7, 21, 7, 14, 5], [3, 9, 14, 10, 2], [12, 26, 9, 20, 10], [5, 50, 21, 30, 1]])
+    out = indicators_last_2d(prices, periods)
+    for s in range(len(prices)):
+        row = prices[s]
+        e_f, e_s, r, a, m = periods[s]
+        assert out[s] == pytest.approx([
+            ema_fast(row, e_f)[-1], ema_fast(row, e_s)[-1], rsi_fast(row, r)[-1],
+            atr_fast(row * 1.0001, row * 0.9999, row, a)[-1], momentum_fast(row, m)[-1],
+        ])
+
+
+@pytest.mark.parametrize('streaming', [True, False])
+def test_vectorized_pass_matches_single_symbol_analysis(stub, streaming):
+    engine = MultiSymbolEngine(make_configs(use_streaming_indicators=streaming))
+    engine.update_config('GBPUSD', {'ema_fast_period': 3, 'rsi_period': 14})
+    rng = np.random.default_rng(2)
+    for i in range(160):
+        for symbol in SYMBOLS:
+            engine.legs[symbol].process_tick(make_tick(symbol, i, rng))
+
+    engine.analyze()
+    assert engine.legs_analyzed == len(SYMBOLS)
+    for leg in engine.legs.values():
+        cached = leg.analyze_microstructure()
+        assert leg.get_analysis_cache_stats()['hits'] == 1
+        expected = leg._compute_microstructure()
+        expected.pop('technical_signal', None)  # fused single-leg kernel extra; legs fall back to Python rules
+        assert cached == pytest.approx(expected, rel=1e-9, abs=1e-12, nan_ok=True)
+
+    # Nothing new: the next pass skips every leg
+    assert engine.analyze() == []
+    assert engine.legs_analyzed == len(SYMBOLS)
+
+
+def test_prescreen_never_skips_a_signal(stub):
+    engine = MultiSymbolEngine(make_configs())
+    for leg in engine.legs.values():
+        leg.symbol_point = 0.00001
+    rng = np.random.default_rng(3)
+    produced = 0
+    for i in range(600):
+        for symbol in SYMBOLS:
+            engine.legs[symbol].process_tick(make_tick(symbol, i, rng))
+        if i < 100:
+            continue
+
+        expected = {}
+        for symbol, leg in engine.legs.items():
+            signal = leg.generate_signal(leg._compute_microstructure())
+            if signal:
+                expected[symbol] = signal.signal_type
+        got = {leg.symbol: signal.signal_type for leg, signal in engine.analyze()}
+        assert got == expected
+        produced += len(got)
+
+    assert produced > 0
+    # The screen only calls generate_signal where a signal is possible
+    assert engine.generate_signal_calls < engine.legs_analyzed
+
+
+def test_shared_threads_trade_every_symbol(monkeypatch):
+    terminal = MultiReplayMT5(SYMBOLS)
+    patch_mt5(terminal, monkeypatch.setattr)
+
+    engine = MultiSymbolEngine(make_configs(tick_ingestion_mode='poll'))
+    assert engine.start()
+    try:
+        rng = np.random.default_rng(4)
+        now_msc = int(time.time() * 1000)
+        for i in range(400):
+            for symbol in SYMBOLS:
+                tick = make_tick(symbol, i, rng)
+                terminal.set_tick(symbol, now_msc + i, tick.bid, tick.ask, tick.last, tick.volume)
+            time.sleep(0.002)
+        deadline = time.time() + 2.0
+        while time.time() < deadline and engine.analysis_passes == 0:
+            time.sleep(0.01)
+    finally:
+        engine.stop()
+        symbol_specs.get_symbol_spec_cache().invalidate()
+
+    stats = engine.get_performance_stats()
+    assert stats['threads'] == 3
+    assert stats['analysis_passes'] > 0
+    assert set(stats['symbols']) == set(SYMBOLS)
+    for symbol, leg in engine.legs.items():
+        assert leg.tick_seq > 0
+        assert not leg.is_running
+    assert not engine.data_thread.is_alive()
+    assert not engine.analysis_thread.is_alive()
+    assert not engine.execution_thread.is_alive()
@@ -0,0 +1,161 @@
+"""
+Tests for the notification outbox
+"""
+
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import pytest
+
+from aventa_hft_core import Signal, TickData, UltraLowLatencyEngine
+from config_manager import ConfigManager
+from notification_outbox import NotificationOutbox
+from tick_replay import patch_mt5, ReplayMT5
+
+
+class Recorder:
+    def __init__(self, gate=None):
+        self.calls = []
+        self.threads = set()
+        self.gate = gate
+
+    def __call__(self, signal_type, **fields):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.threads.add(threading.current_thread().name)
+        self.calls.append((signal_type, fields))
+
+
+def test_delivers_in_order_on_one_consumer():
+    recorder = Recorder()
+    outbox = NotificationOutbox(recorder, name='TestOutbox')
+    for i in range(20):
+        assert outbox.post('open_position', n=i)
+    assert outbox.flush()
+
+    assert [fields['n'] for _, fields in recorder.calls] == list(range(20))
+    assert recorder.threads == {'TestOutbox'}
+    stats = outbox.get_stats()
+    assert stats['posted'] == stats['delivered'] == 20
+    assert stats['depth'] == 0
+    outbox.stop()
+
+
+def test_post_does_not_wait_for_slow_delivery():
+    gate = threading.Event()
+    outbox = NotificationOutbox(Recorder(gate))
+    start = time.perf_counter()
+    for i in range(50):
+        outbox.post('close_position', n=i)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert outbox.get_stats()['max_depth'] >= 49
+    gate.set()
+    assert outbox.flush()
+    outbox.stop()
+
+
+@pytest.mark.parametrize('overflow, expected', [('drop_oldest', [0, 3, 4]), ('drop_newest', [0, 1, 2])])
+def test_overflow_policies(overflow, expected):
+    gate = threading.Event()
+    recorder = Recorder(gate)
+    outbox = NotificationOutbox(recorder, maxsize=2, overflow=overflow)
+    outbox.post('open_position', n=0)
+    while outbox.depth:  # consumer holds record 0 at the gate
+        time.sleep(0.001)
+    results = [outbox.post('open_position', n=i) for i in range(1, 5)]
+    gate.set()
+    assert outbox.flush()
+
+    assert [fields['n'] for _, fields in recorder.calls] == expected
+    assert outbox.get_stats()['dropped'] == 2
+    assert results == ([True] * 4 if overflow == 'drop_oldest' else [True, True, False, False])
+    outbox.stop()
+
+
+def test_coalesce_key_keeps_latest_pending():
+    gate = threading.Event()
+    recorder = Recorder(gate)
+    outbox = NotificationOutbox(recorder)
+    outbox.post('status', n=0)
+    while outbox.depth:
+        time.sleep(0.001)
+    for i in range(1, 4):
+        outbox.post('status', coalesce_key='status', n=i)
+    outbox.post('open_position', n=9)
+    gate.set()
+    assert outbox.flush()
+
+    assert [fields['n'] for _, fields in recorder.calls] == [0, 3, 9]
+    assert outbox.get_stats()['coalesced'] == 2
+    outbox.stop()
+
+
+def test_failing_delivery_is_counted():
+    def deliver(signal_type, **fields):
+        raise RuntimeError("telegram down")
+
+    outbox = NotificationOutbox(deliver)
+    outbox.post('open_position')
+    assert outbox.flush()
+    assert outbox.get_stats()['failed'] == 1
+    outbox.stop()
+
+
+def test_stop_delivers_pending():
+    recorder = Recorder()
+    outbox = NotificationOutbox(recorder)
+    for i in range(5):
+        outbox.post('open_position', n=i)
+    outbox.stop()
+    assert len(recorder.calls) == 5
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        NotificationOutbox(lambda signal_type, **fields: None, overflow='block')
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    terminal = ReplayMT5('XAUUSD', balance=10000.0)
+    terminal.set_tick(int(time.time() * 1000), 2600.00, 2600.20, 2600.10, 1)
+    patch_mt5(terminal, monkeypatch.setattr)
+    return terminal
+
+
+def test_engine_open_position_does_not_wait_for_telegram(terminal):
+    gate = threading.Event()
+    received = []
+
+    def callback(**data):
+        gate.wait(5)
+        received.append(data)
+
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update({'max_floating_profit': 0, 'min_trade_interval': 0.0, 'use_market_data_hub': False})
+    engine = UltraLowLatencyEngine('XAUUSD', config, telegram_callback=callback)
+    assert engine.initialize()
+    engine.process_tick(TickData(timestamp=time.time(), bid=2600.00, ask=2600.20, last=2600.10,
+                                 volume=1, spread=0.20))
+    signal = Signal(timestamp=time.time(), signal_type='BUY', strength=0.9, price=2600.20,
+                    stop_loss=2595.20, take_profit=2605.20, volume=0.01, reason='test')
+
+    assert engine.open_position('BUY', signal)
+    assert received == []  # the callback is still blocked; the order went out anyway
+    gate.set()
+    assert engine.notifications.flush()
+
+    assert len(received) == 1
+    data = received[0]
+    assert data['signal_type'] == 'open_position'
+    assert data['order_type'] == 'BUY'
+    assert data['balance'] == pytest.approx(10000.0)
+    assert data['total_volume_today'] == pytest.approx(0.01)
+    assert engine.get_performance_stats()['notifications']['delivered'] == 1
+    engine.notifications.stop()
@@ -0,0 +1,107 @@
+"""
+Tests for the vectorized batch order-flow path
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import account_cache
+import aventa_hft_core
+from aventa_hft_core import TickData, UltraLowLatencyEngine
+from order_flow import compute_order_flow
+from tick_replay import MT5_TICK_DTYPE
+from tick_ring_buffer import ticks_from_mt5
+
+
+@pytest.fixture(autouse=True)
+def stub_terminal(monkeypatch):
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+
+
+def make_rows(n, seed=0, start_msc=1_767_657_000_000):
+    """Random ticks with flat moves, last on both sides of mid, zero volumes and a day rollover"""
+    rng = np.random.default_rng(seed)
+    rows = np.zeros(n, dtype=MT5_TICK_DTYPE)
+    rows['time_msc'] = start_msc + np.cumsum(rng.integers(1, 400, n))
+    rows['time'] = rows['time_msc'] // 1000
+    rows['bid'] = 2600.0 + np.cumsum(rng.choice([-0.01, 0.0, 0.0, 0.01], n))
+    rows['ask'] = rows['bid'] + rng.choice([0.1, 0.2], n)
+    rows['last'] = rows['bid'] + rng.choice([0.0, 0.05, 0.1, 0.15, 0.2], n)
+    rows['volume'] = rng.choice([0, 1, 2, 5], n)
+    return rows
+
+
+def per_tick_engine(rows):
+    engine = UltraLowLatencyEngine('XAUUSD', {'magic_number': 1, 'use_market_data_hub': False})
+    for row in rows:
+        engine.process_tick(TickData(timestamp=row['time_msc'] / 1000.0, bid=float(row['bid']),
+                                     ask=float(row['ask']), last=float(row['last']),
+                                     volume=int(row['volume']), spread=float(row['ask'] - row['bid'])))
+    return engine
+
+
+def test_batch_matches_per_tick_bit_for_bit():
+    rows = make_rows(3000)
+    reference = per_tick_engine(rows)
+    expected = reference.orderflow_buffer.last_n(5000)
+
+    rng = np.random.default_rng(1)
+    cuts = np.sort(rng.choice(np.arange(1, len(rows)), 40, replace=False))
+    prev_last, cumulative = None, 0.0
+    parts = []
+    for batch in np.split(rows, cuts):
+        flow, cumulative = compute_order_flow(ticks_from_mt5(batch), prev_last, cumulative)
+        prev_last = float(batch['last'][-1])
+        parts.append(flow)
+    actual = np.concatenate(parts)
+
+    assert len(actual) == len(rows) - 1
+    assert actual.tobytes() == np.asarray(expected).tobytes()
+    assert cumulative == reference.cumulative_delta
+
+
+def test_engine_batch_path_matches_process_tick():
+    rows = make_rows(2500, seed=4, start_msc=1_767_657_000_000 + 86_400_000 - 400_000)
+    reference = per_tick_engine(rows)
+
+    engine = UltraLowLatencyEngine('XAUUSD', {'magic_number': 1, 'use_market_data_hub': False})
+    for batch in np.array_split(rows, 13):
+        engine.process_tick_batch(ticks_from_mt5(batch))
+
+    assert engine.tick_seq == reference.tick_seq == len(rows)
+    assert engine.tick_buffer.last_n(10000).tobytes() == reference.tick_buffer.last_n(10000).tobytes()
+    assert engine.orderflow_buffer.last_n(5000).tobytes() == reference.orderflow_buffer.last_n(5000).tobytes()
+    assert engine.last_tick == reference.last_tick
+    assert engine.cumulative_delta == reference.cumulative_delta
+    assert engine.analyze_microstructure() == reference.analyze_microstructure()
+    # The batch crossed midnight: both profiles hold only the new day
+    assert engine.volume_profile.session == reference.volume_profile.session
+    assert engine.volume_profile.total_volume == reference.volume_profile.total_volume
+
+
+def test_hub_publishes_batch_order_flow():
+    from market_data_hub import MarketDataHub
+
+    rows = make_rows(500, seed=7)
+    hub = MarketDataHub('XAUUSD', autostart=False)
+    batches = iter(np.array_split(rows, 5))
+    hub.ingestor.fetch = lambda: next(batches)
+    for _ in range(5):
+        hub.ingest_once()
+
+    reference = per_tick_engine(rows)
+    assert hub.orderflow_buffer.last_n(5000).tobytes() == reference.orderflow_buffer.last_n(5000).tobytes()
+    assert hub.last_tick == reference.last_tick
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
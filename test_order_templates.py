@@ -0,0 +1,104 @@
+"""
+Tests for the pre-built order request templates
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import pytest
+
+from aventa_hft_core import Signal, TickData, UltraLowLatencyEngine
+from config_manager import ConfigManager
+from tick_replay import patch_mt5, ReplayMT5, ReplaySymbol
+
+
+def make_terminal(monkeypatch, spec=None):
+    terminal = ReplayMT5('XAUUSD', spec, balance=10000.0)
+    terminal.set_tick(int(time.time() * 1000), 2600.00, 2600.20, 2600.10, 1)
+    patch_mt5(terminal, monkeypatch.setattr)
+    return terminal
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    return make_terminal(monkeypatch)
+
+
+def make_engine(**overrides):
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update({'magic_number': 7, 'max_floating_profit': 0, 'min_trade_interval': 0.0,
+                   'use_market_data_hub': False, 'slippage': 15, 'filling_mode': 'IOC'})
+    config.update(overrides)
+    engine = UltraLowLatencyEngine('XAUUSD', config)
+    assert engine.initialize()
+    engine.process_tick(TickData(timestamp=time.time(), bid=2600.00, ask=2600.20, last=2600.10,
+                                 volume=1, spread=0.20))
+    return engine
+
+
+def buy_signal():
+    return Signal(timestamp=time.time(), signal_type='BUY', strength=0.9, price=2600.20,
+                  stop_loss=2595.20, take_profit=2605.20, volume=0.02, reason='test')
+
+
+def test_requests_match_the_per_order_dicts(terminal):
+    engine = make_engine()
+    sent = []
+    send = terminal.order_send
+    terminal.order_send = lambda request: sent.append(request) or send(request)
+    terminal.call_counts.clear()
+
+    assert engine.open_position('BUY', buy_signal())
+    assert engine.close_position()
+    assert terminal.call_counts['symbol_info'] == 0
+    assert terminal.call_counts['order_check'] == 0
+
+    common = {'action': terminal.TRADE_ACTION_DEAL, 'symbol': 'XAUUSD', 'deviation': 15, 'magic': 7,
+              'type_time': terminal.ORDER_TIME_GTC, 'type_filling': terminal.ORDER_FILLING_IOC}
+    assert sent[0] == dict(common, volume=0.02, type=terminal.ORDER_TYPE_BUY, price=2600.20,
+                           sl=2595.20, tp=2605.20, comment='AvHFTPro2026_BUY')
+    position = sent[1]['position']
+    assert sent[1] == dict(common, volume=0.02, type=terminal.ORDER_TYPE_SELL, position=position,
+                           price=2600.00, comment='AvHFTPro2026_CLOSE')
+    # Per-order fields never leak into the templates
+    assert 'volume' not in engine.order_templates.open['BUY']
+    assert 'position' not in engine.order_templates.close[terminal.ORDER_TYPE_BUY]
+
+
+def test_config_change_rebuilds_templates(terminal):
+    engine = make_engine()
+    builds = engine.order_templates.builds
+    engine.update_config({'slippage': 40, 'magic_number': 9, 'filling_mode': 'RETURN'})
+    templates = engine.order_templates
+    assert templates.builds == builds + 1 and templates.version == engine.config_version
+    for template in list(templates.open.values()) + list(templates.close.values()):
+        assert (template['deviation'], template['magic'], template['type_filling']) == \
+            (40, 9, terminal.ORDER_FILLING_RETURN)
+
+    # A version bump that skipped update_config() is rebuilt lazily on the next order
+    engine.config_version += 1
+    assert engine.get_order_templates().builds == builds + 2
+
+
+def test_order_check_runs_at_build_not_per_order(monkeypatch):
+    # Symbol allows IOC only: the FOK templates are flagged once, at initialize()
+    terminal = make_terminal(monkeypatch, ReplaySymbol(filling_mode=2))
+    engine = make_engine(filling_mode='FOK')
+    assert terminal.call_counts['order_check'] == 2
+    assert not engine.order_templates.valid
+    assert engine.order_templates.checks['BUY'][0] == terminal.TRADE_RETCODE_INVALID_FILL
+
+    engine.update_config({'filling_mode': 'IOC'})
+    assert terminal.call_counts['order_check'] == 4
+    assert engine.order_templates.valid
+    assert engine.get_performance_stats()['order_templates']['valid']
+
+    engine.update_config({'order_check_templates': False})
+    assert terminal.call_counts['order_check'] == 4 and engine.order_templates.checks == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
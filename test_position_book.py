@@ -0,0 +1,165 @@
+"""
+Tests for the incrementally maintained position book
+"""
+
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import pytest
+
+import position_book
+from aventa_hft_core import Signal, TickData, UltraLowLatencyEngine
+from config_manager import ConfigManager
+from position_book import PositionBook
+from tick_replay import patch_mt5, ReplayMT5, ReplaySymbol
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    terminal = ReplayMT5('XAUUSD', balance=10000.0)
+    terminal.set_tick(int(time.time() * 1000), 2600.00, 2600.20, 2600.10, 1)
+    patch_mt5(terminal, monkeypatch.setattr)
+    return terminal
+
+
+def make_engine(**overrides):
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update({'magic_number': 7, 'max_floating_profit': 0, 'min_trade_interval': 0.0,
+                   'use_market_data_hub': False, 'position_reconcile_interval': 60.0})
+    config.update(overrides)
+    engine = UltraLowLatencyEngine('XAUUSD', config)
+    assert engine.initialize()
+    return engine
+
+
+def quote(terminal, engine, bid, ask):
+    terminal.set_tick(int(time.time() * 1000), bid, ask, (bid + ask) / 2, 1)
+    engine.process_tick(TickData(timestamp=time.time(), bid=bid, ask=ask, last=(bid + ask) / 2,
+                                 volume=1, spread=ask - bid))
+
+
+def signal(side, price, volume=0.01):
+    sign = 1 if side == 'BUY' else -1
+    return Signal(timestamp=time.time(), signal_type=side, strength=0.9, price=price,
+                  stop_loss=price - sign * 5.0, take_profit=price + sign * 5.0, volume=volume, reason='test')
+
+
+def terminal_own_profit(terminal, magic=7):
+    return sum(p.profit for p in terminal.positions.values() if p.magic == magic)
+
+
+def test_fills_and_marks_match_terminal_without_positions_get(terminal):
+    engine = make_engine()
+    quote(terminal, engine, 2600.00, 2600.20)
+    terminal.call_counts.clear()
+
+    assert engine.open_position('BUY', signal('BUY', 2600.20, 0.02))
+    assert engine.open_position('SELL', signal('SELL', 2600.00, 0.03))
+    book = engine.position_book
+    assert set(book.positions) == set(terminal.positions)
+
+    for bid in (2600.50, 2599.40, 2601.05, 2598.75):
+        quote(terminal, engine, bid, bid + 0.20)
+        assert engine.get_position_book().own_profit == pytest.approx(terminal_own_profit(terminal), abs=0.01)
+        assert engine.get_total_floating_loss() == pytest.approx(
+            sum(-p.profit for p in terminal.positions.values() if p.profit < 0), abs=0.01)
+    assert engine.get_current_positions_count() == 2
+    assert engine.get_total_position_volume() == pytest.approx(0.05)
+    assert engine.verify_position_exists()
+
+    assert engine.close_position()
+    assert engine.get_current_positions_count() == 1
+    assert len(terminal.positions) == 1
+    # Gates, reads and the close all came from the book
+    assert terminal.call_counts['positions_get'] == 0
+    assert book.get_stats()['fills_applied'] == 3
+
+
+def test_reconcile_picks_up_other_magics_and_measures_drift(terminal):
+    engine = make_engine(position_reconcile_interval=0.5)
+    quote(terminal, engine, 2600.00, 2600.20)
+    assert engine.open_position('BUY', signal('BUY', 2600.20))
+    terminal.order_send({'type': terminal.ORDER_TYPE_SELL, 'volume': 0.5, 'magic': 99})
+
+    # Not due yet: the other bot's position is unknown to the book
+    assert engine.get_current_positions_count() == 1
+    engine.position_book.last_reconcile -= 1.0
+    assert engine.get_current_positions_count() == 2
+    assert engine.get_floating_pnl() == pytest.approx(sum(p.profit for p in terminal.positions.values()))
+    assert engine.get_position_book().own_count == 1
+    assert abs(engine.get_position_book_stats()['last_drift']) < 0.01
+
+
+def test_crossed_take_profit_forces_reconcile(terminal):
+    engine = make_engine()
+    quote(terminal, engine, 2600.00, 2600.20)
+    assert engine.open_position('BUY', signal('BUY', 2600.20))
+    assert engine.verify_position_exists()
+
+    # The server closes the position at TP; the tick that crossed it marks the book stale
+    quote(terminal, engine, 2605.40, 2605.60)
+    assert not terminal.positions
+    assert engine.position_book.stale
+    assert not engine.verify_position_exists()
+    assert engine.get_total_floating_profit() == 0.0
+
+
+def test_failed_reconcile_keeps_the_book(terminal, monkeypatch):
+    engine = make_engine(position_reconcile_interval=0.0)
+    quote(terminal, engine, 2600.00, 2600.20)
+    assert engine.open_position('BUY', signal('BUY', 2600.20))
+
+    monkeypatch.setattr(terminal, 'positions_get', lambda **kwargs: None)
+    assert engine.verify_position_exists()
+    assert engine.get_position_book_stats()['failed_reconciles'] >= 1
+    # close_all never acts on an unconfirmed book
+    assert engine.close_all_positions() == 0
+    assert len(terminal.positions) == 1
+
+
+def test_magic_change_recomputes_own_totals():
+    book = PositionBook('XAUUSD', magic=1)
+    book.set_spec(SimpleNamespace(trade_tick_size=0.01, trade_tick_value=1.0))
+    book.mark(2600.00, 2600.20)
+    buy = position_book.mt5.ORDER_TYPE_BUY
+    book.on_open(SimpleNamespace(order=11, volume=0.1, price=2600.20), buy)
+    book.mark(2601.00, 2601.20)
+    assert book.own_count == 1 and book.own_profit == pytest.approx(8.0)
+
+    book.set_magic(2)
+    assert book.own_count == 0 and book.own_profit == 0.0
+    assert book.count == 1 and book.profit == pytest.approx(8.0)
+    book.on_close(11)
+    assert book.count == 0 and book.volume == 0.0
+
+
+def test_marks_with_tick_value_for_non_account_quotes(monkeypatch):
+    # USDJPY on a USD account: 1 tick (0.001) of 1 lot is worth ~0.67 USD, not 0.001 * 100000
+    spec = ReplaySymbol(point=0.001, digits=3, trade_contract_size=100000.0, trade_tick_size=0.001,
+                        trade_tick_value=0.67)
+    terminal = ReplayMT5('USDJPY', spec, balance=10000.0)
+    terminal.set_tick(int(time.time() * 1000), 150.000, 150.010, 150.005, 1)
+    patch_mt5(terminal, monkeypatch.setattr)
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update({'magic_number': 7, 'max_floating_profit': 0, 'min_trade_interval': 0.0,
+                   'use_market_data_hub': False, 'position_reconcile_interval': 60.0})
+    engine = UltraLowLatencyEngine('USDJPY', config)
+    assert engine.initialize()
+    quote(terminal, engine, 150.000, 150.010)
+    assert engine.open_position('BUY', Signal(timestamp=time.time(), signal_type='BUY', strength=0.9,
+                                              price=150.010, stop_loss=149.000, take_profit=151.000,
+                                              volume=0.10, reason='test'))
+
+    quote(terminal, engine, 150.110, 150.120)
+    (ticket, position), = terminal.positions.items()
+    book = engine.position_book
+    assert book.positions[ticket].profit == pytest.approx(position.profit, abs=0.01)
+    assert book.own_profit == pytest.approx(100 * 0.67 * 0.10, abs=0.01)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
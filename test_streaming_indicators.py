@@ -0,0 +1,122 @@
+"""
+Streaming indicators must match the batch kernels in fast_indicators.py
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+from fast_indicators import ema_fast, rsi_fast, atr_fast, momentum_fast
+from streaming_indicators import (
+    StreamingEMA, StreamingRSI, StreamingATR, StreamingMomentum, IndicatorBank
+)
+
+TOLERANCE = 1e-9
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(42)
+    return 2600.0 + np.cumsum(rng.normal(0, 0.05, 600))
+
+
+@pytest.mark.parametrize("period", [3, 7, 21, 50])
+def test_ema_matches_batch(prices, period):
+    stream = StreamingEMA(period)
+    batch = ema_fast(prices, period)
+    for i, p in enumerate(prices):
+        assert stream.update(p) == pytest.approx(batch[i], abs=TOLERANCE)
+
+
+@pytest.mark.parametrize("period", [2, 7, 14])
+def test_rsi_matches_batch(prices, period):
+    stream = StreamingRSI(period)
+    for p in prices[:period + 1]:
+        stream.update(p)
+    # Compare at every length from warm-up onwards (batch value at its last index)
+    for n in range(period + 1, len(prices), 37):
+        while stream.count < n:
+            stream.update(prices[stream.count])
+        assert stream.value == pytest.approx(rsi_fast(prices[:n], period)[-1], abs=TOLERANCE)
+
+
+@pytest.mark.parametrize("period", [5, 14])
+def test_atr_matches_batch(prices, period):
+    high = prices * 1.0001
+    low = prices * 0.9999
+    stream = StreamingATR(period)
+    for i in range(period + 1):
+        stream.update(high[i], low[i], prices[i])
+    for n in range(period + 1, len(prices), 41):
+        while stream.count < n:
+            i = stream.count
+            stream.update(high[i], low[i], prices[i])
+        assert stream.value == pytest.approx(atr_fast(high[:n], low[:n], prices[:n], period)[-1], abs=TOLERANCE)
+
+
+@pytest.mark.parametrize("period", [1, 5, 10])
+def test_momentum_matches_batch(prices, period):
+    stream = StreamingMomentum(period)
+    batch = momentum_fast(prices, period)
+    for i, p in enumerate(prices):
+        assert stream.update(p) == pytest.approx(batch[i], abs=TOLERANCE)
+
+
+def test_bank_shares_instances_and_backfills(prices):
+    bank = IndicatorBank()
+    fast = bank.get('ema', 7)
+    assert bank.get('ema', 7) is fast
+    for p in prices[:300]:
+        bank.update(p)
+
+    # Created later: back-filled from history, then streamed
+    late = bank.get('rsi', 14, history=prices[:300])
+    for p in prices[300:]:
+        bank.update(p)
+
+    assert len(bank) == 2
+    assert fast.value == pytest.approx(ema_fast(prices, 7)[-1], abs=TOLERANCE)
+    assert late.value == pytest.approx(rsi_fast(prices, 14)[-1], abs=TOLERANCE)
+    assert bank.peek('atr', 14) is None
+
+
+def test_engine_uses_streamed_values(monkeypatch, prices):
+    import account_cache
+    import aventa_hft_core
+    from aventa_hft_core import TickData
+
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+
+    config = {'magic_number': 1, 'ema_fast_period': 7, 'ema_slow_period': 21,
+              'rsi_period': 7, 'atr_period': 14, 'momentum_period': 5}
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', config)
+    for i, mid in enumerate(prices):
+        engine.process_tick(TickData(timestamp=float(i), bid=mid - 0.01, ask=mid + 0.01,
+                                     last=mid, volume=1, spread=0.02))
+
+    mids = engine.tick_buffer.column('mid', len(prices))
+    result = engine.analyze_microstructure()
+    assert result['ema_fast'] == pytest.approx(ema_fast(mids, 7)[-1], abs=TOLERANCE)
+    assert result['ema_slow'] == pytest.approx(ema_fast(mids, 21)[-1], abs=TOLERANCE)
+    assert result['rsi'] == pytest.approx(rsi_fast(mids, 7)[-1], abs=TOLERANCE)
+    assert result['momentum'] == pytest.approx(momentum_fast(mids, 5)[-1], abs=TOLERANCE)
+
+    # Period change: analysis requests it, data thread builds it from history
+    config['ema_fast_period'] = 9
+    engine.analyze_microstructure()
+    engine.process_tick(TickData(timestamp=1e6, bid=2600.0, ask=2600.02, last=2600.01, volume=1, spread=0.02))
+    mids = engine.tick_buffer.column('mid', len(engine.tick_buffer))
+    result = engine.analyze_microstructure()
+    assert result['ema_fast'] == pytest.approx(ema_fast(np.ascontiguousarray(mids), 9)[-1], abs=TOLERANCE)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,125 @@
+"""
+Tests for the shared symbol specification cache
+"""
+
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import pytest
+
+import symbol_specs
+from symbol_specs import SymbolSpecCache
+
+
+class SpecStub:
+    """symbol_info / symbols_get with call counting"""
+
+    def __init__(self):
+        self.calls = 0
+        self.list_calls = 0
+        self.contract_size = 100.0
+
+    def symbol_info(self, symbol):
+        self.calls += 1
+        if symbol != 'XAUUSD':
+            return None
+        return SimpleNamespace(name=symbol, point=0.01, digits=2, trade_contract_size=self.contract_size,
+                               trade_stops_level=10, filling_mode=3, volume_min=0.01, volume_max=100.0,
+                               volume_step=0.01, trade_tick_size=0.01, trade_tick_value=1.0,
+                               visible=True, spread=20)
+
+    def symbols_get(self):
+        self.list_calls += 1
+        return [SimpleNamespace(name='XAUUSD'), SimpleNamespace(name='EURUSD')]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    stub = SpecStub()
+    monkeypatch.setattr(symbol_specs, 'mt5', stub)
+    return stub
+
+
+def test_repeat_lookups_hit_cache(stub):
+    cache = SymbolSpecCache(ttl=60.0)
+    spec = cache.get('XAUUSD')
+    for _ in range(9):
+        assert cache.get('XAUUSD') is spec
+
+    assert spec.trade_contract_size == 100.0
+    assert spec.trade_stops_level == 10
+    assert spec.volume_step == 0.01
+    assert stub.calls == 1
+    stats = cache.get_stats()
+    assert stats['symbol_info_calls'] == 1
+    assert stats['calls_saved'] == 9
+    assert stats['hit_rate'] == pytest.approx(90.0)
+
+
+def test_ttl_expiry_and_explicit_refresh(stub, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(symbol_specs, 'time', lambda: now[0])
+    cache = SymbolSpecCache(ttl=10.0)
+    cache.get('XAUUSD')
+
+    now[0] += 5.0
+    cache.get('XAUUSD')
+    assert stub.calls == 1
+
+    now[0] += 6.0
+    cache.get('XAUUSD')
+    assert stub.calls == 2
+
+    stub.contract_size = 1.0
+    assert cache.refresh('XAUUSD').trade_contract_size == 1.0
+    assert stub.calls == 3
+
+    cache.invalidate('XAUUSD')
+    cache.get('XAUUSD')
+    assert stub.calls == 4
+
+
+def test_unknown_symbol_is_not_cached(stub):
+    cache = SymbolSpecCache()
+    assert cache.get('NOPE') is None
+    assert cache.get('NOPE') is None
+    assert stub.calls == 2
+
+
+def test_failed_refresh_keeps_last_spec(stub, monkeypatch):
+    cache = SymbolSpecCache()
+    spec = cache.get('XAUUSD')
+    monkeypatch.setattr(stub, 'symbol_info', lambda symbol: None)
+    assert cache.refresh('XAUUSD') is spec
+
+
+def test_symbol_names_cached(stub):
+    cache = SymbolSpecCache()
+    assert cache.symbol_names() == ['XAUUSD', 'EURUSD']
+    assert cache.symbol_names() == ['XAUUSD', 'EURUSD']
+    assert stub.list_calls == 1
+    cache.invalidate()
+    cache.symbol_names()
+    assert stub.list_calls == 2
+    assert cache.get_stats()['symbols_get_saved'] == 1
+
+
+def test_backtester_lookups_share_cache(stub, monkeypatch):
+    import strategy_backtester
+    from strategy_backtester import StrategyBacktester
+
+    monkeypatch.setattr(strategy_backtester, 'mt5', MagicMock(
+        symbol_info_tick=lambda symbol: SimpleNamespace(ask=2600.0)))
+    symbol_specs.get_symbol_spec_cache().invalidate()
+
+    config = {'symbol': 'XAUUSD', 'default_volume': 0.01, 'magic_number': 1}
+    for _ in range(3):
+        backtester = StrategyBacktester(config)
+        backtester._get_symbol_info()
+        assert backtester.find_symbol_in_mt5('xauusd') == 'XAUUSD'
+
+    assert stub.calls == 1
+    assert stub.list_calls == 1
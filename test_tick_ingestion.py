@@ -0,0 +1,159 @@
+"""
+Tests for cursor-based batch tick ingestion (copy_ticks_from)
+Runs against a stubbed MetaTrader5 module - no terminal required
+"""
+
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import account_cache
+import aventa_hft_core
+import tick_ingestion
+from tick_ingestion import TickIngestor
+from tick_ring_buffer import ticks_from_mt5
+
+
+MT5_TICK_DTYPE = np.dtype([
+    ('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'),
+    ('volume', '<u8'), ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8'),
+])
+
+
+def make_ticks(time_msc_list, start_price=2600.0):
+    """Build an MT5-style structured tick array"""
+    ticks = np.zeros(len(time_msc_list), dtype=MT5_TICK_DTYPE)
+    ticks['time_msc'] = time_msc_list
+    ticks['time'] = ticks['time_msc'] // 1000
+    ticks['bid'] = start_price + np.arange(len(ticks)) * 0.01
+    ticks['ask'] = ticks['bid'] + 0.02
+    ticks['last'] = ticks['bid'] + 0.01
+    ticks['volume'] = 1
+    return ticks
+
+
+class StubMT5:
+    """Minimal MetaTrader5 stand-in serving a scripted tick stream"""
+
+    COPY_TICKS_ALL = -1
+
+    def __init__(self, ticks):
+        self.ticks = ticks
+        self.arrived = 0
+        self.copy_calls = 0
+
+    def release(self, n):
+        """Make the next n ticks visible to the terminal API"""
+        self.arrived = min(len(self.ticks), self.arrived + n)
+
+    def symbol_info_tick(self, symbol):
+        if self.arrived == 0:
+            return None
+        t = self.ticks[self.arrived - 1]
+        return SimpleNamespace(time=int(t['time']), time_msc=int(t['time_msc']),
+                               bid=float(t['bid']), ask=float(t['ask']),
+                               last=float(t['last']), volume=int(t['volume']))
+
+    def copy_ticks_from(self, symbol, date_from, count, flags):
+        self.copy_calls += 1
+        visible = self.ticks[:self.arrived]
+        start = np.searchsorted(visible['time_msc'], int(date_from) * 1000, side='left')
+        return visible[start:start + count].copy()
+
+    def account_info(self):
+        return None
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    # Several ticks share a millisecond and many share a second
+    times = [1_700_000_000_000 + i * 250 for i in range(20)]
+    times[5] = times[4]
+    times[6] = times[4]
+    fake = StubMT5(make_ticks(times))
+    monkeypatch.setattr(tick_ingestion, 'mt5', fake)
+    monkeypatch.setattr(aventa_hft_core, 'mt5', fake)
+    monkeypatch.setattr(account_cache, 'mt5', fake)
+    return fake
+
+
+def test_each_tick_ingested_exactly_once(stub):
+    ingestor = TickIngestor('XAUUSD', batch_size=100)
+    collected = []
+
+    for step in [1, 0, 3, 2, 0, 0, 5, 1, 8]:
+        stub.release(step)
+        rows = ingestor.fetch()
+        collected.extend(rows['time_msc'].tolist() if len(rows) else [])
+
+    assert collected == stub.ticks['time_msc'][:stub.arrived].tolist()
+    stats = ingestor.get_stats()
+    assert stats['ticks_ingested'] == stub.arrived
+    assert stats['duplicates_dropped'] > 0
+    assert stats['empty_polls'] >= 3
+
+
+def test_ticks_sharing_a_millisecond_are_not_dropped(stub):
+    ingestor = TickIngestor('XAUUSD', batch_size=100)
+
+    # First fetch starts at the current tick's second
+    stub.release(1)
+    assert len(ingestor.fetch()) == 1
+
+    # Split delivery in the middle of the three ticks sharing time_msc
+    stub.release(4)
+    first = ingestor.fetch()
+    stub.release(2)
+    second = ingestor.fetch()
+
+    assert len(first) == 4
+    assert len(second) == 2
+    assert second['time_msc'][0] == stub.ticks['time_msc'][5]
+
+
+def test_saturated_batch_widens_request(stub):
+    ingestor = TickIngestor('XAUUSD', batch_size=2)
+
+    stub.release(4)
+    assert len(ingestor.fetch()) == 2
+    assert len(ingestor.fetch()) == 2
+    stub.release(3)
+    # The cursor second already holds more than batch_size ticks
+    assert len(ingestor.fetch()) > 0
+
+
+def test_batch_stats_reported(stub):
+    ingestor = TickIngestor('XAUUSD', batch_size=100)
+    for step in [1, 7, 3]:
+        stub.release(step)
+        ingestor.fetch()
+
+    stats = ingestor.get_stats()
+    assert stats['batches'] == 3
+    assert stats['max_batch_size'] == 7
+    assert stats['last_batch_size'] == 3
+    assert stats['avg_batch_size'] == pytest.approx(11 / 3)
+
+
+def test_engine_order_flow_sees_each_tick_once(stub):
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', {'magic_number': 1})
+    assert engine.tick_ingestion_mode == 'batch'
+
+    for step in [1, 3, 0, 0, 6, 0, 10]:
+        stub.release(step)
+        engine.process_tick_batch(ticks_from_mt5(engine.fetch_new_tick_rows()))
+
+    assert len(engine.tick_buffer) == len(stub.ticks)
+    # First tick only seeds the order-flow state
+    assert len(engine.orderflow_buffer) == len(stub.ticks) - 1
+    assert engine.tick_buffer[-1].timestamp == pytest.approx(stub.ticks['time_msc'][-1] / 1000.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
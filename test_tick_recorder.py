@@ -0,0 +1,144 @@
+"""
+Tests for the memory-mapped tick recorder and day-file reader
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+from tick_recorder import (
+    TickRecorder, TickDay, open_tick_day, list_tick_days, load_ticks, RECORD_DTYPE, MS_PER_DAY
+)
+
+POINT = 0.01
+DAY_START = 1_700_006_400_000  # 2023-11-15 00:00:00 UTC
+
+
+MT5_TICK_DTYPE = np.dtype([
+    ('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'),
+    ('volume', '<u8'), ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8'),
+])
+
+
+def make_rows(n, start_msc=DAY_START + 3_600_000, seed=1):
+    rng = np.random.default_rng(seed)
+    rows = np.zeros(n, dtype=MT5_TICK_DTYPE)
+    rows['time_msc'] = start_msc + np.cumsum(rng.integers(0, 300, n))
+    rows['time'] = rows['time_msc'] // 1000
+    rows['bid'] = np.round(2600.0 + np.cumsum(rng.choice([-0.01, 0.0, 0.01], n)), 2)
+    rows['ask'] = rows['bid'] + 0.02
+    rows['last'] = rows['bid'] + 0.01
+    rows['volume'] = rng.integers(1, 5, n)
+    return rows
+
+
+def test_round_trip_is_lossless_to_the_point(tmp_path):
+    rows = make_rows(5000)
+    recorder = TickRecorder('XAUUSD', POINT, root_dir=str(tmp_path), index_interval=256, initial_capacity=1000)
+    for chunk in np.array_split(rows, 17):
+        recorder.record(chunk)
+    recorder.stop()
+
+    day = open_tick_day(str(tmp_path), 'XAUUSD', '20231115')
+    assert len(day) == 5000
+    assert day.records.dtype == RECORD_DTYPE
+    assert isinstance(day.records, np.memmap)
+    np.testing.assert_array_equal(day.time_msc(), rows['time_msc'])
+    np.testing.assert_allclose(day.prices('bid'), rows['bid'], atol=1e-9)
+
+    ticks = day.to_ticks(1000, 1010)
+    np.testing.assert_allclose(ticks['timestamp'], rows['time_msc'][1000:1010] / 1000.0)
+    np.testing.assert_allclose(ticks['spread'], 0.02, atol=1e-9)
+    assert recorder.get_stats()['bytes_written'] == 5000 * RECORD_DTYPE.itemsize
+
+
+def test_index_gives_random_access_by_time(tmp_path):
+    rows = make_rows(3000)
+    recorder = TickRecorder('XAUUSD', POINT, root_dir=str(tmp_path), index_interval=128)
+    recorder.record(rows)
+    recorder.stop()
+
+    day = open_tick_day(str(tmp_path), 'XAUUSD', '20231115')
+    assert len(day.index) == -(-3000 // 128)
+    times = rows['time_msc']
+    for t in [times[0] - 1, times[0], times[777], times[777] + 1, times[-1], times[-1] + 1]:
+        assert day.search_time(t) == np.searchsorted(times, t, side='left')
+    start, stop = day.between(times[100], times[200])
+    assert (start, stop) == (np.searchsorted(times, times[100]), np.searchsorted(times, times[200]))
+
+
+def test_rollover_and_reopen_same_day(tmp_path):
+    late = make_rows(200, start_msc=DAY_START + MS_PER_DAY - 20_000)
+    recorder = TickRecorder('XAUUSD', POINT, root_dir=str(tmp_path))
+    recorder.record(late)
+    recorder.stop()
+    assert list_tick_days(str(tmp_path), 'XAUUSD') == ['20231115', '20231116']
+
+    # Restart on the same day appends after the existing records
+    more = make_rows(50, start_msc=int(late['time_msc'][-1]) + 10, seed=2)
+    recorder = TickRecorder('XAUUSD', POINT, root_dir=str(tmp_path))
+    recorder.record(more)
+    recorder.stop()
+
+    ticks = load_ticks(str(tmp_path), 'XAUUSD', '20231115', '20231116')
+    expected = np.concatenate([late['time_msc'], more['time_msc']])
+    np.testing.assert_array_equal(np.rint(ticks['timestamp'] * 1000).astype(np.int64), expected)
+
+
+def test_background_writer_and_tickdata_input(tmp_path):
+    from aventa_hft_core import TickData
+
+    ticks = [TickData(timestamp=(DAY_START + 1000 * i) / 1000.0, bid=2600.0 + i * POINT,
+                      ask=2600.02 + i * POINT, last=0.0, volume=1, spread=0.02) for i in range(10)]
+    recorder = TickRecorder('XAUUSD', POINT, root_dir=str(tmp_path), flush_interval=0.01)
+    recorder.start()
+    recorder.record(ticks)
+    recorder.stop()
+
+    day = TickDay(str(tmp_path / 'XAUUSD' / 'XAUUSD_20231115.ticks'))
+    np.testing.assert_allclose(day.prices('ask'), [t.ask for t in ticks], atol=1e-9)
+    assert recorder.get_stats()['ticks_recorded'] == 10
+
+
+def test_engine_data_loop_records_batches(tmp_path, monkeypatch):
+    import account_cache
+    import aventa_hft_core
+
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+
+    engine = aventa_hft_core.UltraLowLatencyEngine(
+        'XAUUSD', {'magic_number': 1, 'record_ticks': True, 'tick_record_dir': str(tmp_path),
+                   'trading_sessions_enabled': False})
+    engine.symbol_point = POINT
+    engine.start_tick_recording()
+
+    rows = make_rows(300)
+    batches = iter(np.array_split(rows, 3))
+
+    def fetch():
+        batch = next(batches, None)
+        if batch is None:
+            engine.is_running = False
+            return rows[:0]
+        return batch
+
+    monkeypatch.setattr(engine, 'fetch_new_tick_rows', fetch)
+    engine.is_running = True
+    engine.data_collection_loop()
+    engine.tick_recorder.stop()
+
+    day = open_tick_day(str(tmp_path), 'XAUUSD', '20231115')
+    np.testing.assert_array_equal(day.time_msc(), rows['time_msc'])
+    assert engine.get_performance_stats()['ticks_recorded'] == 300
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
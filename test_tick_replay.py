@@ -0,0 +1,88 @@
+"""
+Tests for the deterministic tick replay harness
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+import aventa_hft_core
+from tick_recorder import TickRecorder, load_ticks
+from tick_replay import TickReplay, ReplayMT5, synthetic_ticks
+
+CONFIG = {
+    'max_spread': 0.5, 'max_volatility': 0.05, 'min_delta_threshold': 30,
+    'min_velocity_threshold': 0.001, 'trading_sessions_enabled': False,
+    'max_floating_loss': 500.0, 'max_floating_profit': 0,
+}
+
+
+def test_replay_is_bit_for_bit_reproducible():
+    ticks = synthetic_ticks(6000, seed=3)
+    first = TickReplay('XAUUSD', CONFIG, ticks).run()
+    second = TickReplay('XAUUSD', CONFIG, ticks).run()
+
+    assert len(first.signals) > 0
+    assert any(t['entry'] == 'OUT' for t in first.trades)
+    assert first.signals == second.signals
+    assert first.trades == second.trades
+    assert first.fingerprint == second.fingerprint
+    for stage in ('process_tick', 'analyze_microstructure', 'generate_signal', 'execute_signal', 'order_send'):
+        assert first.timings[stage]['count'] > 0, stage
+    # Engine modules are restored afterwards
+    assert not isinstance(aventa_hft_core.mt5, ReplayMT5)
+    assert aventa_hft_core.time is time
+
+
+def test_recorded_ticks_replay_like_the_source(tmp_path):
+    ticks = synthetic_ticks(4000, seed=5)
+    recorder = TickRecorder('XAUUSD', 0.01, root_dir=str(tmp_path))
+    recorder.record(ticks)
+    recorder.stop()
+
+    recorded = load_ticks(str(tmp_path), 'XAUUSD', '20260101', '20261231')
+    assert len(recorded) == len(ticks)
+    direct = TickReplay('XAUUSD', CONFIG, ticks).run()
+    replayed = TickReplay('XAUUSD', CONFIG, recorded).run()
+    assert replayed.fingerprint == direct.fingerprint
+
+
+def test_speedup_paces_against_wall_clock():
+    ticks = synthetic_ticks(300, seed=1, mean_interval_ms=10.0)
+    span = ticks['timestamp'][-1] - ticks['timestamp'][0]
+    result = TickReplay('XAUUSD', CONFIG, ticks, speed=10.0).run()
+    assert result.wall_time >= span / 10.0 * 0.95
+    assert result.speedup == pytest.approx(10.0, rel=0.3)
+
+
+def test_terminal_fills_and_stops():
+    mt5 = ReplayMT5('XAUUSD')
+    mt5.set_tick(1_000, 2600.00, 2600.20, 2600.10, 1)
+    result = mt5.order_send({'type': mt5.ORDER_TYPE_BUY, 'volume': 0.1, 'sl': 2599.00,
+                             'tp': 2601.00, 'magic': 7, 'price': 2600.20})
+    assert result.retcode == mt5.TRADE_RETCODE_DONE
+    assert result.price == 2600.20
+    position, = mt5.positions_get(symbol='XAUUSD')
+
+    mt5.set_tick(2_000, 2600.50, 2600.70, 2600.60, 1)
+    assert position.profit == pytest.approx(0.30 * 0.1 * 100)
+
+    mt5.set_tick(3_000, 2601.00, 2601.20, 2601.10, 1)
+    assert mt5.positions_get(symbol='XAUUSD') == ()
+    entry, exit_ = mt5.history_deals_get()
+    assert (entry.entry, exit_.entry) == (mt5.DEAL_ENTRY_IN, mt5.DEAL_ENTRY_OUT)
+    assert exit_.profit == pytest.approx(8.0)
+    assert exit_.comment.startswith('[tp')
+    assert mt5.account_info().balance == pytest.approx(10008.0)
+
+    bad = mt5.order_send({'type': mt5.ORDER_TYPE_SELL, 'volume': 0.1, 'sl': 2600.0, 'tp': 2599.0})
+    assert bad.retcode == mt5.TRADE_RETCODE_INVALID_STOPS
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,138 @@
+"""
+Tests for the columnar tick / order-flow ring buffers
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+from aventa_hft_core import TickData, OrderFlowData
+from tick_ring_buffer import TickRingBuffer, OrderFlowRingBuffer, TICK_DTYPE
+from ml_predictor import FeatureEngineering
+
+
+def make_tick(i):
+    bid = 2600.0 + np.sin(i / 7.0) + i * 0.001
+    return TickData(timestamp=1000.0 + i, bid=bid, ask=bid + 0.02 + (i % 3) * 0.01,
+                    last=bid + 0.01, volume=i % 5, spread=0.02 + (i % 3) * 0.01)
+
+
+def test_last_n_returns_newest_in_order_after_wrap():
+    buf = TickRingBuffer(capacity=8)
+    ticks = [make_tick(i) for i in range(21)]
+    for t in ticks:
+        buf.append(t)
+
+    assert len(buf) == 8
+    assert buf.total_written == 21
+    window = buf.last_n(5)
+    assert window['timestamp'].tolist() == [t.timestamp for t in ticks[-5:]]
+    assert window['mid'][-1] == pytest.approx(ticks[-1].mid_price)
+    assert buf[-1].timestamp == ticks[-1].timestamp
+    assert buf[0].timestamp == ticks[-8].timestamp
+
+
+def test_last_n_is_a_read_only_view():
+    buf = TickRingBuffer(capacity=16)
+    for i in range(40):
+        buf.append(make_tick(i))
+
+    window = buf.last_n(16)
+    assert np.shares_memory(window, buf._data)
+    assert window['mid'].base is not None
+    with pytest.raises(ValueError):
+        window['bid'][0] = 1.0
+
+
+def test_append_many_matches_append():
+    one_by_one = TickRingBuffer(capacity=10)
+    batched = TickRingBuffer(capacity=10)
+    ticks = [make_tick(i) for i in range(37)]
+
+    records = np.zeros(len(ticks), dtype=TICK_DTYPE)
+    for i, t in enumerate(ticks):
+        one_by_one.append(t)
+        records[i] = (t.timestamp, t.bid, t.ask, t.last, t.volume, t.spread, t.mid_price)
+
+    batched.append_many(records[:3])
+    batched.append_many(records[3:9])    # wraps
+    batched.append_many(records[9:])     # larger than capacity
+
+    assert batched.total_written == one_by_one.total_written
+    np.testing.assert_array_equal(batched.last_n(10), one_by_one.last_n(10))
+
+
+def test_features_identical_for_list_and_ring_buffer():
+    ticks = [make_tick(i) for i in range(150)]
+    flows = [OrderFlowData(timestamp=t.timestamp, buy_volume=t.volume, sell_volume=0,
+                           delta=(-1) ** i * t.volume, cumulative_delta=float(i),
+                           imbalance_ratio=(-1) ** i * 1.0) for i, t in enumerate(ticks)]
+    tick_buf = TickRingBuffer(capacity=200)
+    flow_buf = OrderFlowRingBuffer(capacity=200)
+    for t, f in zip(ticks, flows):
+        tick_buf.append(t)
+        flow_buf.append(f)
+
+    from_list = FeatureEngineering.calculate_microstructure_features(ticks)
+    from_buf = FeatureEngineering.calculate_microstructure_features(tick_buf)
+    for key in from_list:
+        assert from_buf[key] == pytest.approx(from_list[key]), key
+
+    from_list = FeatureEngineering.calculate_orderflow_features(flows)
+    from_buf = FeatureEngineering.calculate_orderflow_features(flow_buf)
+    for key in from_list:
+        assert from_buf[key] == pytest.approx(from_list[key]), key
+
+
+def test_engine_microstructure_reads_ring_buffer(monkeypatch):
+    import account_cache
+    import aventa_hft_core
+
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', {'magic_number': 1})
+    ticks = [make_tick(i) for i in range(300)]
+    for t in ticks:
+        engine.tick_buffer.append(t)
+        flow = engine.calculate_order_flow(t)
+        if flow:
+            engine.orderflow_buffer.append(flow)
+
+    result = engine.analyze_microstructure()
+    recent = ticks[-100:]
+    assert result['tick_count'] == 100
+    assert result['avg_spread'] == pytest.approx(np.mean([t.spread for t in recent]))
+    assert result['price_change'] == pytest.approx(recent[-1].mid_price - recent[0].mid_price)
+    assert result['cumulative_delta'] == pytest.approx(engine.cumulative_delta)
+
+
+def test_ring_buffer_smaller_than_dataclass_deque():
+    buf = TickRingBuffer(capacity=10000)
+    # 7 float64 fields, mirrored
+    assert buf.nbytes == 2 * 10000 * 56
+
+
+def test_gui_default_config_keeps_the_10000_tick_history(monkeypatch):
+    import account_cache
+    import aventa_hft_core
+    from config_manager import ConfigManager
+
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+    config = dict(ConfigManager.DEFAULT_CONFIG, use_market_data_hub=False)
+    engine = aventa_hft_core.UltraLowLatencyEngine('XAUUSD', config)
+    assert engine.tick_buffer.capacity == 10000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
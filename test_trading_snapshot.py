@@ -0,0 +1,88 @@
+"""
+Tests for the per-decision trading snapshot used by open_position
+"""
+
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+from aventa_hft_core import Signal, TickData, UltraLowLatencyEngine
+from config_manager import ConfigManager
+from tick_replay import patch_mt5, ReplayMT5
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    terminal = ReplayMT5('XAUUSD', balance=10000.0)
+    terminal.set_tick(int(time.time() * 1000), 2600.00, 2600.20, 2600.10, 1)
+    patch_mt5(terminal, monkeypatch.setattr)
+    return terminal
+
+
+def make_engine(**overrides):
+    config = dict(ConfigManager.DEFAULT_CONFIG)
+    config.update({'max_floating_profit': 0, 'min_trade_interval': 0.0, 'use_market_data_hub': False,
+                   'position_reconcile_interval': 60.0})
+    config.update(overrides)
+    engine = UltraLowLatencyEngine('XAUUSD', config)
+    assert engine.initialize()
+    engine.process_tick(TickData(timestamp=time.time(), bid=2600.00, ask=2600.20, last=2600.10,
+                                 volume=1, spread=0.20))
+    return engine
+
+
+def buy_signal():
+    return Signal(timestamp=time.time(), signal_type='BUY', strength=0.9, price=2600.20,
+                  stop_loss=2595.20, take_profit=2605.20, volume=0.01, reason='test')
+
+
+def test_one_call_each_for_account_and_deals_positions_from_book(terminal):
+    engine = make_engine()
+    terminal.call_counts.clear()
+    assert engine.open_position('BUY', buy_signal())
+
+    calls = dict(terminal.call_counts)
+    assert calls.pop('order_send') == 1
+    assert calls == {'account_info': 1, 'history_deals_get': 1}
+    assert engine.latency['trading_snapshot'].count == 1
+
+
+def test_snapshot_filters_by_magic(terminal):
+    # Positions opened and closed outside the engine: reconcile on every read
+    engine = make_engine(magic_number=7, position_reconcile_interval=0.0)
+    terminal.order_send({'type': terminal.ORDER_TYPE_BUY, 'volume': 0.5, 'magic': 99})
+    terminal.order_send({'type': terminal.ORDER_TYPE_BUY, 'volume': 0.2, 'magic': 7})
+    terminal.set_tick(int(time.time() * 1000), 2599.00, 2599.20, 2599.10, 1)
+    closing = terminal.positions_get(symbol='XAUUSD')[1]
+    terminal.order_send({'type': terminal.ORDER_TYPE_SELL, 'volume': 0.2, 'position': closing.ticket})
+    terminal.order_send({'type': terminal.ORDER_TYPE_SELL, 'volume': 0.3, 'magic': 7})
+
+    snapshot = engine.get_trading_snapshot()
+    assert snapshot.position_count == 2
+    assert snapshot.own_position_count == 1
+    assert snapshot.position_volume == pytest.approx(0.8)
+    assert snapshot.trade_count == 2
+    assert snapshot.total_volume == pytest.approx(0.5)
+    assert snapshot.closed_pnl == pytest.approx((2599.00 - 2600.20) * 0.2 * 100)
+    assert snapshot.floating_loss == pytest.approx(abs(terminal.positions_get(symbol='XAUUSD')[1].profit))
+    assert snapshot.balance == terminal.account_info().balance
+
+
+@pytest.mark.parametrize('limit', [{'max_positions': 2}, {'max_daily_trades': 2}, {'max_daily_volume': 0.02}])
+def test_gates_block_from_the_snapshot(terminal, limit):
+    engine = make_engine(**limit)
+    assert engine.open_position('BUY', buy_signal())
+    assert engine.open_position('BUY', buy_signal())
+    terminal.call_counts.clear()
+    assert not engine.open_position('BUY', buy_signal())
+    assert terminal.call_counts['order_send'] == 0
+    assert terminal.call_counts['positions_get'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,130 @@
+"""
+Tests for the price-level volume profile
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+# Mock MetaTrader5 before importing modules
+sys.modules.setdefault('MetaTrader5', MagicMock())
+
+from volume_profile import VolumeProfile
+
+
+def reference_profile(prices, volumes, point):
+    """Dict-based profile keyed on the rounded level"""
+    levels = {}
+    for price, volume in zip(prices, volumes):
+        level = int(round((price - prices[0]) / point))
+        levels[level] = levels.get(level, 0.0) + volume
+    return levels
+
+
+def test_matches_dict_reference_across_growth():
+    rng = np.random.default_rng(2)
+    prices = 2600.0 + np.cumsum(rng.choice([-0.01, 0.0, 0.01], 20000))
+    volumes = rng.integers(1, 10, 20000).astype(float)
+    profile = VolumeProfile(0.01, initial_buckets=8)
+    for price, volume in zip(prices, volumes):
+        profile.add(price, volume)
+
+    expected = reference_profile(prices, volumes, 0.01)
+    level_prices, level_volumes = profile.levels()
+    assert len(level_volumes) == max(expected) - min(expected) + 1
+    for level, volume in expected.items():
+        assert level_volumes[level - min(expected)] == volume
+    np.testing.assert_allclose(level_prices[0], prices[0] + min(expected) * 0.01)
+    assert profile.total_volume == volumes.sum()
+
+    poc_level = max(expected, key=lambda k: expected[k])
+    assert profile.poc_volume == expected[poc_level]
+    assert profile.poc_price == pytest.approx(prices[0] + profile.poc_level * 0.01)
+    assert expected[profile.poc_level] == expected[poc_level]
+
+
+def test_value_area_holds_requested_share():
+    profile = VolumeProfile(0.5, value_area_pct=0.70)
+    for price, volume in [(100.0, 10), (100.5, 30), (101.0, 40), (101.5, 15), (102.0, 5)]:
+        profile.add(price, volume)
+    assert profile.poc_price == 101.0
+    # 40 + 30 = 70% of 100
+    assert profile.value_area() == (100.5, 101.0)
+    features = profile.get_features()
+    assert features['value_area_high'] == 101.0
+    assert features['profile_volume'] == 100
+
+
+def test_session_reset_and_point_change():
+    profile = VolumeProfile(0.01)
+    profile.add(2600.0, 5)
+    profile.reset(session=1)
+    assert profile.session == 1
+    assert profile.get_features() == {'poc_price': 0.0, 'value_area_low': 0.0, 'value_area_high': 0.0,
+                                      'profile_volume': 0.0}
+    profile.add(2610.0, 1)
+    assert profile.poc_price == 2610.0
+    profile.set_point(0.1)
+    assert profile.total_volume == 0 and profile.session == 1
+
+
+def test_engine_exposes_profile_features(monkeypatch):
+    import account_cache
+    import aventa_hft_core
+    from aventa_hft_core import TickData, UltraLowLatencyEngine
+
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+    engine = UltraLowLatencyEngine('XAUUSD', {'magic_number': 1, 'use_market_data_hub': False})
+
+    day = 86400 * 20000
+    for i in range(120):
+        price = 2600.0 + (i % 3) * 0.01
+        engine.process_tick(TickData(timestamp=day + i, bid=price - 0.1, ask=price + 0.1, last=price,
+                                     volume=2 if i % 3 == 1 else 1, spread=0.2))
+    features = engine.analyze_microstructure()
+    assert features['poc_price'] == pytest.approx(2600.01)
+    assert features['profile_volume'] == 160
+
+    # Next server day starts a fresh profile
+    engine.process_tick(TickData(timestamp=day + 86400, bid=2609.9, ask=2610.1, last=2610.0, volume=1, spread=0.2))
+    assert engine.volume_profile.total_volume == 1
+    assert engine.analyze_microstructure()['poc_price'] == 2610.0
+
+
+def test_polled_ticks_reset_the_profile_on_the_server_day(monkeypatch):
+    from types import SimpleNamespace
+
+    import account_cache
+    import aventa_hft_core
+    from aventa_hft_core import UltraLowLatencyEngine
+
+    stub = MagicMock()
+    stub.account_info.return_value = None
+    monkeypatch.setattr(aventa_hft_core, 'mt5', stub)
+    monkeypatch.setattr(account_cache, 'mt5', stub)
+    engine = UltraLowLatencyEngine('XAUUSD', {'magic_number': 1, 'use_market_data_hub': False,
+                                              'tick_ingestion_mode': 'poll'})
+
+    def poll(epoch):
+        stub.symbol_info_tick.return_value = SimpleNamespace(
+            time=int(epoch), time_msc=int(epoch * 1000), bid=2599.9, ask=2600.1, last=2600.0, volume=1)
+        tick = engine.get_tick_ultra_fast()
+        engine.process_tick(tick)
+        return tick
+
+    day = 86400 * 20000
+    assert poll(day + 43200.5).timestamp == day + 43200.5
+    # Half a day later (where time + time_msc / 1000 used to cross a boundary) is the same session
+    poll(day + 86399)
+    assert engine.volume_profile.total_volume == 2
+    poll(day + 86400)
+    assert engine.volume_profile.total_volume == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,156 @@
+"""
+Tick Ingestion for Aventa HFT Pro 2026
+Cursor-based batch tick retrieval (copy_ticks_from) instead of symbol_info_tick polling
+"""
+
+import MetaTrader5 as mt5
+import numpy as np
+from time import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TickIngestor:
+    """
+    Pulls every new tick since the last one seen, exactly once.
+
+    Keeps a ``time_msc`` cursor plus the number of ticks already consumed at
+    that millisecond (several ticks can share one ``time_msc``).  Each fetch
+    asks the terminal for all ticks from the cursor's second onwards and drops
+    the overlap, so quiet markets yield empty batches instead of repeated
+    ticks and bursts are never sampled away.
+    """
+
+    def __init__(self, symbol: str, batch_size: int = 1000):
+        """
+        Initialize ingestor
+
+        Args:
+            symbol: Symbol to ingest
+            batch_size: Maximum ticks requested per copy_ticks_from call
+        """
+        self.symbol = symbol
+        self.batch_size = max(1, int(batch_size))
+
+        # Cursor
+        self.cursor_msc = 0
+        self._seen_at_cursor = 0
+
+        # Statistics
+        self.ticks_ingested = 0
+        self.duplicates_dropped = 0
+        self.batches = 0
+        self.empty_polls = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self._started_at = None
+
+    def _copy_ticks(self, from_seconds: int, count: int):
+        """Fetch raw ticks from MT5 starting at from_seconds"""
+        return mt5.copy_ticks_from(self.symbol, from_seconds, count, mt5.COPY_TICKS_ALL)
+
+    def _seed_from_seconds(self) -> int:
+        """Start position for the very first fetch (second of the current tick)"""
+        tick = mt5.symbol_info_tick(self.symbol)
+        if tick is None:
+            return 0
+        return int(tick.time)
+
+    def fetch(self) -> np.ndarray:
+        """
+        Fetch ticks that arrived since the previous call
+
+        Returns:
+            Structured array of new ticks (MT5 copy_ticks_* layout), possibly empty
+        """
+        if self._started_at is None:
+            self._started_at = time()
+
+        if self.cursor_msc == 0:
+            from_seconds = self._seed_from_seconds()
+            if from_seconds == 0:
+                self.empty_polls += 1
+                return np.empty(0)
+        else:
+            from_seconds = self.cursor_msc // 1000
+
+        count = self.batch_size
+        rows = self._copy_ticks(from_seconds, count)
+        new_rows, skipped = self._drop_seen(rows)
+
+        # A full batch made only of already-seen ticks means the cursor second
+        # holds more ticks than batch_size - widen the request until we get past it
+        while rows is not None and len(new_rows) == 0 and len(rows) >= count:
+            count *= 4
+            logger.debug(f"Tick batch saturated at cursor, widening request to {count}")
+            rows = self._copy_ticks(from_seconds, count)
+            new_rows, skipped = self._drop_seen(rows)
+
+        self.duplicates_dropped += skipped
+
+        if len(new_rows) == 0:
+            self.empty_polls += 1
+            self.last_batch_size = 0
+            return new_rows
+
+        self._advance_cursor(new_rows['time_msc'])
+
+        n = len(new_rows)
+        self.ticks_ingested += n
+        self.batches += 1
+        self.last_batch_size = n
+        if n > self.max_batch_size:
+            self.max_batch_size = n
+
+        return new_rows
+
+    def _drop_seen(self, rows):
+        """Split off ticks at or before the cursor. Returns (new_rows, skipped_count)"""
+        if rows is None or len(rows) == 0:
+            return np.empty(0), 0
+
+        if self.cursor_msc == 0:
+            return rows, 0
+
+        time_msc = rows['time_msc']
+        first_at_cursor = int(np.searchsorted(time_msc, self.cursor_msc, side='left'))
+        first_after_cursor = int(np.searchsorted(time_msc, self.cursor_msc, side='right'))
+        at_cursor = first_after_cursor - first_at_cursor
+
+        skip = first_at_cursor + min(self._seen_at_cursor, at_cursor)
+        return rows[skip:], skip
+
+    def _advance_cursor(self, time_msc: np.ndarray):
+        """Move cursor to the newest tick and remember how many share its millisecond"""
+        last_msc = int(time_msc[-1])
+        same_msc = len(time_msc) - int(np.searchsorted(time_msc, last_msc, side='left'))
+
+        if last_msc == self.cursor_msc:
+            self._seen_at_cursor += same_msc
+        else:
+            self.cursor_msc = last_msc
+            self._seen_at_cursor = same_msc
+
+    def reset(self):
+        """Forget the cursor (next fetch re-seeds from the current tick)"""
+        self.cursor_msc = 0
+        self._seen_at_cursor = 0
+
+    def get_stats(self) -> dict:
+        """Get ingestion statistics"""
+        elapsed = (time() - self._started_at) if self._started_at else 0.0
+        return {
+            'ticks_ingested': self.ticks_ingested,
+            'ticks_per_sec': (self.ticks_ingested / elapsed) if elapsed > 0 else 0.0,
+            'duplicates_dropped': self.duplicates_dropped,
+            'batches': self.batches,
+            'empty_polls': self.empty_polls,
+            'last_batch_size': self.last_batch_size,
+            'max_batch_size': self.max_batch_size,
+            'avg_batch_size': (self.ticks_ingested / self.batches) if self.batches > 0 else 0.0,
+        }
+
+    def __repr__(self):
+        return (f"TickIngestor(symbol={self.symbol}, cursor={self.cursor_msc}, "
+                f"ingested={self.ticks_ingested}, dropped={self.duplicates_dropped})")
@@ -0,0 +1,448 @@
+"""
+Tick Recorder for Aventa HFT Pro 2026
+Append-only, memory-mapped per-symbol / per-day tick files with a time index
+
+File layout (one pair per symbol and server day):
+
+    <root>/<SYMBOL>/<SYMBOL>_<YYYYMMDD>.ticks   header + fixed-size records
+    <root>/<SYMBOL>/<SYMBOL>_<YYYYMMDD>.tidx    (record_no, time_msc) every N records
+
+Records store prices as integer points (price / symbol_point) and time as
+the millisecond delta to the previous tick, so a tick costs 20 bytes on
+disk instead of 56 in memory.  The index holds the absolute time of every
+``index_interval``-th record, which gives random access by time without
+decoding the whole day.
+"""
+
+import os
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from tick_ring_buffer import TICK_DTYPE
+
+logger = logging.getLogger(__name__)
+
+
+FILE_MAGIC = b'AVTK'
+FILE_VERSION = 1
+HEADER_SIZE = 128
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u2'),
+    ('record_size', '<u2'),
+    ('point', '<f8'),
+    ('day_start_msc', '<i8'),
+    ('count', '<i8'),
+    ('last_time_msc', '<i8'),
+    ('index_interval', '<u4'),
+    ('symbol', 'S32'),
+])
+
+RECORD_DTYPE = np.dtype([
+    ('dt_ms', '<u4'),     # ms since previous tick (first tick: since 00:00 of the day)
+    ('bid', '<i4'),       # points
+    ('ask', '<i4'),       # points
+    ('last', '<i4'),      # points
+    ('volume', '<f4'),
+])
+
+INDEX_DTYPE = np.dtype([
+    ('record_no', '<i8'),
+    ('time_msc', '<i8'),
+])
+
+MS_PER_DAY = 86_400_000
+
+
+def day_path(root_dir: str, symbol: str, day: str) -> str:
+    """Path of the data file for symbol on day ('YYYYMMDD'); index is the same path with .tidx"""
+    return os.path.join(root_dir, symbol, f"{symbol}_{day}.ticks")
+
+
+def _day_of(time_msc: int) -> Tuple[str, int]:
+    """('YYYYMMDD', day start in ms) for a server timestamp in ms"""
+    day_start = (int(time_msc) // MS_PER_DAY) * MS_PER_DAY
+    day = datetime.fromtimestamp(day_start / 1000.0, tz=timezone.utc).strftime('%Y%m%d')
+    return day, day_start
+
+
+def _normalize(ticks) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(time_msc, bid, ask, last, volume) columns from MT5 rows, TICK_DTYPE records or TickData objects"""
+    if isinstance(ticks, np.ndarray):
+        names = ticks.dtype.names
+        if 'time_msc' in names:
+            time_msc = ticks['time_msc'].astype(np.int64)
+        else:
+            time_msc = np.rint(ticks['timestamp'] * 1000.0).astype(np.int64)
+        return (time_msc, ticks['bid'].astype(np.float64), ticks['ask'].astype(np.float64),
+                ticks['last'].astype(np.float64), ticks['volume'].astype(np.float64))
+
+    n = len(ticks)
+    time_msc = np.empty(n, dtype=np.int64)
+    columns = np.empty((4, n), dtype=np.float64)
+    for i, tick in enumerate(ticks):
+        time_msc[i] = round(tick.timestamp * 1000.0)
+        columns[0, i] = tick.bid
+        columns[1, i] = tick.ask
+        columns[2, i] = tick.last
+        columns[3, i] = tick.volume
+    return time_msc, columns[0], columns[1], columns[2], columns[3]
+
+
+class _DayFile:
+    """Writer side of one day's data + index file pair"""
+
+    def __init__(self, path: str, symbol: str, point: float, day_start: int,
+                 index_interval: int, initial_capacity: int):
+        self.path = path
+        self.index_path = path[:-len('.ticks')] + '.tidx'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)[0]
+            if header['magic'] != FILE_MAGIC or header['version'] != FILE_VERSION:
+                raise ValueError(f"{path} is not a tick file (version {FILE_VERSION})")
+            if header['point'] != point:
+                logger.warning(f"⚠️ {path}: point {header['point']} in file, {point} configured - keeping file's point")
+            self.point = float(header['point'])
+            self.index_interval = int(header['index_interval'])
+            self.count = int(header['count'])
+            self.last_time_msc = int(header['last_time_msc'])
+            capacity = max((os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize, 1)
+            # Index entries written after the last published count are rewritten below
+            if os.path.exists(self.index_path):
+                index = np.fromfile(self.index_path, dtype=INDEX_DTYPE)
+                index[index['record_no'] < self.count].tofile(self.index_path)
+        else:
+            self.point = float(point)
+            self.index_interval = int(index_interval)
+            self.count = 0
+            self.last_time_msc = day_start
+            capacity = int(initial_capacity)
+            with open(path, 'wb') as f:
+                f.truncate(HEADER_SIZE + capacity * RECORD_DTYPE.itemsize)
+            header = np.zeros(1, dtype=HEADER_DTYPE)
+            header['magic'] = FILE_MAGIC
+            header['version'] = FILE_VERSION
+            header['record_size'] = RECORD_DTYPE.itemsize
+            header['point'] = self.point
+            header['day_start_msc'] = day_start
+            header['last_time_msc'] = day_start
+            header['index_interval'] = self.index_interval
+            header['symbol'] = symbol.encode()[:32]
+            np.memmap(path, dtype=HEADER_DTYPE, mode='r+', shape=(1,))[:] = header
+            # Drop a stale index left without its data file
+            open(self.index_path, 'wb').close()
+
+        self.day_start = day_start
+        self.capacity = capacity
+        self._map(capacity)
+
+    def _map(self, capacity: int):
+        self.header = np.memmap(self.path, dtype=HEADER_DTYPE, mode='r+', shape=(1,))
+        self.records = np.memmap(self.path, dtype=RECORD_DTYPE, mode='r+',
+                                 offset=HEADER_SIZE, shape=(capacity,))
+
+    def _grow(self, needed: int):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self.records.flush()
+        self.header.flush()
+        del self.records, self.header
+        with open(self.path, 'r+b') as f:
+            f.truncate(HEADER_SIZE + capacity * RECORD_DTYPE.itemsize)
+        self.capacity = capacity
+        self._map(capacity)
+
+    def write(self, time_msc, bid, ask, last, volume) -> int:
+        """Encode and append a batch of ticks belonging to this day. Returns bytes written"""
+        n = len(time_msc)
+        start = self.count
+        if start + n > self.capacity:
+            self._grow(start + n)
+
+        # Deltas must stay non-negative for the cumulative decode
+        time_msc = np.maximum.accumulate(np.maximum(time_msc, self.last_time_msc))
+        dt = np.diff(time_msc, prepend=self.last_time_msc)
+
+        out = self.records[start:start + n]
+        out['dt_ms'] = dt
+        out['bid'] = np.rint(bid / self.point)
+        out['ask'] = np.rint(ask / self.point)
+        out['last'] = np.rint(last / self.point)
+        out['volume'] = volume
+
+        # Index every index_interval-th record (absolute time anchors)
+        first = -(-start // self.index_interval) * self.index_interval
+        record_no = np.arange(first, start + n, self.index_interval, dtype=np.int64)
+        if len(record_no):
+            entries = np.empty(len(record_no), dtype=INDEX_DTYPE)
+            entries['record_no'] = record_no
+            entries['time_msc'] = time_msc[record_no - start]
+            with open(self.index_path, 'ab') as f:
+                entries.tofile(f)
+
+        self.count = start + n
+        self.last_time_msc = int(time_msc[-1])
+        # Publish the count last so readers never see unwritten records
+        self.header['last_time_msc'][0] = self.last_time_msc
+        self.header['count'][0] = self.count
+        return n * RECORD_DTYPE.itemsize
+
+    def close(self):
+        self.records.flush()
+        self.header.flush()
+        del self.records, self.header
+
+
+class TickRecorder:
+    """
+    Batched, off-hot-path tick recorder
+
+    ``record()`` only appends a reference to a pending queue; a background
+    thread encodes and writes pending batches every ``flush_interval``
+    seconds, rolling over to a new file at each server-day boundary.
+    """
+
+    def __init__(self, symbol: str, point: float, root_dir: str = 'tick_data',
+                 flush_interval: float = 0.5, index_interval: int = 1024,
+                 initial_capacity: int = 65536):
+        """
+        Initialize recorder
+
+        Args:
+            symbol: Symbol being recorded
+            point: Symbol point size (prices are stored in points)
+            root_dir: Directory holding one sub-directory per symbol
+            flush_interval: Seconds between background writes
+            index_interval: Records between time-index entries
+            initial_capacity: Records pre-allocated per new day file (doubles when full)
+        """
+        if point <= 0:
+            raise ValueError(f"symbol point must be positive, got {point}")
+        self.symbol = symbol
+        self.point = float(point)
+        self.root_dir = root_dir
+        self.flush_interval = flush_interval
+        self.index_interval = index_interval
+        self.initial_capacity = initial_capacity
+
+        self._pending = deque()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._file: Optional[_DayFile] = None
+        self._day = None
+
+        self.ticks_recorded = 0
+        self.batches_written = 0
+        self.bytes_written = 0
+        self.write_errors = 0
+
+    def record(self, ticks):
+        """Queue ticks for writing (MT5 rows, TICK_DTYPE records or a list of TickData)"""
+        if len(ticks):
+            self._pending.append(ticks)
+
+    def start(self):
+        """Start the background writer"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"TickRecorder-{self.symbol}")
+        self._thread.start()
+        logger.info(f"⏺️ Rekam tick {self.symbol} ke {os.path.join(self.root_dir, self.symbol)}")
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self) -> int:
+        """Write everything pending now. Returns ticks written"""
+        with self._flush_lock:
+            batches = []
+            while self._pending:
+                batches.append(self._pending.popleft())
+            if not batches:
+                return 0
+
+            try:
+                columns = [_normalize(batch) for batch in batches]
+                time_msc, bid, ask, last, volume = (np.concatenate(c) for c in zip(*columns))
+                self._write(time_msc, bid, ask, last, volume)
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(f"Tick recorder write error ({self.symbol}): {e}")
+                return 0
+
+            self.batches_written += 1
+            self.ticks_recorded += len(time_msc)
+            return len(time_msc)
+
+    def _write(self, time_msc, bid, ask, last, volume):
+        # Split the batch at server-day boundaries
+        days = time_msc // MS_PER_DAY
+        bounds = np.flatnonzero(np.diff(days)) + 1
+        for part in np.split(np.arange(len(time_msc)), bounds):
+            if len(part) == 0:
+                continue
+            day, day_start = _day_of(time_msc[part[0]])
+            if day != self._day:
+                self._open_day(day, day_start)
+            self.bytes_written += self._file.write(
+                time_msc[part], bid[part], ask[part], last[part], volume[part])
+
+    def _open_day(self, day: str, day_start: int):
+        if self._file is not None:
+            self._file.close()
+        self._file = _DayFile(day_path(self.root_dir, self.symbol, day), self.symbol,
+                              self.point, day_start, self.index_interval, self.initial_capacity)
+        self._day = day
+
+    def stop(self):
+        """Flush remaining ticks and close the current file"""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+        with self._flush_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._day = None
+
+    def get_stats(self) -> Dict:
+        """Get recorder statistics"""
+        return {
+            'ticks_recorded': self.ticks_recorded,
+            'batches_written': self.batches_written,
+            'bytes_written': self.bytes_written,
+            'pending_batches': len(self._pending),
+            'write_errors': self.write_errors,
+            'current_day': self._day,
+        }
+
+
+class TickDay:
+    """
+    Read-only view of one recorded day
+
+    ``records`` is a zero-copy memory map of the raw encoded records;
+    decoding helpers return float prices and absolute millisecond times.
+    """
+
+    def __init__(self, path: str):
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if len(header) == 0 or header[0]['magic'] != FILE_MAGIC:
+            raise ValueError(f"{path} is not a tick file")
+        header = header[0]
+        self.path = path
+        self.symbol = header['symbol'].decode()
+        self.point = float(header['point'])
+        self.day_start = int(header['day_start_msc'])
+        self.index_interval = int(header['index_interval'])
+        count = int(header['count'])
+
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+        index_path = path[:-len('.ticks')] + '.tidx'
+        index = np.fromfile(index_path, dtype=INDEX_DTYPE) if os.path.exists(index_path) else np.zeros(0, INDEX_DTYPE)
+        self.index = index[index['record_no'] < count]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _anchor(self, start: int) -> Tuple[int, int]:
+        """(record_no, time_msc) of the closest index entry at or before start"""
+        k = start // self.index_interval
+        if k < len(self.index):
+            entry = self.index[k]
+            return int(entry['record_no']), int(entry['time_msc'])
+        return 0, self.day_start + int(self.records['dt_ms'][0])
+
+    def time_msc(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Absolute tick times in ms for records [start, stop)"""
+        start, stop, _ = slice(start, stop).indices(len(self.records))
+        if start >= stop:
+            return np.zeros(0, dtype=np.int64)
+        anchor_no, anchor_time = self._anchor(start)
+        deltas = self.records['dt_ms'][anchor_no + 1:stop].astype(np.int64)
+        times = anchor_time + np.concatenate(([0], np.cumsum(deltas)))
+        return times[start - anchor_no:]
+
+    def prices(self, field: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Decoded prices ('bid', 'ask' or 'last') for records [start, stop)"""
+        return self.records[field][start:stop] * self.point
+
+    def search_time(self, time_msc: int) -> int:
+        """Index of the first record at or after time_msc (decodes one index block)"""
+        n = len(self.records)
+        if n == 0:
+            return 0
+        # Last block whose anchor is before time_msc; the answer is in it or starts the next one
+        k = max(int(np.searchsorted(self.index['time_msc'], time_msc, side='left')) - 1, 0)
+        start = k * self.index_interval
+        stop = n if k >= len(self.index) - 1 else min(start + self.index_interval, n)
+        return start + int(np.searchsorted(self.time_msc(start, stop), time_msc, side='left'))
+
+    def between(self, from_msc: int, to_msc: int) -> Tuple[int, int]:
+        """Record range [start, stop) with from_msc <= time < to_msc"""
+        return self.search_time(from_msc), self.search_time(to_msc)
+
+    def to_ticks(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Decode records [start, stop) into TICK_DTYPE (same layout as TickRingBuffer)"""
+        raw = self.records[start:stop]
+        out = np.empty(len(raw), dtype=TICK_DTYPE)
+        out['timestamp'] = self.time_msc(start, stop) / 1000.0
+        out['bid'] = raw['bid'] * self.point
+        out['ask'] = raw['ask'] * self.point
+        out['last'] = raw['last'] * self.point
+        out['volume'] = raw['volume']
+        out['spread'] = out['ask'] - out['bid']
+        out['mid'] = (out['bid'] + out['ask']) / 2
+        return out
+
+    def to_dataframe(self, start: int = 0, stop: Optional[int] = None):
+        """Decoded ticks as a pandas DataFrame indexed by time (notebooks, ML training)"""
+        import pandas as pd
+        df = pd.DataFrame(self.to_ticks(start, stop))
+        df.index = pd.to_datetime(df.pop('timestamp'), unit='s')
+        return df
+
+    def __repr__(self):
+        return f"TickDay({self.symbol}, {os.path.basename(self.path)}, ticks={len(self)})"
+
+
+def open_tick_day(root_dir: str, symbol: str, day: str) -> TickDay:
+    """Open one recorded day ('YYYYMMDD') for reading"""
+    return TickDay(day_path(root_dir, symbol, day))
+
+
+def list_tick_days(root_dir: str, symbol: str) -> List[str]:
+    """Recorded days ('YYYYMMDD') available for symbol, oldest first"""
+    folder = os.path.join(root_dir, symbol)
+    if not os.path.isdir(folder):
+        return []
+    prefix = f"{symbol}_"
+    return sorted(name[len(prefix):-len('.ticks')] for name in os.listdir(folder)
+                  if name.startswith(prefix) and name.endswith('.ticks'))
+
+
+def load_ticks(root_dir: str, symbol: str, start_day: str, end_day: str) -> np.ndarray:
+    """Decoded TICK_DTYPE ticks for every recorded day in [start_day, end_day]"""
+    days = [d for d in list_tick_days(root_dir, symbol) if start_day <= d <= end_day]
+    if not days:
+        return np.zeros(0, dtype=TICK_DTYPE)
+    return np.concatenate([open_tick_day(root_dir, symbol, d).to_ticks() for d in days])
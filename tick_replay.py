@@ -0,0 +1,753 @@
+"""
+Tick Replay Harness for Aventa HFT Pro 2026
+Deterministic, accelerated replay of recorded or synthetic ticks through the real engine
+
+The harness swaps a simulated terminal (ReplayMT5) and a virtual clock into
+the engine modules, then drives the same stages the engine threads run:
+
+    process_tick -> analyze_microstructure -> generate_signal -> execute_signal
+
+synchronously, one analysis every ``analysis_interval`` of *tick* time.
+Signals and trades depend only on the ticks and the config, so two runs
+produce identical output (compare ``ReplayResult.fingerprint``).  Stage
+timings are measured with the real clock and are reported separately.
+
+Usage:
+    from tick_replay import TickReplay, synthetic_ticks
+    result = TickReplay('XAUUSD', {'max_spread': 0.5}, synthetic_ticks(20000)).run()
+    print(result.summary())
+"""
+
+import bisect
+import hashlib
+import importlib
+import itertools
+import json
+import sys
+import threading
+import time as _time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+import copy
+import logging
+
+import numpy as np
+
+from tick_ring_buffer import TICK_DTYPE
+
+logger = logging.getLogger(__name__)
+
+# Engine modules that bind MetaTrader5 at import as ``mt5``; a simulated terminal goes into all of them
+MT5_MODULES = ('aventa_hft_core', 'account_cache', 'deals_ledger', 'multi_symbol_engine', 'order_templates',
+               'position_book', 'symbol_specs', 'tick_ingestion')
+
+MS_PER_DAY = 86_400_000
+
+# Layout of MetaTrader5.copy_ticks_from results
+MT5_TICK_DTYPE = np.dtype([
+    ('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'),
+    ('volume', '<u8'), ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8'),
+])
+
+
+class VirtualClock:
+    """
+    Stand-in for the ``time`` module: time()/sleep() follow replayed tick time
+
+    perf_counter() stays on the real clock so latency measurements remain
+    meaningful; everything else is delegated to the real module.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.now = float(start)
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += max(0.0, seconds)
+
+    def advance_to(self, t: float):
+        if t > self.now:
+            self.now = t
+
+    def perf_counter(self) -> float:
+        return _time.perf_counter()
+
+    def __getattr__(self, name):
+        return getattr(_time, name)
+
+
+@dataclass
+class ReplaySymbol:
+    """Contract specification served by ReplayMT5.symbol_info"""
+    point: float = 0.01
+    digits: int = 2
+    trade_contract_size: float = 100.0
+    trade_stops_level: int = 0
+    trade_tick_size: float = 0.01
+    trade_tick_value: float = 1.0
+    volume_min: float = 0.01
+    volume_step: float = 0.01
+    volume_max: float = 100.0
+    filling_mode: int = 3
+    spread: int = 20
+    visible: bool = True
+
+
+class ReplayMT5:
+    """
+    Simulated MetaTrader5 terminal for one symbol
+
+    Market orders fill at the current bid/ask, SL/TP are checked on every
+    tick, and every fill produces a deal.  Tickets, deal ids and fill prices
+    are deterministic.
+    """
+
+    # Constants used by the engine
+    ORDER_TYPE_BUY = 0
+    ORDER_TYPE_SELL = 1
+    TRADE_ACTION_DEAL = 1
+    ORDER_TIME_GTC = 0
+    ORDER_FILLING_FOK = 0
+    ORDER_FILLING_IOC = 1
+    ORDER_FILLING_RETURN = 2
+    DEAL_TYPE_BUY = 0
+    DEAL_TYPE_SELL = 1
+    DEAL_ENTRY_IN = 0
+    DEAL_ENTRY_OUT = 1
+    COPY_TICKS_ALL = -1
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_INVALID_VOLUME = 10014
+    TRADE_RETCODE_INVALID_STOPS = 10016
+    TRADE_RETCODE_INVALID_FILL = 10030
+    TRADE_RETCODE_POSITION_CLOSED = 10036
+
+    def __init__(self, symbol: str, spec: Optional[ReplaySymbol] = None,
+                 balance: float = 10000.0, leverage: float = 100.0, login: int = 1):
+        self.symbol = symbol
+        self.spec = spec or ReplaySymbol()
+        self.initial_balance = balance
+        self.balance = balance
+        self.leverage = leverage
+        self.login = login
+
+        self.tick = None
+        self._history_msc: List[int] = []
+        self._history_rows: List[tuple] = []
+        self.positions: Dict[int, SimpleNamespace] = {}
+        self.deals: List[SimpleNamespace] = []
+        self._next_ticket = 1
+        self.call_counts = defaultdict(int)
+        self.order_send_times = []
+        # Guards positions/deals when live engine threads share the terminal with a feeder
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Market
+    # ------------------------------------------------------------------
+
+    def set_tick(self, time_msc: int, bid: float, ask: float, last: float, volume: float):
+        """Advance the market to a new tick and trigger SL/TP"""
+        with self._lock:
+            self._set_tick(time_msc, bid, ask, last, volume)
+
+    def _set_tick(self, time_msc: int, bid: float, ask: float, last: float, volume: float):
+        self.tick = SimpleNamespace(time=int(time_msc // 1000), time_msc=int(time_msc), bid=bid, ask=ask,
+                                    last=last, volume=int(volume), volume_real=float(volume), flags=0)
+        self._history_msc.append(self.tick.time_msc)
+        self._history_rows.append((self.tick.time, bid, ask, last, int(volume), self.tick.time_msc, 0, float(volume)))
+        for position in list(self.positions.values()):
+            is_buy = position.type == self.ORDER_TYPE_BUY
+            price = bid if is_buy else ask
+            position.price_current = price
+            position.profit = self._profit(position, price)
+            position.time_update = self.tick.time
+
+            hit = None
+            if position.sl:
+                if (is_buy and bid <= position.sl) or (not is_buy and ask >= position.sl):
+                    hit = 'sl'
+            if hit is None and position.tp:
+                if (is_buy and bid >= position.tp) or (not is_buy and ask <= position.tp):
+                    hit = 'tp'
+            if hit:
+                self._close(position, price, f"[{hit} {price:.{self.spec.digits}f}]")
+
+    def _profit(self, position, price: float) -> float:
+        # Priced like the terminal: ticks moved times the tick value in account currency
+        direction = 1.0 if position.type == self.ORDER_TYPE_BUY else -1.0
+        ticks = (price - position.price_open) * direction / self.spec.trade_tick_size
+        return round(ticks * self.spec.trade_tick_value * position.volume, 2)
+
+    def _new_ticket(self) -> int:
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        return ticket
+
+    def _deal(self, position, entry: int, price: float, profit: float, comment: str):
+        deal_type = position.type if entry == self.DEAL_ENTRY_IN else 1 - position.type
+        deal = SimpleNamespace(
+            ticket=self._new_ticket(), order=0, time=self.tick.time, time_msc=self.tick.time_msc,
+            type=deal_type, entry=entry, magic=position.magic, position_id=position.ticket,
+            reason=0, volume=position.volume, price=price, commission=0.0, swap=0.0,
+            profit=profit, fee=0.0, symbol=self.symbol, comment=comment, external_id=''
+        )
+        self.deals.append(deal)
+        return deal
+
+    def _close(self, position, price: float, comment: str):
+        profit = self._profit(position, price)
+        position.profit = profit
+        position.price_current = price
+        del self.positions[position.ticket]
+        self.balance = round(self.balance + profit, 2)
+        return self._deal(position, self.DEAL_ENTRY_OUT, price, profit, comment)
+
+    def _result(self, retcode: int, request: dict, deal=None, price: float = 0.0, comment: str = '', order: int = 0):
+        # As on a real server, the order that opens a position has the position's ticket
+        return SimpleNamespace(
+            retcode=retcode, deal=deal.ticket if deal else 0, order=order or (deal.ticket if deal else 0),
+            volume=request.get('volume', 0.0), price=price,
+            bid=self.tick.bid if self.tick else 0.0, ask=self.tick.ask if self.tick else 0.0,
+            comment=comment or ('Request executed' if retcode == self.TRADE_RETCODE_DONE else 'Rejected'),
+            request_id=0, retcode_external=0, request=request
+        )
+
+    # ------------------------------------------------------------------
+    # MetaTrader5 API
+    # ------------------------------------------------------------------
+
+    def initialize(self, *args, **kwargs) -> bool:
+        self.call_counts['initialize'] += 1
+        return True
+
+    def shutdown(self):
+        self.call_counts['shutdown'] += 1
+
+    def last_error(self):
+        return (1, 'Success')
+
+    def symbol_select(self, symbol, enable=True) -> bool:
+        return symbol == self.symbol
+
+    def symbol_info(self, symbol):
+        self.call_counts['symbol_info'] += 1
+        if symbol != self.symbol:
+            return None
+        info = SimpleNamespace(**self.spec.__dict__)
+        info.name = symbol
+        if self.tick is not None:
+            info.bid, info.ask = self.tick.bid, self.tick.ask
+        return info
+
+    def symbol_info_tick(self, symbol):
+        self.call_counts['symbol_info_tick'] += 1
+        return self.tick if symbol == self.symbol else None
+
+    def copy_ticks_from(self, symbol, date_from, count, flags):
+        """Ticks fed so far from date_from (seconds or datetime), up to count"""
+        self.call_counts['copy_ticks_from'] += 1
+        if symbol != self.symbol:
+            return None
+        seconds = date_from.timestamp() if hasattr(date_from, 'timestamp') else date_from
+        start = bisect.bisect_left(self._history_msc, int(seconds) * 1000)
+        return np.array(self._history_rows[start:start + int(count)], dtype=MT5_TICK_DTYPE)
+
+    def account_info(self):
+        self.call_counts['account_info'] += 1
+        with self._lock:
+            return self._account_info()
+
+    def _account_info(self):
+        floating = sum(p.profit for p in self.positions.values())
+        margin = sum(p.volume * self.spec.trade_contract_size * p.price_open / self.leverage
+                     for p in self.positions.values())
+        equity = round(self.balance + floating, 2)
+        return SimpleNamespace(
+            login=self.login, balance=self.balance, equity=equity, profit=round(floating, 2),
+            margin=round(margin, 2), margin_free=round(equity - margin, 2),
+            margin_level=(equity / margin * 100) if margin > 0 else 0.0,
+            leverage=int(self.leverage), currency='USD', server='Replay', name='Replay'
+        )
+
+    def positions_get(self, symbol=None, ticket=None, group=None):
+        self.call_counts['positions_get'] += 1
+        with self._lock:
+            positions = [p for p in self.positions.values()
+                         if (symbol is None or p.symbol == symbol) and (ticket is None or p.ticket == ticket)]
+        return tuple(positions)
+
+    def positions_total(self) -> int:
+        return len(self.positions)
+
+    def history_deals_get(self, date_from=None, date_to=None, **kwargs):
+        """Deals of the current (replayed) server day; the date arguments are not used"""
+        self.call_counts['history_deals_get'] += 1
+        if self.tick is None:
+            return ()
+        day_start = (self.tick.time_msc // MS_PER_DAY) * MS_PER_DAY
+        deals = [d for d in self.deals if d.time_msc >= day_start]
+        if 'position' in kwargs:
+            deals = [d for d in deals if d.position_id == kwargs['position']]
+        return tuple(deals)
+
+    def order_send(self, request: dict):
+        self.call_counts['order_send'] += 1
+        start = _time.perf_counter()
+        try:
+            with self._lock:
+                return self._order_send(request)
+        finally:
+            self.order_send_times.append((_time.perf_counter() - start) * 1e6)
+
+    def order_check(self, request: dict):
+        """Validate a market request without executing it (retcode 0 = would be accepted)"""
+        self.call_counts['order_check'] += 1
+        retcode, comment = 0, 'Done'
+        filling = request.get('type_filling', self.ORDER_FILLING_FOK)
+        # symbol_info.filling_mode flags: 1 = FOK allowed, 2 = IOC allowed; RETURN is always accepted here
+        allowed = {self.ORDER_FILLING_FOK: 1, self.ORDER_FILLING_IOC: 2}.get(filling, 0)
+        if float(request.get('volume', 0.0)) <= 0 or self.tick is None:
+            retcode, comment = self.TRADE_RETCODE_INVALID_VOLUME, 'Invalid volume'
+        elif allowed and not self.spec.filling_mode & allowed:
+            retcode, comment = self.TRADE_RETCODE_INVALID_FILL, 'Unsupported filling mode'
+        return SimpleNamespace(retcode=retcode, comment=comment, balance=self.balance, request=request)
+
+    def _order_send(self, request: dict):
+        volume = float(request.get('volume', 0.0))
+        if volume <= 0 or self.tick is None:
+            return self._result(self.TRADE_RETCODE_INVALID_VOLUME, request)
+
+        is_buy = request['type'] == self.ORDER_TYPE_BUY
+        price = self.tick.ask if is_buy else self.tick.bid
+
+        if request.get('position'):
+            position = self.positions.get(request['position'])
+            if position is None:
+                return self._result(self.TRADE_RETCODE_POSITION_CLOSED, request)
+            deal = self._close(position, price, request.get('comment', ''))
+            return self._result(self.TRADE_RETCODE_DONE, request, deal, price)
+
+        # Stops must sit beyond the stops level on the correct side
+        min_distance = self.spec.trade_stops_level * self.spec.point
+        sl, tp = request.get('sl', 0.0), request.get('tp', 0.0)
+        reference = self.tick.bid if is_buy else self.tick.ask
+        if sl and ((is_buy and sl > reference - min_distance) or (not is_buy and sl < reference + min_distance)):
+            return self._result(self.TRADE_RETCODE_INVALID_STOPS, request, comment='Invalid stops')
+        if tp and ((is_buy and tp < reference + min_distance) or (not is_buy and tp > reference - min_distance)):
+            return self._result(self.TRADE_RETCODE_INVALID_STOPS, request, comment='Invalid stops')
+
+        ticket = self._new_ticket()
+        position = SimpleNamespace(
+            ticket=ticket, time=self.tick.time, time_msc=self.tick.time_msc, time_update=self.tick.time,
+            type=request['type'], magic=request.get('magic', 0), identifier=ticket, reason=0,
+            volume=volume, price_open=price, sl=sl, tp=tp,
+            price_current=self.tick.bid if is_buy else self.tick.ask,
+            swap=0.0, profit=0.0, symbol=self.symbol, comment=request.get('comment', ''), external_id=''
+        )
+        position.profit = self._profit(position, position.price_current)
+        self.positions[ticket] = position
+        deal = self._deal(position, self.DEAL_ENTRY_IN, price, 0.0, request.get('comment', ''))
+        return self._result(self.TRADE_RETCODE_DONE, request, deal, price, order=ticket)
+
+
+class MultiReplayMT5:
+    """
+    One simulated terminal serving several symbols
+
+    Symbol-specific calls are routed to a ReplayMT5 per symbol; account and
+    history calls aggregate over all of them.
+    """
+
+    def __init__(self, symbols: List[str], spec: Optional[ReplaySymbol] = None, balance: float = 10000.0):
+        self.terminals = {symbol: ReplayMT5(symbol, spec, balance=balance / len(symbols)) for symbol in symbols}
+        self.initial_balance = balance
+        # One ticket sequence for all symbols, increasing like a real account's
+        tickets = itertools.count(1)
+        for terminal in self.terminals.values():
+            terminal._new_ticket = tickets.__next__
+
+    def __getattr__(self, name):
+        # Constants (ORDER_TYPE_BUY, ...) are the same for every terminal
+        return getattr(ReplayMT5, name)
+
+    @property
+    def call_counts(self) -> Dict[str, int]:
+        counts = defaultdict(int)
+        for terminal in self.terminals.values():
+            for name, n in terminal.call_counts.items():
+                counts[name] += n
+        return counts
+
+    def set_tick(self, symbol: str, time_msc: int, bid: float, ask: float, last: float, volume: float):
+        self.terminals[symbol].set_tick(time_msc, bid, ask, last, volume)
+
+    def initialize(self, *args, **kwargs) -> bool:
+        return True
+
+    def shutdown(self):
+        pass
+
+    def last_error(self):
+        return (1, 'Success')
+
+    def symbol_select(self, symbol, enable=True) -> bool:
+        return symbol in self.terminals
+
+    def symbol_info(self, symbol):
+        terminal = self.terminals.get(symbol)
+        return terminal.symbol_info(symbol) if terminal else None
+
+    def symbol_info_tick(self, symbol):
+        terminal = self.terminals.get(symbol)
+        return terminal.symbol_info_tick(symbol) if terminal else None
+
+    def copy_ticks_from(self, symbol, date_from, count, flags):
+        terminal = self.terminals.get(symbol)
+        return terminal.copy_ticks_from(symbol, date_from, count, flags) if terminal else None
+
+    def order_send(self, request: dict):
+        return self.terminals[request['symbol']].order_send(request)
+
+    def order_check(self, request: dict):
+        return self.terminals[request['symbol']].order_check(request)
+
+    def positions_get(self, symbol=None, ticket=None, group=None):
+        if symbol is not None:
+            terminal = self.terminals.get(symbol)
+            return terminal.positions_get(symbol=symbol, ticket=ticket) if terminal else ()
+        return tuple(p for t in self.terminals.values() for p in t.positions_get(ticket=ticket))
+
+    def history_deals_get(self, date_from=None, date_to=None, **kwargs):
+        return tuple(d for t in self.terminals.values() for d in t.history_deals_get(date_from, date_to, **kwargs))
+
+    def account_info(self):
+        accounts = [t.account_info() for t in self.terminals.values()]
+        first = accounts[0]
+        total = {name: round(sum(getattr(a, name) for a in accounts), 2)
+                 for name in ('balance', 'equity', 'profit', 'margin', 'margin_free')}
+        total['margin_level'] = (total['equity'] / total['margin'] * 100) if total['margin'] > 0 else 0.0
+        return SimpleNamespace(**{**first.__dict__, **total})
+
+
+def synthetic_ticks(n: int = 20000, seed: int = 0, start_msc: int = 1_767_607_200_000,
+                    price: float = 2600.0, point: float = 0.01, spread_points: int = 20,
+                    regime_length: int = 400, mean_interval_ms: float = 120.0) -> np.ndarray:
+    """
+    Reproducible random-walk ticks (TICK_DTYPE) with alternating trend regimes
+
+    Each regime drifts up, down or sideways so order-flow and momentum
+    signals actually fire.  start_msc defaults to Monday 2026-01-05 09:00 UTC.
+    """
+    rng = np.random.default_rng(seed)
+    drift = rng.choice([-0.6, 0.0, 0.6], size=n // regime_length + 1)[np.arange(n) // regime_length]
+    steps = np.clip(np.rint(rng.normal(drift, 1.2)), -4, 4)
+
+    ticks = np.zeros(n, dtype=TICK_DTYPE)
+    time_msc = start_msc + np.cumsum(rng.exponential(mean_interval_ms, n).astype(np.int64))
+    bid_points = np.rint(price / point) + np.cumsum(steps)
+    ticks['timestamp'] = time_msc / 1000.0
+    ticks['bid'] = bid_points * point
+    ticks['ask'] = (bid_points + spread_points) * point
+    # Trades print on the side of the move (aggressor)
+    buyer = np.where(steps == 0, rng.random(n) < 0.5, steps > 0)
+    ticks['last'] = np.where(buyer, ticks['ask'], ticks['bid'])
+    ticks['volume'] = rng.integers(1, 6, n)
+    ticks['spread'] = ticks['ask'] - ticks['bid']
+    ticks['mid'] = (ticks['bid'] + ticks['ask']) / 2
+    return ticks
+
+
+@dataclass
+class ReplayResult:
+    """Output of one replay run"""
+    signals: List[dict]
+    trades: List[dict]
+    timings: Dict[str, dict]
+    ticks: int
+    analyses: int
+    wall_time: float
+    replayed_time: float
+    call_counts: Dict[str, int] = field(default_factory=dict)
+    final_balance: float = 0.0
+
+    @property
+    def fingerprint(self) -> str:
+        """SHA-256 over signals and trades (equal across runs for equal input)"""
+        payload = json.dumps({'signals': self.signals, 'trades': self.trades}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @property
+    def speedup(self) -> float:
+        return self.replayed_time / self.wall_time if self.wall_time > 0 else 0.0
+
+    def summary(self) -> str:
+        lines = [
+            f"Ticks: {self.ticks} | Analyses: {self.analyses} | Signals: {len(self.signals)} | "
+            f"Deals: {len(self.trades)} | Balance: {self.final_balance:.2f}",
+            f"Replayed {self.replayed_time:.1f}s in {self.wall_time:.2f}s ({self.speedup:.0f}x)",
+            f"Fingerprint: {self.fingerprint[:16]}",
+            f"{'Stage':<24} {'count':>8} {'mean us':>10} {'p50 us':>10} {'p99 us':>10} {'max us':>10}",
+        ]
+        for stage, t in self.timings.items():
+            lines.append(f"{stage:<24} {t['count']:>8} {t['mean_us']:>10.1f} {t['p50_us']:>10.1f} "
+                         f"{t['p99_us']:>10.1f} {t['max_us']:>10.1f}")
+        return "\n".join(lines)
+
+
+def _timing_stats(samples: List[float]) -> dict:
+    if not samples:
+        return {'count': 0, 'mean_us': 0.0, 'p50_us': 0.0, 'p99_us': 0.0, 'max_us': 0.0}
+    a = np.asarray(samples)
+    return {'count': len(a), 'mean_us': float(a.mean()), 'p50_us': float(np.percentile(a, 50)),
+            'p99_us': float(np.percentile(a, 99)), 'max_us': float(a.max())}
+
+
+def _ensure_mt5_importable(terminal: ReplayMT5):
+    """Let the engine modules import on machines without the MetaTrader5 package"""
+    try:
+        import MetaTrader5  # noqa: F401
+    except ImportError:
+        sys.modules['MetaTrader5'] = terminal
+
+
+def mt5_modules() -> list:
+    """The MT5_MODULES modules (imported on first use)"""
+    return [importlib.import_module(name) for name in MT5_MODULES]
+
+
+def patch_mt5(terminal, setattr=setattr):
+    """
+    Point ``mt5`` in every MT5_MODULES module at ``terminal`` and drop cached specs
+
+    Pass pytest's ``monkeypatch.setattr`` to have the swap undone after the test.
+    """
+    for module in mt5_modules():
+        setattr(module, 'mt5', terminal)
+    importlib.import_module('symbol_specs').get_symbol_spec_cache().invalidate()
+
+
+def serve_live(symbol: str, ticks: np.ndarray, spec: Optional[ReplaySymbol] = None,
+               balance: float = 10000.0) -> ReplayMT5:
+    """
+    Install a ReplayMT5 into the engine modules for the rest of the process and
+    publish ``ticks`` into it on their own schedule, stamped with the wall clock
+
+    Meant for processes that run the real engine threads against recorded or
+    synthetic ticks, e.g. as an EngineProcess initializer.  Nothing is restored.
+    """
+    terminal = ReplayMT5(symbol, spec, balance=balance)
+    _ensure_mt5_importable(terminal)
+    patch_mt5(terminal)
+
+    first = ticks[0]
+    terminal.set_tick(int(_time.time() * 1000), float(first['bid']), float(first['ask']),
+                      float(first['last']), float(first['volume']))
+
+    def publish():
+        t0 = float(ticks['timestamp'][0])
+        start = _time.time()
+        for row in ticks[1:]:
+            delay = start + (float(row['timestamp']) - t0) - _time.time()
+            if delay > 0:
+                _time.sleep(delay)
+            terminal.set_tick(int(_time.time() * 1000), float(row['bid']), float(row['ask']),
+                              float(row['last']), float(row['volume']))
+
+    threading.Thread(target=publish, daemon=True, name=f"ReplayFeed-{symbol}").start()
+    return terminal
+
+
+class TickReplay:
+    """
+    Replays ticks through a real UltraLowLatencyEngine against ReplayMT5
+
+    Args:
+        symbol: Symbol name the engine trades
+        config: Engine config overrides (merged over ConfigManager.DEFAULT_CONFIG)
+        ticks: TICK_DTYPE array (tick_recorder.load_ticks / TickDay.to_ticks or synthetic_ticks)
+        speed: Replay speed-up over real time (e.g. 60 = one minute per second);
+            None replays as fast as possible
+        spec: Contract specification for the simulated symbol
+        balance: Starting account balance
+        ml_predictor / risk_manager: Optional components handed to the engine
+    """
+
+    def __init__(self, symbol: str, config: Optional[dict], ticks: np.ndarray,
+                 speed: Optional[float] = None, spec: Optional[ReplaySymbol] = None,
+                 balance: float = 10000.0, ml_predictor=None, risk_manager=None):
+        from config_manager import ConfigManager
+
+        self.symbol = symbol
+        self.config = copy.deepcopy(ConfigManager.DEFAULT_CONFIG)
+        self.config.update(copy.deepcopy(config or {}))
+        # Replay drives the engine directly: no shared hub, no recording
+        self.config.update({'symbol': symbol, 'use_market_data_hub': False, 'record_ticks': False,
+                            'initial_balance': balance})
+        self.ticks = np.asarray(ticks)
+        self.speed = speed
+        self.spec = spec or ReplaySymbol()
+        self.balance = balance
+        self.ml_predictor = ml_predictor
+        self.risk_manager = risk_manager
+
+        self.terminal = None
+        self.clock = None
+        self.engine = None
+
+    @contextmanager
+    def _patched(self):
+        """Install the simulated terminal and virtual clock into the engine modules"""
+        import account_cache
+        import aventa_hft_core
+        import deals_ledger
+        import performance_utils
+        import position_book
+        import symbol_specs
+        import thread_safety
+
+        saved = [(module, 'mt5', self.terminal) for module in mt5_modules()] + [
+            (deals_ledger, 'time', self.clock.time), (position_book, 'time', self.clock.time),
+            (symbol_specs, 'time', self.clock.time), (account_cache, 'time', self.clock.time),
+            (thread_safety, 'time', self.clock.time),
+            (aventa_hft_core, 'time', self.clock), (performance_utils, 'time', self.clock),
+        ]
+        originals = [(module, name, getattr(module, name)) for module, name, _ in saved]
+        for module, name, value in saved:
+            setattr(module, name, value)
+        # Specs cached from the live terminal must not leak into the replay (or back)
+        symbol_specs.get_symbol_spec_cache().invalidate()
+        try:
+            yield
+        finally:
+            for module, name, value in originals:
+                setattr(module, name, value)
+            symbol_specs.get_symbol_spec_cache().invalidate()
+
+    def run(self) -> ReplayResult:
+        """Replay every tick and return signals, trades and stage timings"""
+        if len(self.ticks) == 0:
+            raise ValueError("nothing to replay")
+
+        first_ts = float(self.ticks['timestamp'][0])
+        self.terminal = ReplayMT5(self.symbol, self.spec, balance=self.balance)
+        _ensure_mt5_importable(self.terminal)
+        from aventa_hft_core import TickData, UltraLowLatencyEngine
+
+        self.clock = VirtualClock(first_ts)
+        # Signals are generated against the first tick's quotes before any analysis
+        t0 = self.ticks[0]
+        self.terminal.set_tick(int(round(t0['timestamp'] * 1000)), float(t0['bid']), float(t0['ask']),
+                               float(t0['last']), float(t0['volume']))
+
+        timings = defaultdict(list)
+        signals = []
+        analyses = 0
+        perf = _time.perf_counter
+
+        with self._patched():
+            engine = UltraLowLatencyEngine(self.symbol, self.config, risk_manager=self.risk_manager,
+                                           ml_predictor=self.ml_predictor)
+            self.engine = engine
+            if not engine.initialize():
+                raise RuntimeError("engine failed to initialize against the replay terminal")
+            engine.is_running = True
+
+            analysis_interval = float(self.config.get('analysis_interval', 0.1))
+            next_analysis = first_ts
+            wall_start = perf()
+
+            for row in self.ticks:
+                ts = float(row['timestamp'])
+                self.clock.advance_to(ts)
+                self.terminal.set_tick(int(round(ts * 1000)), float(row['bid']), float(row['ask']),
+                                       float(row['last']), float(row['volume']))
+                tick = TickData(timestamp=ts, bid=float(row['bid']), ask=float(row['ask']),
+                                last=float(row['last']), volume=int(row['volume']),
+                                spread=float(row['ask'] - row['bid']))
+
+                start = perf()
+                engine.process_tick(tick)
+                timings['process_tick'].append((perf() - start) * 1e6)
+
+                if ts >= next_analysis:
+                    next_analysis = ts + analysis_interval
+                    self._analyze(engine, timings, signals)
+                    analyses += 1
+
+                if self.speed:
+                    # Pace against the wall clock
+                    lag = (ts - first_ts) / self.speed - (perf() - wall_start)
+                    if lag > 0:
+                        _time.sleep(lag)
+
+            wall_time = perf() - wall_start
+            engine.is_running = False
+
+        timings['order_send'] = self.terminal.order_send_times
+        trades = [{
+            'ticket': d.ticket, 'time_msc': d.time_msc, 'type': 'BUY' if d.type == 0 else 'SELL',
+            'entry': 'IN' if d.entry == 0 else 'OUT', 'position': d.position_id, 'magic': d.magic,
+            'volume': d.volume, 'price': d.price, 'profit': d.profit, 'comment': d.comment,
+        } for d in self.terminal.deals]
+
+        return ReplayResult(
+            signals=signals,
+            trades=trades,
+            timings={stage: _timing_stats(samples) for stage, samples in timings.items()},
+            ticks=len(self.ticks),
+            analyses=analyses,
+            wall_time=wall_time,
+            replayed_time=float(self.ticks['timestamp'][-1]) - first_ts,
+            call_counts=dict(self.terminal.call_counts),
+            final_balance=self.terminal.balance,
+        )
+
+    def _analyze(self, engine, timings, signals):
+        """One pass of the analysis thread followed by the execution thread"""
+        perf = _time.perf_counter
+
+        start = perf()
+        microstructure = engine.analyze_microstructure()
+        timings['analyze_microstructure'].append((perf() - start) * 1e6)
+        if not microstructure:
+            return
+
+        start = perf()
+        signal = engine.generate_signal(microstructure)
+        timings['generate_signal'].append((perf() - start) * 1e6)
+        if signal is None:
+            return
+
+        # Same latency marks the analysis thread attaches before queueing
+        signal.tick_perf = engine.last_tick_perf
+        start = perf()
+        executed = engine.execute_signal(signal)
+        timings['execute_signal'].append((perf() - start) * 1e6)
+
+        signals.append({
+            'time': signal.timestamp, 'type': signal.signal_type, 'strength': signal.strength,
+            'price': signal.price, 'sl': signal.stop_loss, 'tp': signal.take_profit,
+            'volume': signal.volume, 'reason': signal.reason, 'executed': bool(executed),
+        })
+
+
+if __name__ == "__main__":
+    logging.getLogger('aventa_hft_core').setLevel(logging.ERROR)
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    speed = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    config = {'max_spread': 0.5, 'max_volatility': 0.05, 'min_delta_threshold': 30, 'min_velocity_threshold': 0.001,
+              'trading_sessions_enabled': False, 'max_floating_loss': 500.0, 'max_floating_profit': 0}
+
+    print("=" * 80)
+    print(f"TICK REPLAY - {n} synthetic XAUUSD ticks, speed={'max' if speed is None else f'{speed:g}x'}")
+    print("=" * 80)
+    first = TickReplay('XAUUSD', config, synthetic_ticks(n), speed=speed).run()
+    print(first.summary())
+    second = TickReplay('XAUUSD', config, synthetic_ticks(n), speed=speed).run()
+    print("-" * 80)
+    print(f"Second run identical: {first.fingerprint == second.fingerprint}")
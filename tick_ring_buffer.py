@@ -0,0 +1,186 @@
+"""
+Columnar Ring Buffers for Aventa HFT Pro 2026
+Fixed-capacity NumPy structured-array buffers with zero-copy window views
+"""
+
+import numpy as np
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+TICK_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('bid', 'f8'),
+    ('ask', 'f8'),
+    ('last', 'f8'),
+    ('volume', 'f8'),
+    ('spread', 'f8'),
+    ('mid', 'f8'),
+])
+
+ORDERFLOW_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('buy_volume', 'f8'),
+    ('sell_volume', 'f8'),
+    ('delta', 'f8'),
+    ('cumulative_delta', 'f8'),
+    ('imbalance_ratio', 'f8'),
+])
+
+
+def ticks_from_mt5(rows: np.ndarray) -> np.ndarray:
+    """TICK_DTYPE records from copy_ticks_from rows (same values as building TickData per row)"""
+    ticks = np.empty(len(rows), dtype=TICK_DTYPE)
+    ticks['timestamp'] = rows['time_msc'] / 1000.0
+    ticks['bid'] = rows['bid']
+    ticks['ask'] = rows['ask']
+    ticks['last'] = rows['last']
+    ticks['volume'] = rows['volume']
+    ticks['spread'] = rows['ask'] - rows['bid']
+    ticks['mid'] = (ticks['bid'] + ticks['ask']) / 2
+    return ticks
+
+
+class StructuredRingBuffer:
+    """
+    Fixed-capacity ring buffer over a NumPy structured array
+
+    Every record is written twice (at ``i`` and ``i + capacity``) so the
+    newest ``n`` records are always one contiguous slice of the backing
+    array.  ``last_n`` therefore returns a read-only view without copying,
+    and per-field access (``window['mid']``) is a strided view as well.
+
+    Single writer, any number of readers.
+    """
+
+    def __init__(self, dtype: np.dtype, capacity: int):
+        """
+        Initialize buffer
+
+        Args:
+            dtype: Structured record dtype
+            capacity: Maximum number of records kept
+        """
+        self.capacity = max(1, int(capacity))
+        self.dtype = np.dtype(dtype)
+        # np.record scalars allow attribute access (buffer[-1].mid)
+        self._data = np.zeros(2 * self.capacity, dtype=np.dtype((np.record, self.dtype)))
+        self._fields = self.dtype.names
+        self._write_lock = threading.Lock()
+        self.total_written = 0
+
+    def __len__(self) -> int:
+        return min(self.total_written, self.capacity)
+
+    def _end(self) -> int:
+        """Index one past the newest record in the mirrored half"""
+        return (self.total_written % self.capacity) + self.capacity
+
+    def append_values(self, *values):
+        """Append one record given its field values in dtype order"""
+        with self._write_lock:
+            i = self.total_written % self.capacity
+            self._data[i] = values
+            self._data[i + self.capacity] = values
+            self.total_written += 1
+
+    def append_many(self, records: np.ndarray):
+        """Append a batch of records (structured array with this buffer's fields)"""
+        n = len(records)
+        if n == 0:
+            return
+        if n > self.capacity:
+            records = records[-self.capacity:]
+            skipped = n - self.capacity
+            n = self.capacity
+        else:
+            skipped = 0
+
+        with self._write_lock:
+            start = (self.total_written + skipped) % self.capacity
+            first = min(n, self.capacity - start)
+            for name in self._fields:
+                column = records[name]
+                self._data[name][start:start + first] = column[:first]
+                self._data[name][start + self.capacity:start + self.capacity + first] = column[:first]
+                if first < n:
+                    rest = n - first
+                    self._data[name][:rest] = column[first:]
+                    self._data[name][self.capacity:self.capacity + rest] = column[first:]
+            self.total_written += n + skipped
+
+    def last_n(self, n: int) -> np.ndarray:
+        """Read-only zero-copy view of the newest n records (oldest first)"""
+        n = min(int(n), len(self))
+        end = self._end()
+        view = self._data[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def range(self, start_seq: int, end_seq: int) -> np.ndarray:
+        """
+        Read-only zero-copy view of records by sequence number [start_seq, end_seq)
+
+        Sequence numbers count every record ever appended (``total_written``).
+        Records already overwritten are clipped from the front.
+        """
+        end_seq = min(int(end_seq), self.total_written)
+        start_seq = max(int(start_seq), end_seq - self.capacity, 0)
+        if start_seq >= end_seq:
+            return self._data[0:0]
+        start = start_seq % self.capacity
+        view = self._data[start:start + (end_seq - start_seq)]
+        view.flags.writeable = False
+        return view
+
+    def column(self, name: str, n: int) -> np.ndarray:
+        """Read-only zero-copy view of one field over the newest n records"""
+        return self.last_n(n)[name]
+
+    def __getitem__(self, index: int):
+        """Record access relative to the window (buffer[-1] is the newest)"""
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("ring buffer index out of range")
+        return self._data[self._end() - size + index]
+
+    def clear(self):
+        """Drop all records"""
+        with self._write_lock:
+            self.total_written = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the backing array"""
+        return self._data.nbytes
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(len={len(self)}, capacity={self.capacity})"
+
+
+class TickRingBuffer(StructuredRingBuffer):
+    """Ring buffer of ticks (timestamp, bid, ask, last, volume, spread, mid)"""
+
+    def __init__(self, capacity: int = 10000):
+        super().__init__(TICK_DTYPE, capacity)
+
+    def append(self, tick):
+        """Append a TickData-like object"""
+        self.append_values(tick.timestamp, tick.bid, tick.ask, tick.last,
+                           tick.volume, tick.spread, (tick.bid + tick.ask) / 2)
+
+
+class OrderFlowRingBuffer(StructuredRingBuffer):
+    """Ring buffer of order flow records"""
+
+    def __init__(self, capacity: int = 5000):
+        super().__init__(ORDERFLOW_DTYPE, capacity)
+
+    def append(self, orderflow):
+        """Append an OrderFlowData-like object"""
+        self.append_values(orderflow.timestamp, orderflow.buy_volume, orderflow.sell_volume,
+                           orderflow.delta, orderflow.cumulative_delta, orderflow.imbalance_ratio)
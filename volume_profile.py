@@ -0,0 +1,171 @@
+"""
+Volume Profile - price-level volume histogram for Aventa HFT Pro 2026
+O(1) per-tick updates into a growable NumPy array indexed by (price - anchor) / point
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+
+class VolumeProfile:
+    """
+    Session volume-at-price histogram
+
+    The first price of a session becomes the anchor; a price maps to level
+    ``round((price - anchor) / point)`` and level ``base + i`` is stored in
+    ``volumes[i]``.  When a price falls outside the array it is grown by
+    doubling (re-centred when growing downwards), so ``add`` is amortised
+    O(1).  The point of control is tracked on every update; the value area
+    is computed from the traded range on demand and cached until the next
+    update.
+    """
+
+    def __init__(self, point: float, value_area_pct: float = 0.70, initial_buckets: int = 1024):
+        if point <= 0:
+            raise ValueError("point must be positive")
+        self.point = point
+        self.value_area_pct = value_area_pct
+        self.initial_buckets = initial_buckets
+        self.reset()
+
+    def reset(self, session=None):
+        """Start a new session (keeps point and value area settings)"""
+        self.session = session
+        self.volumes = np.zeros(self.initial_buckets, dtype=np.float64)
+        self.anchor: Optional[float] = None
+        self.base = -(self.initial_buckets // 2)
+        self.low_level = 0
+        self.high_level = 0
+        self.poc_level = 0
+        self.poc_volume = 0.0
+        self.total_volume = 0.0
+        self.updates = 0
+        self._value_area = None
+        self._value_area_updates = -1
+
+    def set_point(self, point: float):
+        """Change the bucket size (resets the profile if it differs)"""
+        if point > 0 and point != self.point:
+            self.point = point
+            self.reset(self.session)
+
+    def _grow(self, index: int):
+        """Resize so that array index ``index`` (relative to the current base) fits"""
+        size = len(self.volumes)
+        new_size = size * 2
+        while index < -(new_size - size) or index >= new_size:
+            new_size *= 2
+        # Growing downwards puts the new space in front of the existing levels
+        shift = new_size - size if index < 0 else 0
+        volumes = np.zeros(new_size, dtype=np.float64)
+        volumes[shift:shift + size] = self.volumes
+        self.volumes = volumes
+        self.base -= shift
+
+    def add(self, price: float, volume: float = 1.0):
+        """Add traded volume at a price"""
+        if self.anchor is None:
+            self.anchor = price
+        level = int(round((price - self.anchor) / self.point))
+        index = level - self.base
+        if index < 0 or index >= len(self.volumes):
+            self._grow(index)
+            index = level - self.base
+
+        bucket = self.volumes[index] + volume
+        self.volumes[index] = bucket
+        self.total_volume += volume
+        if self.updates == 0:
+            self.low_level = self.high_level = level
+        elif level < self.low_level:
+            self.low_level = level
+        elif level > self.high_level:
+            self.high_level = level
+        if bucket > self.poc_volume:
+            self.poc_volume = bucket
+            self.poc_level = level
+        self.updates += 1
+
+    def add_many(self, prices: np.ndarray, volumes: np.ndarray):
+        """Add a batch of trades (one scatter-add; POC ties go to the lower price)"""
+        if len(prices) == 0:
+            return
+        if self.anchor is None:
+            self.anchor = float(prices[0])
+        levels = np.rint((prices - self.anchor) / self.point).astype(np.int64)
+        low, high = int(levels.min()), int(levels.max())
+        if low - self.base < 0:
+            self._grow(low - self.base)
+        if high - self.base >= len(self.volumes):
+            self._grow(high - self.base)
+
+        indices = levels - self.base
+        np.add.at(self.volumes, indices, volumes)
+        self.total_volume += float(np.sum(volumes))
+        if self.updates == 0:
+            self.low_level, self.high_level = low, high
+        else:
+            self.low_level = min(self.low_level, low)
+            self.high_level = max(self.high_level, high)
+
+        # Only touched buckets can have overtaken the point of control
+        touched = np.unique(indices)
+        best = touched[int(np.argmax(self.volumes[touched]))]
+        if self.volumes[best] > self.poc_volume:
+            self.poc_volume = float(self.volumes[best])
+            self.poc_level = int(best) + self.base
+        self.updates += len(prices)
+
+    def price_at(self, level: int) -> float:
+        return self.anchor + level * self.point
+
+    @property
+    def poc_price(self) -> float:
+        """Point of control (price with the most volume), 0.0 when empty"""
+        return self.price_at(self.poc_level) if self.updates else 0.0
+
+    def levels(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(prices, volumes) over the traded range (volumes is a view)"""
+        if not self.updates:
+            return np.empty(0), np.empty(0)
+        start = self.low_level - self.base
+        stop = self.high_level - self.base + 1
+        prices = self.anchor + np.arange(self.low_level, self.high_level + 1) * self.point
+        return prices, self.volumes[start:stop]
+
+    def value_area(self) -> Tuple[float, float]:
+        """
+        (value area low, value area high)
+
+        The highest-volume price levels that together hold value_area_pct of
+        the session volume; (0.0, 0.0) when empty.
+        """
+        if not self.updates:
+            return 0.0, 0.0
+        if self._value_area_updates == self.updates:
+            return self._value_area
+
+        _, volumes = self.levels()
+        order = np.argsort(-volumes, kind='stable')
+        cumulative = np.cumsum(volumes[order])
+        count = int(np.searchsorted(cumulative, self.value_area_pct * self.total_volume - 1e-12)) + 1
+        chosen = order[:count]
+        result = (self.price_at(self.low_level + int(chosen.min())),
+                  self.price_at(self.low_level + int(chosen.max())))
+        self._value_area = result
+        self._value_area_updates = self.updates
+        return result
+
+    def get_features(self) -> dict:
+        """POC and value area for signal logic"""
+        val, vah = self.value_area()
+        return {
+            'poc_price': self.poc_price,
+            'value_area_low': val,
+            'value_area_high': vah,
+            'profile_volume': self.total_volume,
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return self.volumes.nbytes